@@ -322,6 +322,7 @@ const RootAuthCheck = ({ children }) => {
         console.log('RootAuthCheck: No user logged in');
       }
       
+      performance.mark('lyvo:auth-checked');
       setIsChecking(false);
     };
 
@@ -347,8 +348,12 @@ function AppRoutesWithLoader() {
   const [loading, setLoading] = useState(false);
 
   useEffect(() => {
+    performance.mark('lyvo:route-rendered');
     setLoading(true);
-    const timer = setTimeout(() => setLoading(false), 1000);
+    const timer = setTimeout(() => {
+      setLoading(false);
+      performance.mark('lyvo:loader-hidden');
+    }, 1000);
     return () => clearTimeout(timer);
   }, [location.pathname]);
 
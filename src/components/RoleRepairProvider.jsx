@@ -7,6 +7,7 @@ const RoleRepairProvider = ({ children }) => {
 
   useEffect(() => {
     const repairUserRole = async () => {
+      performance.mark('lyvo:role-repair-start');
       try {
         setIsRepairing(true);
         console.log('🔧 RoleRepairProvider: Starting role repair...');
@@ -26,6 +27,7 @@ const RoleRepairProvider = ({ children }) => {
         setRepairComplete(true);
       } finally {
         setIsRepairing(false);
+        performance.mark('lyvo:role-repair-end');
       }
     };
 
@@ -2,6 +2,15 @@ import React from "react";
 import ReactDOM from "react-dom/client";
 import "./index.css";
 import App from "./App.jsx";
+import { MotionGlobalConfig } from "framer-motion";
+
+// Boot phase marks (lyvo:*) are read by the startup profiler in tests/selenium/boot_profiler.py
+performance.mark("lyvo:bundle-evaluated");
+
+// Set by the fast UI test mode (tests/selenium/fast_ui.py) so UI tests never wait on animations
+if (window.__lyvoSkipAnimations) {
+  MotionGlobalConfig.skipAnimations = true;
+}
 
 const root = ReactDOM.createRoot(document.getElementById("root"));
 root.render(
@@ -6,6 +6,21 @@ class LocationService {
     this.googleMapsLoaded = false;
     this.geocoder = null;
     this.autocomplete = null;
+    // Recent lookups, so retyping a query or revisiting a spot skips the network
+    this.searchCache = new Map();
+    this.reverseCache = new Map();
+    this.cacheLimit = 100;
+  }
+
+  // Store a lookup result, evicting the oldest entry once the cache is full
+  rememberLookup(cache, key, value) {
+    if (cache.has(key)) {
+      cache.delete(key);
+    }
+    cache.set(key, value);
+    if (cache.size > this.cacheLimit) {
+      cache.delete(cache.keys().next().value);
+    }
   }
 
   // Initialize Google Maps services
@@ -58,6 +73,11 @@ class LocationService {
   async searchWithNominatim(query) {
     if (!query || query.length < 3) return [];
 
+    const cacheKey = query.trim().toLowerCase();
+    if (this.searchCache.has(cacheKey)) {
+      return this.searchCache.get(cacheKey);
+    }
+
     try {
       const response = await fetch(
         `https://nominatim.openstreetmap.org/search?format=json&q=${encodeURIComponent(query)}&countrycodes=in&limit=5&addressdetails=1`
@@ -69,7 +89,7 @@ class LocationService {
 
       const results = await response.json();
       
-      return results.map(result => ({
+      const locations = results.map(result => ({
         id: result.place_id,
         name: result.display_name.split(',')[0], // Get the first part as name
         address: result.display_name,
@@ -78,6 +98,9 @@ class LocationService {
         type: result.type,
         importance: result.importance
       })).sort((a, b) => b.importance - a.importance); // Sort by importance
+
+      this.rememberLookup(this.searchCache, cacheKey, locations);
+      return locations;
     } catch (error) {
       console.error('Nominatim search error:', error);
       return [];
@@ -137,6 +160,12 @@ class LocationService {
   // Reverse geocoding using Nominatim API (for Leaflet)
   async reverseGeocodeWithNominatim(lat, lng) {
     try {
+      // ~11 m precision is plenty for naming a location
+      const cacheKey = `${lat.toFixed(4)},${lng.toFixed(4)}`;
+      if (this.reverseCache.has(cacheKey)) {
+        return { ...this.reverseCache.get(cacheKey), lat, lng };
+      }
+
       const response = await fetch(
         `https://nominatim.openstreetmap.org/reverse?format=json&lat=${lat}&lon=${lng}&addressdetails=1`
       );
@@ -165,12 +194,14 @@ class LocationService {
         }
       }
 
-      return {
+      const location = {
         name: locationName,
         address: address,
         lat: lat,
         lng: lng
       };
+      this.rememberLookup(this.reverseCache, cacheKey, location);
+      return location;
     } catch (error) {
       console.error('Nominatim reverse geocoding error:', error);
       return {
@@ -78,6 +78,19 @@ const testUsers = [
     }
 ];
 
+// Per-worker copies for parallel pytest-xdist runs: seeker+gw0@test.com, seeker+gw1@test.com, ...
+// Set TEST_WORKERS to the number of workers (see selenium/worker_isolation.py)
+function workerUsers(workerCount) {
+    const users = [];
+    for (let i = 0; i < workerCount; i++) {
+        for (const userData of testUsers) {
+            const [local, domain] = userData.email.split('@');
+            users.push({ ...userData, email: `${local}+gw${i}@${domain}` });
+        }
+    }
+    return users;
+}
+
 async function createTestUsers() {
     try {
         // Connect to MongoDB
@@ -87,8 +100,11 @@ async function createTestUsers() {
         await mongoose.connect(mongoUri);
         console.log('✅ Connected to MongoDB');
 
+        const workerCount = parseInt(process.env.TEST_WORKERS || '0', 10);
+        const allUsers = [...testUsers, ...workerUsers(workerCount)];
+
         // Check if test users already exist
-        for (const userData of testUsers) {
+        for (const userData of allUsers) {
             const existingUser = await User.findOne({ email: userData.email });
             
             if (existingUser) {
@@ -140,4 +156,4 @@ if (require.main === module) {
     createTestUsers();
 }
 
-module.exports = { createTestUsers, testUsers };
+module.exports = { createTestUsers, testUsers, workerUsers };
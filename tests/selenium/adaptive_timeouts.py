@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Lyvo Adaptive Timeouts
+Per-step wait timeouts learned from the p99 of earlier passing runs plus a safety margin,
+capped by the static values in the timeouts block of test_config.json.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+from duration_history import DurationHistory
+
+DEFAULT_ADAPTIVE_TIMEOUTS = {
+    'enabled': True,
+    'history_file': './test-reports/step_timings.json',
+    'keep': 100,
+    'min_samples': 5,
+    'margin': 1.5,
+    'min_seconds': 1.0
+}
+
+
+class AdaptiveTimeouts:
+    """Hands out per-step timeouts and records how long each step actually took"""
+
+    def __init__(self, config: Dict, history_file=None):
+        self.settings = dict(DEFAULT_ADAPTIVE_TIMEOUTS, **config.get('adaptive_timeouts', {}))
+        self.history = DurationHistory(Path(history_file or self.settings['history_file']), keep=self.settings['keep'])
+        self.committed: Dict[str, List[float]] = {}
+        self.lock = threading.Lock()
+        # Steps of the test running on each thread, kept until we know whether it passed
+        self.local = threading.local()
+
+    def _pending(self) -> List:
+        if not hasattr(self.local, 'pending'):
+            self.local.pending = []
+        return self.local.pending
+
+    def timeout(self, step: str, ceiling: float) -> float:
+        """p99 of passing runs times the margin, never above ceiling; ceiling until there is enough history"""
+        samples = self.history.samples.get(step, [])
+        if not self.settings['enabled'] or len(samples) < self.settings['min_samples']:
+            return ceiling
+        learned = self.history.quantile(step, 99) * self.settings['margin']
+        return round(min(ceiling, max(learned, self.settings['min_seconds'])), 2)
+
+    @contextmanager
+    def step(self, name: str, ceiling: float) -> Iterator[float]:
+        """Yield the timeout for name and time the block; only blocks that finish are recorded"""
+        start = time.perf_counter()
+        yield self.timeout(name, ceiling)
+        self._pending().append((name, time.perf_counter() - start))
+
+    def commit(self):
+        """The current test passed: keep its step timings"""
+        pending = self._pending()
+        with self.lock:
+            for name, seconds in pending:
+                self.history.record(name, seconds)
+                self.committed.setdefault(name, []).append(round(seconds, 3))
+        pending.clear()
+
+    def discard(self):
+        """The current test failed: its timings say nothing about healthy runs"""
+        self._pending().clear()
+
+    def record_all(self, samples: Dict[str, List[float]]):
+        """Add timings committed elsewhere (e.g. by pytest-xdist workers)"""
+        with self.lock:
+            for name, values in samples.items():
+                for seconds in values:
+                    self.history.record(name, seconds)
+
+    def save(self):
+        with self.lock:
+            self.history.save()
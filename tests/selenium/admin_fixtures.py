@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Lyvo Admin Fixtures
+Deterministic synthetic users, admin-view properties and bookings for the benchmarks.
+Roles follow the frontend: 1 = seeker, 2 = admin, 3 = owner.
+"""
+
+import random
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+from location_fixtures import PLACES
+
+FIRST_NAMES = ['Anandu', 'Priya', 'Rahul', 'Sneha', 'Arjun', 'Meera', 'Vikram', 'Anjali',
+               'Karthik', 'Divya', 'Rohan', 'Lakshmi', 'Nikhil', 'Aisha', 'Suresh', 'Neha']
+LAST_NAMES = ['Nair', 'Menon', 'Sharma', 'Iyer', 'Reddy', 'Patel', 'Kumar', 'Das',
+              'Pillai', 'Singh', 'Rao', 'Joseph', 'Thomas', 'Varghese', 'Gupta', 'Khan']
+APPROVAL_STATES = ['approved', 'pending', 'rejected']
+BOOKING_STATES = ['pending', 'confirmed', 'pending_approval', 'cancelled']
+
+BASE_DATE = datetime(2025, 1, 1)
+
+
+def generate_users(count: int, seed: int = 42, owner_ratio: float = 0.2) -> List[Dict]:
+    """Synthetic users shaped like the user service /user/all and /user/users payloads"""
+    rng = random.Random(seed)
+    users = []
+    for i in range(count):
+        role = 3 if rng.random() < owner_ratio else 1
+        first = FIRST_NAMES[rng.randrange(len(FIRST_NAMES))]
+        last = LAST_NAMES[rng.randrange(len(LAST_NAMES))]
+        created = BASE_DATE + timedelta(minutes=rng.randrange(0, 60 * 24 * 365))
+        users.append({
+            '_id': f"user{i:06d}",
+            'name': f"{first} {last}",
+            'email': f"{first.lower()}.{last.lower()}{i}@example.com",
+            'phone': f"9{rng.randrange(100000000, 999999999)}",
+            'role': role,
+            'isVerified': rng.random() < 0.8,
+            'isActive': rng.random() < 0.95,
+            'kycStatus': APPROVAL_STATES[rng.randrange(len(APPROVAL_STATES))] if role == 3 else None,
+            'createdAt': created.isoformat(),
+            'updatedAt': created.isoformat()
+        })
+    return users
+
+
+def generate_admin_properties(count: int, seed: int = 42, owners: int = 200) -> List[Dict]:
+    """Synthetic properties shaped like the property service /api/admin/properties payload"""
+    rng = random.Random(seed)
+    properties = []
+    for i in range(count):
+        name, city, state = PLACES[i % len(PLACES)][:3]
+        owner_index = rng.randrange(max(owners, 1))
+        rooms = []
+        for r in range(rng.randint(1, 6)):
+            rooms.append({
+                '_id': f"room{i:06d}{r}",
+                'room_number': r + 1,
+                'rent': rng.randrange(4000, 30000, 500),
+                'occupancy': rng.randint(1, 4),
+                'approval_status': APPROVAL_STATES[rng.randrange(len(APPROVAL_STATES))],
+                'room_image': None
+            })
+        properties.append({
+            '_id': f"aprop{i:06d}",
+            'property_name': f"{name} Residency {i}",
+            'address': {'street': f"{rng.randint(1, 400)} Main Road", 'city': city, 'state': state},
+            'owner_id': f"owner{owner_index:05d}",
+            'owner': {'name': f"Owner {owner_index}", 'email': f"owner{owner_index}@example.com"},
+            'approval_status': APPROVAL_STATES[rng.randrange(len(APPROVAL_STATES))],
+            'status': 'active',
+            'rooms': rooms,
+            'created_at': (BASE_DATE + timedelta(days=rng.randrange(365))).isoformat()
+        })
+    return properties
+
+
+def generate_bookings(count: int, user_id: str, owner_id: str, seed: int = 42) -> List[Dict]:
+    """Synthetic bookings carrying both the seeker view (property/room) and the owner view (snapshots)"""
+    rng = random.Random(seed)
+    bookings = []
+    for i in range(count):
+        name, city, state = PLACES[i % len(PLACES)][:3]
+        rent = rng.randrange(4000, 30000, 500)
+        status = BOOKING_STATES[i % len(BOOKING_STATES)]
+        created = BASE_DATE + timedelta(days=rng.randrange(365))
+        property_view = {
+            '_id': f"bprop{i:05d}",
+            'propertyName': f"{name} Residency {i}",
+            'propertyType': 'PG',
+            'address': {'street': f"{rng.randint(1, 400)} Main Road", 'city': city, 'state': state, 'pincode': '560001'},
+            'ownerName': 'Test Owner',
+            'ownerEmail': 'owner@test.com',
+            'ownerPhone': '1234567890',
+            'images': {}
+        }
+        room_view = {
+            '_id': f"broom{i:05d}",
+            'roomNumber': rng.randint(1, 20),
+            'roomType': 'Single',
+            'rent': rent,
+            'occupancy': rng.randint(1, 3),
+            'bedType': 'Single Bed',
+            'roomSize': rng.randint(90, 250),
+            'amenities': {'wifi': True, 'ac': rng.random() < 0.5},
+            'images': []
+        }
+        bookings.append({
+            '_id': f"booking{i:05d}",
+            'userId': user_id,
+            'ownerId': owner_id,
+            'propertyId': property_view['_id'],
+            'roomId': room_view['_id'],
+            'status': status,
+            'cancelledBy': 'seeker' if status == 'cancelled' else None,
+            'checkInDate': (created + timedelta(days=14)).isoformat(),
+            'bookedAt': created.isoformat(),
+            'createdAt': created.isoformat(),
+            'payment': {'paymentStatus': 'completed' if status == 'confirmed' else 'pending', 'amount': rent},
+            'property': property_view,
+            'room': room_view,
+            'userSnapshot': {'name': 'Test Seeker', 'email': 'seeker@test.com', 'phone': '1234567890'},
+            'propertySnapshot': {'name': property_view['propertyName'], 'address': property_view['address']},
+            'roomSnapshot': {'roomNumber': room_view['roomNumber'], 'roomType': 'Single', 'rent': rent}
+        })
+    return bookings
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+Lyvo Admin List Benchmark
+Seeds large user/property datasets into the local stand-in and measures render time,
+scroll jank and interaction latency of the admin list pages as row counts grow.
+"""
+
+import argparse
+import csv
+import sys
+import time
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+
+from admin_fixtures import generate_admin_properties, generate_users
+from login_test import LyvoLoginTester, load_config, logger
+from perf_utils import bar_chart, check_budgets, dropped_frames, linear_fit, report_dir, save_report
+from standin_server import LyvoStandin, make_token, standin_user
+
+ADMIN_PAGES = {
+    'all_users': {
+        'route': '/admin-users',
+        'rows': 'tbody tr',
+        'search': 'input[placeholder^="Search by name"]'
+    },
+    'seekers': {
+        'route': '/admin-seekers',
+        'rows': 'tbody tr',
+        'search': 'input[placeholder="Search seekers..."]'
+    },
+    'owners': {
+        'route': '/admin-owners',
+        'rows': 'tbody tr',
+        'search': 'input[placeholder="Search owners..."]'
+    },
+    'properties': {
+        'route': '/admin-properties',
+        'rows': 'div.cursor-pointer.group',
+        'search': 'input[placeholder^="Search properties"]'
+    }
+}
+
+DEFAULT_ADMIN_BENCHMARK = {
+    'row_counts': [1000, 10000, 50000],
+    'pages': list(ADMIN_PAGES),
+    'render_timeout': 120,
+    'scroll_duration_ms': 3000,
+    'scroll_step_px': 120,
+    'budgets': {
+        'render_ms': 2500,
+        'dropped_frame_ratio': 0.1,
+        'interaction_ms': 200
+    }
+}
+
+# Runs before any page script: row-count timeline plus Event Timing entries
+INIT_SCRIPT = """
+(function() {
+  window.__lyvoRows = [];
+  window.__lyvoEvents = [];
+  try {
+    new PerformanceObserver(function(list) {
+      for (const e of list.getEntries()) {
+        if (e.interactionId) {
+          window.__lyvoEvents.push({name: e.name, duration: e.duration, start: e.startTime});
+        }
+      }
+    }).observe({type: 'event', durationThreshold: 16, buffered: true});
+  } catch (e) {}
+  document.addEventListener('DOMContentLoaded', function() {
+    let last = -1;
+    new MutationObserver(function() {
+      const count = document.querySelectorAll(sessionStorage.getItem('__lyvoRowSelector') || 'tbody tr').length;
+      if (count !== last) {
+        last = count;
+        window.__lyvoRows.push([performance.now(), count]);
+      }
+    }).observe(document.body, {childList: true, subtree: true});
+  });
+})();
+"""
+
+# Scrolls the page's main scroller once per animation frame and reports frame deltas
+SCROLL_SCRIPT = """
+const done = arguments[arguments.length - 1];
+const durationMs = arguments[0];
+const step = arguments[1];
+let scroller = document.scrollingElement;
+let best = scroller.scrollHeight - scroller.clientHeight;
+for (const el of document.querySelectorAll('main, div')) {
+  const style = getComputedStyle(el);
+  const room = el.scrollHeight - el.clientHeight;
+  if ((style.overflowY === 'auto' || style.overflowY === 'scroll') && room > best) {
+    scroller = el;
+    best = room;
+  }
+}
+const frames = [];
+const start = performance.now();
+let last = start;
+function frame(now) {
+  frames.push(now - last);
+  last = now;
+  scroller.scrollTop += step;
+  const atEnd = scroller.scrollTop + scroller.clientHeight >= scroller.scrollHeight;
+  if (now - start < durationMs && !atEnd) {
+    requestAnimationFrame(frame);
+  } else {
+    done(frames.slice(1));
+  }
+}
+requestAnimationFrame(frame);
+"""
+
+
+class LyvoAdminListBenchmark:
+    """Measures the admin list pages against growing datasets"""
+
+    def __init__(self, config: Dict):
+        self.config = config
+        self.settings = dict(DEFAULT_ADMIN_BENCHMARK, **config.get('admin_list_benchmark', {}))
+        self.budgets = dict(DEFAULT_ADMIN_BENCHMARK['budgets'], **self.settings.get('budgets', {}))
+        self.standin = LyvoStandin(ports={
+            'user': urlparse(config.get('backend_url', 'http://localhost:4002')).port or 4002,
+            'property': urlparse(config.get('property_service_url', 'http://localhost:3002')).port or 3002
+        })
+        self.tester: Optional[LyvoLoginTester] = None
+        self.results: Dict[str, Dict[str, Dict]] = {}
+
+    def seed(self, count: int):
+        """Replace the stand-in dataset with count users and count properties"""
+        logger.info(f"🌱 Seeding {count} users and {count} properties")
+        self.standin.store.users = generate_users(count)
+        self.standin.store.admin_properties = generate_admin_properties(count)
+
+    def _setup_browser(self) -> bool:
+        self.tester = LyvoLoginTester(self.config)
+        if not self.tester.setup_driver():
+            return False
+        self.tester.driver.set_script_timeout(self.settings['scroll_duration_ms'] / 1000 + 30)
+        self.tester.driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': INIT_SCRIPT})
+        admin = standin_user('admin', 'bench')
+        return self.tester.seed_session(admin, make_token(admin['_id']))
+
+    def _wait_for_rows(self) -> List:
+        """Poll the row timeline until the count has been stable for a second"""
+        driver = self.tester.driver
+        deadline = time.time() + self.settings['render_timeout']
+        timeline: List = []
+        stable_since = None
+        while time.time() < deadline:
+            timeline = driver.execute_script("return window.__lyvoRows || [];")
+            count = timeline[-1][1] if timeline else 0
+            if count > 0:
+                stable_since = stable_since or (time.time(), count)
+                if stable_since[1] != count:
+                    stable_since = (time.time(), count)
+                elif time.time() - stable_since[0] >= 1.0:
+                    break
+            time.sleep(0.1)
+        return timeline
+
+    def measure_page(self, name: str) -> Dict:
+        """Render, scroll and type into one admin page"""
+        page = ADMIN_PAGES[name]
+        driver = self.tester.driver
+        driver.execute_script("sessionStorage.setItem('__lyvoRowSelector', arguments[0]);", page['rows'])
+        driver.get(f"{self.config['base_url']}{page['route']}")
+
+        timeline = self._wait_for_rows()
+        rows = timeline[-1][1] if timeline else 0
+        result = {
+            'rows_rendered': rows,
+            'render_ms': round(timeline[-1][0], 2) if rows else None,
+            'dom_nodes': driver.execute_script("return document.getElementsByTagName('*').length;"),
+            'heap_bytes': driver.execute_script(
+                "return performance.memory ? performance.memory.usedJSHeapSize : null;")
+        }
+        if not rows:
+            logger.warning(f"⚠️ {name}: no rows rendered within {self.settings['render_timeout']}s")
+            return result
+
+        deltas = driver.execute_async_script(
+            SCROLL_SCRIPT, self.settings['scroll_duration_ms'], self.settings['scroll_step_px'])
+        dropped = dropped_frames(deltas)
+        result.update({
+            'scroll_frames': len(deltas),
+            'dropped_frames': dropped,
+            'dropped_frame_ratio': round(dropped / (len(deltas) + dropped), 3) if deltas else None,
+            'worst_frame_ms': round(max(deltas), 2) if deltas else None
+        })
+
+        search = WebDriverWait(driver, self.config['timeouts']['element_wait']).until(
+            EC.element_to_be_clickable((By.CSS_SELECTOR, page['search'])))
+        driver.execute_script("window.__lyvoEvents = [];")
+        search.send_keys('a')
+        time.sleep(0.5)
+        search.send_keys(Keys.BACKSPACE)
+        time.sleep(1.0)
+        events = driver.execute_script("return window.__lyvoEvents;")
+        result['interaction_ms'] = round(max((e['duration'] for e in events), default=0), 2)
+        result['interaction_events'] = len(events)
+        return result
+
+    def scaling(self) -> Dict[str, Dict]:
+        """Per-page linear fit of render time against the rows actually rendered. A page whose row
+        count stops growing with the dataset (the properties page asks for limit=200) is reported
+        as capped, with its render time at each seeded size, instead of a per-row cost."""
+        fits = {}
+        for name, sizes in self.results.items():
+            measured = {size: r for size, r in sizes.items() if r.get('render_ms') is not None}
+            if not measured:
+                continue
+            rendered = {r['rows_rendered'] for r in measured.values()}
+            if max(rendered) < max(int(size) for size in measured):
+                fits[name] = {
+                    'capped_at_rows': max(rendered),
+                    'render_ms_by_seeded': {size: r['render_ms'] for size, r in measured.items()}
+                }
+                continue
+            if len(rendered) < 2:
+                continue
+            points = [(r['rows_rendered'], r['render_ms']) for r in measured.values()]
+            slope, intercept = linear_fit([p[0] for p in points], [p[1] for p in points])
+            fits[name] = {'ms_per_1k_rows': round(slope * 1000, 2), 'base_ms': round(intercept, 2)}
+        return fits
+
+    def flatten_metrics(self) -> Dict[str, float]:
+        """Worst value across pages and sizes for each budgeted metric"""
+        metrics: Dict[str, float] = {}
+        for sizes in self.results.values():
+            for result in sizes.values():
+                for key in self.budgets:
+                    value = result.get(key)
+                    if value is not None:
+                        metrics[key] = max(metrics.get(key, value), value)
+        return metrics
+
+    def write_csv(self):
+        path = report_dir(self.config) / 'admin_list_scaling.csv'
+        fields = ['page', 'seeded', 'rows_rendered', 'render_ms', 'dropped_frames',
+                  'dropped_frame_ratio', 'worst_frame_ms', 'interaction_ms', 'dom_nodes', 'heap_bytes']
+        with open(path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=fields, extrasaction='ignore')
+            writer.writeheader()
+            for name, sizes in self.results.items():
+                for size, result in sizes.items():
+                    writer.writerow(dict(result, page=name, seeded=size))
+        return path
+
+    def run(self) -> List[str]:
+        """Seed each size, measure every page, save reports and return budget violations"""
+        self.standin.start_background(['user', 'property'])
+        try:
+            if not self._setup_browser():
+                logger.error("❌ Failed to prepare browser for admin list benchmark")
+                return ['browser setup failed']
+            for count in self.settings['row_counts']:
+                self.seed(count)
+                for name in self.settings['pages']:
+                    logger.info(f"📋 {name} with {count} seeded rows")
+                    try:
+                        result = self.measure_page(name)
+                    except Exception as e:
+                        logger.error(f"❌ {name} failed at {count} rows: {e}")
+                        self.tester.take_screenshot(f"error_admin_{name}_{count}")
+                        result = {'error': str(e)}
+                    self.results.setdefault(name, {})[str(count)] = result
+        finally:
+            if self.tester:
+                self.tester.teardown_driver()
+            self.standin.stop_background()
+
+        violations = check_budgets(self.flatten_metrics(), self.budgets)
+        report = save_report(self.config, 'admin_list_benchmark',
+                             {'pages': self.results, 'scaling': self.scaling()}, violations)
+        csv_path = self.write_csv()
+        self.print_results(violations)
+        logger.info(f"📄 Admin list report saved to: {report} (CSV: {csv_path})")
+        return violations
+
+    def print_results(self, violations: List[str]):
+        logger.info("\n📊 Admin List Render Time by Seeded Rows:")
+        logger.info("=" * 50)
+        fits = self.scaling()
+        for name, sizes in self.results.items():
+            logger.info(f"{name}:")
+            rows = [(size, r['render_ms']) for size, r in sizes.items() if r.get('render_ms') is not None]
+            for line in bar_chart(rows):
+                logger.info(f"  {line}")
+            if 'capped_at_rows' in fits.get(name, {}):
+                logger.info(f"  capped at {fits[name]['capped_at_rows']} rendered rows; no per-row cost")
+            elif name in fits:
+                logger.info(f"  ≈ {fits[name]['ms_per_1k_rows']} ms per 1k rendered rows")
+        for violation in violations:
+            logger.error(f"❌ Budget exceeded: {violation}")
+        if not violations:
+            logger.info("✅ All admin list budgets met")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Lyvo admin list large-dataset benchmark')
+    parser.add_argument('--rows', type=int, action='append', help='Seeded row count (repeatable)')
+    parser.add_argument('--page', action='append', choices=sorted(ADMIN_PAGES), help='Page to measure (repeatable)')
+    args = parser.parse_args()
+
+    config = load_config()
+    settings = config.setdefault('admin_list_benchmark', {})
+    if args.rows:
+        settings['row_counts'] = args.rows
+    if args.page:
+        settings['pages'] = args.page
+
+    violations = LyvoAdminListBenchmark(config).run()
+    sys.exit(1 if violations else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Lyvo Assistant Benchmark
+Measures the AI chatbot against a stand-in Gemini endpoint that streams its reply at a set
+token rate and fails on a set pattern. The report covers time to ready, time to first token,
+time until the reply shows in Chatbot.jsx, the per-query project-data fetch, and the retries
+and backoff aiService.js goes through under 429s.
+"""
+
+import argparse
+import json
+import sys
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+
+from llm_fixtures import DEFAULT_LLM, retry_summary
+from login_test import LyvoLoginTester, load_config, logger
+from perf_utils import check_budgets, save_report, summarize
+from standin_server import LyvoStandin, StandinStore
+
+DEFAULT_ASSISTANT_BENCHMARK = {
+    # A public route that renders <Chatbot />
+    'route': '/',
+    # aiService.fetchProjectData reads this origin on every query
+    'context_url': 'http://localhost:3003',
+    'queries': [
+        'What does a single room cost?',
+        'Which cities do you have properties in?',
+        'Is WiFi included?'
+    ],
+    # Stand-in LLM behaviour per scenario (llm_fixtures.DEFAULT_LLM keys) and budgets overriding
+    # the shared ones. rate_limited_probe fails the first connection test, rate_limited everything.
+    'scenarios': {
+        'fast': {'llm': {'ttft_ms': 300, 'tokens_per_second': 60}},
+        'slow_stream': {'llm': {'ttft_ms': 1500, 'tokens_per_second': 8}, 'budgets': {'reply_ms': 12000}},
+        'rate_limited_probe': {'llm': {'fail_requests': [1]}, 'budgets': {'ready_ms': 7000}},
+        'rate_limited': {'llm': {'fail_every': 1}, 'budgets': {'ready_ms': 12000, 'reply_ms': 15000}}
+    },
+    # p50 over the queries (ready_ms once per scenario)
+    'budgets': {
+        'ready_ms': 1500,
+        'reply_ms': 5000,
+        'context_fetch_ms': 300
+    }
+}
+
+GEMINI_ORIGIN = 'https://generativelanguage.googleapis.com'
+INPUT_SELECTOR = 'input[placeholder="Ask about rooms, pricing, amenities..."]'
+TOGGLE_SELECTOR = 'div.fixed.bottom-4.right-4 > button'
+
+# Runs before any page script: sends aiService's Gemini calls to the stand-in and keeps every
+# resource timing entry of a long session
+REWRITE_SCRIPT = """
+(function() {
+  const origin = '%s';
+  const target = __LLM_ORIGIN__;
+  performance.setResourceTimingBufferSize(5000);
+  const realFetch = window.fetch;
+  window.fetch = function(input, init) {
+    if (typeof input === 'string' && input.startsWith(origin)) input = target + input.slice(origin.length);
+    return realFetch.call(this, input, init);
+  };
+})();
+""" % GEMINI_ORIGIN
+
+# Installed after load: when the status line first says the AI is online, and when the count of
+# chat bubbles last changed
+OBSERVER_SCRIPT = """
+const selector = arguments[0];
+const state = {ready: null, bubbles: 0, changedAt: null};
+window.__lyvoAssistant = state;
+new MutationObserver(function() {
+  const input = document.querySelector(selector);
+  const panel = input && input.closest('.fixed');
+  if (!panel) return;
+  const now = performance.now();
+  if (state.ready === null && panel.textContent.includes('AI Online')) state.ready = now;
+  const bubbles = panel.querySelectorAll('p.leading-relaxed').length;
+  if (bubbles !== state.bubbles) {
+    state.bubbles = bubbles;
+    state.changedAt = now;
+  }
+}).observe(document.body, {childList: true, subtree: true, characterData: true});
+"""
+
+# Clicks send and returns the page time of the click
+SEND_SCRIPT = """
+const input = document.querySelector(arguments[0]);
+const button = input.closest('.flex.space-x-2').querySelector('button');
+const sent = performance.now();
+button.click();
+return sent;
+"""
+
+RESOURCES_SCRIPT = """
+return performance.getEntriesByType('resource')
+  .filter(r => r.startTime >= arguments[0])
+  .map(r => ({name: r.name, start: r.startTime, response_start: r.responseStart || r.responseEnd,
+              end: r.responseEnd, status: r.responseStatus || null}));
+"""
+
+
+def reply_phases(sent: float, rendered: Optional[float], context: Optional[Dict], llm_calls: List[Dict]) -> Dict:
+    """Where the time went between sending a chatbot question and its reply appearing.
+
+    Times are ms on the page clock. context is the Resource Timing entry ({'start', 'response_start',
+    'end'}) of the project-data fetch, llm_calls those of the LLM requests in order, with their
+    'status'. The last successful call carries the reply. Phases whose entry is missing are None.
+    """
+    last = llm_calls[-1] if llm_calls else None
+    answered = [call for call in llm_calls if (call.get('status') or 200) < 400]
+    answer = answered[-1] if answered else None
+
+    def span(start, end):
+        return round(end - start, 1) if start is not None and end is not None else None
+
+    return {
+        'reply_ms': span(sent, rendered),
+        'context_fetch_ms': span(context['start'], context['end']) if context else None,
+        'llm_calls': len(llm_calls),
+        'llm_failures': len(llm_calls) - len(answered),
+        # Retries and re-initialisation probes before the last call
+        'llm_retry_ms': span(llm_calls[0]['start'], last['start']) if len(llm_calls) > 1 else 0.0,
+        'llm_ttft_ms': span(answer['start'], answer['response_start']) if answer else None,
+        'llm_stream_ms': span(answer['response_start'], answer['end']) if answer else None,
+        # From the last byte to the bubble on screen, Chatbot's typing delay included
+        'render_ms': span(last['end'] if last else sent, rendered)
+    }
+
+
+class LyvoAssistantBenchmark:
+    """Chatbot reply latency and retry behaviour per stand-in LLM scenario"""
+
+    def __init__(self, config: Dict):
+        self.config = config
+        self.settings = dict(DEFAULT_ASSISTANT_BENCHMARK, **config.get('assistant_benchmark', {}))
+        self.budgets = dict(DEFAULT_ASSISTANT_BENCHMARK['budgets'], **self.settings.get('budgets', {}))
+        self.store = StandinStore()
+        self.standin = LyvoStandin(store=self.store, ports={
+            'property': urlparse(self.settings['context_url']).port or 3003
+        })
+        self.tester: Optional[LyvoLoginTester] = None
+        self.results: Dict[str, Dict] = {}
+
+    def open_chat(self) -> Dict:
+        driver = self.tester.driver
+        driver.get(f"{self.config['base_url']}{self.settings['route']}")
+        # The toggle springs in two seconds after load
+        toggle = self.tester.wait_until('assistant_toggle',
+                                        EC.element_to_be_clickable((By.CSS_SELECTOR, TOGGLE_SELECTOR)))
+        driver.execute_script(OBSERVER_SCRIPT, INPUT_SELECTOR)
+        opened = driver.execute_script("const t = performance.now(); arguments[0].click(); return t;", toggle)
+        self.tester.wait_until('assistant_ready', lambda d: d.execute_script("return window.__lyvoAssistant.ready;"),
+                               ceiling=self.config['timeouts']['page_load'])
+        state = driver.execute_script("return window.__lyvoAssistant;")
+        return {'ready_ms': round(state['ready'] - opened, 1), 'bubbles': state['bubbles']}
+
+    def ask(self, question: str, bubbles: int) -> Dict:
+        driver = self.tester.driver
+        field = driver.find_element(By.CSS_SELECTOR, INPUT_SELECTOR)
+        field.send_keys(question)
+        sent = driver.execute_script(SEND_SCRIPT, INPUT_SELECTOR)
+        # The question and the reply
+        self.tester.wait_until('assistant_reply',
+                               lambda d: d.execute_script("return window.__lyvoAssistant.bubbles;") >= bubbles + 2,
+                               ceiling=self.config['timeouts']['page_load'] * 2)
+        rendered = driver.execute_script("return window.__lyvoAssistant.changedAt;")
+        resources = driver.execute_script(RESOURCES_SCRIPT, sent)
+        context = next((r for r in resources if '/api/public/properties' in r['name']), None)
+        llm_calls = [r for r in resources if ':generateContent' in r['name'] and r['end'] <= rendered]
+        return reply_phases(sent, rendered, context, llm_calls)
+
+    def run_scenario(self, name: str, scenario: Dict):
+        """One chat session: the page is reloaded, so aiService probes the connection afresh"""
+        self.store.llm = dict(DEFAULT_LLM, **scenario.get('llm', {}))
+        del self.store.llm_requests[:]
+        opened = self.open_chat()
+        bubbles = opened['bubbles']
+        replies = []
+        for question in self.settings['queries']:
+            replies.append(self.ask(question, bubbles))
+            bubbles += 2
+        retries = retry_summary(self.store.llm_requests)
+        self.results[name] = {
+            'llm': self.store.llm,
+            'ready_ms': opened['ready_ms'],
+            'phases': {phase: summarize(r[phase] for r in replies if r[phase] is not None)
+                       for phase in replies[0]},
+            'replies': replies,
+            'llm_requests': retries
+        }
+        logger.info(
+            f"🤖 {name}: ready in {opened['ready_ms']} ms, reply p50 "
+            f"{self.results[name]['phases']['reply_ms'].get('p50')} ms, {retries['failures']} failed LLM calls"
+        )
+
+    def run(self) -> List[str]:
+        """Run every scenario, save the report and return budget violations"""
+        self.standin.start_background(['property', 'llm'])
+        try:
+            self.tester = LyvoLoginTester(self.config)
+            if not self.tester.setup_driver():
+                logger.error("❌ Failed to prepare browser for assistant benchmark")
+                return ['browser setup failed']
+            llm_origin = f"http://{self.standin.host}:{self.standin.ports['llm']}"
+            self.tester.driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {
+                'source': REWRITE_SCRIPT.replace('__LLM_ORIGIN__', json.dumps(llm_origin))
+            })
+            for name, scenario in self.settings['scenarios'].items():
+                try:
+                    self.run_scenario(name, scenario)
+                except Exception as e:
+                    logger.error(f"❌ Assistant scenario {name} failed: {e}")
+                    self.tester.take_screenshot(f"error_assistant_{name}")
+                    self.results[name] = {'error': str(e)}
+        finally:
+            if self.tester:
+                self.tester.teardown_driver()
+            self.standin.stop_background()
+
+        metrics, budgets = {}, {}
+        for name, result in self.results.items():
+            if 'error' in result:
+                continue
+            limits = dict(self.budgets, **self.settings['scenarios'][name].get('budgets', {}))
+            values = {'ready_ms': result['ready_ms'],
+                      'reply_ms': result['phases']['reply_ms'].get('p50'),
+                      'context_fetch_ms': result['phases']['context_fetch_ms'].get('p50')}
+            for metric, limit in limits.items():
+                metrics[f"{name}:{metric}"] = values.get(metric)
+                budgets[f"{name}:{metric}"] = limit
+        violations = check_budgets(metrics, budgets)
+        report = save_report(self.config, 'assistant_benchmark', self.results, violations)
+        self.print_results(violations)
+        logger.info(f"📄 Assistant report saved to: {report}")
+        return violations
+
+    def print_results(self, violations: List[str]):
+        columns = ['reply_ms', 'llm_ttft_ms', 'llm_stream_ms', 'render_ms', 'context_fetch_ms', 'llm_retry_ms']
+        logger.info("\n📊 Chatbot Latency by LLM Scenario (p50 ms):")
+        logger.info("=" * 50)
+        logger.info(f"{'scenario'.ljust(20)} {'ready'.rjust(8)} " + ' '.join(c[:-3].rjust(12) for c in columns))
+        for name, result in self.results.items():
+            if 'error' in result:
+                logger.info(f"{name.ljust(20)} ❌ {result['error']}")
+                continue
+            row = ' '.join(str(result['phases'][c].get('p50', '-')).rjust(12) for c in columns)
+            logger.info(f"{name.ljust(20)} {str(result['ready_ms']).rjust(8)} {row}")
+            for backoff in result['llm_requests']['backoffs']:
+                logger.info(f"{''.ljust(20)} {backoff['status']} on {backoff['after']}, "
+                            f"{backoff['next']} {backoff['wait_ms']} ms later")
+        for violation in violations:
+            logger.error(f"❌ Budget exceeded: {violation}")
+        if not violations:
+            logger.info("✅ All assistant budgets met")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Lyvo AI chatbot latency benchmark against a stand-in LLM')
+    parser.add_argument('--scenario', action='append', help='Scenario from config to run (repeatable, default all)')
+    parser.add_argument('--ttft-ms', type=float, help='Time to first token for every scenario')
+    parser.add_argument('--tokens-per-second', type=float, help='Token rate for every scenario')
+    args = parser.parse_args()
+
+    config = load_config()
+    settings = config.setdefault('assistant_benchmark', {})
+    scenarios = dict(settings.get('scenarios', DEFAULT_ASSISTANT_BENCHMARK['scenarios']))
+    if args.scenario:
+        scenarios = {name: scenarios[name] for name in args.scenario}
+    for name, scenario in scenarios.items():
+        llm = dict(scenario.get('llm', {}))
+        if args.ttft_ms is not None:
+            llm['ttft_ms'] = args.ttft_ms
+        if args.tokens_per_second is not None:
+            llm['tokens_per_second'] = args.tokens_per_second
+        scenarios[name] = dict(scenario, llm=llm)
+    settings['scenarios'] = scenarios
+
+    violations = LyvoAssistantBenchmark(config).run()
+    sys.exit(1 if violations else 0)
+
+
+if __name__ == "__main__":
+    main()
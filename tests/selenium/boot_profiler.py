@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Lyvo Boot Profiler
+Times app start from navigation to the first route render for each role's cached session:
+bundle download and evaluation, React mount, RoleRepairProvider's role repair and route
+resolution, read from the lyvo:* performance marks the app sets while it boots.
+Profiles the production build served from dist/: the dev server serves unbundled modules and
+StrictMode mounts every component twice, so neither its bundle nor its mounts are real.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+from login_test import LyvoLoginTester, load_config, logger
+from perf_utils import check_budgets, save_report, summarize
+from standin_server import LyvoStandin, StandinStore, make_token, standin_user
+from static_server import DEFAULT_STATIC_SERVER, serve_dist
+
+PHASES = ['document', 'bundle_download', 'bundle_evaluate', 'react_mount', 'role_repair', 'route_resolution',
+          'route_render', 'loader_hidden']
+# Marks every start sets; a build without them predates the instrumentation
+BOOT_MARKS = ['lyvo:bundle-evaluated', 'lyvo:role-repair-start', 'lyvo:role-repair-end', 'lyvo:route-rendered',
+              'lyvo:loader-hidden']
+
+DEFAULT_BOOT_PROFILER = {
+    'repetitions': 5,
+    # Stand-in delay on the role repair lookup
+    'standin_latency_ms': 50,
+    # p50 ms from navigation start to the route's final render, per scenario
+    'budgets': {
+        'signed_out': 800,
+        'seeker': 1000,
+        'seeker_role_repair': 1200,
+        'owner': 1000,
+        'admin': 1000
+    }
+}
+
+USERS = {role: standin_user(role, 'boot') for role in ('seeker', 'owner', 'admin')}
+
+# Scenario -> (landing route, cached user or None). The role repair scenario caches a user
+# without a role, as older sessions have, so RoleRepairProvider asks the user service for it.
+SCENARIOS = {
+    'signed_out': ('/', None),
+    'seeker': ('/seeker-dashboard', USERS['seeker']),
+    'seeker_role_repair': ('/seeker-dashboard', {k: v for k, v in USERS['seeker'].items() if k != 'role'}),
+    'owner': ('/owner-dashboard', USERS['owner']),
+    'admin': ('/admin-dashboard', USERS['admin'])
+}
+
+COLLECT_SCRIPT = """
+const nav = performance.getEntriesByType('navigation')[0];
+const bundle = performance.getEntriesByType('resource').find(
+  r => r.initiatorType === 'script' && /\\/assets\\/[^/]+\\.js/.test(r.name));
+return {
+  document_end: nav ? nav.responseEnd : null,
+  bundle_start: bundle ? bundle.startTime : null,
+  bundle_end: bundle ? bundle.responseEnd : null,
+  marks: performance.getEntriesByType('mark')
+    .filter(m => m.name.startsWith('lyvo:'))
+    .map(m => ({name: m.name, time: m.startTime}))
+};
+"""
+
+
+def boot_phases(timing: Dict) -> Dict[str, Optional[float]]:
+    """Durations of the app start phases from navigation, bundle timing and the app's lyvo:* marks.
+
+    timing holds document_end, bundle_start and bundle_end (ms since navigation start) and marks,
+    a list of {'name', 'time'}. A phase whose marks are missing is None.
+    """
+    marks: Dict[str, List[float]] = {}
+    for mark in sorted(timing.get('marks', []), key=lambda m: m['time']):
+        marks.setdefault(mark['name'], []).append(mark['time'])
+    first = {name: times[0] for name, times in marks.items()}
+    # RoleRepairProvider unmounts the routes while it repairs, so the last mount is the one that stays
+    route = marks.get('lyvo:route-rendered', [None])[-1]
+    spans = [
+        ('document', 0.0, timing.get('document_end')),
+        ('bundle_download', timing.get('bundle_start'), timing.get('bundle_end')),
+        ('bundle_evaluate', timing.get('bundle_end'), first.get('lyvo:bundle-evaluated')),
+        ('react_mount', first.get('lyvo:bundle-evaluated'), first.get('lyvo:role-repair-start')),
+        ('role_repair', first.get('lyvo:role-repair-start'), first.get('lyvo:role-repair-end')),
+        ('route_resolution', first.get('lyvo:role-repair-end'), route)
+    ]
+    phases: Dict[str, Optional[float]] = {
+        name: round(end - start, 1) if start is not None and end is not None else None
+        for name, start, end in spans
+    }
+    phases['route_render'] = round(route, 1) if route is not None else None
+    phases['loader_hidden'] = round(first['lyvo:loader-hidden'], 1) if 'lyvo:loader-hidden' in first else None
+    phases['route_mounts'] = len(marks.get('lyvo:route-rendered', []))
+    return phases
+
+
+def missing_timing(timing: Dict) -> List[str]:
+    """lyvo:* marks and bundle timing absent from one start, which would leave its phases empty"""
+    seen = {mark['name'] for mark in timing.get('marks', [])}
+    missing = [name for name in BOOT_MARKS if name not in seen]
+    if timing.get('bundle_start') is None:
+        missing.append('bundle (/assets/*.js)')
+    return missing
+
+
+class LyvoBootProfiler:
+    """Repeated app starts per cached session, broken down into boot phases"""
+
+    def __init__(self, config: Dict):
+        self.config = config
+        self.settings = dict(DEFAULT_BOOT_PROFILER, **config.get('boot_profiler', {}))
+        self.budgets = dict(DEFAULT_BOOT_PROFILER['budgets'], **self.settings.get('budgets', {}))
+        self.dist_dir = Path(dict(DEFAULT_STATIC_SERVER, **config.get('static_server', {}))['dist_dir'])
+        store = StandinStore()
+        store.users = list(USERS.values())
+        self.standin = LyvoStandin(store=store, latency_ms=self.settings['standin_latency_ms'], ports={
+            'property': urlparse(config.get('property_service_url', 'http://localhost:3002')).port or 3002,
+            'chat': urlparse(config.get('chat_service_url', 'http://localhost:3004')).port or 3004,
+            'user': urlparse(config.get('backend_url', 'http://localhost:4002')).port or 4002
+        })
+        self.tester: Optional[LyvoLoginTester] = None
+        self.results: Dict[str, Dict] = {}
+
+    def boot_once(self, route: str) -> Dict:
+        driver = self.tester.driver
+        driver.get(f"{self.config['base_url']}{route}")
+        self.tester.wait_until(
+            f'boot:{route}',
+            lambda d: d.execute_script("return performance.getEntriesByName('lyvo:loader-hidden').length > 0;"),
+            ceiling=self.config['timeouts']['page_load']
+        )
+        timing = driver.execute_script(COLLECT_SCRIPT)
+        missing = missing_timing(timing)
+        if missing:
+            raise RuntimeError(f"{route} started without {', '.join(missing)}; is {self.dist_dir} a build of "
+                               f"this checkout?")
+        return boot_phases(timing)
+
+    def profile(self, scenario: str):
+        route, user = SCENARIOS[scenario]
+        driver = self.tester.driver
+        driver.get(self.config['base_url'])
+        driver.execute_script("localStorage.clear();")
+        if user:
+            self.tester.seed_session(user, make_token(user['_id']))
+        runs = []
+        for _ in range(self.settings['repetitions']):
+            if user and 'role' not in user:
+                # Repair writes the role back; put the role-less session back before every start
+                self.tester.seed_session(user, make_token(user['_id']))
+            runs.append(self.boot_once(route))
+        self.results[scenario] = {
+            'route': route,
+            'phases': {phase: summarize(r[phase] for r in runs if r[phase] is not None) for phase in PHASES},
+            'route_mounts': max(r['route_mounts'] for r in runs)
+        }
+        render = self.results[scenario]['phases']['route_render']
+        logger.info(f"🥾 {scenario}: route rendered at p50 {render.get('p50')} ms")
+
+    def run(self) -> List[str]:
+        """Profile every scenario, save the report and return budget violations and failed scenarios"""
+        server = serve_dist(self.config)
+        if not server:
+            logger.error(f"❌ Boot profiling needs a production build in {self.dist_dir}; run npm run build first")
+            return ['no production build']
+        self.standin.start_background(['property', 'chat', 'user'])
+        try:
+            self.tester = LyvoLoginTester(self.config)
+            if not self.tester.setup_driver():
+                logger.error("❌ Failed to prepare browser for boot profiling")
+                return ['browser setup failed']
+            for scenario in SCENARIOS:
+                try:
+                    self.profile(scenario)
+                except Exception as e:
+                    logger.error(f"❌ Boot profile of {scenario} failed: {e}")
+                    self.tester.take_screenshot(f"error_boot_{scenario}")
+                    self.results[scenario] = {'error': str(e)}
+        finally:
+            if self.tester:
+                self.tester.teardown_driver()
+            self.standin.stop_background()
+            server.stop_background()
+
+        metrics = {scenario: result['phases']['route_render'].get('p50')
+                   for scenario, result in self.results.items() if 'phases' in result}
+        violations = check_budgets(metrics, self.budgets)
+        violations += [f"{scenario}: {result['error']}" for scenario, result in self.results.items()
+                       if 'error' in result]
+        report = save_report(self.config, 'boot_profile', self.results, violations)
+        self.print_results(violations)
+        logger.info(f"📄 Boot profile saved to: {report}")
+        return violations
+
+    def print_results(self, violations: List[str]):
+        logger.info("\n📊 App Start by Cached Session (p50 ms):")
+        logger.info("=" * 50)
+        logger.info(f"{'scenario'.ljust(20)} " + ' '.join(phase[:10].rjust(10) for phase in PHASES))
+        for scenario, result in self.results.items():
+            if 'error' in result:
+                logger.info(f"{scenario.ljust(20)} ❌ {result['error']}")
+                continue
+            row = ' '.join(str(result['phases'][phase].get('p50', '-')).rjust(10) for phase in PHASES)
+            logger.info(f"{scenario.ljust(20)} {row}")
+            if result['route_mounts'] > 1:
+                logger.info(f"{''.ljust(20)} route mounted {result['route_mounts']} times during boot")
+        for violation in violations:
+            logger.error(f"❌ Budget exceeded: {violation}")
+        if not violations:
+            logger.info("✅ All boot budgets met")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Lyvo app start profiler per cached session')
+    parser.add_argument('--repetitions', type=int, help='App starts measured per scenario')
+    args = parser.parse_args()
+
+    config = load_config()
+    settings = config.setdefault('boot_profiler', {})
+    if args.repetitions:
+        settings['repetitions'] = args.repetitions
+
+    violations = LyvoBootProfiler(config).run()
+    sys.exit(1 if violations else 0)
+
+
+if __name__ == "__main__":
+    main()
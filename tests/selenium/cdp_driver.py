@@ -0,0 +1,510 @@
+#!/usr/bin/env python3
+"""
+Lyvo CDP Driver
+A driver backend that talks Chrome DevTools Protocol over one persistent websocket instead of
+going through chromedriver's HTTP hop. It implements the part of the selenium WebDriver API that
+LyvoLoginTester uses, so the same tests run on either backend (driver_backend in test_config.json).
+"""
+
+import asyncio
+import base64
+import concurrent.futures
+import itertools
+import json
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import aiohttp
+from selenium.common.exceptions import (
+    JavascriptException,
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException,
+    WebDriverException
+)
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
+
+CHROME_BINARIES = ['google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser', 'chrome']
+
+# Special keys sent as key events; everything else is inserted as text
+SPECIAL_KEYS = {
+    Keys.ENTER: ('Enter', 13, '\r'),
+    Keys.RETURN: ('Enter', 13, '\r'),
+    Keys.TAB: ('Tab', 9, ''),
+    Keys.BACKSPACE: ('Backspace', 8, ''),
+    Keys.ESCAPE: ('Escape', 27, ''),
+    Keys.ARROW_DOWN: ('ArrowDown', 40, ''),
+    Keys.ARROW_UP: ('ArrowUp', 38, '')
+}
+
+# Locates elements in the page and waits for them there, so an implicit wait costs one round trip
+FIND_FUNCTION = """
+async function(by, value, all, timeoutMs) {
+  const root = this;
+  function query() {
+    switch (by) {
+      case 'xpath': {
+        const doc = root.ownerDocument || root;
+        const snapshot = doc.evaluate(value, root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        const nodes = [];
+        for (let i = 0; i < snapshot.snapshotLength; i++) nodes.push(snapshot.snapshotItem(i));
+        return nodes;
+      }
+      case 'link text':
+      case 'partial link text':
+        return Array.from(root.querySelectorAll('a')).filter(a => by === 'link text'
+          ? a.innerText.trim() === value : a.innerText.includes(value));
+      case 'id': return Array.from(root.querySelectorAll('[id="' + CSS.escape(value) + '"]'));
+      case 'name': return Array.from(root.querySelectorAll('[name="' + CSS.escape(value) + '"]'));
+      case 'class name': return Array.from(root.querySelectorAll('.' + CSS.escape(value)));
+      default: return Array.from(root.querySelectorAll(value));
+    }
+  }
+  const deadline = Date.now() + timeoutMs;
+  for (;;) {
+    const found = query();
+    if (found.length || Date.now() >= deadline) return all ? found : (found[0] || null);
+    await new Promise(resolve => setTimeout(resolve, 50));
+  }
+}
+"""
+
+# Sets the value through the native setter so React's onChange sees the change
+CLEAR_FUNCTION = """
+function() {
+  this.focus();
+  const setter = Object.getOwnPropertyDescriptor(Object.getPrototypeOf(this), 'value');
+  if (setter && setter.set) setter.set.call(this, ''); else this.value = '';
+  this.dispatchEvent(new Event('input', {bubbles: true}));
+  this.dispatchEvent(new Event('change', {bubbles: true}));
+}
+"""
+
+CENTER_FUNCTION = """
+function() {
+  this.scrollIntoView({block: 'center', inline: 'center'});
+  const rect = this.getBoundingClientRect();
+  return [rect.left + rect.width / 2, rect.top + rect.height / 2];
+}
+"""
+
+DISPLAYED_FUNCTION = """
+function() {
+  const rect = this.getBoundingClientRect();
+  const style = getComputedStyle(this);
+  return rect.width > 0 && rect.height > 0 && style.visibility !== 'hidden' && style.display !== 'none';
+}
+"""
+
+ATTRIBUTE_FUNCTION = """
+function(name) {
+  const value = name in this ? this[name] : this.getAttribute(name);
+  return value === null || value === undefined || value === false ? null : String(value);
+}
+"""
+
+
+class CDPError(WebDriverException):
+    """An error reply to a DevTools command"""
+
+
+class CDPConnection:
+    """One websocket to the browser; replies are matched by id, so many commands can be in flight"""
+
+    def __init__(self, ws_url: str, timeout: float = 30.0):
+        self.timeout = timeout
+        self.ids = itertools.count(1)
+        self.pending: Dict[int, asyncio.Future] = {}
+        self.listeners: Dict[Tuple[str, Optional[str]], List[Callable[[Dict], None]]] = {}
+        self.commands = 0
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name='lyvo-cdp', daemon=True)
+        self.thread.start()
+        self._run(self._connect(ws_url))
+
+    def _run(self, coroutine, timeout: Optional[float] = None):
+        future = asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+        try:
+            return future.result(timeout or self.timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise TimeoutException("DevTools command timed out")
+
+    async def _connect(self, ws_url: str):
+        self.http = aiohttp.ClientSession()
+        self.ws = await self.http.ws_connect(ws_url, max_msg_size=0)
+        self.reader = asyncio.ensure_future(self._read())
+
+    async def _read(self):
+        async for message in self.ws:
+            if message.type != aiohttp.WSMsgType.TEXT:
+                continue
+            data = json.loads(message.data)
+            if 'id' in data:
+                future = self.pending.pop(data['id'], None)
+                if not future or future.done():
+                    continue
+                if 'error' in data:
+                    future.set_exception(CDPError(data['error'].get('message', str(data['error']))))
+                else:
+                    future.set_result(data.get('result', {}))
+            else:
+                for listener in list(self.listeners.get((data.get('method'), data.get('sessionId')), [])):
+                    listener(data.get('params', {}))
+        for future in self.pending.values():
+            if not future.done():
+                future.set_exception(CDPError("DevTools connection closed"))
+        self.pending.clear()
+
+    async def _send_many(self, commands: Sequence[Tuple[str, Dict]], session_id: Optional[str]):
+        futures = []
+        for method, params in commands:
+            message = {'id': next(self.ids), 'method': method, 'params': params}
+            if session_id:
+                message['sessionId'] = session_id
+            future = self.loop.create_future()
+            self.pending[message['id']] = future
+            futures.append(future)
+            await self.ws.send_str(json.dumps(message))
+        self.commands += len(commands)
+        return await asyncio.gather(*futures)
+
+    def send_many(self, commands: Sequence[Tuple[str, Dict]], session_id: Optional[str] = None,
+                  timeout: Optional[float] = None) -> List[Dict]:
+        """Pipeline commands: all are written before the first reply is awaited"""
+        return self._run(self._send_many(commands, session_id), timeout)
+
+    def send(self, method: str, params: Optional[Dict] = None, session_id: Optional[str] = None,
+             timeout: Optional[float] = None) -> Dict:
+        return self.send_many([(method, params or {})], session_id, timeout)[0]
+
+    def on(self, method: str, session_id: Optional[str], listener: Callable[[Dict], None]):
+        """Call listener (on the connection thread) for every matching event"""
+        self.listeners.setdefault((method, session_id), []).append(listener)
+
+    def expect(self, method: str, session_id: Optional[str]) -> concurrent.futures.Future:
+        """Future for the next matching event; register before sending the command that causes it"""
+        future: concurrent.futures.Future = concurrent.futures.Future()
+
+        def once(params: Dict):
+            self.listeners[(method, session_id)].remove(once)
+            future.set_result(params)
+
+        self.loop.call_soon_threadsafe(self.on, method, session_id, once)
+        return future
+
+    def close(self):
+        async def shutdown():
+            await self.ws.close()
+            await self.http.close()
+            self.reader.cancel()
+
+        try:
+            self._run(shutdown(), timeout=5)
+        except Exception:
+            pass
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(timeout=5)
+
+
+class CDPElement:
+    """A DOM node held by its Runtime object id"""
+
+    def __init__(self, driver: 'CDPDriver', object_id: str):
+        self.driver = driver
+        self.object_id = object_id
+
+    def _call(self, function: str, *args, await_promise: bool = False, by_value: bool = True) -> Dict:
+        return self.driver._call_on(self.object_id, function, args, await_promise, by_value)
+
+    @property
+    def text(self) -> str:
+        return self._call("function() { return this.innerText; }")['value'] or ''
+
+    @property
+    def tag_name(self) -> str:
+        return self._call("function() { return this.tagName.toLowerCase(); }")['value']
+
+    def get_attribute(self, name: str) -> Optional[str]:
+        return self._call(ATTRIBUTE_FUNCTION, name)['value']
+
+    def is_displayed(self) -> bool:
+        return self._call(DISPLAYED_FUNCTION)['value']
+
+    def is_enabled(self) -> bool:
+        return self._call("function() { return !this.disabled; }")['value']
+
+    def clear(self):
+        self._call(CLEAR_FUNCTION)
+
+    def click(self):
+        x, y = self._call(CENTER_FUNCTION)['value']
+        mouse = {'x': x, 'y': y, 'button': 'left', 'clickCount': 1}
+        self.driver.conn.send_many([
+            ('Input.dispatchMouseEvent', dict(mouse, type='mouseMoved', button='none', clickCount=0)),
+            ('Input.dispatchMouseEvent', dict(mouse, type='mousePressed')),
+            ('Input.dispatchMouseEvent', dict(mouse, type='mouseReleased'))
+        ], self.driver.session_id)
+
+    def send_keys(self, *values: str):
+        self._call("function() { this.focus(); }")
+        commands: List[Tuple[str, Dict]] = []
+        text = ''
+        for char in ''.join(values):
+            if char not in SPECIAL_KEYS:
+                text += char
+                continue
+            if text:
+                commands.append(('Input.insertText', {'text': text}))
+                text = ''
+            key, code, key_text = SPECIAL_KEYS[char]
+            event = {'key': key, 'code': key, 'windowsVirtualKeyCode': code, 'text': key_text}
+            commands.append(('Input.dispatchKeyEvent', dict(event, type='keyDown' if key_text else 'rawKeyDown')))
+            commands.append(('Input.dispatchKeyEvent', dict(event, type='keyUp')))
+        if text:
+            commands.append(('Input.insertText', {'text': text}))
+        self.driver.conn.send_many(commands, self.driver.session_id)
+
+    def find_element(self, by: str = By.ID, value: Optional[str] = None) -> 'CDPElement':
+        return self.driver._find(self.object_id, by, value, False)
+
+    def find_elements(self, by: str = By.ID, value: Optional[str] = None) -> List['CDPElement']:
+        return self.driver._find(self.object_id, by, value, True)
+
+
+class CDPBrowser:
+    """A Chrome process started with a debugging port and the one websocket every driver on it shares"""
+
+    def __init__(self, arguments: Sequence[str] = (), binary: Optional[str] = None, startup_timeout: float = 20.0,
+                 profile_dir: Optional[Path] = None):
+        binary = binary or next((path for name in CHROME_BINARIES if (path := shutil.which(name))), None)
+        if not binary:
+            raise WebDriverException("Chrome binary not found; set chrome_binary in test_config.json")
+
+        # A profile handed in (e.g. a warmed template clone) belongs to the caller
+        self.owns_profile = profile_dir is None
+        self.profile_dir = Path(profile_dir or tempfile.mkdtemp(prefix='lyvo-cdp-'))
+        self.process = subprocess.Popen(
+            [binary, f'--user-data-dir={self.profile_dir}', '--remote-debugging-port=0',
+             '--no-first-run', '--no-default-browser-check', *arguments, 'about:blank'],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        self.conn = CDPConnection(self._browser_ws_url(startup_timeout))
+
+    def _browser_ws_url(self, timeout: float) -> str:
+        # Chrome writes the port it picked and the browser endpoint once it is listening
+        port_file = self.profile_dir / 'DevToolsActivePort'
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if port_file.exists():
+                lines = port_file.read_text().split()
+                if len(lines) == 2:
+                    return f"ws://127.0.0.1:{lines[0]}{lines[1]}"
+            if self.process.poll() is not None:
+                break
+            time.sleep(0.05)
+        self.process.kill()
+        raise WebDriverException("Chrome did not open its DevTools port")
+
+    def default_page(self) -> str:
+        return next(t['targetId'] for t in self.conn.send('Target.getTargets')['targetInfos'] if t['type'] == 'page')
+
+    def new_driver(self) -> 'CDPDriver':
+        """A page in a fresh browser context: cookies, storage and cache of its own, no extra process"""
+        context_id = self.conn.send('Target.createBrowserContext', {'disposeOnDetach': True})['browserContextId']
+        target_id = self.conn.send('Target.createTarget', {'url': 'about:blank', 'browserContextId': context_id})['targetId']
+        return CDPDriver(self, target_id, context_id)
+
+    def close(self):
+        try:
+            self.conn.send('Browser.close', timeout=5)
+        except Exception:
+            pass
+        self.conn.close()
+        try:
+            self.process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+        if self.owns_profile:
+            shutil.rmtree(self.profile_dir, ignore_errors=True)
+
+
+class CDPDriver:
+    """One page driven over its own DevTools session on a CDPBrowser"""
+
+    def __init__(self, browser: CDPBrowser, target_id: str, context_id: Optional[str] = None):
+        self.browser = browser
+        self.conn = browser.conn
+        self.target_id = target_id
+        self.context_id = context_id
+        self.owns_browser = False
+        self.implicit_wait = 0.0
+        self.page_load_timeout = 300.0
+        self.url = 'about:blank'
+
+        self.session_id = self.conn.send('Target.attachToTarget', {'targetId': target_id, 'flatten': True})['sessionId']
+        _, frames = self.conn.send_many([('Page.enable', {}), ('Page.getFrameTree', {})], self.session_id)
+        self.frame_id = frames['frameTree']['frame']['id']
+        self.conn.on('Page.frameNavigated', self.session_id, self._frame_navigated)
+        self.conn.on('Page.navigatedWithinDocument', self.session_id, self._frame_navigated)
+
+    @classmethod
+    def launch(cls, arguments: Sequence[str] = (), binary: Optional[str] = None,
+               profile_dir: Optional[Path] = None) -> 'CDPDriver':
+        """Start a Chrome of its own and drive its first tab; quit() closes the browser"""
+        browser = CDPBrowser(arguments, binary, profile_dir=profile_dir)
+        driver = cls(browser, browser.default_page())
+        driver.owns_browser = True
+        return driver
+
+    def _frame_navigated(self, params: Dict):
+        frame = params.get('frame', params)
+        if frame.get('id', frame.get('frameId')) == self.frame_id:
+            self.url = frame['url']
+
+    def _result(self, reply: Dict) -> Dict:
+        if 'exceptionDetails' in reply:
+            details = reply['exceptionDetails']
+            raise JavascriptException(details.get('exception', {}).get('description', details.get('text')))
+        return reply['result']
+
+    def _call_on(self, object_id: str, function: str, args: Sequence, await_promise: bool = False,
+                 by_value: bool = True) -> Dict:
+        arguments = [{'objectId': a.object_id} if isinstance(a, CDPElement) else {'value': a} for a in args]
+        try:
+            reply = self.conn.send('Runtime.callFunctionOn', {
+                'objectId': object_id, 'functionDeclaration': function, 'arguments': arguments,
+                'awaitPromise': await_promise, 'returnByValue': by_value
+            }, self.session_id)
+        except CDPError as e:
+            raise StaleElementReferenceException(str(e))
+        return self._result(reply)
+
+    def _evaluate(self, expression: str, await_promise: bool = False, by_value: bool = True) -> Dict:
+        return self._result(self.conn.send('Runtime.evaluate', {
+            'expression': expression, 'awaitPromise': await_promise, 'returnByValue': by_value
+        }, self.session_id))
+
+    def _find(self, object_id: Optional[str], by: str, value: str, all_matches: bool):
+        args = [by, value, all_matches, int(self.implicit_wait * 1000)]
+        timeout = self.implicit_wait + self.conn.timeout
+        try:
+            if object_id:
+                reply = self.conn.send('Runtime.callFunctionOn', {
+                    'objectId': object_id, 'functionDeclaration': FIND_FUNCTION,
+                    'arguments': [{'value': a} for a in args], 'awaitPromise': True
+                }, self.session_id, timeout=timeout)
+            else:
+                reply = self.conn.send('Runtime.evaluate', {
+                    'expression': f"({FIND_FUNCTION}).apply(document, {json.dumps(args)})", 'awaitPromise': True
+                }, self.session_id, timeout=timeout)
+            result = self._result(reply)
+        except CDPError:
+            # The document navigated away while we were looking
+            result = {'subtype': 'null'}
+
+        if not all_matches:
+            if result.get('subtype') != 'node':
+                raise NoSuchElementException(f"No element matching {by}={value}")
+            return CDPElement(self, result['objectId'])
+        if 'objectId' not in result:
+            return []
+        properties = self.conn.send('Runtime.getProperties', {'objectId': result['objectId'], 'ownProperties': True},
+                                    self.session_id)['result']
+        return [CDPElement(self, p['value']['objectId']) for p in properties
+                if p['name'].isdigit() and p.get('value', {}).get('subtype') == 'node']
+
+    # -- WebDriver API -------------------------------------------------------
+
+    @property
+    def current_url(self) -> str:
+        return self.url
+
+    @property
+    def title(self) -> str:
+        return self._evaluate('document.title')['value']
+
+    @property
+    def page_source(self) -> str:
+        return self._evaluate('document.documentElement.outerHTML')['value']
+
+    def implicitly_wait(self, seconds: float):
+        self.implicit_wait = seconds
+
+    def set_page_load_timeout(self, seconds: float):
+        self.page_load_timeout = seconds
+
+    def _load(self, method: str, params: Dict):
+        loaded = self.conn.expect('Page.loadEventFired', self.session_id)
+        reply = self.conn.send(method, params, self.session_id)
+        if reply.get('errorText'):
+            raise WebDriverException(f"Navigation failed: {reply['errorText']}")
+        # Fragment and same-document navigations have no loader and fire no load event
+        if method == 'Page.navigate' and not reply.get('loaderId'):
+            return
+        try:
+            loaded.result(self.page_load_timeout)
+        except concurrent.futures.TimeoutError:
+            raise TimeoutException(f"Page load exceeded {self.page_load_timeout}s")
+
+    def get(self, url: str):
+        self._load('Page.navigate', {'url': url})
+
+    def refresh(self):
+        self._load('Page.reload', {})
+
+    def find_element(self, by: str = By.ID, value: Optional[str] = None) -> CDPElement:
+        return self._find(None, by, value, False)
+
+    def find_elements(self, by: str = By.ID, value: Optional[str] = None) -> List[CDPElement]:
+        return self._find(None, by, value, True)
+
+    def execute_script(self, script: str, *args):
+        """Run script as a function body; arguments may include elements, the result comes back as JSON"""
+        function = f"function() {{ {script} }}"
+        element = next((a for a in args if isinstance(a, CDPElement)), None)
+        if element:
+            return self._call_on(element.object_id, function, args).get('value')
+        return self._evaluate(f"({function}).apply(null, {json.dumps(list(args))})").get('value')
+
+    def execute_batch(self, expressions: Sequence[str]) -> List:
+        """Evaluate several expressions in one pipelined round trip"""
+        replies = self.conn.send_many(
+            [('Runtime.evaluate', {'expression': e, 'returnByValue': True}) for e in expressions], self.session_id)
+        return [self._result(reply).get('value') for reply in replies]
+
+    def execute_cdp_cmd(self, cmd: str, cmd_args: Dict) -> Dict:
+        return self.conn.send(cmd, cmd_args, self.session_id)
+
+    def save_screenshot(self, filename: str) -> bool:
+        data = self.conn.send('Page.captureScreenshot', {'format': 'png'}, self.session_id)['data']
+        Path(filename).write_bytes(base64.b64decode(data))
+        return True
+
+    def set_window_size(self, width: int, height: int):
+        window = self.conn.send('Browser.getWindowForTarget', {'targetId': self.target_id})['windowId']
+        self.conn.send('Browser.setWindowBounds', {'windowId': window, 'bounds': {'width': width, 'height': height}})
+
+    def delete_all_cookies(self):
+        self.conn.send('Network.clearBrowserCookies', {}, self.session_id)
+
+    def quit(self):
+        if self.owns_browser:
+            self.browser.close()
+            return
+        try:
+            self.conn.send('Target.closeTarget', {'targetId': self.target_id}, timeout=5)
+        except Exception:
+            pass
+        # A context outlives its closed page; dispose of it even if closing the page failed
+        if self.context_id:
+            try:
+                self.conn.send('Target.disposeBrowserContext', {'browserContextId': self.context_id}, timeout=5)
+            except Exception:
+                pass
@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+Lyvo Chat Benchmark
+Measures socket.io message latency, fan-out and reconnect storms against the local
+chat stand-in, plus the browser render cost of message bursts.
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+import socketio
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+
+from login_test import LyvoLoginTester, load_config, logger
+from perf_utils import check_budgets, save_report, summarize
+from standin_server import LyvoStandin, StandinStore, make_token, standin_user
+
+DEFAULT_CHAT_BENCHMARK = {
+    'chats': 200,
+    'messages_per_chat': 20,
+    'message_interval': 0.05,
+    'storm_clients': 200,
+    'burst_size': 200,
+    'budgets': {
+        'delivery_p95_ms': 150,
+        'delivery_p99_ms': 400,
+        'reconnect_p95_ms': 1500,
+        'burst_render_ms': 2000,
+        'burst_long_task_ms': 500
+    }
+}
+
+# Installed in the page before a burst; counts rendered burst messages and long tasks
+BURST_OBSERVER_SCRIPT = """
+const expected = arguments[0];
+const state = {expected: expected, seen: new Set(), firstAt: null, lastAt: null, longTasks: []};
+window.__lyvoChatBurst = state;
+const pattern = /bench-burst-(\\d+)/g;
+const observer = new MutationObserver((mutations) => {
+  const now = performance.now();
+  for (const mutation of mutations) {
+    for (const node of mutation.addedNodes) {
+      const text = node.textContent || '';
+      for (const match of text.matchAll(pattern)) {
+        if (!state.seen.has(match[1])) {
+          state.seen.add(match[1]);
+          if (state.firstAt === null) state.firstAt = now;
+          state.lastAt = now;
+        }
+      }
+    }
+  }
+});
+observer.observe(document.body, {childList: true, subtree: true});
+try {
+  new PerformanceObserver((list) => {
+    for (const entry of list.getEntries()) state.longTasks.push(entry.duration);
+  }).observe({type: 'longtask', buffered: false});
+} catch (e) {}
+"""
+
+BURST_STATE_SCRIPT = """
+const state = window.__lyvoChatBurst;
+if (!state) return null;
+return {
+  seen: state.seen.size,
+  expected: state.expected,
+  renderWindowMs: state.firstAt === null ? null : state.lastAt - state.firstAt,
+  longTaskCount: state.longTasks.length,
+  longTaskMs: state.longTasks.reduce((a, b) => a + b, 0),
+  heapBytes: performance.memory ? performance.memory.usedJSHeapSize : null,
+  domNodes: document.getElementsByTagName('*').length
+};
+"""
+
+
+class ChatParticipant:
+    """One socket.io client taking part in a benchmark chat"""
+
+    def __init__(self, url: str, user_id: str):
+        self.url = url
+        self.user_id = user_id
+        self.client = socketio.AsyncClient(reconnection=False)
+        self.latencies_ms: List[float] = []
+        self.joined = asyncio.Event()
+        self.client.on('receive_message', self._on_message)
+        self.client.on('chat_joined', self._on_joined)
+
+    async def _on_joined(self, data):
+        self.joined.set()
+
+    async def _on_message(self, message):
+        sent_at = (message.get('metadata') or {}).get('sentAt')
+        if sent_at is not None and message.get('senderId') != self.user_id:
+            self.latencies_ms.append((time.perf_counter() - sent_at) * 1000)
+
+    async def connect_and_join(self, chat_id: str, timeout: float = 10.0):
+        self.joined.clear()
+        await self.client.connect(self.url, auth={'token': make_token(self.user_id)},
+                                  transports=['websocket'], wait_timeout=timeout)
+        await self.client.emit('join_chat', {'chatId': chat_id})
+        await asyncio.wait_for(self.joined.wait(), timeout)
+
+    async def send(self, chat_id: str, content: str):
+        await self.client.emit('send_message', {
+            'chatId': chat_id,
+            'content': content,
+            'contentType': 'text',
+            'metadata': {'sentAt': time.perf_counter()}
+        })
+
+    async def disconnect(self):
+        if self.client.connected:
+            await self.client.disconnect()
+
+
+class LyvoChatBenchmark:
+    """Drives the chat benchmark scenarios"""
+
+    def __init__(self, config: Dict):
+        self.config = config
+        self.settings = dict(DEFAULT_CHAT_BENCHMARK, **config.get('chat_benchmark', {}))
+        self.budgets = dict(DEFAULT_CHAT_BENCHMARK['budgets'], **self.settings.get('budgets', {}))
+        self.chat_url = config.get('chat_service_url', 'http://localhost:3004')
+        self.store = StandinStore()
+        self.standin: Optional[LyvoStandin] = None
+        self.results: Dict[str, Dict] = {}
+
+    def start_standin(self):
+        """Start the in-process chat stand-in on the chat service port"""
+        port = urlparse(self.chat_url).port or 3004
+        self.standin = LyvoStandin(store=self.store, ports={'chat': port})
+        self.standin.start_background(['chat'])
+
+    def stop_standin(self):
+        if self.standin:
+            self.standin.stop_background()
+            self.standin = None
+
+    def _create_chats(self, count: int) -> List[Dict]:
+        return [
+            self.store.create_chat(f"seeker{i:05d}", f"owner{i:05d}", owner_name=f"Bench Owner {i}")
+            for i in range(count)
+        ]
+
+    async def run_latency(self, chats: int, messages_per_chat: int, interval: float) -> Dict:
+        """Concurrent chats exchanging messages; records send -> delivery latency"""
+        logger.info(f"💬 Latency run: {chats} chats x {messages_per_chat} messages")
+        pairs = []
+        for chat in self._create_chats(chats):
+            seeker = ChatParticipant(self.chat_url, chat['seekerId'])
+            owner = ChatParticipant(self.chat_url, chat['ownerId'])
+            pairs.append((chat['chatId'], seeker, owner))
+
+        participants = [p for _, seeker, owner in pairs for p in (seeker, owner)]
+        connect_start = time.perf_counter()
+        await asyncio.gather(*(
+            p.connect_and_join(chat_id)
+            for chat_id, seeker, owner in pairs for p in (seeker, owner)
+        ))
+        connect_ms = (time.perf_counter() - connect_start) * 1000
+
+        async def converse(chat_id: str, seeker: ChatParticipant, owner: ChatParticipant):
+            for i in range(messages_per_chat):
+                sender = seeker if i % 2 == 0 else owner
+                await sender.send(chat_id, f"bench message {i}")
+                await asyncio.sleep(interval)
+
+        send_start = time.perf_counter()
+        await asyncio.gather(*(converse(*pair) for pair in pairs))
+        # Give in-flight messages a moment to land before counting
+        await asyncio.sleep(max(interval * 4, 0.5))
+        elapsed = time.perf_counter() - send_start
+
+        latencies = [ms for p in participants for ms in p.latencies_ms]
+        expected = chats * messages_per_chat
+        await asyncio.gather(*(p.disconnect() for p in participants))
+
+        summary = summarize(latencies)
+        return {
+            'chats': chats,
+            'clients': len(participants),
+            'connect_all_ms': round(connect_ms, 2),
+            'messages_sent': expected,
+            'messages_delivered': len(latencies),
+            'delivery_ratio': round(len(latencies) / expected, 4) if expected else 0,
+            'throughput_msgs_per_s': round(len(latencies) / elapsed, 2) if elapsed else 0,
+            'delivery_ms': summary
+        }
+
+    async def run_reconnect_storm(self, clients: int) -> Dict:
+        """Connect many clients, drop them all at once and measure the reconnect herd"""
+        logger.info(f"🌩️ Reconnect storm: {clients} clients")
+        chats = self._create_chats(clients)
+        participants = [(chat['chatId'], ChatParticipant(self.chat_url, chat['seekerId'])) for chat in chats]
+        await asyncio.gather(*(p.connect_and_join(chat_id) for chat_id, p in participants))
+        await asyncio.gather(*(p.disconnect() for _, p in participants))
+
+        async def rejoin(chat_id: str, participant: ChatParticipant) -> Optional[float]:
+            participant.client = socketio.AsyncClient(reconnection=False)
+            participant.client.on('chat_joined', participant._on_joined)
+            start = time.perf_counter()
+            try:
+                await participant.connect_and_join(chat_id)
+                return (time.perf_counter() - start) * 1000
+            except Exception:
+                return None
+
+        storm_start = time.perf_counter()
+        timings = await asyncio.gather(*(rejoin(chat_id, p) for chat_id, p in participants))
+        storm_ms = (time.perf_counter() - storm_start) * 1000
+        await asyncio.gather(*(p.disconnect() for _, p in participants))
+
+        recovered = [t for t in timings if t is not None]
+        return {
+            'clients': clients,
+            'recovered': len(recovered),
+            'failed': clients - len(recovered),
+            'storm_total_ms': round(storm_ms, 2),
+            'reconnect_ms': summarize(recovered)
+        }
+
+    async def _send_burst(self, chat: Dict, burst_size: int):
+        owner = ChatParticipant(self.chat_url, chat['ownerId'])
+        await owner.connect_and_join(chat['chatId'])
+        for i in range(burst_size):
+            await owner.send(chat['chatId'], f"bench-burst-{i}")
+        await owner.disconnect()
+
+    def run_render_burst(self, burst_size: int) -> Dict:
+        """Burst messages into an open chat and measure the browser's render cost"""
+        logger.info(f"🖥️ Render burst: {burst_size} messages into /seeker-messages")
+        seeker = standin_user('seeker', 'render')
+        chat = self.store.create_chat(seeker['_id'], 'owner-render', owner_name='Burst Owner')
+        tester = LyvoLoginTester(self.config)
+        if not tester.setup_driver():
+            return {'error': 'WebDriver setup failed'}
+
+        try:
+            tester.seed_session(seeker, make_token(seeker['_id']))
+            tester.driver.get(f"{self.config['base_url']}/seeker-messages")
+
+            wait = WebDriverWait(tester.driver, self.config['timeouts']['page_load'])
+            wait.until(EC.element_to_be_clickable((By.XPATH, "//*[contains(text(), 'Burst Owner')]"))).click()
+            wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, 'textarea[placeholder="Type a message..."]')))
+
+            tester.driver.execute_script(BURST_OBSERVER_SCRIPT, burst_size)
+            send_start = time.perf_counter()
+            asyncio.run(self._send_burst(chat, burst_size))
+            send_ms = (time.perf_counter() - send_start) * 1000
+
+            state = None
+            deadline = time.time() + self.config['timeouts']['page_load']
+            while time.time() < deadline:
+                state = tester.driver.execute_script(BURST_STATE_SCRIPT)
+                if state and state['seen'] >= burst_size:
+                    break
+                time.sleep(0.05)
+            complete_ms = (time.perf_counter() - send_start) * 1000
+
+            tester.take_screenshot('chat_render_burst')
+            return {
+                'burst_size': burst_size,
+                'rendered': state['seen'] if state else 0,
+                'send_ms': round(send_ms, 2),
+                'send_to_last_render_ms': round(complete_ms, 2),
+                'render_window_ms': state['renderWindowMs'] if state else None,
+                'long_task_count': state['longTaskCount'] if state else None,
+                'long_task_ms': state['longTaskMs'] if state else None,
+                'heap_bytes': state['heapBytes'] if state else None,
+                'dom_nodes': state['domNodes'] if state else None
+            }
+        except Exception as e:
+            logger.error(f"❌ Render burst failed: {e}")
+            tester.take_screenshot('error_chat_render_burst')
+            return {'error': str(e)}
+        finally:
+            tester.teardown_driver()
+
+    def flatten_metrics(self) -> Dict[str, float]:
+        """Metrics compared against the budgets"""
+        latency = self.results.get('latency', {}).get('delivery_ms', {})
+        storm = self.results.get('reconnect_storm', {}).get('reconnect_ms', {})
+        burst = self.results.get('render_burst', {})
+        return {
+            'delivery_p95_ms': latency.get('p95'),
+            'delivery_p99_ms': latency.get('p99'),
+            'reconnect_p95_ms': storm.get('p95'),
+            'burst_render_ms': burst.get('send_to_last_render_ms'),
+            'burst_long_task_ms': burst.get('long_task_ms')
+        }
+
+    def run(self, include_browser: bool = True) -> List[str]:
+        """Run every scenario, save the report and return budget violations"""
+        self.start_standin()
+        try:
+            self.results['latency'] = asyncio.run(self.run_latency(
+                self.settings['chats'], self.settings['messages_per_chat'], self.settings['message_interval']
+            ))
+            self.results['reconnect_storm'] = asyncio.run(self.run_reconnect_storm(self.settings['storm_clients']))
+            if include_browser:
+                self.results['render_burst'] = self.run_render_burst(self.settings['burst_size'])
+        finally:
+            self.stop_standin()
+
+        violations = check_budgets(self.flatten_metrics(), self.budgets)
+        report = save_report(self.config, 'chat_benchmark', self.results, violations)
+        self.print_results(violations)
+        logger.info(f"📄 Chat benchmark report saved to: {report}")
+        return violations
+
+    def print_results(self, violations: List[str]):
+        logger.info("\n📊 Chat Benchmark Results:")
+        logger.info("=" * 50)
+        for name, value in self.flatten_metrics().items():
+            logger.info(f"{name.ljust(22)}: {value}")
+        for violation in violations:
+            logger.error(f"❌ Budget exceeded: {violation}")
+        if not violations:
+            logger.info("✅ All chat budgets met")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Lyvo chat throughput and latency benchmark')
+    parser.add_argument('--chats', type=int, help='Concurrent chats in the latency run')
+    parser.add_argument('--messages', type=int, help='Messages per chat')
+    parser.add_argument('--storm-clients', type=int, help='Clients in the reconnect storm')
+    parser.add_argument('--burst', type=int, help='Messages in the browser render burst')
+    parser.add_argument('--skip-browser', action='store_true', help='Skip the Selenium render burst')
+    args = parser.parse_args()
+
+    config = load_config()
+    overrides = {
+        'chats': args.chats,
+        'messages_per_chat': args.messages,
+        'storm_clients': args.storm_clients,
+        'burst_size': args.burst
+    }
+    config.setdefault('chat_benchmark', {}).update({k: v for k, v in overrides.items() if v is not None})
+
+    benchmark = LyvoChatBenchmark(config)
+    violations = benchmark.run(include_browser=not args.skip_browser)
+    sys.exit(1 if violations else 0)
+
+
+if __name__ == "__main__":
+    main()
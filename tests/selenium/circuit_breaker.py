@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Lyvo Backend Circuit Breaker
+Tracks backend reachability and API error rates during a run. While a service's breaker is
+open, tests that need it are short-circuited as "service down". A breaker opened by a failed
+health probe closes as soon as the background monitor sees the service back; one opened by API
+errors only closes after a trial of real calls succeeds, since its health endpoint may well
+have stayed up throughout.
+"""
+
+import threading
+import time
+import urllib.request
+from collections import deque
+from typing import Callable, Dict, FrozenSet, Iterable, Optional
+from urllib.parse import urlparse
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+# Why a breaker opened
+PROBE = 'probe'
+ERRORS = 'errors'
+
+# Service name -> config key holding its base URL
+SERVICE_URL_KEYS = {
+    'user': 'backend_url',
+    'property': 'property_service_url',
+    'chat': 'chat_service_url'
+}
+
+DEFAULT_CIRCUIT_BREAKER = {
+    'health_path': '/api/health',
+    'probe_timeout': 2.0,
+    'failure_threshold': 3,
+    'error_rate': 0.5,
+    'window': 10,
+    'cooldown': 15.0,
+    # Successful API calls a half-open breaker needs before an error trip counts as over
+    'trial_calls': 3,
+    'monitor_interval': 5.0
+}
+
+# Runs before any page script: counts cross-origin API calls per origin in sessionStorage,
+# so the tally survives navigations until the runner drains it after each test.
+API_MONITOR_SCRIPT = """
+(function() {
+  const key = '__lyvoApiCalls';
+  function record(url, ok) {
+    try {
+      const origin = new URL(url, location.href).origin;
+      if (origin === location.origin) return;
+      const calls = JSON.parse(sessionStorage.getItem(key) || '{}');
+      const entry = calls[origin] || (calls[origin] = {ok: 0, failed: 0});
+      entry[ok ? 'ok' : 'failed'] += 1;
+      sessionStorage.setItem(key, JSON.stringify(calls));
+    } catch (e) {}
+  }
+  const originalFetch = window.fetch;
+  window.fetch = function(input, init) {
+    const url = typeof input === 'string' ? input : input.url;
+    return originalFetch.apply(this, arguments).then(
+      function(response) { record(url, response.status < 500); return response; },
+      function(error) { record(url, false); throw error; }
+    );
+  };
+  const originalOpen = XMLHttpRequest.prototype.open;
+  XMLHttpRequest.prototype.open = function(method, url) {
+    this.addEventListener('loadend', () => record(url, this.status > 0 && this.status < 500));
+    return originalOpen.apply(this, arguments);
+  };
+})();
+"""
+
+DRAIN_API_CALLS_SCRIPT = """
+const calls = sessionStorage.getItem('__lyvoApiCalls');
+sessionStorage.removeItem('__lyvoApiCalls');
+return calls ? JSON.parse(calls) : {};
+"""
+
+
+def http_probe(url: str, timeout: float) -> bool:
+    """True when url answers with HTTP 200 within timeout"""
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as response:
+            return response.status == 200
+    except Exception:
+        return False
+
+
+class CircuitBreaker:
+    """Closed -> open on a failed health probe or too many API errors. After the cooldown a probe
+    trip closes on a healthy probe; an error trip goes half-open and closes after trial_calls
+    successful API calls, reopening on the first failure."""
+
+    def __init__(self, name: str, probe: Callable[[], bool], failure_threshold: int = 3,
+                 error_rate: float = 0.5, window: int = 10, cooldown: float = 15.0,
+                 trial_calls: int = 3, clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.probe = probe
+        self.failure_threshold = failure_threshold
+        self.error_rate = error_rate
+        self.cooldown = cooldown
+        self.trial_calls = trial_calls
+        self.clock = clock
+        self.state = CLOSED
+        self.opened_by: Optional[str] = None
+        self.opened_at: Optional[float] = None
+        self.probed = False
+        self.trips = 0
+        self.trial_successes = 0
+        self.outcomes: deque = deque(maxlen=window)
+        self.consecutive_failures = 0
+        self.lock = threading.Lock()
+
+    def _open(self, reason: str):
+        if self.state != OPEN:
+            self.trips += 1
+        self.state = OPEN
+        self.opened_by = reason
+        self.opened_at = self.clock()
+
+    def _close(self):
+        self.state = CLOSED
+        self.opened_by = None
+        self.opened_at = None
+        self.outcomes.clear()
+        self.consecutive_failures = 0
+
+    def record(self, success: bool):
+        """Feed one API call outcome observed during a test"""
+        with self.lock:
+            if self.state == HALF_OPEN:
+                if not success:
+                    self._open(ERRORS)
+                    return
+                self.trial_successes += 1
+                if self.trial_successes >= self.trial_calls:
+                    self._close()
+                return
+            self.outcomes.append(success)
+            self.consecutive_failures = 0 if success else self.consecutive_failures + 1
+            failures = self.outcomes.count(False)
+            too_many = self.consecutive_failures >= self.failure_threshold
+            error_rate = len(self.outcomes) >= self.failure_threshold and failures / len(self.outcomes) >= self.error_rate
+            if self.state == CLOSED and (too_many or error_rate):
+                self._open(ERRORS)
+
+    def record_calls(self, ok: int, failed: int):
+        """Feed one test's tally of API calls. Their order is lost: a half-open trial fails on any
+        failure, otherwise successes go first so the failures count as the latest calls."""
+        with self.lock:
+            failed_trial = self.state == HALF_OPEN and failed > 0
+        if failed_trial:
+            self.record(False)
+            return
+        for _ in range(ok):
+            self.record(True)
+        for _ in range(failed):
+            self.record(False)
+
+    def check(self) -> bool:
+        """Probe the service now; an unreachable service opens the breaker immediately, and a
+        healthy one only closes a breaker that a failed probe opened"""
+        healthy = self.probe()
+        with self.lock:
+            self.probed = True
+            if not healthy:
+                self._open(PROBE)
+            elif self.state != CLOSED and self.opened_by == PROBE:
+                self._close()
+        return healthy
+
+    def allow(self) -> bool:
+        """Whether a test needing this service should run now"""
+        if not self.probed:
+            return self.check()
+        with self.lock:
+            if self.state in (CLOSED, HALF_OPEN):
+                return True
+            if self.clock() - self.opened_at < self.cooldown:
+                return False
+            if self.opened_by == ERRORS:
+                # Let the next tests through as the trial, unless the service is now unreachable
+                self.state = HALF_OPEN
+                self.trial_successes = 0
+        return self.check()
+
+
+class BackendBreakers:
+    """One breaker per backend service, plus the monitor thread that watches their health"""
+
+    def __init__(self, config: Dict, probe: Callable[[str, float], bool] = http_probe):
+        self.settings = dict(DEFAULT_CIRCUIT_BREAKER, **config.get('circuit_breaker', {}))
+        self.urls = {service: config[key].rstrip('/') for service, key in SERVICE_URL_KEYS.items() if config.get(key)}
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        for service, url in self.urls.items():
+            health_url = f"{url}{self.settings['health_path']}"
+            self.breakers[service] = CircuitBreaker(
+                service,
+                lambda health_url=health_url: probe(health_url, self.settings['probe_timeout']),
+                failure_threshold=self.settings['failure_threshold'],
+                error_rate=self.settings['error_rate'],
+                window=self.settings['window'],
+                cooldown=self.settings['cooldown'],
+                trial_calls=self.settings['trial_calls']
+            )
+        self._stop = threading.Event()
+        self._monitor: Optional[threading.Thread] = None
+        # Replaced, never mutated, so the monitor thread can read it without a lock
+        self._watched: FrozenSet[str] = frozenset()
+
+    def __getitem__(self, service: str) -> CircuitBreaker:
+        return self.breakers[service]
+
+    def down(self, services: Iterable[str]) -> Optional[str]:
+        """First of services whose breaker is open, or None when all may be used"""
+        for service in services:
+            breaker = self.breakers.get(service)
+            if breaker and not breaker.allow():
+                return service
+        return None
+
+    def service_for_origin(self, origin: str) -> Optional[str]:
+        for service, url in self.urls.items():
+            parsed = urlparse(url)
+            if origin == f"{parsed.scheme}://{parsed.netloc}":
+                return service
+        return None
+
+    def record_api_calls(self, calls: Dict[str, Dict[str, int]]):
+        """Feed the per-origin tallies collected by API_MONITOR_SCRIPT"""
+        for origin, counts in calls.items():
+            service = self.service_for_origin(origin)
+            if not service:
+                continue
+            self.breakers[service].record_calls(counts.get('ok', 0), counts.get('failed', 0))
+
+    def start_monitor(self, services: Iterable[str]):
+        """Poll health of services in the background so open breakers close as soon as they recover;
+        services passed once the monitor is running are added to it"""
+        self._watched = self._watched | {s for s in services if s in self.breakers}
+        if not self._watched or self._monitor:
+            return
+
+        def poll():
+            while not self._stop.wait(self.settings['monitor_interval']):
+                for service in self._watched:
+                    self.breakers[service].check()
+
+        self._stop.clear()
+        self._monitor = threading.Thread(target=poll, name='lyvo-breaker-monitor', daemon=True)
+        self._monitor.start()
+
+    def stop_monitor(self):
+        self._stop.set()
+        if self._monitor:
+            self._monitor.join(timeout=self.settings['probe_timeout'] + 1)
+            self._monitor = None
+        self._watched = frozenset()
+
+    def summary(self) -> Dict[str, Dict]:
+        return {service: {'state': b.state, 'trips': b.trips} for service, b in self.breakers.items()}
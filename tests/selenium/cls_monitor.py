@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Lyvo CLS Monitor
+Records layout shifts with the Layout Instability API while each route loads and is scrolled
+through, per emulated device, and reports Cumulative Layout Shift with the nodes that moved.
+Each device runs in its own browser with DevTools device-metrics emulation, all at once.
+"""
+
+import argparse
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urlparse
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+
+from login_test import LyvoLoginTester, load_config, logger
+from perf_utils import check_budgets, save_report
+from standin_server import LyvoStandin, StandinStore, make_token, standin_user
+
+DEFAULT_CLS_MONITOR = {
+    # user is one of the USERS below, or null to load the route signed out
+    'routes': [
+        {'route': '/', 'user': None},
+        {'route': '/about', 'user': None},
+        {'route': '/login', 'user': None},
+        {'route': '/seeker-dashboard', 'user': 'seeker'},
+        {'route': '/owner-dashboard', 'user': 'owner'}
+    ],
+    # Passed to Emulation.setDeviceMetricsOverride
+    'viewports': {
+        'mobile': {'width': 375, 'height': 667, 'deviceScaleFactor': 2, 'mobile': True},
+        'tablet': {'width': 768, 'height': 1024, 'deviceScaleFactor': 2, 'mobile': True},
+        'desktop': {'width': 1920, 'height': 1080, 'deviceScaleFactor': 1, 'mobile': False}
+    },
+    'settle_seconds': 2.0,
+    # Scroll the page a viewport at a time so below-the-fold content (ScrollReveal, maps) loads
+    'scroll_steps': 4,
+    'scroll_pause_seconds': 0.5,
+    # Applied to every route on every viewport
+    'budgets': {
+        'cls': 0.1
+    }
+}
+
+USERS = {role: standin_user(role, 'cls') for role in ('seeker', 'owner')}
+
+# Runs before any page script. Each shift keeps its sources as a short CSS path and the area
+# they cover after the shift, which picks the node the shift is credited to.
+INIT_SCRIPT = """
+(function() {
+  window.__lyvoShifts = [];
+  function describe(node) {
+    const parts = [];
+    while (node && node.nodeType === 1 && parts.length < 4) {
+      let part = node.tagName.toLowerCase();
+      if (node.id) {
+        parts.unshift(part + '#' + node.id);
+        break;
+      }
+      const classes = typeof node.className === 'string' ? node.className.trim().split(/\\s+/) : [];
+      if (classes[0]) part += '.' + classes.slice(0, 2).join('.');
+      parts.unshift(part);
+      node = node.parentElement;
+    }
+    return parts.join(' > ') || '(removed)';
+  }
+  try {
+    new PerformanceObserver(function(list) {
+      list.getEntries().forEach(function(entry) {
+        window.__lyvoShifts.push({
+          value: entry.value,
+          time: entry.startTime,
+          had_recent_input: entry.hadRecentInput,
+          sources: (entry.sources || []).map(function(source) {
+            const rect = source.currentRect;
+            return {node: describe(source.node), area: rect ? rect.width * rect.height : 0};
+          })
+        });
+      });
+    }).observe({type: 'layout-shift', buffered: true});
+  } catch (e) {}
+})();
+"""
+
+
+def layout_shift_summary(entries: Iterable[Dict], gap_ms: float = 1000, window_ms: float = 5000,
+                         top_nodes: int = 5) -> Dict:
+    """CLS and the nodes that moved from Layout Instability entries, windowed like web-vitals.
+
+    Each entry is {'value', 'time', 'had_recent_input', 'sources': [{'node', 'area'}]}. Shifts right
+    after input do not count. A session window ends after gap_ms without shifts or window_ms in
+    total; CLS is the largest window. Each shift is credited to its largest source, as web-vitals does.
+    """
+    entries = list(entries)
+    counted = sorted((e for e in entries if not e.get('had_recent_input')), key=lambda e: e['time'])
+    windows: List[Dict] = []
+    nodes: Dict[str, Dict] = {}
+    for entry in counted:
+        current = windows[-1] if windows else None
+        if current is None or entry['time'] - current['last'] > gap_ms or entry['time'] - current['start'] > window_ms:
+            current = {'start': entry['time'], 'last': entry['time'], 'score': 0.0, 'shifts': 0}
+            windows.append(current)
+        current['last'] = entry['time']
+        current['score'] += entry['value']
+        current['shifts'] += 1
+        sources = entry.get('sources') or []
+        largest = max(sources, key=lambda s: s.get('area') or 0)['node'] if sources else '(unknown)'
+        node = nodes.setdefault(largest, {'node': largest, 'score': 0.0, 'shifts': 0})
+        node['score'] += entry['value']
+        node['shifts'] += 1
+
+    worst = max(windows, key=lambda w: w['score'], default=None)
+    ranked = sorted(nodes.values(), key=lambda n: n['score'], reverse=True)[:top_nodes]
+    return {
+        'cls': round(worst['score'], 4) if worst else 0.0,
+        'shifts': len(counted),
+        'input_shifts': len(entries) - len(counted),
+        'worst_window_ms': [round(worst['start'], 1), round(worst['last'], 1)] if worst else None,
+        'nodes': [dict(n, score=round(n['score'], 4)) for n in ranked]
+    }
+
+
+class LyvoClsMonitor:
+    """Per-route, per-viewport CLS with the nodes responsible, against CLS budgets"""
+
+    def __init__(self, config: Dict):
+        self.config = config
+        self.settings = dict(DEFAULT_CLS_MONITOR, **config.get('cls_monitor', {}))
+        self.budgets = dict(DEFAULT_CLS_MONITOR['budgets'], **self.settings.get('budgets', {}))
+        self.standin = LyvoStandin(store=StandinStore(), ports={
+            'property': urlparse(config.get('property_service_url', 'http://localhost:3002')).port or 3002,
+            'chat': urlparse(config.get('chat_service_url', 'http://localhost:3004')).port or 3004,
+            'user': urlparse(config.get('backend_url', 'http://localhost:4002')).port or 4002
+        })
+        self.results: Dict[str, Dict[str, Dict]] = {}
+
+    def measure_route(self, tester: LyvoLoginTester, viewport: str, route: str, user: Optional[str]) -> Dict:
+        driver = tester.driver
+        driver.execute_script("localStorage.clear();")
+        if user:
+            tester.seed_session(USERS[user], make_token(USERS[user]['_id']))
+        driver.get(f"{self.config['base_url']}{route}")
+        tester.wait_until(f'cls_body:{route}', EC.presence_of_element_located((By.TAG_NAME, 'body')))
+        time.sleep(self.settings['settle_seconds'])
+        for _ in range(self.settings['scroll_steps']):
+            driver.execute_script("window.scrollBy(0, window.innerHeight);")
+            time.sleep(self.settings['scroll_pause_seconds'])
+        summary = layout_shift_summary(driver.execute_script("return window.__lyvoShifts || [];"))
+        summary['user'] = user
+        logger.info(f"📐 {viewport} {route}: CLS {summary['cls']} over {summary['shifts']} shifts")
+        return summary
+
+    def measure_viewport(self, viewport: str) -> Dict[str, Dict]:
+        """Every route in one browser emulating one device"""
+        metrics = self.settings['viewports'][viewport]
+        results: Dict[str, Dict] = {}
+        tester = LyvoLoginTester(dict(self.config, cold_profile=True))
+        if not tester.setup_driver():
+            return {entry['route']: {'error': 'browser setup failed'} for entry in self.settings['routes']}
+        try:
+            driver = tester.driver
+            # Emulation instead of set_window_size: the layout viewport, DPR and mobile meta
+            # viewport handling all match the device, whatever size the browser window is
+            driver.execute_cdp_cmd('Emulation.setDeviceMetricsOverride', dict(metrics))
+            driver.execute_cdp_cmd('Emulation.setTouchEmulationEnabled', {'enabled': bool(metrics.get('mobile'))})
+            driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': INIT_SCRIPT})
+            driver.get(self.config['base_url'])
+            for entry in self.settings['routes']:
+                route, user = entry['route'], entry.get('user')
+                try:
+                    results[route] = self.measure_route(tester, viewport, route, user)
+                except Exception as e:
+                    logger.error(f"❌ CLS of {route} on {viewport} failed: {e}")
+                    tester.take_screenshot(f"error_cls_{viewport}_{route.strip('/') or 'home'}")
+                    results[route] = {'error': str(e)}
+        finally:
+            tester.teardown_driver()
+        return results
+
+    def run(self) -> List[str]:
+        """Measure every viewport in parallel, save the report and return budget violations"""
+        viewports = list(self.settings['viewports'])
+        self.standin.start_background(['property', 'chat', 'user'])
+        try:
+            with ThreadPoolExecutor(max_workers=len(viewports)) as pool:
+                for viewport, results in zip(viewports, pool.map(self.measure_viewport, viewports)):
+                    self.results[viewport] = results
+        finally:
+            self.standin.stop_background()
+
+        metrics, budgets = {}, {}
+        for viewport, routes in self.results.items():
+            for route, result in routes.items():
+                for name, limit in self.budgets.items():
+                    metrics[f"{viewport}:{route}:{name}"] = result.get(name)
+                    budgets[f"{viewport}:{route}:{name}"] = limit
+        violations = check_budgets(metrics, budgets)
+        report = save_report(self.config, 'cls_monitor', self.results, violations)
+        self.print_results(violations)
+        logger.info(f"📄 CLS report saved to: {report}")
+        return violations
+
+    def print_results(self, violations: List[str]):
+        logger.info("\n📊 Cumulative Layout Shift by Route and Viewport:")
+        logger.info("=" * 50)
+        for viewport, routes in self.results.items():
+            logger.info(f"{viewport}:")
+            for route, result in routes.items():
+                if 'error' in result:
+                    logger.info(f"  {route.ljust(20)} ❌ {result['error']}")
+                    continue
+                logger.info(f"  {route.ljust(20)} CLS {result['cls']} ({result['shifts']} shifts)")
+                for node in result['nodes'][:3]:
+                    logger.info(f"      {node['score']:.4f}  {node['node']}")
+        for violation in violations:
+            logger.error(f"❌ Budget exceeded: {violation}")
+        if not violations:
+            logger.info("✅ All CLS budgets met")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Lyvo per-route, per-viewport Cumulative Layout Shift monitor')
+    parser.add_argument('--route', action='append', help='Signed-out route to measure (repeatable, default from config)')
+    parser.add_argument('--viewport', action='append', help='Viewport from config to measure (repeatable, default all)')
+    args = parser.parse_args()
+
+    config = load_config()
+    settings = config.setdefault('cls_monitor', {})
+    if args.route:
+        settings['routes'] = [{'route': route, 'user': None} for route in args.route]
+    if args.viewport:
+        viewports = dict(DEFAULT_CLS_MONITOR['viewports'], **settings.get('viewports', {}))
+        settings['viewports'] = {name: viewports[name] for name in args.viewport}
+
+    violations = LyvoClsMonitor(config).run()
+    sys.exit(1 if violations else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Lyvo Concurrency Controller
+Samples host CPU, free memory and Chrome's resident memory during a run and raises or lowers
+how many browser workers may run a test at once. Runs that spent a sizeable share of their
+samples throttled are flagged, because timings taken on a saturated host say more about the
+host than about the app. Without psutil the limit simply stays fixed.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional
+
+from perf_utils import summarize
+
+CHROME_PROCESS_NAMES = ('chrome', 'chromium', 'headless_shell')
+
+DEFAULT_CONCURRENCY = {
+    'enabled': True,
+    'min_workers': 1,
+    'sample_interval': 2.0,
+    'cpu_high': 85.0,
+    'cpu_low': 60.0,
+    'memory_min_mb': 1024,
+    # Assumed cost of one more browser worker until Chrome's RSS has been measured
+    'worker_rss_mb': 400,
+    # Share of samples under pressure above which the run's timings count as unreliable; a lone
+    # spike, such as Chrome starting up, stays below it
+    'throttled_fraction': 0.25
+}
+
+
+class HostSample(NamedTuple):
+    cpu_percent: float
+    available_mb: float
+    chrome_rss_mb: float
+
+
+def sample_host() -> HostSample:
+    """CPU load since the previous call, available memory and the RSS of every Chrome process"""
+    import psutil
+
+    chrome_rss = 0
+    for process in psutil.process_iter(['name', 'memory_info']):
+        name = (process.info['name'] or '').lower()
+        if process.info['memory_info'] and any(chrome in name for chrome in CHROME_PROCESS_NAMES):
+            chrome_rss += process.info['memory_info'].rss
+    return HostSample(
+        cpu_percent=psutil.cpu_percent(interval=None),
+        available_mb=psutil.virtual_memory().available / 2 ** 20,
+        chrome_rss_mb=chrome_rss / 2 ** 20
+    )
+
+
+class ConcurrencyController:
+    """A worker limit adjusted from host samples, and the slots workers take before each test"""
+
+    def __init__(self, config: Dict, max_workers: int, sampler: Callable[[], HostSample] = sample_host,
+                 on_change: Optional[Callable[[Dict], None]] = None, clock: Callable[[], float] = time.monotonic):
+        self.settings = dict(DEFAULT_CONCURRENCY, **config.get('concurrency', {}))
+        self.min_workers = max(1, min(self.settings['min_workers'], max_workers))
+        self.max_workers = max_workers
+        self.limit = max_workers
+        self.active = 0
+        self.peak = 0
+        self.pressured_samples = 0
+        self.sampler = sampler
+        self.sampler_error: Optional[str] = None
+        self.on_change = on_change
+        self.clock = clock
+        self.started = clock()
+        self.samples: List[HostSample] = []
+        self.events: List[Dict] = []
+        self.condition = threading.Condition()
+        self._stop = threading.Event()
+        self._monitor: Optional[threading.Thread] = None
+
+    def worker_rss_mb(self, sample: HostSample) -> float:
+        """Chrome memory per active worker, or the configured estimate before anything has run"""
+        if self.active and sample.chrome_rss_mb:
+            return sample.chrome_rss_mb / self.active
+        return self.settings['worker_rss_mb']
+
+    def decide(self, sample: HostSample) -> int:
+        """Step the limit down under CPU or memory pressure, up when another worker fits"""
+        self.samples.append(sample)
+        settings = self.settings
+        with self.condition:
+            previous = self.limit
+            reason = None
+            if sample.cpu_percent > settings['cpu_high']:
+                reason = f"CPU {sample.cpu_percent:.0f}% > {settings['cpu_high']:.0f}%"
+            elif sample.available_mb < settings['memory_min_mb']:
+                reason = f"free memory {sample.available_mb:.0f} MB < {settings['memory_min_mb']} MB"
+
+            if reason:
+                self.pressured_samples += 1
+                self.limit = max(self.min_workers, self.limit - 1)
+            elif (sample.cpu_percent < settings['cpu_low']
+                  and sample.available_mb - self.worker_rss_mb(sample) >= settings['memory_min_mb']):
+                self.limit = min(self.max_workers, self.limit + 1)
+
+            event = None
+            if self.limit != previous:
+                event = {
+                    'at': round(self.clock() - self.started, 1),
+                    'from': previous,
+                    'to': self.limit,
+                    'reason': reason or 'host has headroom again'
+                }
+                self.events.append(event)
+                self.condition.notify_all()
+        if event and self.on_change:
+            self.on_change(event)
+        return self.limit
+
+    @property
+    def throttled(self) -> bool:
+        """Whether the host was saturated for at least throttled_fraction of the samples, even if
+        the limit could not go lower"""
+        if not self.samples:
+            return False
+        return self.pressured_samples / len(self.samples) >= self.settings['throttled_fraction']
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        """Hold one of the currently allowed worker slots for the duration of a test"""
+        with self.condition:
+            self.condition.wait_for(lambda: self.active < self.limit)
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            yield
+        finally:
+            with self.condition:
+                self.active -= 1
+                self.condition.notify_all()
+
+    def start(self) -> 'ConcurrencyController':
+        if not self.settings['enabled'] or self._monitor:
+            return self
+        try:
+            self.sampler()  # primes the CPU counter; the first reading is meaningless
+        except ImportError as e:
+            # No psutil: nothing to sample, so the limit stays at max_workers
+            self.sampler_error = str(e)
+            return self
+
+        def poll():
+            while not self._stop.wait(self.settings['sample_interval']):
+                try:
+                    self.decide(self.sampler())
+                except Exception:
+                    pass
+
+        self._stop.clear()
+        self._monitor = threading.Thread(target=poll, name='lyvo-concurrency', daemon=True)
+        self._monitor.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._monitor:
+            self._monitor.join(timeout=self.settings['sample_interval'] + 1)
+            self._monitor = None
+
+    def summary(self) -> Dict:
+        return {
+            'max_workers': self.max_workers,
+            'peak_workers': self.peak,
+            'final_limit': self.limit,
+            'throttled': self.throttled,
+            'pressured_samples': self.pressured_samples,
+            'samples': len(self.samples),
+            'sampler_error': self.sampler_error,
+            'events': self.events,
+            'cpu_percent': summarize(s.cpu_percent for s in self.samples),
+            'available_mb': summarize(s.available_mb for s in self.samples),
+            'chrome_rss_mb': summarize(s.chrome_rss_mb for s in self.samples)
+        }
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Shared pytest fixtures for the Lyvo Selenium suite
+Worker-aware configuration, a worker-local driver pool and merged results under pytest-xdist
+"""
+
+import json
+import os
+import re
+import shutil
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import pytest
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+
+from adaptive_timeouts import AdaptiveTimeouts
+from circuit_breaker import BackendBreakers
+from db_snapshot import DEFAULT_DB_SNAPSHOT, DbSnapshots
+from duration_history import DurationHistory, lpt_schedule
+from fast_ui import DEFAULT_FAST_UI, fast_ui_settings, install_fast_ui, settle as settle_page
+from profile_template import ProfileTemplates
+from static_server import serve_dist
+from worker_isolation import merge_worker_results, worker_config, worker_count, worker_id, write_worker_results
+
+TESTS_ROOT = Path(__file__).parent.parent
+WORKER_RESULTS_DIR = TESTS_ROOT / 'test-reports' / 'workers'
+MERGED_RESULTS_FILE = TESTS_ROOT / 'test-reports' / 'merged_results.json'
+DURATION_HISTORY_FILE = TESTS_ROOT / 'test-reports' / 'durations.json'
+STEP_TIMINGS_FILE = TESTS_ROOT / 'test-reports' / 'step_timings.json'
+LPT_GROUP = re.compile(r'@lpt\d+$')
+
+DEFAULT_CONFIG = {
+    'base_url': 'http://localhost:3000',
+    'headless': False,
+    'slow_mo': 1.0,
+    'test_users': {
+        'seeker': {'email': 'seeker@test.com', 'password': 'password123'},
+        'owner': {'email': 'owner@test.com', 'password': 'password123'},
+        'admin': {'email': 'admin@test.com', 'password': 'password123'},
+        'invalid': {'email': 'invalid@test.com', 'password': 'wrongpassword'}
+    }
+}
+
+_outcomes: List[Dict] = []
+_session = {'controller': False, 'timeouts': None, 'static_server': None}
+
+
+class DriverPool:
+    """Chrome instances owned by one worker and reused across test classes"""
+
+    def __init__(self, templates: Optional[ProfileTemplates] = None, fast_ui: Optional[Dict] = None,
+                 explicit_waits: bool = False):
+        self.idle: Dict[Tuple, List] = {}
+        self.drivers: List = []
+        self.templates = templates
+        self.profiles: List[Path] = []
+        self.fast_ui = fast_ui or DEFAULT_FAST_UI
+        # Adaptive timeouts or fast UI: waits are explicit and the implicit wait stays 0
+        self.explicit_waits = explicit_waits or self.fast_ui['enabled']
+
+    def acquire(self, headless: bool, implicit_wait: float, window_size: Optional[str] = None, warm: bool = True):
+        """Reuse an idle driver with the same settings or start a new one.
+
+        warm drivers start from a clone of the warmed profile; tests measuring cold loads pass warm=False.
+        """
+        key = (headless, implicit_wait, window_size, warm)
+        if self.idle.get(key):
+            return self.idle[key].pop()
+
+        chrome_options = Options()
+        if headless:
+            chrome_options.add_argument('--headless')
+        chrome_options.add_argument('--no-sandbox')
+        chrome_options.add_argument('--disable-dev-shm-usage')
+        if window_size:
+            chrome_options.add_argument(f'--window-size={window_size}')
+        profile = self.templates.clone(chrome_options.arguments) if warm and self.templates else None
+        if profile:
+            self.profiles.append(profile)
+            chrome_options.add_argument(f'--user-data-dir={profile}')
+
+        driver = webdriver.Chrome(options=chrome_options)
+        driver.implicitly_wait(0 if self.explicit_waits else implicit_wait)
+        install_fast_ui(driver, self.fast_ui)
+        driver.lyvo_pool_key = key
+        self.drivers.append(driver)
+        return driver
+
+    def release(self, driver):
+        """Reset browser state and return the driver to the idle list"""
+        try:
+            driver.delete_all_cookies()
+            driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+            if driver.lyvo_pool_key[2]:
+                width, height = driver.lyvo_pool_key[2].split(',')
+                driver.set_window_size(int(width), int(height))
+            driver.get('about:blank')
+        except Exception:
+            # A browser that cannot be reset is not worth reusing
+            self.drivers.remove(driver)
+            driver.quit()
+            return
+        self.idle.setdefault(driver.lyvo_pool_key, []).append(driver)
+
+    def close(self):
+        for driver in self.drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+        self.drivers.clear()
+        self.idle.clear()
+        for profile in self.profiles:
+            shutil.rmtree(profile, ignore_errors=True)
+        self.profiles.clear()
+
+
+def _is_xdist_controller(config) -> bool:
+    return not hasattr(config, 'workerinput') and getattr(config.option, 'dist', 'no') != 'no'
+
+
+def load_config() -> Dict:
+    config_file = TESTS_ROOT / "test_config.json"
+    if config_file.exists():
+        with open(config_file, 'r') as f:
+            return json.load(f)
+    return DEFAULT_CONFIG
+
+
+@pytest.fixture(scope="session")
+def lyvo_config():
+    """test_config.json (or defaults) with this worker's users and artifact directories"""
+    config = load_config()
+    # Set by pytest_configure when the production build is being served
+    if os.environ.get('LYVO_BASE_URL'):
+        config['base_url'] = os.environ['LYVO_BASE_URL']
+    return worker_config(config)
+
+
+@pytest.fixture(scope="session")
+def driver_pool(lyvo_config, adaptive_timeouts):
+    pool = DriverPool(ProfileTemplates(lyvo_config), fast_ui_settings(lyvo_config),
+                      explicit_waits=adaptive_timeouts.settings['enabled'])
+    yield pool
+    pool.close()
+
+
+@pytest.fixture(scope="session")
+def settle(lyvo_config):
+    """settle(driver, seconds): time.sleep for UI tests; in fast UI mode it returns once the page is idle"""
+    settings = fast_ui_settings(lyvo_config)
+
+    def pause(driver, seconds: float):
+        if settings['enabled']:
+            settle_page(driver, seconds, settings)
+        else:
+            time.sleep(seconds)
+    return pause
+
+
+@pytest.fixture(scope="session")
+def backend_breakers(lyvo_config):
+    breakers = BackendBreakers(lyvo_config)
+    yield breakers
+    breakers.stop_monitor()
+
+
+@pytest.fixture(scope="session")
+def adaptive_timeouts(lyvo_config):
+    """Per-step wait timeouts learned from passing runs; the controller persists them"""
+    # Workers read the shared history but never write it; their timings travel in the worker file
+    timeouts = AdaptiveTimeouts(lyvo_config, history_file=STEP_TIMINGS_FILE)
+    _session['timeouts'] = timeouts
+    return timeouts
+
+
+@pytest.fixture(scope="session")
+def db_snapshots(lyvo_config):
+    """Snapshots of the seeded databases, or None unless db_snapshot is enabled and this is the only worker"""
+    settings = dict(DEFAULT_DB_SNAPSHOT, **lyvo_config.get('db_snapshot', {}))
+    # Workers share one mongod: restoring under one would wipe what another's test just wrote
+    if not settings['enabled'] or worker_count() > 1:
+        return None
+    return DbSnapshots(lyvo_config)
+
+
+@pytest.fixture(autouse=True)
+def database_isolation(request):
+    """Put the snapshot back after every test when db_snapshot.restore is 'test'"""
+    snapshots = request.getfixturevalue('db_snapshots')
+    yield
+    if snapshots and snapshots.settings['restore'] == 'test':
+        snapshots.restore()
+
+
+@pytest.fixture(scope="module", autouse=True)
+def module_database_isolation(request):
+    """Put the snapshot back after every module when db_snapshot.restore is 'module'"""
+    snapshots = request.getfixturevalue('db_snapshots')
+    yield
+    if snapshots and snapshots.settings['restore'] == 'module':
+        snapshots.restore()
+
+
+@pytest.fixture(autouse=True)
+def backend_circuit(request):
+    """Skip tests marked @pytest.mark.backend('user', ...) while one of those services is down"""
+    marker = request.node.get_closest_marker('backend')
+    if marker:
+        breakers = request.getfixturevalue('backend_breakers')
+        breakers.start_monitor(marker.args)
+        down = breakers.down(marker.args)
+        if down:
+            pytest.skip(f"service down: {down}")
+
+
+def pytest_configure(config):
+    # Under xdist the controller also sees every worker's reports; only workers record them
+    _session['controller'] = _is_xdist_controller(config)
+    # One static server for the whole run, started before any worker so they all inherit its URL
+    if not hasattr(config, 'workerinput'):
+        _session['static_server'] = serve_dist(load_config())
+
+
+def pytest_unconfigure(config):
+    if _session['static_server']:
+        _session['static_server'].stop_background()
+        _session['static_server'] = None
+
+
+def _prepare_db_snapshot(config: Dict):
+    """Start every run from the snapshot, taking it from the freshly seeded databases the first time"""
+    if not dict(DEFAULT_DB_SNAPSHOT, **config.get('db_snapshot', {}))['enabled']:
+        return
+    try:
+        snapshots = DbSnapshots(config)
+        if snapshots.exists():
+            snapshots.restore()
+        else:
+            snapshots.take()
+    except Exception as e:
+        pytest.exit(f"db_snapshot is enabled but the snapshot could not be prepared: {e}",
+                    returncode=pytest.ExitCode.USAGE_ERROR)
+
+
+def pytest_sessionstart(session):
+    # Runs on the controller before workers start, so stale worker files never leak into the merge
+    # and every worker starts from the same database state
+    if not hasattr(session.config, 'workerinput'):
+        for stale in WORKER_RESULTS_DIR.glob('*.json'):
+            stale.unlink()
+        _prepare_db_snapshot(load_config())
+
+
+# Before xdist's own hook, which reads the xdist_group markers and adds the @group suffix to nodeids
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_modifyitems(config, items):
+    """Pin tests to workers longest-first from recorded durations (needs --dist loadgroup)"""
+    workers = worker_count()
+    # Workers see dist reset to 'no'; xdist keeps --dist loadgroup for them as option.loadgroup
+    if workers < 2 or not getattr(config.option, 'loadgroup', False):
+        return
+    # Every worker collects the same items and reads the same history, so all agree on the plan
+    history = DurationHistory(DURATION_HISTORY_FILE)
+    estimates = {item.nodeid: history.estimate(item.nodeid) for item in items}
+    shards = lpt_schedule([item.nodeid for item in items], estimates, workers)
+    group = {nodeid: index for index, shard in enumerate(shards) for nodeid in shard}
+    for item in items:
+        item.add_marker(pytest.mark.xdist_group(name=f"lpt{group[item.nodeid]}"))
+
+
+def pytest_runtest_logreport(report):
+    if _session['controller']:
+        return
+    timeouts = _session['timeouts']
+    if timeouts and report.when == 'call':
+        if report.passed:
+            timeouts.commit()
+        else:
+            timeouts.discard()
+    if report.when == 'call' or (report.when == 'setup' and not report.passed):
+        _outcomes.append({
+            'test': LPT_GROUP.sub('', report.nodeid),
+            'outcome': report.outcome,
+            'duration': round(report.duration, 3)
+        })
+
+
+def pytest_sessionfinish(session):
+    if not _session['controller']:
+        timeouts = _session['timeouts']
+        write_worker_results(WORKER_RESULTS_DIR, worker_id(), _outcomes,
+                             step_timings=timeouts.committed if timeouts else None)
+    if hasattr(session.config, 'workerinput'):
+        return
+
+    # Controller (or single process): every worker has finished and written its file
+    merged = merge_worker_results(WORKER_RESULTS_DIR)
+    MERGED_RESULTS_FILE.parent.mkdir(parents=True, exist_ok=True)
+    with open(MERGED_RESULTS_FILE, 'w') as f:
+        json.dump(merged, f, indent=2)
+
+    history = DurationHistory(DURATION_HISTORY_FILE)
+    for result in merged['results']:
+        if result['outcome'] != 'skipped':
+            history.record(result['test'], result['duration'])
+    history.save()
+
+    timeouts = AdaptiveTimeouts(load_config(), history_file=STEP_TIMINGS_FILE)
+    timeouts.record_all(merged['step_timings'])
+    timeouts.save()
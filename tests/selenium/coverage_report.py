@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Lyvo Coverage Report
+Loads each route of the production build with DevTools JS block coverage and CSS rule usage
+tracking on, and maps the bytes that never ran back to src/ modules through the build's
+source maps. The result shows what each route downloads but does not need, per module.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+
+from login_test import LyvoLoginTester, load_config, logger
+from perf_utils import check_budgets, save_report
+from source_maps import SourceMap, attribute, coverage_summary, css_used_mask, js_used_mask, utf16_text
+from standin_server import LyvoStandin, StandinStore, make_token, standin_user
+from static_server import DEFAULT_STATIC_SERVER, serve_dist
+
+DEFAULT_COVERAGE_REPORT = {
+    # user is one of the USERS below, or null to load the route signed out
+    'routes': [
+        {'route': '/', 'user': None},
+        {'route': '/login', 'user': None},
+        {'route': '/signup', 'user': None},
+        {'route': '/seeker-dashboard', 'user': 'seeker'},
+        {'route': '/owner-dashboard', 'user': 'owner'},
+        {'route': '/admin-dashboard', 'user': 'admin'}
+    ],
+    'settle_seconds': 2.0,
+    # Applied to every route
+    'budgets': {
+        'unused_js_percent': 60,
+        'unused_css_percent': 70
+    }
+}
+
+USERS = {role: standin_user(role, 'cov') for role in ('seeker', 'admin', 'owner')}
+
+
+class LyvoCoverageReport:
+    """Collects per-route JS and CSS coverage and attributes it to source modules"""
+
+    def __init__(self, config: Dict):
+        self.config = config
+        self.settings = dict(DEFAULT_COVERAGE_REPORT, **config.get('coverage_report', {}))
+        self.budgets = dict(DEFAULT_COVERAGE_REPORT['budgets'], **self.settings.get('budgets', {}))
+        self.dist_dir = Path(dict(DEFAULT_STATIC_SERVER, **config.get('static_server', {}))['dist_dir'])
+        self.standin = LyvoStandin(store=StandinStore(), ports={
+            'property': urlparse(config.get('property_service_url', 'http://localhost:3002')).port or 3002,
+            'chat': urlparse(config.get('chat_service_url', 'http://localhost:3004')).port or 3004
+        })
+        self.tester: Optional[LyvoLoginTester] = None
+        self.maps: Dict[str, Optional[SourceMap]] = {}
+        self.results: Dict[str, Dict] = {}
+
+    def dist_file(self, url: str) -> Optional[Path]:
+        """The file in dist/ a script or stylesheet URL was served from"""
+        path = self.dist_dir / urlparse(url).path.lstrip('/')
+        return path if path.is_file() else None
+
+    def source_map(self, path: Path) -> Optional[SourceMap]:
+        name = path.name
+        if name not in self.maps:
+            self.maps[name] = SourceMap.load(path.with_name(name + '.map'))
+            if not self.maps[name]:
+                logger.warning(f"⚠️ No source map for {name}; build with LYVO_SOURCEMAP=1 npm run build")
+        return self.maps[name]
+
+    def summarize_file(self, path: Path, text: str, mask: bytearray) -> Dict:
+        source_map = self.source_map(path)
+        spans = source_map.spans(text) if source_map else [(0, len(text), path.name)]
+        return coverage_summary(attribute(mask, spans))
+
+    def js_coverage(self, scripts: List[Dict]) -> Dict[str, Dict]:
+        """Per bundle file, merging every execution context that loaded it"""
+        masks: Dict[Path, bytearray] = {}
+        texts: Dict[Path, str] = {}
+        for script in scripts:
+            path = self.dist_file(script['url']) if script['url'] else None
+            if not path or path.suffix not in ('.js', '.mjs'):
+                continue
+            if path not in texts:
+                texts[path] = utf16_text(path.read_text(encoding='utf-8'))
+            text = texts[path]
+            mask = js_used_mask(len(text), script['functions'])
+            masks[path] = bytearray(a | b for a, b in zip(masks[path], mask)) if path in masks else mask
+        return {path.name: self.summarize_file(path, texts[path], mask) for path, mask in masks.items()}
+
+    def css_coverage(self, rules: List[Dict]) -> Dict[str, Dict]:
+        """Per stylesheet from dist/, matched to the file by its text"""
+        driver = self.tester.driver
+        by_text = {utf16_text(path.read_text(encoding='utf-8')): path for path in self.dist_dir.rglob('*.css')}
+        sheets: Dict[str, List[Dict]] = {}
+        for rule in rules:
+            sheets.setdefault(rule['styleSheetId'], []).append(rule)
+        masks: Dict[Path, bytearray] = {}
+        texts = {path: text for text, path in by_text.items()}
+        for sheet_id, sheet_rules in sheets.items():
+            text = utf16_text(driver.execute_cdp_cmd('CSS.getStyleSheetText', {'styleSheetId': sheet_id})['text'])
+            path = by_text.get(text)
+            if not path:
+                continue
+            mask = css_used_mask(len(text), sheet_rules)
+            masks[path] = bytearray(a | b for a, b in zip(masks[path], mask)) if path in masks else mask
+        return {path.name: self.summarize_file(path, texts[path], mask) for path, mask in masks.items()}
+
+    def collect_route(self, route: str, user: Optional[str]):
+        driver = self.tester.driver
+        if user:
+            self.tester.seed_session(USERS[user], make_token(USERS[user]['_id']))
+        # Started after the session is seeded so only the measured load is counted
+        driver.execute_cdp_cmd('Profiler.enable', {})
+        driver.execute_cdp_cmd('Profiler.startPreciseCoverage', {'callCount': False, 'detailed': True})
+        driver.execute_cdp_cmd('DOM.enable', {})
+        driver.execute_cdp_cmd('CSS.enable', {})
+        driver.execute_cdp_cmd('CSS.startRuleUsageTracking', {})
+        try:
+            driver.get(f"{self.config['base_url']}{route}")
+            self.tester.wait_until(f'coverage_body:{route}', EC.presence_of_element_located((By.TAG_NAME, 'body')))
+            time.sleep(self.settings['settle_seconds'])
+            scripts = driver.execute_cdp_cmd('Profiler.takePreciseCoverage', {})['result']
+            rules = driver.execute_cdp_cmd('CSS.stopRuleUsageTracking', {})['ruleUsage']
+        finally:
+            driver.execute_cdp_cmd('Profiler.stopPreciseCoverage', {})
+        js = self.js_coverage(scripts)
+        css = self.css_coverage(rules)
+        self.results[route] = {
+            'user': user,
+            'js': js,
+            'css': css,
+            'unused_js_kb': round(sum(f['unused_kb'] for f in js.values()), 1),
+            'unused_js_percent': self.unused_percent(js),
+            'unused_css_kb': round(sum(f['unused_kb'] for f in css.values()), 1),
+            'unused_css_percent': self.unused_percent(css),
+            'never_executed': sorted({m for f in js.values() for m in f['never_executed']})
+        }
+        logger.info(
+            f"🧮 {route}: {self.results[route]['unused_js_kb']} KB JS and "
+            f"{self.results[route]['unused_css_kb']} KB CSS downloaded but unused"
+        )
+
+    @staticmethod
+    def unused_percent(files: Dict[str, Dict]) -> float:
+        total = sum(f['total_kb'] for f in files.values())
+        return round(100 * sum(f['unused_kb'] for f in files.values()) / total, 1) if total else 0.0
+
+    def module_routes(self) -> Dict[str, List[str]]:
+        """Routes on which each JS module ran at least partly; [] means it ran nowhere"""
+        modules: Dict[str, List[str]] = {}
+        for route, result in self.results.items():
+            for summary in result.get('js', {}).values():
+                for module, sizes in summary['modules'].items():
+                    ran = modules.setdefault(module, [])
+                    if sizes['unused_kb'] < sizes['kb']:
+                        ran.append(route)
+        return modules
+
+    def run(self) -> List[str]:
+        """Cover every route, save the report and return budget violations"""
+        server = serve_dist(self.config)
+        if not server:
+            logger.error(f"❌ Coverage needs a production build in {self.dist_dir}; run npm run build first")
+            return ['no production build']
+        self.standin.start_background(['property', 'chat'])
+        try:
+            self.tester = LyvoLoginTester(dict(self.config, cold_profile=True))
+            if not self.tester.setup_driver():
+                logger.error("❌ Failed to prepare browser for coverage")
+                return ['browser setup failed']
+            for entry in self.settings['routes']:
+                route, user = entry['route'], entry.get('user')
+                try:
+                    self.collect_route(route, user)
+                except Exception as e:
+                    logger.error(f"❌ Coverage of {route} failed: {e}")
+                    self.tester.take_screenshot(f"error_coverage_{route.strip('/') or 'home'}")
+                    self.results[route] = {'error': str(e)}
+        finally:
+            if self.tester:
+                self.tester.teardown_driver()
+            self.standin.stop_background()
+            server.stop_background()
+
+        module_routes = self.module_routes()
+        payload = {
+            'routes': self.results,
+            'never_executed_anywhere': sorted(m for m, routes in module_routes.items() if not routes),
+            'single_route_modules': {m: routes[0] for m, routes in sorted(module_routes.items()) if len(routes) == 1}
+        }
+        metrics = {f"{route}:{name}": result.get(name) for route, result in self.results.items() for name in self.budgets}
+        budgets = {f"{route}:{name}": limit for route in self.results for name, limit in self.budgets.items()}
+        violations = check_budgets(metrics, budgets)
+        report = save_report(self.config, 'coverage_report', payload, violations)
+        self.print_results(payload, violations)
+        logger.info(f"📄 Coverage report saved to: {report}")
+        return violations
+
+    def print_results(self, payload: Dict, violations: List[str]):
+        logger.info("\n📊 Downloaded but Unused by Route:")
+        logger.info("=" * 50)
+        for route, result in self.results.items():
+            if 'error' in result:
+                logger.info(f"{route.ljust(20)}: ❌ {result['error']}")
+                continue
+            logger.info(
+                f"{route.ljust(20)}: JS {result['unused_js_kb']} KB ({result['unused_js_percent']}%), "
+                f"CSS {result['unused_css_kb']} KB ({result['unused_css_percent']}%), "
+                f"{len(result['never_executed'])} modules never executed"
+            )
+        logger.info(f"Modules that ran on no route: {len(payload['never_executed_anywhere'])}")
+        logger.info(f"Modules that ran on exactly one route (split candidates): {len(payload['single_route_modules'])}")
+        for violation in violations:
+            logger.error(f"❌ Budget exceeded: {violation}")
+        if not violations:
+            logger.info("✅ All coverage budgets met")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Lyvo per-route JS/CSS coverage report')
+    parser.add_argument('--route', action='append', help='Signed-out route to cover (repeatable, default from config)')
+    args = parser.parse_args()
+
+    config = load_config()
+    settings = config.setdefault('coverage_report', {})
+    if args.route:
+        settings['routes'] = [{'route': route, 'user': None} for route in args.route]
+
+    violations = LyvoCoverageReport(config).run()
+    sys.exit(1 if violations else 0)
+
+
+if __name__ == "__main__":
+    main()
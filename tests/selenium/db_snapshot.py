@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Lyvo Database Snapshots
+Snapshot the seeded service databases on a local mongod once, then put them back between tests
+instead of re-seeding. Copies run inside mongod with $out, and a restore only rewrites the
+collections whose dbHash changed since the snapshot, so a test that touched nothing costs one
+hash per database.
+"""
+
+import argparse
+import fnmatch
+import logging
+import sys
+import time
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_SNAPSHOT = {
+    'enabled': False,
+    'mongo_url': 'mongodb://localhost:27017',
+    # Database names or fnmatch patterns; lyvo* covers lyvo_user and the other service databases
+    'databases': ['lyvo*'],
+    'name': 'baseline',
+    # Restore after every 'test' or every 'module'
+    'restore': 'test'
+}
+
+SNAPSHOT_PREFIX = 'snapshot_'
+MANIFEST = '__manifest'
+SYSTEM_DATABASES = {'admin', 'config', 'local'}
+# MongoDB rejects longer database names
+MAX_DATABASE_NAME = 63
+
+
+def mongo_client(url: str):
+    """pymongo client that fails fast when no mongod is listening"""
+    import pymongo
+
+    return pymongo.MongoClient(url, serverSelectionTimeoutMS=2000)
+
+
+def snapshot_database(name: str, database: str) -> str:
+    """Name of the database holding snapshot name of database"""
+    if '__' in name:
+        raise ValueError(f"snapshot names cannot contain '__': {name}")
+    snapshot = f"{SNAPSHOT_PREFIX}{name}__{database}"
+    if len(snapshot.encode()) > MAX_DATABASE_NAME:
+        raise ValueError(f"snapshot database name too long: {snapshot}")
+    return snapshot
+
+
+def restore_plan(snapshot: Dict[str, str], live: Dict[str, str]) -> Dict[str, List[str]]:
+    """Collections to copy back (changed or missing) and to drop (created since), from dbHash per collection"""
+    return {
+        'restore': sorted(name for name, digest in snapshot.items() if live.get(name) != digest),
+        'drop': sorted(name for name in live if name not in snapshot)
+    }
+
+
+class DbSnapshots:
+    """Take, restore and drop named snapshots of the matching databases"""
+
+    def __init__(self, config: Dict, client=None):
+        self.settings = dict(DEFAULT_DB_SNAPSHOT, **config.get('db_snapshot', {}))
+        self.client = client or mongo_client(self.settings['mongo_url'])
+
+    def databases(self) -> List[str]:
+        """Live databases matching the configured names or patterns"""
+        return sorted(
+            name for name in self.client.list_database_names()
+            if name not in SYSTEM_DATABASES and not name.startswith(SNAPSHOT_PREFIX)
+            and any(fnmatch.fnmatchcase(name, pattern) for pattern in self.settings['databases'])
+        )
+
+    def snapshots(self) -> Dict[str, List[str]]:
+        """Databases captured by every stored snapshot"""
+        found: Dict[str, List[str]] = {}
+        for name in self.client.list_database_names():
+            if name.startswith(SNAPSHOT_PREFIX) and '__' in name[len(SNAPSHOT_PREFIX):]:
+                snapshot, database = name[len(SNAPSHOT_PREFIX):].split('__', 1)
+                found.setdefault(snapshot, []).append(database)
+        return {snapshot: sorted(databases) for snapshot, databases in found.items()}
+
+    def exists(self, name: Optional[str] = None) -> bool:
+        return (name or self.settings['name']) in self.snapshots()
+
+    @staticmethod
+    def _copy(source, target, collection: str, count: int):
+        """Replace target's collection with source's, server-side; target's indexes are kept"""
+        if count:
+            source[collection].aggregate([{'$out': {'db': target.name, 'coll': collection}}])
+        elif collection in target.list_collection_names():
+            target[collection].delete_many({})
+        else:
+            target.create_collection(collection)
+
+    @staticmethod
+    def _collections(database) -> List[str]:
+        return sorted(name for name in database.list_collection_names(filter={'type': 'collection'})
+                      if not name.startswith('system.') and name != MANIFEST)
+
+    def take(self, name: Optional[str] = None) -> Dict:
+        """Snapshot every matching database, replacing an older snapshot of the same name"""
+        name = name or self.settings['name']
+        start = time.perf_counter()
+        self.drop(name)
+        captured = {}
+        for database in self.databases():
+            live = self.client[database]
+            target = self.client[snapshot_database(name, database)]
+            hashes = live.command('dbHash')['collections']
+            # Lists, not name-keyed documents: collection and index names may contain dots
+            collections = []
+            for collection in self._collections(live):
+                count = live[collection].estimated_document_count()
+                self._copy(live, target, collection, count)
+                collections.append({
+                    'name': collection,
+                    'hash': hashes.get(collection),
+                    'count': count,
+                    'indexes': [dict(info, name=index) for index, info in live[collection].index_information().items()]
+                })
+            target[MANIFEST].insert_one({'database': database, 'collections': collections, 'taken': time.time()})
+            captured[database] = [c['name'] for c in collections]
+        elapsed = round((time.perf_counter() - start) * 1000, 1)
+        logger.info(f"📸 Snapshot {name}: {len(captured)} databases in {elapsed} ms")
+        return {'name': name, 'databases': captured, 'ms': elapsed}
+
+    def restore(self, name: Optional[str] = None) -> Dict:
+        """Put every database of the snapshot back, touching only collections that changed"""
+        name = name or self.settings['name']
+        start = time.perf_counter()
+        changes = {}
+        for database in self.snapshots().get(name, []):
+            source = self.client[snapshot_database(name, database)]
+            specs = {spec['name']: spec for spec in source[MANIFEST].find_one({})['collections']}
+            live = self.client[database]
+            existing = set(live.list_collection_names())
+            plan = restore_plan({c: spec['hash'] for c, spec in specs.items()}, live.command('dbHash')['collections'])
+            for collection in plan['drop']:
+                live.drop_collection(collection)
+            for collection in plan['restore']:
+                spec = specs[collection]
+                self._copy(source, live, collection, spec['count'])
+                if collection not in existing:
+                    self._create_indexes(live[collection], spec['indexes'])
+            if plan['restore'] or plan['drop']:
+                changes[database] = plan
+        elapsed = round((time.perf_counter() - start) * 1000, 1)
+        logger.debug(f"Restored snapshot {name} in {elapsed} ms: {changes or 'nothing changed'}")
+        return {'name': name, 'changes': changes, 'ms': elapsed}
+
+    @staticmethod
+    def _create_indexes(collection, indexes: List[Dict]):
+        """Recreate the indexes of a collection a test dropped, from index_information()"""
+        for info in indexes:
+            if info['name'] == '_id_':
+                continue
+            options = {key: value for key, value in info.items() if key not in ('key', 'v', 'ns')}
+            collection.create_index([tuple(key) for key in info['key']], **options)
+
+    def drop(self, name: Optional[str] = None):
+        name = name or self.settings['name']
+        for database in self.snapshots().get(name, []):
+            self.client.drop_database(snapshot_database(name, database))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Lyvo database snapshots for fast test isolation')
+    parser.add_argument('action', choices=['take', 'restore', 'drop', 'list'])
+    parser.add_argument('--name', help='Snapshot name (default from config)')
+    parser.add_argument('--mongo-url', help='mongod to use (default from config)')
+    parser.add_argument('--database', action='append', help='Database name or pattern (repeatable)')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    # login_test opens its log file on import
+    from login_test import load_config
+
+    config = load_config()
+    settings = config.setdefault('db_snapshot', {})
+    if args.mongo_url:
+        settings['mongo_url'] = args.mongo_url
+    if args.database:
+        settings['databases'] = args.database
+    snapshots = DbSnapshots(config)
+
+    if args.action == 'take':
+        result = snapshots.take(args.name)
+        for database, collections in result['databases'].items():
+            logger.info(f"  {database}: {', '.join(collections) or '(empty)'}")
+    elif args.action == 'restore':
+        if not snapshots.exists(args.name):
+            logger.error(f"❌ No snapshot named {args.name or snapshots.settings['name']}")
+            sys.exit(1)
+        result = snapshots.restore(args.name)
+        logger.info(f"♻️ Restored in {result['ms']} ms")
+        for database, plan in result['changes'].items():
+            logger.info(f"  {database}: restored {plan['restore']}, dropped {plan['drop']}")
+    elif args.action == 'drop':
+        snapshots.drop(args.name)
+    else:
+        for name, databases in sorted(snapshots.snapshots().items()):
+            logger.info(f"{name}: {', '.join(databases)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Lyvo Driver Benchmark
+Per-command latency of the chromedriver (WebDriver HTTP) backend against the direct CDP backend,
+measured with the same commands on the same login page.
+"""
+
+import argparse
+import sys
+import time
+from typing import Callable, Dict, List
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+
+from login_test import LyvoLoginTester, load_config, logger
+from perf_utils import check_budgets, save_report, summarize
+
+BACKENDS = ['webdriver', 'cdp']
+
+DEFAULT_DRIVER_BENCHMARK = {
+    'repetitions': 50,
+    'batch_size': 10,
+    # p50 milliseconds per command on the CDP backend
+    'budgets': {
+        'find_element': 5,
+        'get_attribute': 5,
+        'execute_script': 5,
+        'send_keys': 10,
+        'click': 10,
+        'script_batch': 10
+    }
+}
+
+
+class LyvoDriverBenchmark:
+    """Runs identical command loops on each driver backend and compares their latency"""
+
+    def __init__(self, config: Dict):
+        self.config = config
+        self.settings = dict(DEFAULT_DRIVER_BENCHMARK, **config.get('driver_benchmark', {}))
+        self.budgets = dict(DEFAULT_DRIVER_BENCHMARK['budgets'], **self.settings.get('budgets', {}))
+        self.results: Dict[str, Dict] = {}
+
+    def time_command(self, action: Callable[[], None]) -> List[float]:
+        samples = []
+        for _ in range(self.settings['repetitions']):
+            start = time.perf_counter()
+            action()
+            samples.append((time.perf_counter() - start) * 1000)
+        return samples
+
+    def commands(self, driver) -> Dict[str, Callable[[], None]]:
+        email = driver.find_element(By.ID, 'email')
+        password = driver.find_element(By.ID, 'password')
+        toggle = driver.find_element(By.CSS_SELECTOR, '#password ~ button')
+        batch = ['document.readyState'] * self.settings['batch_size']
+
+        def script_batch():
+            # chromedriver has no batching, so it pays one round trip per expression
+            if hasattr(driver, 'execute_batch'):
+                driver.execute_batch(batch)
+            else:
+                for expression in batch:
+                    driver.execute_script(f"return {expression};")
+
+        return {
+            'find_element': lambda: driver.find_element(By.ID, 'email'),
+            'get_attribute': lambda: password.get_attribute('type'),
+            'execute_script': lambda: driver.execute_script("return document.readyState;"),
+            'send_keys': lambda: email.send_keys('a'),
+            'click': toggle.click,
+            'script_batch': script_batch
+        }
+
+    def measure_backend(self, backend: str):
+        tester = LyvoLoginTester(dict(self.config, driver_backend=backend))
+        if not tester.setup_driver():
+            self.results[backend] = {'error': 'browser setup failed'}
+            return
+        try:
+            tester.driver.get(f"{self.config['base_url']}/login")
+            tester.wait_until('login_form', EC.presence_of_element_located((By.ID, 'email')))
+            self.results[backend] = {}
+            for command, action in self.commands(tester.driver).items():
+                self.results[backend][command] = summarize(self.time_command(action))
+                logger.info(f"⏱️ {backend} {command}: p50 {self.results[backend][command]['p50']} ms")
+        except Exception as e:
+            logger.error(f"❌ {backend} benchmark failed: {e}")
+            tester.take_screenshot(f"error_driver_{backend}")
+            self.results[backend] = {'error': str(e)}
+        finally:
+            tester.teardown_driver()
+
+    def run(self) -> List[str]:
+        """Measure both backends, save the report and return CDP budget violations"""
+        for backend in BACKENDS:
+            self.measure_backend(backend)
+
+        webdriver, cdp = (self.results.get(b, {}) for b in BACKENDS)
+        self.results['speedup'] = {
+            command: round(webdriver[command]['p50'] / cdp[command]['p50'], 1)
+            for command in self.budgets
+            if command in webdriver and command in cdp and cdp[command]['p50'] > 0
+        }
+        metrics = {command: stats['p50'] for command, stats in cdp.items() if isinstance(stats, dict)}
+        violations = check_budgets(metrics, self.budgets)
+        report = save_report(self.config, 'driver_benchmark', self.results, violations)
+        self.print_results(violations)
+        logger.info(f"📄 Driver report saved to: {report}")
+        return violations
+
+    def print_results(self, violations: List[str]):
+        logger.info("\n📊 Per-command p50 latency (WebDriver vs CDP):")
+        logger.info("=" * 50)
+        webdriver, cdp = (self.results.get(b, {}) for b in BACKENDS)
+        for backend in BACKENDS:
+            if 'error' in self.results.get(backend, {}):
+                logger.info(f"{backend.ljust(16)}: ❌ {self.results[backend]['error']}")
+        for command in self.budgets:
+            if command not in webdriver or command not in cdp:
+                continue
+            logger.info(
+                f"{command.ljust(16)}: {webdriver[command]['p50']} ms -> {cdp[command]['p50']} ms "
+                f"(x{self.results['speedup'].get(command, '?')})"
+            )
+        for violation in violations:
+            logger.error(f"❌ Budget exceeded: {violation}")
+        if not violations:
+            logger.info("✅ All CDP command budgets met")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Lyvo WebDriver vs CDP per-command latency benchmark')
+    parser.add_argument('--repetitions', type=int, help='Times each command is timed per backend')
+    args = parser.parse_args()
+
+    config = load_config()
+    settings = config.setdefault('driver_benchmark', {})
+    if args.repetitions:
+        settings['repetitions'] = args.repetitions
+
+    violations = LyvoDriverBenchmark(config).run()
+    sys.exit(1 if violations else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Lyvo Duration History
+Per-test durations recorded across runs and a longest-processing-time-first scheduler
+that balances tests across parallel workers from that history.
+"""
+
+import heapq
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from perf_utils import percentile
+
+DEFAULT_HISTORY_FILE = './test-reports/durations.json'
+FALLBACK_SECONDS = 5.0
+
+
+class DurationHistory:
+    """Rolling window of recorded durations per test, persisted as JSON"""
+
+    def __init__(self, path: Path, keep: int = 10):
+        self.path = Path(path)
+        self.keep = keep
+        self.samples: Dict[str, List[float]] = {}
+        if self.path.exists():
+            try:
+                with open(self.path, 'r') as f:
+                    self.samples = json.load(f)
+            except (OSError, ValueError):
+                self.samples = {}
+
+    @classmethod
+    def from_config(cls, config: Dict) -> 'DurationHistory':
+        return cls(Path(config.get('duration_history_file', DEFAULT_HISTORY_FILE)))
+
+    def record(self, name: str, seconds: float):
+        window = self.samples.setdefault(name, [])
+        window.append(round(seconds, 3))
+        del window[:-self.keep]
+
+    def estimate(self, name: str, default: Optional[float] = None) -> float:
+        """Median of the recorded runs; unknown tests get default, else the median of known tests"""
+        if self.samples.get(name):
+            return percentile(self.samples[name], 50)
+        if default is not None:
+            return default
+        known = [percentile(values, 50) for values in self.samples.values() if values]
+        return percentile(known, 50) if known else FALLBACK_SECONDS
+
+    def quantile(self, name: str, pct: float) -> Optional[float]:
+        """pct-th percentile of the recorded runs, or None without history"""
+        if not self.samples.get(name):
+            return None
+        return percentile(self.samples[name], pct)
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'w') as f:
+            json.dump(self.samples, f, indent=2, sort_keys=True)
+
+
+def lpt_schedule(tests: Sequence[str], estimates: Dict[str, float], workers: int) -> List[List[str]]:
+    """Assign tests to workers longest-first, each to the currently least loaded worker.
+
+    Every shard keeps the tests in their original order so a single worker runs them as declared.
+    """
+    workers = max(1, min(workers, len(tests)))
+    # Equal loads go to the shard with fewer tests, so tests recorded at 0 s still spread out
+    loads = [(0.0, 0, index) for index in range(workers)]
+    shards: List[List[str]] = [[] for _ in range(workers)]
+    for test in sorted(tests, key=lambda t: estimates.get(t, FALLBACK_SECONDS), reverse=True):
+        load, count, index = heapq.heappop(loads)
+        shards[index].append(test)
+        heapq.heappush(loads, (load + estimates.get(test, FALLBACK_SECONDS), count + 1, index))
+
+    position = {test: i for i, test in enumerate(tests)}
+    return [sorted(shard, key=position.__getitem__) for shard in shards if shard]
+
+
+def makespan(shards: List[List[str]], estimates: Dict[str, float]) -> float:
+    """Estimated wall time: the load of the busiest shard"""
+    return max((sum(estimates.get(t, FALLBACK_SECONDS) for t in shard) for shard in shards), default=0.0)
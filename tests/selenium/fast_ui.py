@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Lyvo Fast UI
+Test mode that takes animation timing out of UI tests: CSS transitions and animations run in
+zero time, framer-motion skips its animations, and setTimeout runs on a virtual clock the
+tests advance. A wait or delay then lasts only until the page has nothing left to do.
+"""
+
+import os
+import time
+from typing import Dict, List
+
+DEFAULT_FAST_UI = {
+    'enabled': False,
+    'disable_animations': True,
+    'virtual_clock': True,
+    # Real seconds between checks while settling or waiting
+    'poll_seconds': 0.05,
+    # Consecutive quiet checks (no requests in flight, no timer due) before the page counts as settled
+    'quiet_polls': 2,
+    # A waiting test fires timers due within this many virtual ms; longer ones (idle logout,
+    # session expiry) only ever fire on the real clock
+    'max_jump_ms': 5000
+}
+
+# Runs before any page script. The style goes in as soon as <html> exists; the flag makes
+# src/index.jsx set framer-motion's MotionGlobalConfig.skipAnimations before the app renders.
+NO_ANIMATION_SCRIPT = """
+(function() {
+  window.__lyvoSkipAnimations = true;
+  const css = '*, *::before, *::after {' +
+    ' transition-duration: 0s !important; transition-delay: 0s !important;' +
+    ' animation-duration: 0s !important; animation-delay: 0s !important;' +
+    ' animation-iteration-count: 1 !important; scroll-behavior: auto !important; }';
+  function add() {
+    const style = document.createElement('style');
+    style.id = 'lyvo-no-animations';
+    style.textContent = css;
+    (document.head || document.documentElement).appendChild(style);
+  }
+  if (document.documentElement) {
+    add();
+  } else {
+    new MutationObserver(function(_, observer) {
+      if (document.documentElement) {
+        observer.disconnect();
+        add();
+      }
+    }).observe(document, {childList: true});
+  }
+})();
+"""
+
+# Runs before any page script. setTimeout timers still fire on the real clock, but advance()
+# fires the ones due within a virtual budget right away, moving Date forward to each one's due
+# time, so debounces and delayed UI resolve in order without the wait. setInterval keeps real
+# time: fast-forwarding a poll would only turn it into a busy loop. performance.now() is left
+# alone so the timing harnesses still measure real time.
+VIRTUAL_CLOCK_SCRIPT = """
+(function() {
+  const realSetTimeout = window.setTimeout.bind(window);
+  const realClearTimeout = window.clearTimeout.bind(window);
+  const RealDate = window.Date;
+  const timers = new Map();
+  let offset = 0;
+  let nextId = 1 << 30;
+  let inFlight = 0;
+  let budget = {key: null, limit: 0};
+
+  function now() { return RealDate.now() + offset; }
+  function fire(id) {
+    const timer = timers.get(id);
+    if (!timer) return;
+    timers.delete(id);
+    realClearTimeout(timer.realId);
+    if (timer.due > now()) offset += timer.due - now();
+    if (typeof timer.fn === 'function') timer.fn.apply(window, timer.args);
+  }
+  function earliest(limit) {
+    let found = null;
+    timers.forEach(function(timer, id) {
+      if (timer.due <= limit && (!found || timer.due < found.due)) found = {id: id, due: timer.due};
+    });
+    return found;
+  }
+
+  window.setTimeout = function(fn, delay) {
+    const id = nextId++;
+    const wait = Math.max(0, Number(delay) || 0);
+    const timer = {fn: fn, args: Array.prototype.slice.call(arguments, 2), due: now() + wait};
+    timer.realId = realSetTimeout(function() { fire(id); }, wait);
+    timers.set(id, timer);
+    return id;
+  };
+  window.clearTimeout = function(id) {
+    const timer = timers.get(id);
+    if (timer) {
+      realClearTimeout(timer.realId);
+      timers.delete(id);
+    } else {
+      realClearTimeout(id);
+    }
+  };
+
+  function VirtualDate() {
+    const args = Array.prototype.slice.call(arguments);
+    if (!(this instanceof VirtualDate)) return new RealDate(now()).toString();
+    return args.length ? new (Function.prototype.bind.apply(RealDate, [null].concat(args)))() : new RealDate(now());
+  }
+  VirtualDate.prototype = RealDate.prototype;
+  VirtualDate.now = now;
+  VirtualDate.parse = RealDate.parse;
+  VirtualDate.UTC = RealDate.UTC;
+  window.Date = VirtualDate;
+
+  const realFetch = window.fetch;
+  window.fetch = function() {
+    inFlight++;
+    return realFetch.apply(this, arguments).finally(function() { inFlight--; });
+  };
+  const realSend = XMLHttpRequest.prototype.send;
+  XMLHttpRequest.prototype.send = function() {
+    inFlight++;
+    this.addEventListener('loadend', function() { inFlight--; });
+    return realSend.apply(this, arguments);
+  };
+
+  window.__lyvoClock = {
+    // Fire every timer due within ms of virtual time; key ties repeated calls to one budget
+    advance: function(ms, key) {
+      if (budget.key !== key) budget = {key: key, limit: now() + ms};
+      let fired = 0;
+      for (let next = earliest(budget.limit); next && fired < 1000; next = earliest(budget.limit)) {
+        fire(next.id);
+        fired++;
+      }
+      return {fired: fired, in_flight: inFlight, timers: timers.size};
+    },
+    // Fire the next timer if it is due within ms
+    next: function(ms) {
+      const next = earliest(now() + ms);
+      if (next) fire(next.id);
+      return {fired: next ? 1 : 0, in_flight: inFlight, timers: timers.size};
+    }
+  };
+})();
+"""
+
+ADVANCE_SCRIPT = "return window.__lyvoClock ? window.__lyvoClock.advance(arguments[0], arguments[1]) : null;"
+NEXT_TIMER_SCRIPT = "return window.__lyvoClock ? window.__lyvoClock.next(arguments[0]) : null;"
+
+
+def fast_ui_settings(config: Dict) -> Dict:
+    """The fast_ui block over the defaults; LYVO_FAST_UI=1 or 0 overrides enabled for one run"""
+    settings = dict(DEFAULT_FAST_UI, **config.get('fast_ui', {}))
+    if os.environ.get('LYVO_FAST_UI'):
+        settings['enabled'] = os.environ['LYVO_FAST_UI'].lower() not in ('0', 'false')
+    return settings
+
+
+def init_scripts(settings: Dict) -> List[str]:
+    """Scripts to add with Page.addScriptToEvaluateOnNewDocument; none unless fast UI is enabled"""
+    if not settings.get('enabled'):
+        return []
+    scripts = []
+    if settings.get('disable_animations', True):
+        scripts.append(NO_ANIMATION_SCRIPT)
+    if settings.get('virtual_clock', True):
+        scripts.append(VIRTUAL_CLOCK_SCRIPT)
+    return scripts
+
+
+def install_fast_ui(driver, settings: Dict):
+    """Add the fast UI scripts to every document the driver loads from now on"""
+    for script in init_scripts(settings):
+        driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': script})
+
+
+def settle(driver, seconds: float, settings: Dict) -> float:
+    """Stand-in for time.sleep(seconds): advance the virtual clock by seconds and return once no
+    request is in flight and no timer is due, or after seconds of real time. Returns real seconds spent.
+    """
+    start = time.monotonic()
+    key = f"settle-{start}"
+    quiet = 0
+    while time.monotonic() - start < seconds:
+        try:
+            state = driver.execute_script(ADVANCE_SCRIPT, seconds * 1000, key)
+        except Exception:
+            # Navigating; the next document brings its own clock
+            state = None
+        if state is None:
+            quiet = 0
+        elif state['fired'] == 0 and state['in_flight'] == 0:
+            quiet += 1
+            if quiet >= settings['quiet_polls']:
+                break
+        else:
+            quiet = 0
+        time.sleep(settings['poll_seconds'])
+    return time.monotonic() - start
+
+
+def advancing(condition, settings: Dict):
+    """WebDriverWait condition that fires the page's next timer each time condition is not met yet"""
+    def check(driver):
+        result = condition(driver)
+        if not result:
+            try:
+                driver.execute_script(NEXT_TIMER_SCRIPT, settings['max_jump_ms'])
+            except Exception:
+                pass
+        return result
+    return check
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Lyvo Image Audit
+Loads each route with images enabled in a cold profile and reports what every image costs:
+bytes on the wire, decoded versus rendered size, format, lazy loading, whether it is above
+the fold and whether it is the Largest Contentful Paint element.
+"""
+
+import argparse
+import sys
+import time
+from typing import Dict, Iterable, List
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+
+from login_test import LyvoLoginTester, load_config, logger
+from perf_utils import check_budgets, save_report
+
+DEFAULT_IMAGE_AUDIT = {
+    'routes': ['/', '/login', '/signup', '/about', '/contact'],
+    'settle_seconds': 2.0,
+    # Decoded pixels per painted pixel before an image counts as oversized
+    'max_oversize_ratio': 2.0,
+    # PNG/JPEG/GIF above this size should be WebP or AVIF
+    'modern_format_kb': 50,
+    # Applied to every route
+    'budgets': {
+        'route_image_kb': 300,
+        'largest_image_kb': 150,
+        'lcp_image_kb': 100,
+        'max_oversize_ratio': 4.0
+    }
+}
+
+# Runs before any page script so the LCP candidates of the initial load are all recorded
+INIT_SCRIPT = """
+(function() {
+  window.__lyvoLcp = null;
+  try {
+    new PerformanceObserver(function(list) {
+      const entries = list.getEntries();
+      const last = entries[entries.length - 1];
+      window.__lyvoLcp = {url: last.url, startTime: last.startTime, size: last.size};
+    }).observe({type: 'largest-contentful-paint', buffered: true});
+  } catch (e) {}
+})();
+"""
+
+# Every <img> joined with its resource timing entry. Cross-origin images without
+# Timing-Allow-Origin report 0 bytes, which is returned as null rather than as free.
+COLLECT_SCRIPT = """
+const lcp = window.__lyvoLcp;
+const fold = window.innerHeight;
+return Array.from(document.images).map(function(img) {
+  const url = img.currentSrc || img.src;
+  const rect = img.getBoundingClientRect();
+  const timing = performance.getEntriesByName(url)[0];
+  const bytes = timing && timing.encodedBodySize ? timing.encodedBodySize : null;
+  let format = null;
+  const data = /^data:image\\/([a-z0-9+]+)/i.exec(url);
+  const ext = /\\.([a-z0-9]+)(?:[?#]|$)/i.exec(url);
+  if (data) format = data[1].toLowerCase();
+  else if (ext) format = ext[1].toLowerCase().replace('jpg', 'jpeg');
+  return {
+    url: url,
+    format: format,
+    bytes: bytes,
+    transfer_bytes: timing ? timing.transferSize : null,
+    decoded_bytes: timing && timing.decodedBodySize ? timing.decodedBodySize : null,
+    natural_width: img.naturalWidth,
+    natural_height: img.naturalHeight,
+    rendered_width: Math.round(rect.width),
+    rendered_height: Math.round(rect.height),
+    loading: img.loading || 'eager',
+    complete: img.complete && img.naturalWidth > 0,
+    above_fold: rect.bottom > 0 && rect.top < fold && rect.width > 0,
+    is_lcp: Boolean(lcp && lcp.url && lcp.url === url)
+  };
+});
+"""
+
+
+def image_summary(images: Iterable[Dict], device_pixel_ratio: float = 1.0, max_oversize_ratio: float = 2.0,
+                  modern_format_kb: float = 50) -> Dict:
+    """Bytes, oversizing and loading issues for the images a route loaded.
+
+    oversize_ratio compares decoded pixels with the pixels actually painted (rendered size times
+    the device pixel ratio); 1.0 is a perfect fit.
+    """
+    details = []
+    for image in images:
+        kb = round(image['bytes'] / 1024, 1) if image.get('bytes') is not None else None
+        painted = image['rendered_width'] * image['rendered_height'] * device_pixel_ratio ** 2
+        decoded = image['natural_width'] * image['natural_height']
+        ratio = round(decoded / painted, 2) if painted else None
+        issues = []
+        if ratio and ratio > max_oversize_ratio:
+            issues.append('oversized')
+        if image['above_fold'] and image.get('loading') == 'lazy':
+            issues.append('lazy_above_fold')
+        if not image['above_fold'] and image.get('loading') != 'lazy':
+            issues.append('eager_below_fold')
+        if image.get('format') in ('png', 'jpeg', 'gif') and kb and kb > modern_format_kb:
+            issues.append('legacy_format')
+        details.append(dict(image, kb=kb, oversize_ratio=ratio, issues=issues))
+
+    sized = [d for d in details if d['kb'] is not None]
+    largest = max(sized, key=lambda d: d['kb'], default=None)
+    issue_counts: Dict[str, int] = {}
+    for detail in details:
+        for issue in detail['issues']:
+            issue_counts[issue] = issue_counts.get(issue, 0) + 1
+    return {
+        'images': len(details),
+        'total_kb': round(sum(d['kb'] for d in sized), 1),
+        'largest_kb': largest['kb'] if largest else 0,
+        'largest_image': largest['url'] if largest else None,
+        'max_oversize_ratio': max((d['oversize_ratio'] for d in details if d['oversize_ratio']), default=None),
+        'unknown_size': len(details) - len(sized),
+        'issues': issue_counts,
+        'details': details
+    }
+
+
+class LyvoImageAudit:
+    """Measures the image weight of each route against per-route budgets"""
+
+    def __init__(self, config: Dict):
+        # Images on, and a cold profile so nothing is served from the warmed HTTP cache
+        browser_options = dict(config.get('browser_options', {}), disable_images=False)
+        self.config = dict(config, browser_options=browser_options, cold_profile=True)
+        self.settings = dict(DEFAULT_IMAGE_AUDIT, **config.get('image_audit', {}))
+        self.budgets = dict(DEFAULT_IMAGE_AUDIT['budgets'], **self.settings.get('budgets', {}))
+        self.results: Dict[str, Dict] = {}
+
+    def audit_route(self, tester: LyvoLoginTester, route: str):
+        driver = tester.driver
+        driver.get(f"{self.config['base_url']}{route}")
+        tester.wait_until(f'images_body:{route}', EC.presence_of_element_located((By.TAG_NAME, 'body')))
+        time.sleep(self.settings['settle_seconds'])
+        images = driver.execute_script(COLLECT_SCRIPT)
+        device_pixel_ratio = driver.execute_script("return window.devicePixelRatio;") or 1
+        summary = image_summary(images, device_pixel_ratio, self.settings['max_oversize_ratio'],
+                                self.settings['modern_format_kb'])
+        lcp = next((d for d in summary['details'] if d['is_lcp']), None)
+        summary['lcp_image'] = lcp['url'] if lcp else None
+        summary['lcp_image_kb'] = lcp['kb'] if lcp else None
+        self.results[route] = summary
+        logger.info(
+            f"🖼️ {route}: {summary['images']} images, {summary['total_kb']} KB "
+            f"(largest {summary['largest_kb']} KB, LCP image {summary['lcp_image'] or 'none'})"
+        )
+
+    def route_metrics(self) -> Dict[str, float]:
+        """Budgeted metrics of every route, named <route>:<metric>"""
+        metrics = {}
+        for route, summary in self.results.items():
+            if 'error' in summary:
+                continue
+            metrics[f"{route}:route_image_kb"] = summary['total_kb']
+            metrics[f"{route}:largest_image_kb"] = summary['largest_kb']
+            metrics[f"{route}:lcp_image_kb"] = summary['lcp_image_kb']
+            metrics[f"{route}:max_oversize_ratio"] = summary['max_oversize_ratio']
+        return metrics
+
+    def run(self) -> List[str]:
+        """Audit every route, save the report and return budget violations"""
+        tester = LyvoLoginTester(self.config)
+        if not tester.setup_driver():
+            logger.error("❌ Failed to prepare browser for image audit")
+            return ['browser setup failed']
+        try:
+            tester.driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': INIT_SCRIPT})
+            # Every route starts from an empty cache, as a first visit would
+            tester.driver.execute_cdp_cmd('Network.enable', {})
+            for route in self.settings['routes']:
+                tester.driver.execute_cdp_cmd('Network.clearBrowserCache', {})
+                try:
+                    self.audit_route(tester, route)
+                except Exception as e:
+                    logger.error(f"❌ Image audit of {route} failed: {e}")
+                    tester.take_screenshot(f"error_images_{route.strip('/') or 'home'}")
+                    self.results[route] = {'error': str(e)}
+        finally:
+            tester.teardown_driver()
+
+        budgets = {f"{route}:{name}": limit for route in self.results for name, limit in self.budgets.items()}
+        violations = check_budgets(self.route_metrics(), budgets)
+        report = save_report(self.config, 'image_audit', self.results, violations)
+        self.print_results(violations)
+        logger.info(f"📄 Image report saved to: {report}")
+        return violations
+
+    def print_results(self, violations: List[str]):
+        logger.info("\n📊 Image Weight by Route:")
+        logger.info("=" * 50)
+        for route, summary in self.results.items():
+            if 'error' in summary:
+                logger.info(f"{route.ljust(16)}: ❌ {summary['error']}")
+                continue
+            logger.info(
+                f"{route.ljust(16)}: {summary['total_kb']} KB in {summary['images']} images, "
+                f"oversize x{summary['max_oversize_ratio'] or '-'}"
+            )
+            for detail in summary['details']:
+                if detail['issues']:
+                    logger.info(f"    {detail['url']}: {', '.join(detail['issues'])} ({detail['kb']} KB)")
+        for violation in violations:
+            logger.error(f"❌ Budget exceeded: {violation}")
+        if not violations:
+            logger.info("✅ All image budgets met")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Lyvo per-route image weight audit')
+    parser.add_argument('--route', action='append', help='Route to audit (repeatable, default from config)')
+    args = parser.parse_args()
+
+    config = load_config()
+    settings = config.setdefault('image_audit', {})
+    if args.route:
+        settings['routes'] = args.route
+
+    violations = LyvoImageAudit(config).run()
+    sys.exit(1 if violations else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Lyvo Interaction Benchmark
+Records Interaction to Next Paint (INP) with input delay, processing and presentation
+breakdowns for clicks and keystrokes on the login form, the booking pages and the chat input.
+"""
+
+import argparse
+import sys
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+from urllib.parse import urlparse
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+
+from admin_fixtures import generate_bookings
+from login_test import LyvoLoginTester, load_config, logger
+from perf_utils import check_budgets, save_report
+from standin_server import LyvoStandin, StandinStore, make_token, standin_user
+
+DEFAULT_INTERACTION_BENCHMARK = {
+    'repetitions': 5,
+    'bookings': 40,
+    'settle_seconds': 0.5,
+    'budgets': {
+        'login_email_typing': 100,
+        'login_password_typing': 100,
+        'login_password_toggle': 200,
+        'login_submit_validation': 200,
+        'seeker_cancel_open': 200,
+        'seeker_cancel_close': 200,
+        'owner_view_toggle': 200,
+        'owner_status_filter': 200,
+        'owner_card_expand': 200,
+        'chat_input_typing': 100
+    }
+}
+
+SEEKER = standin_user('seeker', 'inp')
+OWNER = standin_user('owner', 'inp')
+CHAT_INPUT = 'textarea[placeholder="Type a message..."]'
+
+# Runs before any page script: the web-vitals style Event Timing observer.
+# 16ms is the lowest threshold the API allows; faster interactions are not reported.
+INIT_SCRIPT = """
+(function() {
+  window.__lyvoInteractions = [];
+  try {
+    new PerformanceObserver(function(list) {
+      for (const e of list.getEntries()) {
+        if (!e.interactionId) continue;
+        window.__lyvoInteractions.push({
+          id: e.interactionId,
+          name: e.name,
+          duration: e.duration,
+          inputDelay: e.processingStart - e.startTime,
+          processing: e.processingEnd - e.processingStart,
+          presentation: Math.max(e.startTime + e.duration - e.processingEnd, 0)
+        });
+      }
+    }).observe({type: 'event', durationThreshold: 16, buffered: true});
+  } catch (e) {}
+})();
+"""
+
+
+def interaction_summary(entries: Iterable[Dict]) -> Dict[str, float]:
+    """INP and its phase breakdown from Event Timing entries, grouped by interactionId like web-vitals"""
+    worst_by_id: Dict = {}
+    for entry in entries:
+        current = worst_by_id.get(entry['id'])
+        if current is None or entry['duration'] > current['duration']:
+            worst_by_id[entry['id']] = entry
+    if not worst_by_id:
+        return {'interactions': 0, 'inp_ms': None}
+
+    # web-vitals ignores the single slowest interaction for every 50 recorded
+    ranked = sorted(worst_by_id.values(), key=lambda e: e['duration'], reverse=True)
+    worst = ranked[min(len(ranked) // 50, len(ranked) - 1)]
+    return {
+        'interactions': len(ranked),
+        'inp_ms': round(worst['duration'], 2),
+        'input_delay_ms': round(worst['inputDelay'], 2),
+        'processing_ms': round(worst['processing'], 2),
+        'presentation_delay_ms': round(worst['presentation'], 2),
+        'event': worst['name']
+    }
+
+
+class LyvoInteractionBenchmark:
+    """Measures input responsiveness of key controls against per-control INP budgets"""
+
+    def __init__(self, config: Dict):
+        self.config = config
+        self.settings = dict(DEFAULT_INTERACTION_BENCHMARK, **config.get('interaction_benchmark', {}))
+        self.budgets = dict(DEFAULT_INTERACTION_BENCHMARK['budgets'], **self.settings.get('budgets', {}))
+        self.store = StandinStore()
+        self.standin = LyvoStandin(store=self.store, ports={
+            'property': urlparse(config.get('property_service_url', 'http://localhost:3002')).port or 3002,
+            'chat': urlparse(config.get('chat_service_url', 'http://localhost:3004')).port or 3004
+        })
+        self.tester: Optional[LyvoLoginTester] = None
+        self.results: Dict[str, Dict] = {}
+
+    def _wait(self) -> WebDriverWait:
+        return WebDriverWait(self.tester.driver, self.config['timeouts']['element_wait'])
+
+    def _clickable(self, by: str, selector: str):
+        return self._wait().until(EC.element_to_be_clickable((by, selector)))
+
+    def _open(self, route: str, user: Optional[Dict] = None):
+        """Navigate with a fresh interaction log, as the given user or signed out"""
+        driver = self.tester.driver
+        if user:
+            self.tester.seed_session(user, make_token(user['_id']))
+        else:
+            driver.get(self.config['base_url'])
+            driver.execute_script("localStorage.clear();")
+        driver.get(f"{self.config['base_url']}{route}")
+
+    def measure(self, control: str, action: Callable[[], None], prepare: Optional[Callable[[], None]] = None):
+        """Run action repeatedly and keep the INP summary of the interactions it produced"""
+        driver = self.tester.driver
+        settle = self.settings['settle_seconds']
+        drain = "const entries = window.__lyvoInteractions; window.__lyvoInteractions = []; return entries;"
+        entries: List[Dict] = []
+        for _ in range(self.settings['repetitions']):
+            if prepare:
+                prepare()
+            # Entries are delivered after the next paint, so let each step flush before draining
+            time.sleep(settle)
+            driver.execute_script(drain)
+            action()
+            time.sleep(settle)
+            entries.extend(driver.execute_script(drain))
+        summary = interaction_summary(entries)
+        self.results[control] = summary
+        logger.info(f"🖱️ {control}: INP {summary['inp_ms']} ms over {summary['interactions']} interactions")
+
+    def login_controls(self):
+        self._open('/login')
+        email = self._clickable(By.ID, 'email')
+        password = self._clickable(By.ID, 'password')
+        toggle = self._clickable(By.CSS_SELECTOR, '#password ~ button')
+        submit = self._clickable(By.CSS_SELECTOR, 'button[type="submit"]')
+
+        def clear_and_type(field, text: str):
+            field.clear()
+            field.send_keys(text)
+
+        self.measure('login_email_typing', lambda: clear_and_type(email, self.config['test_users']['seeker']['email']))
+        self.measure('login_password_typing', lambda: clear_and_type(password, 'incorrect-password'))
+        self.measure('login_password_toggle', toggle.click)
+        # Empty fields stop at the browser's required-field validation, no request is sent
+        email.clear()
+        password.clear()
+        self.measure('login_submit_validation', submit.click)
+
+    def seeker_booking_controls(self):
+        self._open('/seeker-bookings', SEEKER)
+        open_xpath = "//button[.//span[normalize-space()='Cancel Booking']]"
+        close_xpath = "//button[normalize-space()='Keep Booking']"
+        self._clickable(By.XPATH, open_xpath)
+
+        def open_modal():
+            self._clickable(By.XPATH, open_xpath).click()
+            self._clickable(By.XPATH, close_xpath)
+
+        def close_modal():
+            self._clickable(By.XPATH, close_xpath).click()
+            self._wait().until(EC.invisibility_of_element_located((By.XPATH, close_xpath)))
+
+        def dismiss():
+            if self.tester.driver.find_elements(By.XPATH, close_xpath):
+                close_modal()
+
+        self.measure('seeker_cancel_open', open_modal, prepare=dismiss)
+        dismiss()
+        self.measure('seeker_cancel_close', close_modal, prepare=open_modal)
+
+    def owner_booking_controls(self):
+        self._open('/owner-bookings', OWNER)
+        table = self._clickable(By.XPATH, "//button[normalize-space()='Table']")
+        cards = self._clickable(By.XPATH, "//button[normalize-space()='Cards']")
+        filter_card = "//div[contains(@class, 'cursor-pointer')][.//div[normalize-space()='{}']]"
+
+        def toggle_view():
+            cards.click()
+            table.click()
+
+        def filter_status():
+            self._clickable(By.XPATH, filter_card.format('Confirmed')).click()
+            self._clickable(By.XPATH, filter_card.format('Total Bookings')).click()
+
+        def expand_card():
+            button = self._clickable(By.XPATH, "//button[normalize-space()='Show More' or normalize-space()='Show Less']")
+            button.click()
+
+        self.measure('owner_view_toggle', toggle_view)
+        self.measure('owner_status_filter', filter_status)
+        cards.click()
+        self.measure('owner_card_expand', expand_card)
+
+    def chat_controls(self):
+        self.store.create_chat(SEEKER['_id'], OWNER['_id'], owner_name='Interaction Owner')
+        self._open('/seeker-messages', SEEKER)
+        self._clickable(By.XPATH, "//*[contains(text(), 'Interaction Owner')]").click()
+        textarea = self._clickable(By.CSS_SELECTOR, CHAT_INPUT)
+
+        def type_draft():
+            textarea.clear()
+            textarea.send_keys('Is the room still available next month?')
+
+        self.measure('chat_input_typing', type_draft)
+
+    def run(self) -> List[str]:
+        """Measure every control group, save the report and return budget violations"""
+        self.store.bookings = generate_bookings(self.settings['bookings'], SEEKER['_id'], OWNER['_id'])
+        self.standin.start_background(['property', 'chat'])
+        try:
+            self.tester = LyvoLoginTester(self.config)
+            if not self.tester.setup_driver():
+                logger.error("❌ Failed to prepare browser for interaction benchmark")
+                return ['browser setup failed']
+            self.tester.driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': INIT_SCRIPT})
+
+            groups = [self.login_controls, self.seeker_booking_controls,
+                      self.owner_booking_controls, self.chat_controls]
+            for group in groups:
+                try:
+                    group()
+                except Exception as e:
+                    logger.error(f"❌ {group.__name__} failed: {e}")
+                    self.tester.take_screenshot(f"error_interaction_{group.__name__}")
+                    self.results[group.__name__] = {'error': str(e)}
+        finally:
+            if self.tester:
+                self.tester.teardown_driver()
+            self.standin.stop_background()
+
+        metrics = {name: result.get('inp_ms') for name, result in self.results.items()}
+        violations = check_budgets(metrics, self.budgets)
+        report = save_report(self.config, 'interaction_benchmark', self.results, violations)
+        self.print_results(violations)
+        logger.info(f"📄 Interaction report saved to: {report}")
+        return violations
+
+    def print_results(self, violations: List[str]):
+        logger.info("\n📊 Interaction to Next Paint by Control:")
+        logger.info("=" * 50)
+        for name, result in self.results.items():
+            if 'error' in result:
+                logger.info(f"{name.ljust(26)}: ❌ {result['error']}")
+            elif result['inp_ms'] is None:
+                logger.info(f"{name.ljust(26)}: < 16 ms (no slow interactions)")
+            else:
+                logger.info(
+                    f"{name.ljust(26)}: {result['inp_ms']} ms "
+                    f"(input {result['input_delay_ms']} / processing {result['processing_ms']} / "
+                    f"presentation {result['presentation_delay_ms']}, {result['event']})"
+                )
+        for violation in violations:
+            logger.error(f"❌ Budget exceeded: {violation}")
+        if not violations:
+            logger.info("✅ All interaction budgets met")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Lyvo interaction responsiveness (INP) benchmark')
+    parser.add_argument('--repetitions', type=int, help='Times each control is exercised')
+    parser.add_argument('--bookings', type=int, help='Bookings seeded for the booking pages')
+    args = parser.parse_args()
+
+    config = load_config()
+    settings = config.setdefault('interaction_benchmark', {})
+    if args.repetitions:
+        settings['repetitions'] = args.repetitions
+    if args.bookings:
+        settings['bookings'] = args.bookings
+
+    violations = LyvoInteractionBenchmark(config).run()
+    sys.exit(1 if violations else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Lyvo LLM Fixtures
+Deterministic replies, streaming schedule and fault patterns for the stand-in Gemini endpoint,
+and the analysis of the retries the app made against it. No network access is required.
+"""
+
+import json
+from typing import Dict, Iterable, List, Optional
+
+DEFAULT_LLM = {
+    # Delay before the first token, then tokens at this rate
+    'ttft_ms': 400,
+    'tokens_per_second': 40,
+    # Status returned instead of a reply for the listed 1-based request numbers and/or every nth
+    'fail_status': 429,
+    'fail_requests': [],
+    'fail_every': 0,
+    'retry_after_seconds': 5
+}
+
+REPLY = ("Lyvo+ has single rooms from ₹12,000 and shared rooms from ₹8,000 a month, with WiFi, "
+         "security and housekeeping included. You can book a tour from any listing and move in "
+         "within a few days of signing the digital agreement.")
+
+# aiService.testConnectionWithRetry sends this prompt before any real query
+PROBE_PROMPT = 'test'
+
+
+def prompt_text(body: Dict) -> str:
+    """The user text of a generateContent request body"""
+    try:
+        return body['contents'][-1]['parts'][0]['text']
+    except (KeyError, IndexError, TypeError):
+        return ''
+
+
+def fault_status(settings: Dict, request_number: int) -> Optional[int]:
+    """Status to fail the nth (1-based) request with, or None to answer it"""
+    every = settings.get('fail_every') or 0
+    if request_number in settings.get('fail_requests', []) or (every and request_number % every == 0):
+        return settings.get('fail_status', 429)
+    return None
+
+
+def reply_tokens(text: str = REPLY) -> List[str]:
+    """Words with their trailing space, the unit the stand-in streams"""
+    words = text.split(' ')
+    return [word + ' ' for word in words[:-1]] + [words[-1]]
+
+
+def gemini_chunks(tokens: List[str]) -> List[bytes]:
+    """A generateContent response body split so that each chunk carries one more token.
+
+    Concatenated, the chunks are exactly the JSON the real API returns for a single candidate.
+    """
+    encoded = [json.dumps(token, ensure_ascii=False)[1:-1] for token in tokens]
+    prefix = '{"candidates": [{"content": {"parts": [{"text": "'
+    suffix = '"}], "role": "model"}, "finishReason": "STOP"}]}'
+    chunks = [prefix + (encoded[0] if encoded else '')] + encoded[1:]
+    chunks[-1] += suffix
+    return [chunk.encode() for chunk in chunks]
+
+
+def retry_summary(requests: Iterable[Dict]) -> Dict:
+    """Failures, retries and the backoff the app waited after each failure.
+
+    requests are the stand-in's log entries {'time' (s), 'kind' ('probe' or 'query'), 'status'}, in order.
+    """
+    requests = list(requests)
+    backoffs = []
+    for failed, retry in zip(requests, requests[1:]):
+        if failed['status'] >= 400:
+            backoffs.append({
+                'after': failed['kind'],
+                'status': failed['status'],
+                'next': retry['kind'],
+                'wait_ms': round((retry['time'] - failed['time']) * 1000, 1)
+            })
+    return {
+        'requests': len(requests),
+        'probes': sum(1 for r in requests if r['kind'] == 'probe'),
+        'queries': sum(1 for r in requests if r['kind'] == 'query'),
+        'failures': sum(1 for r in requests if r['status'] >= 400),
+        'backoff_ms': round(sum(b['wait_ms'] for b in backoffs), 1),
+        'backoffs': backoffs
+    }
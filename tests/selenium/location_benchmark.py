@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Lyvo Location Search Benchmark
+Measures keystroke-to-suggestion latency and Leaflet map render time on the seeker
+dashboard search, using the local stand-in for properties and geocoding.
+"""
+
+import argparse
+import sys
+import time
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+
+from location_fixtures import generate_properties, search_places
+from login_test import LyvoLoginTester, load_config, logger
+from perf_utils import check_budgets, save_report, summarize
+from standin_server import LyvoStandin, make_token, standin_user
+
+DEFAULT_LOCATION_BENCHMARK = {
+    'property_counts': [1000, 5000, 10000],
+    'queries': ['Koramangala', 'Indiranagar', 'Kakkanad', 'Gachibowli'],
+    'typing_delay': 0.08,
+    'budgets': {
+        'suggestion_p95_ms': 600,
+        'map_render_ms': 3000,
+        'selection_render_ms': 1500
+    }
+}
+
+NOMINATIM_ORIGIN = 'https://nominatim.openstreetmap.org'
+SEARCH_INPUT = 'input[placeholder^="Search for a location"]'
+SUGGESTION_BUTTON = 'div[class*="z-[9999]"] button'
+MARKER = '.custom-div-icon'
+
+# Runs before any page script: points Nominatim lookups at the geocoder stand-in
+# and records when the marker count changes.
+INIT_SCRIPT = """
+(function() {
+  const origin = '%(origin)s';
+  const target = '%(target)s';
+  const originalFetch = window.fetch;
+  window.fetch = function(input, init) {
+    const url = typeof input === 'string' ? input : input.url;
+    if (url && url.startsWith(origin)) {
+      const rewritten = target + url.slice(origin.length);
+      input = typeof input === 'string' ? rewritten : new Request(rewritten, input);
+    }
+    return originalFetch.call(this, input, init);
+  };
+  window.__lyvoMarkers = [];
+  document.addEventListener('DOMContentLoaded', function() {
+    let last = 0;
+    new MutationObserver(function() {
+      const count = document.querySelectorAll('%(marker)s').length;
+      if (count !== last) {
+        last = count;
+        window.__lyvoMarkers.push([performance.now(), count]);
+      }
+    }).observe(document.body, {childList: true, subtree: true});
+  });
+})();
+"""
+
+# Installed once the dashboard is up; timestamps input, suggestions, clicks and results
+SEARCH_PROBE_SCRIPT = """
+const input = document.querySelector(arguments[0]);
+const suggestionSelector = arguments[1];
+const state = {lastInputAt: null, suggestionsAt: null, expected: null, clickAt: null, resultsAt: null};
+window.__lyvoSearchProbe = state;
+input.addEventListener('input', () => { state.lastInputAt = performance.now(); state.suggestionsAt = null; }, true);
+document.addEventListener('click', () => { state.clickAt = performance.now(); state.resultsAt = null; }, true);
+new MutationObserver(() => {
+  const now = performance.now();
+  if (state.expected !== null && state.suggestionsAt === null) {
+    for (const button of document.querySelectorAll(suggestionSelector)) {
+      if (button.textContent.includes(state.expected)) { state.suggestionsAt = now; break; }
+    }
+  }
+  if (state.clickAt !== null && state.resultsAt === null) {
+    for (const heading of document.querySelectorAll('h3')) {
+      if (heading.textContent.startsWith('Found ')) { state.resultsAt = now; break; }
+    }
+  }
+}).observe(document.body, {childList: true, subtree: true, characterData: true});
+"""
+
+
+class LyvoLocationBenchmark:
+    """Drives the seeker dashboard search against synthetic property sets"""
+
+    def __init__(self, config: Dict):
+        self.config = config
+        self.settings = dict(DEFAULT_LOCATION_BENCHMARK, **config.get('location_benchmark', {}))
+        self.budgets = dict(DEFAULT_LOCATION_BENCHMARK['budgets'], **self.settings.get('budgets', {}))
+        self.standin = LyvoStandin(ports={
+            'property': urlparse(config.get('property_service_url', 'http://localhost:3002')).port or 3002
+        })
+        self.geocoder_url = f"http://127.0.0.1:{self.standin.ports['geocoder']}"
+        self.tester: Optional[LyvoLoginTester] = None
+        self.results: Dict[str, Dict] = {}
+
+    def _wait(self, timeout: Optional[float] = None) -> WebDriverWait:
+        return WebDriverWait(self.tester.driver, timeout or self.config['timeouts']['page_load'])
+
+    def _setup_browser(self) -> bool:
+        self.tester = LyvoLoginTester(self.config)
+        if not self.tester.setup_driver():
+            return False
+
+        driver = self.tester.driver
+        driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {
+            'source': INIT_SCRIPT % {'origin': NOMINATIM_ORIGIN, 'target': self.geocoder_url, 'marker': MARKER}
+        })
+        # Map tiles come from the public OSM servers; block them so only our rendering is measured
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': ['*tile.openstreetmap.org*']})
+
+        seeker = standin_user('seeker', 'location')
+        return self.tester.seed_session(seeker, make_token(seeker['_id']))
+
+    def measure_map_render(self, expected: int) -> Dict:
+        """Load the dashboard and time how long it takes for every marker to appear"""
+        driver = self.tester.driver
+        driver.get(f"{self.config['base_url']}/seeker-dashboard")
+        self._wait().until(EC.presence_of_element_located((By.CSS_SELECTOR, SEARCH_INPUT)))
+
+        deadline = time.time() + self.config['timeouts']['page_load'] * 4
+        log: List = []
+        while time.time() < deadline:
+            log = driver.execute_script("return window.__lyvoMarkers || [];")
+            if log and log[-1][1] >= expected:
+                break
+            time.sleep(0.1)
+
+        rendered = log[-1][1] if log else 0
+        timing = driver.execute_script(
+            "const nav = performance.getEntriesByType('navigation')[0];"
+            "return nav ? {dcl: nav.domContentLoadedEventEnd, load: nav.loadEventEnd} : {};"
+        )
+        return {
+            'expected_markers': expected,
+            'rendered_markers': rendered,
+            'markers_complete_ms': round(log[-1][0], 2) if log else None,
+            'dom_content_loaded_ms': round(timing.get('dcl', 0), 2),
+            'dom_nodes': driver.execute_script("return document.getElementsByTagName('*').length;")
+        }
+
+    def measure_query(self, query: str) -> Dict:
+        """Type a query like a user and time the suggestion list and the result render"""
+        driver = self.tester.driver
+        expected = search_places(query, limit=1)
+        expected_name = expected[0]['display_name'].split(',')[0] if expected else query
+
+        search_input = driver.find_element(By.CSS_SELECTOR, SEARCH_INPUT)
+        search_input.send_keys(Keys.CONTROL + 'a', Keys.DELETE)
+        driver.execute_script("window.__lyvoSearchProbe.expected = arguments[0];", expected_name)
+        for char in query:
+            search_input.send_keys(char)
+            time.sleep(self.settings['typing_delay'])
+
+        probe = None
+        deadline = time.time() + self.config['timeouts']['element_wait']
+        while time.time() < deadline:
+            probe = driver.execute_script("return window.__lyvoSearchProbe;")
+            if probe['suggestionsAt'] is not None:
+                break
+            time.sleep(0.02)
+
+        result = {'query': query, 'suggestion_ms': None, 'selection_render_ms': None}
+        if not probe or probe['suggestionsAt'] is None:
+            logger.warning(f"⚠️ No suggestion for '{query}' within {self.config['timeouts']['element_wait']}s")
+            return result
+        result['suggestion_ms'] = round(probe['suggestionsAt'] - probe['lastInputAt'], 2)
+
+        buttons = driver.find_elements(By.CSS_SELECTOR, SUGGESTION_BUTTON)
+        if buttons:
+            buttons[0].click()
+            deadline = time.time() + self.config['timeouts']['page_load']
+            while time.time() < deadline:
+                probe = driver.execute_script("return window.__lyvoSearchProbe;")
+                if probe['resultsAt'] is not None:
+                    result['selection_render_ms'] = round(probe['resultsAt'] - probe['clickAt'], 2)
+                    break
+                time.sleep(0.05)
+        return result
+
+    def run_size(self, count: int) -> Dict:
+        """Full measurement for one synthetic dataset size"""
+        logger.info(f"🗺️ Location benchmark with {count} properties")
+        self.standin.store.properties = generate_properties(count)
+        render = self.measure_map_render(count)
+        self.tester.driver.execute_script(SEARCH_PROBE_SCRIPT, SEARCH_INPUT, SUGGESTION_BUTTON)
+
+        # First pass hits the geocoder, second pass is served by locationService's cache
+        cold = [self.measure_query(q) for q in self.settings['queries']]
+        warm = [self.measure_query(q) for q in self.settings['queries']]
+        self.tester.take_screenshot(f"location_search_{count}")
+
+        def values(runs: List[Dict], key: str) -> List[float]:
+            return [run[key] for run in runs if run[key] is not None]
+
+        return {
+            'properties': count,
+            'map_render': render,
+            'suggestion_cold_ms': summarize(values(cold, 'suggestion_ms')),
+            'suggestion_warm_ms': summarize(values(warm, 'suggestion_ms')),
+            'selection_render_ms': summarize(values(cold + warm, 'selection_render_ms')),
+            'queries': cold + warm
+        }
+
+    def flatten_metrics(self) -> Dict[str, float]:
+        """Worst value across dataset sizes for each budgeted metric"""
+        def worst(values: List[Optional[float]]) -> Optional[float]:
+            present = [v for v in values if v is not None]
+            return max(present) if present else None
+
+        sizes = [r for r in self.results.values() if 'map_render' in r]
+        return {
+            'suggestion_p95_ms': worst([r['suggestion_cold_ms'].get('p95') for r in sizes]),
+            'map_render_ms': worst([r['map_render']['markers_complete_ms'] for r in sizes]),
+            'selection_render_ms': worst([r['selection_render_ms'].get('p95') for r in sizes])
+        }
+
+    def run(self) -> List[str]:
+        """Run every dataset size, save the report and return budget violations"""
+        self.standin.start_background(['property', 'geocoder'])
+        try:
+            if not self._setup_browser():
+                logger.error("❌ Failed to prepare browser for location benchmark")
+                return ['browser setup failed']
+            for count in self.settings['property_counts']:
+                try:
+                    self.results[str(count)] = self.run_size(count)
+                except Exception as e:
+                    logger.error(f"❌ Location benchmark failed at {count} properties: {e}")
+                    self.tester.take_screenshot(f"error_location_{count}")
+                    self.results[str(count)] = {'error': str(e)}
+        finally:
+            if self.tester:
+                self.tester.teardown_driver()
+            self.standin.stop_background()
+
+        violations = check_budgets(self.flatten_metrics(), self.budgets)
+        report = save_report(self.config, 'location_benchmark', self.results, violations)
+        self.print_results(violations)
+        logger.info(f"📄 Location benchmark report saved to: {report}")
+        return violations
+
+    def print_results(self, violations: List[str]):
+        logger.info("\n📊 Location Benchmark Results:")
+        logger.info("=" * 50)
+        for count, result in self.results.items():
+            if 'error' in result:
+                logger.info(f"{count.rjust(6)} properties: ❌ {result['error']}")
+                continue
+            logger.info(
+                f"{count.rjust(6)} properties: map {result['map_render']['markers_complete_ms']} ms, "
+                f"suggest p95 cold {result['suggestion_cold_ms'].get('p95')} ms / "
+                f"warm {result['suggestion_warm_ms'].get('p95')} ms"
+            )
+        for violation in violations:
+            logger.error(f"❌ Budget exceeded: {violation}")
+        if not violations:
+            logger.info("✅ All location budgets met")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Lyvo location search benchmark')
+    parser.add_argument('--properties', type=int, action='append',
+                        help='Synthetic property count (repeatable)')
+    args = parser.parse_args()
+
+    config = load_config()
+    if args.properties:
+        config.setdefault('location_benchmark', {})['property_counts'] = args.properties
+
+    violations = LyvoLocationBenchmark(config).run()
+    sys.exit(1 if violations else 0)
+
+
+if __name__ == "__main__":
+    main()
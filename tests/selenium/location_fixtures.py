@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Lyvo Location Fixtures
+Deterministic geocoding dataset and synthetic property generator used by the
+location stand-in and the search benchmark. No network access is required.
+"""
+
+import math
+import random
+from typing import Dict, List, Optional
+
+# (name, city, state, lat, lng, type, importance)
+PLACES = [
+    ('Koramangala', 'Bangalore', 'Karnataka', 12.9352, 77.6245, 'suburb', 0.72),
+    ('Indiranagar', 'Bangalore', 'Karnataka', 12.9784, 77.6408, 'suburb', 0.71),
+    ('Whitefield', 'Bangalore', 'Karnataka', 12.9698, 77.7500, 'suburb', 0.69),
+    ('HSR Layout', 'Bangalore', 'Karnataka', 12.9116, 77.6474, 'suburb', 0.66),
+    ('Electronic City', 'Bangalore', 'Karnataka', 12.8452, 77.6602, 'suburb', 0.65),
+    ('Marathahalli', 'Bangalore', 'Karnataka', 12.9591, 77.6974, 'suburb', 0.61),
+    ('Jayanagar', 'Bangalore', 'Karnataka', 12.9250, 77.5938, 'suburb', 0.63),
+    ('BTM Layout', 'Bangalore', 'Karnataka', 12.9166, 77.6101, 'suburb', 0.60),
+    ('Kakkanad', 'Kochi', 'Kerala', 10.0159, 76.3419, 'suburb', 0.64),
+    ('Edappally', 'Kochi', 'Kerala', 10.0261, 76.3125, 'suburb', 0.62),
+    ('Kaloor', 'Kochi', 'Kerala', 9.9975, 76.2920, 'suburb', 0.58),
+    ('Vyttila', 'Kochi', 'Kerala', 9.9658, 76.3186, 'suburb', 0.57),
+    ('Kottayam', 'Kottayam', 'Kerala', 9.5916, 76.5222, 'city', 0.70),
+    ('Kanjirappally', 'Kottayam', 'Kerala', 9.5586, 76.7890, 'town', 0.55),
+    ('Pala', 'Kottayam', 'Kerala', 9.7130, 76.6830, 'town', 0.54),
+    ('Technopark', 'Thiruvananthapuram', 'Kerala', 8.5581, 76.8816, 'commercial', 0.60),
+    ('Kazhakkoottam', 'Thiruvananthapuram', 'Kerala', 8.5686, 76.8731, 'suburb', 0.56),
+    ('Andheri', 'Mumbai', 'Maharashtra', 19.1136, 72.8697, 'suburb', 0.74),
+    ('Powai', 'Mumbai', 'Maharashtra', 19.1176, 72.9060, 'suburb', 0.70),
+    ('Bandra', 'Mumbai', 'Maharashtra', 19.0596, 72.8295, 'suburb', 0.73),
+    ('Hinjewadi', 'Pune', 'Maharashtra', 18.5913, 73.7389, 'suburb', 0.65),
+    ('Kothrud', 'Pune', 'Maharashtra', 18.5074, 73.8077, 'suburb', 0.62),
+    ('Gachibowli', 'Hyderabad', 'Telangana', 17.4401, 78.3489, 'suburb', 0.68),
+    ('Madhapur', 'Hyderabad', 'Telangana', 17.4483, 78.3915, 'suburb', 0.66),
+    ('Velachery', 'Chennai', 'Tamil Nadu', 12.9815, 80.2180, 'suburb', 0.64),
+    ('T Nagar', 'Chennai', 'Tamil Nadu', 13.0418, 80.2341, 'suburb', 0.67),
+    ('Connaught Place', 'New Delhi', 'Delhi', 28.6315, 77.2167, 'commercial', 0.78),
+    ('Saket', 'New Delhi', 'Delhi', 28.5245, 77.2066, 'suburb', 0.66),
+    ('Sector 62', 'Noida', 'Uttar Pradesh', 28.6208, 77.3633, 'suburb', 0.59),
+    ('Cyber City', 'Gurugram', 'Haryana', 28.4950, 77.0895, 'commercial', 0.67)
+]
+
+PROPERTY_TYPES = ['PG', 'Co-living', 'Apartment', 'House']
+AMENITIES = ['wifi', 'ac', 'parking', 'laundry', 'gym', 'food', 'security', 'powerBackup']
+
+
+def _place_record(index: int) -> Dict:
+    """Build a Nominatim-style record for PLACES[index]"""
+    name, city, state, lat, lng, place_type, importance = PLACES[index]
+    return {
+        'place_id': 900000 + index,
+        'display_name': f"{name}, {city}, {state}, India",
+        'lat': f"{lat:.7f}",
+        'lon': f"{lng:.7f}",
+        'type': place_type,
+        'importance': importance,
+        'address': {
+            'suburb': name,
+            'city': city,
+            'state': state,
+            'country': 'India',
+            'country_code': 'in'
+        }
+    }
+
+
+def search_places(query: str, limit: int = 5) -> List[Dict]:
+    """Case-insensitive substring search over the fixture, most important first"""
+    needle = (query or '').strip().lower()
+    if len(needle) < 3:
+        return []
+
+    matches = [
+        _place_record(i) for i, place in enumerate(PLACES)
+        if needle in f"{place[0]}, {place[1]}, {place[2]}".lower()
+    ]
+    matches.sort(key=lambda record: record['importance'], reverse=True)
+    return matches[:limit]
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great-circle distance, matching calculateDistance() in SeekerDashboard.jsx"""
+    radius = 6371
+    d_lat = math.radians(lat2 - lat1)
+    d_lng = math.radians(lng2 - lng1)
+    a = (math.sin(d_lat / 2) ** 2 +
+         math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(d_lng / 2) ** 2)
+    return radius * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+
+def reverse_place(lat: float, lng: float) -> Optional[Dict]:
+    """Nearest fixture place to a coordinate"""
+    if not PLACES:
+        return None
+    nearest = min(range(len(PLACES)), key=lambda i: haversine_km(lat, lng, PLACES[i][3], PLACES[i][4]))
+    record = _place_record(nearest)
+    record['lat'] = f"{lat:.7f}"
+    record['lon'] = f"{lng:.7f}"
+    return record
+
+
+def generate_properties(count: int, seed: int = 42, spread_km: float = 8.0) -> List[Dict]:
+    """Synthetic properties scattered around the fixture places, shaped like /api/public/properties"""
+    rng = random.Random(seed)
+    properties = []
+    for i in range(count):
+        name, city, state, lat, lng, _, _ = PLACES[i % len(PLACES)]
+        distance = rng.uniform(0, spread_km)
+        bearing = rng.uniform(0, 2 * math.pi)
+        d_lat = (distance / 111.0) * math.cos(bearing)
+        d_lng = (distance / (111.0 * math.cos(math.radians(lat)))) * math.sin(bearing)
+        properties.append({
+            '_id': f"prop{i:06d}",
+            'propertyName': f"{name} Residency {i}",
+            'address': f"{rng.randint(1, 400)} Main Road, {name}, {city}, {state}",
+            'latitude': round(lat + d_lat, 6),
+            'longitude': round(lng + d_lng, 6),
+            'rent': rng.randrange(4000, 30000, 500),
+            'propertyType': PROPERTY_TYPES[rng.randrange(len(PROPERTY_TYPES))],
+            'amenities': {amenity: rng.random() < 0.5 for amenity in AMENITIES},
+            'totalRooms': rng.randint(1, 40),
+            'images': [],
+            'ownerName': f"Owner {i % 97}",
+            'status': 'approved'
+        })
+    return properties
@@ -8,10 +8,12 @@ import os
 import sys
 import time
 import json
+import shutil
 import logging
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
 
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -28,6 +30,19 @@ from selenium.common.exceptions import (
     ElementNotInteractableException
 )
 
+from adaptive_timeouts import AdaptiveTimeouts
+from cdp_driver import CDPBrowser, CDPDriver
+from circuit_breaker import API_MONITOR_SCRIPT, DRAIN_API_CALLS_SCRIPT, BackendBreakers
+from concurrency_controller import ConcurrencyController
+from duration_history import DurationHistory, lpt_schedule, makespan
+from fast_ui import advancing, fast_ui_settings, install_fast_ui, settle
+from profile_template import ProfileTemplates
+from request_log import (DEFAULT_REQUEST_LOG, DRAIN_REQUESTS_SCRIPT, REQUEST_LOG_SCRIPT, redundancy_summary,
+                         redundancy_violations)
+from static_server import serve_dist
+from suite_graph import FAILED, PASSED, SERVICE_DOWN, SKIPPED, NodeResult, SuiteGraph
+from worker_isolation import log_file_name
+
 # Configure logging with UTF-8 encoding for Windows compatibility
 import io
 import sys
@@ -42,58 +57,128 @@ logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s',
     handlers=[
-        logging.FileHandler('test_results.log', encoding='utf-8'),
+        logging.FileHandler(log_file_name(), encoding='utf-8'),
         logging.StreamHandler(sys.stdout)
     ]
 )
 logger = logging.getLogger(__name__)
 
+# Rough first-run costs (seconds, including slow_mo delays) until real durations are recorded
+DEFAULT_TEST_DURATIONS = {
+    'login_page_elements': 3.0,
+    'invalid_login': 9.0,
+    'seeker_login': 12.0,
+    'owner_login': 12.0,
+    'admin_login': 12.0,
+    'password_toggle': 4.0,
+    'form_validation': 3.0
+}
+
 class LyvoLoginTester:
     """Main test class for Lyvo login functionality"""
     
-    def __init__(self, config: Dict):
+    def __init__(self, config: Dict, breakers: Optional[BackendBreakers] = None,
+                 timeouts: Optional[AdaptiveTimeouts] = None, browser: Optional[CDPBrowser] = None):
         self.config = config
         self.driver = None
+        # Set when this tester runs in a browser context of a Chrome shared with other testers
+        self.browser = browser
+        # Set by run_all_tests: gates how many testers may run a test at once
+        self.concurrency: Optional[ConcurrencyController] = None
+        self.host_contention: Dict = {}
+        # Set by run_all_tests: every fetch/XHR the tests made, shared by all testers of the run
+        self.request_log: Optional[List[Dict]] = None
+        self.request_log_settings = dict(DEFAULT_REQUEST_LOG, **config.get('request_log', {}))
+        self.network_redundancy: Dict = {}
+        self.redundancy_violations: List[str] = []
+        # Zero-duration animations and a virtual setTimeout clock; delays and waits end once the page is idle
+        self.fast_ui = fast_ui_settings(config)
+        # Clone of the warmed profile this tester's browser runs on (None for cold starts)
+        self.profile_templates = ProfileTemplates(config)
+        self.profile_dir: Optional[Path] = None
+        # Shared between parallel testers so every worker sees the same service state and step history
+        self.breakers = breakers or BackendBreakers(config)
+        self.timeouts = timeouts or AdaptiveTimeouts(config)
         self.screenshot_counter = 0
         self.test_results = {}
+        self.skipped: Dict[str, str] = {}
         self.screenshot_dir = Path(config['screenshot_dir'])
         
         # Create screenshot directory
-        self.screenshot_dir.mkdir(exist_ok=True)
+        self.screenshot_dir.mkdir(parents=True, exist_ok=True)
+        
+    def chrome_arguments(self) -> List[str]:
+        """Command-line switches for every Chrome this tester starts"""
+        arguments = [
+            '--no-sandbox',
+            '--disable-dev-shm-usage',
+            '--disable-gpu',
+            '--window-size=1920,1080',
+            '--disable-web-security',
+            '--allow-running-insecure-content',
+            '--disable-extensions',
+            '--disable-plugins'
+        ]
+        
+        # Skipping images loads faster but hides their cost; the image audit turns them back on
+        if self.config.get('browser_options', {}).get('disable_images', True):
+            arguments.append('--blink-settings=imagesEnabled=false')
+        
+        # Headless mode if configured
+        if self.config.get('headless', False):
+            arguments.append('--headless')
         
+        # User agent
+        arguments.append('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
+        return arguments
+    
     def setup_driver(self) -> bool:
         """Initialize Chrome WebDriver with proper options"""
         try:
             logger.info("🚀 Setting up Chrome WebDriver...")
             
             chrome_options = Options()
-            
-            # Basic Chrome options
-            chrome_options.add_argument('--no-sandbox')
-            chrome_options.add_argument('--disable-dev-shm-usage')
-            chrome_options.add_argument('--disable-gpu')
-            chrome_options.add_argument('--window-size=1920,1080')
-            chrome_options.add_argument('--disable-web-security')
-            chrome_options.add_argument('--allow-running-insecure-content')
-            chrome_options.add_argument('--disable-extensions')
-            chrome_options.add_argument('--disable-plugins')
-            chrome_options.add_argument('--disable-images')  # Faster loading
-            
-            # Headless mode if configured
+            for argument in self.chrome_arguments():
+                chrome_options.add_argument(argument)
             if self.config.get('headless', False):
-                chrome_options.add_argument('--headless')
                 logger.info("Running in headless mode")
             
-            # User agent
-            chrome_options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
-            
-            # Initialize driver
-            self.driver = webdriver.Chrome(options=chrome_options)
-            
-            # Set timeouts
-            self.driver.implicitly_wait(self.config['timeouts']['implicit'])
+            # Start from the warmed profile unless this run measures cold loads (contexts never touch disk)
+            if not self.browser and not self.config.get('cold_profile', False):
+                try:
+                    self.profile_dir = self.profile_templates.clone(chrome_options.arguments)
+                except Exception as e:
+                    logger.warning(f"⚠️ Warm profile unavailable, starting cold: {e}")
+                if self.profile_dir:
+                    logger.info(f"🔥 Using warmed profile {self.profile_templates.template.name}")
+            
+            # Initialize driver: a context in the shared browser, DevTools over one websocket, or chromedriver
+            if self.browser:
+                self.driver = self.browser.new_driver()
+            elif self.config.get('driver_backend', 'webdriver') == 'cdp':
+                self.driver = CDPDriver.launch(chrome_options.arguments, binary=self.config.get('chrome_binary'),
+                                               profile_dir=self.profile_dir)
+                logger.info("Using the direct CDP driver backend")
+            else:
+                if self.profile_dir:
+                    chrome_options.add_argument(f'--user-data-dir={self.profile_dir}')
+                # DevTools Network events, read back with get_log('performance') by the waterfall report
+                if self.config.get('performance_log', False):
+                    chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+                self.driver = webdriver.Chrome(options=chrome_options)
+            
+            # Set timeouts. Learned or fast-forwarded explicit waits own the timing; an implicit wait
+            # would let every presence check inside them block for the full implicit timeout
+            explicit_waits = self.timeouts.settings['enabled'] or self.fast_ui['enabled']
+            self.driver.implicitly_wait(0 if explicit_waits else self.config['timeouts']['implicit'])
             self.driver.set_page_load_timeout(self.config['timeouts']['page_load'])
             
+            # Count backend API calls per origin for the circuit breaker
+            self.driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': API_MONITOR_SCRIPT})
+            if self.request_log_settings['enabled']:
+                self.driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': REQUEST_LOG_SCRIPT})
+            install_fast_ui(self.driver, self.fast_ui)
+            
             logger.info("✅ WebDriver setup complete")
             return True
             
@@ -110,6 +195,10 @@ class LyvoLoginTester:
                 logger.info("✅ WebDriver closed")
             except Exception as e:
                 logger.error(f"❌ Error closing WebDriver: {e}")
+            self.driver = None
+        if self.profile_dir:
+            shutil.rmtree(self.profile_dir, ignore_errors=True)
+            self.profile_dir = None
     
     def take_screenshot(self, name: str) -> bool:
         """Take screenshot with error handling"""
@@ -132,18 +221,49 @@ class LyvoLoginTester:
     def delay(self, seconds: Optional[float] = None):
         """Add delay between actions"""
         delay_time = seconds or self.config.get('slow_mo', 1.0)
+        if self.fast_ui['enabled'] and self.driver:
+            settle(self.driver, delay_time, self.fast_ui)
+            return
         time.sleep(delay_time)
     
+    def wait_until(self, step: str, condition, ceiling: Optional[float] = None):
+        """WebDriverWait with the timeout learned for step, never above ceiling (default element_wait)"""
+        ceiling = ceiling or self.config['timeouts']['element_wait']
+        with self.timeouts.step(step, ceiling) as timeout:
+            if self.fast_ui['enabled']:
+                return WebDriverWait(self.driver, timeout, poll_frequency=self.fast_ui['poll_seconds']).until(
+                    advancing(condition, self.fast_ui))
+            return WebDriverWait(self.driver, timeout).until(condition)
+    
+    def seed_session(self, user: Dict, token: str) -> bool:
+        """Store an authenticated session in localStorage, skipping the login form"""
+        try:
+            self.driver.get(self.config['base_url'])
+            self.driver.execute_script(
+                "localStorage.setItem('authToken', arguments[0]);"
+                "localStorage.setItem('user', JSON.stringify(arguments[1]));",
+                token, user
+            )
+            logger.info(f"🔑 Seeded session for {user.get('email', user.get('_id'))}")
+            return True
+        except Exception as e:
+            logger.error(f"❌ Failed to seed session: {e}")
+            return False
+
     def navigate_to_login(self) -> bool:
         """Navigate to login page"""
         try:
             logger.info("🌐 Navigating to login page...")
-            self.driver.get(f"{self.config['base_url']}/login")
+            page_load = self.config['timeouts']['page_load']
+            try:
+                with self.timeouts.step('page_load:/login', page_load) as timeout:
+                    self.driver.set_page_load_timeout(timeout)
+                    self.driver.get(f"{self.config['base_url']}/login")
+            finally:
+                self.driver.set_page_load_timeout(page_load)
             
             # Wait for page to load
-            WebDriverWait(self.driver, self.config['timeouts']['element_wait']).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
-            )
+            self.wait_until('login_body', EC.presence_of_element_located((By.TAG_NAME, "body")))
             
             self.take_screenshot("01_login_page")
             self.delay()
@@ -159,9 +279,7 @@ class LyvoLoginTester:
         
         try:
             # Wait for page to fully load
-            WebDriverWait(self.driver, self.config['timeouts']['element_wait']).until(
-                EC.presence_of_element_located((By.TAG_NAME, "h2"))
-            )
+            self.wait_until('login_title', EC.presence_of_element_located((By.TAG_NAME, "h2")))
             
             elements_to_check = [
                 ("Logo", By.CSS_SELECTOR, 'img[alt="Lyvo Logo"]'),
@@ -217,7 +335,7 @@ class LyvoLoginTester:
             invalid_user = self.config['test_users']['invalid']
             
             # Fill email field
-            email_field = self.driver.find_element(By.ID, "email")
+            email_field = self.wait_until('invalid_login_form', EC.presence_of_element_located((By.ID, "email")))
             email_field.clear()
             email_field.send_keys(invalid_user['email'])
             self.delay()
@@ -240,13 +358,11 @@ class LyvoLoginTester:
             # Check for error message or stay on login page
             try:
                 # Look for error message
-                error_element = WebDriverWait(self.driver, 5).until(
-                    EC.any_of(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, '.bg-red-50')),
-                        EC.presence_of_element_located((By.CSS_SELECTOR, '.text-red-700')),
-                        EC.presence_of_element_located((By.CSS_SELECTOR, '[class*="error"]'))
-                    )
-                )
+                error_element = self.wait_until('invalid_login_error', EC.any_of(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, '.bg-red-50')),
+                    EC.presence_of_element_located((By.CSS_SELECTOR, '.text-red-700')),
+                    EC.presence_of_element_located((By.CSS_SELECTOR, '[class*="error"]'))
+                ))
                 error_text = error_element.text
                 logger.info(f"✅ Error message displayed: {error_text}")
                 return True
@@ -279,7 +395,7 @@ class LyvoLoginTester:
             user = self.config['test_users'][user_type]
             
             # Fill email field
-            email_field = self.driver.find_element(By.ID, "email")
+            email_field = self.wait_until(f"{user_type}_login_form", EC.presence_of_element_located((By.ID, "email")))
             email_field.clear()
             email_field.send_keys(user['email'])
             self.delay()
@@ -318,13 +434,11 @@ class LyvoLoginTester:
                 
                 # Check if user is logged in (look for logout button or user menu)
                 try:
-                    logout_element = WebDriverWait(self.driver, 5).until(
-                        EC.any_of(
-                            EC.presence_of_element_located((By.CSS_SELECTOR, '[class*="logout"]')),
-                            EC.presence_of_element_located((By.CSS_SELECTOR, '[href*="logout"]')),
-                            EC.presence_of_element_located((By.XPATH, '//button[contains(text(), "Logout")]'))
-                        )
-                    )
+                    logout_element = self.wait_until(f"{user_type}_logout_control", EC.any_of(
+                        EC.presence_of_element_located((By.CSS_SELECTOR, '[class*="logout"]')),
+                        EC.presence_of_element_located((By.CSS_SELECTOR, '[href*="logout"]')),
+                        EC.presence_of_element_located((By.XPATH, '//button[contains(text(), "Logout")]'))
+                    ))
                     logger.info("✅ Logout button found - user is logged in")
                     
                 except TimeoutException:
@@ -354,7 +468,7 @@ class LyvoLoginTester:
             self.driver.get(f"{self.config['base_url']}/login")
             self.delay(2)
             
-            password_field = self.driver.find_element(By.ID, "password")
+            password_field = self.wait_until('password_toggle_form', EC.presence_of_element_located((By.ID, "password")))
             toggle_button = self.driver.find_element(By.CSS_SELECTOR, 'button[type="button"]')
             
             # Check initial state (password should be hidden)
@@ -407,7 +521,8 @@ class LyvoLoginTester:
             self.delay(2)
             
             # Test empty form submission
-            sign_in_button = self.driver.find_element(By.CSS_SELECTOR, 'button[type="submit"]')
+            sign_in_button = self.wait_until('validation_form', EC.presence_of_element_located(
+                (By.CSS_SELECTOR, 'button[type="submit"]')))
             sign_in_button.click()
             self.delay(1)
             
@@ -432,8 +547,123 @@ class LyvoLoginTester:
             self.take_screenshot("error_form_validation")
             return False
     
+    def check_backend_healthy(self) -> bool:
+        """Prerequisite: the user service answers its health endpoint"""
+        healthy = self.breakers['user'].check()
+        if healthy:
+            logger.info("✅ Backend healthy")
+        else:
+            logger.error(f"❌ Backend health check failed ({self.breakers.urls['user']})")
+        return healthy
+    
+    def check_login_page_renders(self) -> bool:
+        """Prerequisite: the login form renders at all"""
+        if not self.navigate_to_login():
+            return False
+        try:
+            self.wait_until('login_form', EC.presence_of_element_located((By.ID, "email")))
+            logger.info("✅ Login page renders")
+            return True
+        except TimeoutException:
+            logger.error("❌ Login form did not render")
+            self.take_screenshot("error_login_page_render")
+            return False
+    
+    def suite_graph(self) -> SuiteGraph:
+        """Checks and tests run by run_all_tests, with their prerequisites"""
+        graph = SuiteGraph()
+        graph.add('backend_healthy', self.check_backend_healthy)
+        graph.add('login_page_renders', self.check_login_page_renders)
+        
+        graph.add('login_page_elements', self.test_login_page_elements, requires=['login_page_renders'])
+        graph.add('invalid_login', self.test_invalid_login, requires=['login_page_renders'], services=['user'])
+        # Valid logins need the test users (see create_test_users.js)
+        if self.config.get('run_valid_logins', False):
+            for user_type in ['seeker', 'owner', 'admin']:
+                graph.add(f"{user_type}_login", lambda user_type=user_type: self.test_valid_login(user_type),
+                          requires=['login_page_renders', 'backend_healthy'], services=['user'])
+        graph.add('password_toggle', self.test_password_visibility_toggle, requires=['login_page_renders'])
+        graph.add('form_validation', self.test_form_validation, requires=['login_page_renders'])
+        return graph
+    
+    def _log_result(self, name: str, result: NodeResult):
+        status, seconds, reason = result
+        # Only passing steps teach the timeouts what a healthy run looks like
+        if status == PASSED:
+            self.timeouts.commit()
+        else:
+            self.timeouts.discard()
+        if status == SKIPPED:
+            logger.warning(f"⏭️ {name} skipped: prerequisite {reason}")
+        elif status == SERVICE_DOWN:
+            logger.warning(f"🔌 {name} short-circuited: {reason}")
+        else:
+            logger.info(f"{'✅' if status == PASSED else '❌'} {name} {status} in {seconds:.1f}s")
+    
+    def _log_concurrency(self, event: Dict):
+        if event['to'] < event['from']:
+            logger.warning(f"🐢 Throttling to {event['to']} worker(s): {event['reason']}")
+        else:
+            logger.info(f"🚀 Scaling up to {event['to']} worker(s): {event['reason']}")
+    
+    def run_shard(self, names: List[str], known: Dict[str, NodeResult]) -> Dict[str, NodeResult]:
+        """Run the named tests in this tester's own browser, honouring prerequisites in known"""
+        if not self.driver and not self.setup_driver():
+            logger.error("❌ Failed to setup WebDriver")
+            return {}
+        
+        graph = self.suite_graph()
+        tests = {name: graph.nodes[name] for name in names}
+        
+        def from_login_page(test: Callable[[], bool]) -> Callable[[], bool]:
+            # Every test starts on the login page; a valid login navigates away from it
+            def run() -> bool:
+                return ('/login' in self.driver.current_url or self.navigate_to_login()) and test()
+            
+            def run_in_slot() -> bool:
+                with self.concurrency.slot():
+                    return run()
+            
+            return run_in_slot if self.concurrency else run
+        
+        for name, test in tests.items():
+            graph.nodes[name] = from_login_page(test)
+        def after_test(name: str, result: NodeResult):
+            # Feed the API calls the test made into the breakers before the next test asks them
+            try:
+                self.breakers.record_api_calls(self.driver.execute_script(DRAIN_API_CALLS_SCRIPT))
+            except Exception:
+                pass
+            if self.request_log is not None and self.request_log_settings['enabled']:
+                try:
+                    self.request_log.extend(dict(entry, test=name)
+                                            for entry in self.driver.execute_script(DRAIN_REQUESTS_SCRIPT))
+                except Exception:
+                    pass
+            self._log_result(name, result)
+        
+        try:
+            return graph.run(names, known, on_result=after_test, service_down=self.breakers.down)
+        except Exception as e:
+            logger.error(f"❌ Test shard failed: {e}")
+            return {}
+        finally:
+            self.teardown_driver()
+    
+    def shared_browser(self) -> Optional[CDPBrowser]:
+        """One Chrome for all parallel workers when parallel_mode is "contexts", else None"""
+        if self.config.get('parallel_mode', 'browsers') != 'contexts':
+            return None
+        logger.info("🧩 Running parallel workers as browser contexts in one Chrome")
+        # Every context is a background tab to Chrome; keep their timers and rendering at full speed
+        return CDPBrowser(self.chrome_arguments() + [
+            '--disable-background-timer-throttling',
+            '--disable-backgrounding-occluded-windows',
+            '--disable-renderer-backgrounding'
+        ], binary=self.config.get('chrome_binary'))
+    
     def run_all_tests(self) -> Dict[str, bool]:
-        """Run all login tests"""
+        """Run prerequisite checks, then the login tests across parallel_workers browsers longest-first"""
         logger.info("🧪 Starting Lyvo Login Test Suite...")
         logger.info("=" * 50)
         
@@ -447,51 +677,124 @@ class LyvoLoginTester:
             'password_toggle': False,
             'form_validation': False
         }
+        self.skipped = {}
+        self.request_log = []
+        
+        # Setup WebDriver
+        if not self.setup_driver():
+            logger.error("❌ Failed to setup WebDriver")
+            return self.test_results
         
+        graph = self.suite_graph()
+        checks = [name for name in graph.nodes if not graph.requires[name]]
+        names = [name for name in graph.nodes if name not in checks]
+        outcomes: Dict[str, NodeResult] = {}
+        controller: Optional[ConcurrencyController] = None
+        self.breakers.start_monitor({service for name in names for service in graph.services[name]})
         try:
-            # Setup WebDriver
-            if not self.setup_driver():
-                logger.error("❌ Failed to setup WebDriver")
-                return self.test_results
-            
-            # Navigate to login page
-            if not self.navigate_to_login():
-                logger.error("❌ Failed to navigate to login page")
-                return self.test_results
-            
-            # Test 1: Login page elements
-            self.test_results['login_page_elements'] = self.test_login_page_elements()
-            
-            # Test 2: Invalid login
-            self.test_results['invalid_login'] = self.test_invalid_login()
-            
-            # Test 3: Valid logins (uncomment if you have test users)
-            # self.test_results['seeker_login'] = self.test_valid_login('seeker')
-            # self.test_results['owner_login'] = self.test_valid_login('owner')
-            # self.test_results['admin_login'] = self.test_valid_login('admin')
-            
-            # Test 4: Password visibility toggle
-            self.test_results['password_toggle'] = self.test_password_visibility_toggle()
-            
-            # Test 5: Form validation
-            self.test_results['form_validation'] = self.test_form_validation()
-            
+            outcomes = graph.run(checks, on_result=self._log_result)
+            # Tests blocked by a failed check are skipped now, without ever touching the browser
+            statuses = {name: result[0] for name, result in outcomes.items()}
+            runnable = []
+            for name in names:
+                blocker = graph.blocked_by(name, statuses)
+                if blocker:
+                    outcomes[name] = (SKIPPED, 0.0, f"{blocker} {statuses[blocker]}")
+                    self._log_result(name, outcomes[name])
+                else:
+                    runnable.append(name)
+            
+            history = DurationHistory.from_config(self.config)
+            estimates = {name: history.estimate(f"login_test::{name}", DEFAULT_TEST_DURATIONS.get(name))
+                         for name in runnable}
+            shards = lpt_schedule(runnable, estimates, self.config.get('parallel_workers', 1))
+            logger.info(f"🗂️ {len(runnable)} tests on {len(shards)} worker(s), "
+                        f"estimated {makespan(shards, estimates):.1f}s")
+            
+            known = dict(outcomes)
+            controller = ConcurrencyController(self.config, max(len(shards), 1), on_change=self._log_concurrency).start()
+            if controller.sampler_error:
+                logger.warning(f"⚠️ Host sampling unavailable ({controller.sampler_error}); "
+                               f"running a fixed {controller.limit} worker(s)")
+            if len(shards) == 1:
+                self.concurrency = controller
+                outcomes.update(self.run_shard(shards[0], known))
+            elif shards:
+                self.teardown_driver()
+                browser = self.shared_browser()
+                # Separate screenshot directories keep each worker's numbered files apart
+                testers = [LyvoLoginTester(dict(self.config, screenshot_dir=str(self.screenshot_dir / f"worker{i}")),
+                                           breakers=self.breakers, timeouts=self.timeouts, browser=browser)
+                           for i in range(len(shards))]
+                for tester in testers:
+                    tester.concurrency = controller
+                    tester.request_log = self.request_log
+                try:
+                    with ThreadPoolExecutor(max_workers=len(shards)) as pool:
+                        for shard_outcomes in pool.map(LyvoLoginTester.run_shard, testers, shards, [known] * len(shards)):
+                            outcomes.update(shard_outcomes)
+                finally:
+                    if browser:
+                        browser.close()
+            controller.stop()
+            self.concurrency = None
+            self.host_contention = controller.summary()
+            
+            if self.host_contention['throttled']:
+                # Durations from a saturated host would skew scheduling and the learned timeouts
+                logger.warning("⚠️ Host was saturated during this run; timings are unreliable and not recorded")
+            else:
+                for name, (status, seconds, _) in outcomes.items():
+                    if name in names and status not in (SKIPPED, SERVICE_DOWN):
+                        history.record(f"login_test::{name}", seconds)
+                history.save()
+                self.timeouts.save()
         except Exception as e:
             logger.error(f"❌ Test suite failed: {e}")
         finally:
+            self.breakers.stop_monitor()
+            if controller:
+                controller.stop()
             self.teardown_driver()
         
+        if self.request_log_settings['enabled']:
+            self.check_request_redundancy()
+        
+        for name in names:
+            status, _, reason = outcomes.get(name, (FAILED, 0.0, ''))
+            self.test_results[name] = status == PASSED
+            if status in (SKIPPED, SERVICE_DOWN):
+                self.skipped[name] = reason
+        
         # Print results
         self.print_results()
         return self.test_results
     
+    def check_request_redundancy(self):
+        """Summarise duplicate and polled API calls across the run and compare them with the budgets"""
+        settings = self.request_log_settings
+        self.network_redundancy = redundancy_summary(self.request_log, settings['window_ms'], settings['min_polls'])
+        self.redundancy_violations = redundancy_violations(
+            self.network_redundancy, dict(DEFAULT_REQUEST_LOG['budgets'], **settings.get('budgets', {})))
+        summary = self.network_redundancy
+        logger.info(f"🔁 {summary['duplicates']} of {summary['requests']} API calls were duplicates "
+                    f"({summary['wasted_kb']} KB wasted)")
+        for name, stats in list(summary['endpoints'].items())[:5]:
+            if stats['duplicates']:
+                logger.info(f"   {name}: {stats['duplicates']}/{stats['calls']} duplicates")
+        for violation in self.redundancy_violations:
+            logger.error(f"❌ Request budget exceeded: {violation}")
+    
     def print_results(self):
         """Print test results summary"""
         logger.info("\n📊 Test Results:")
         logger.info("=" * 50)
         
         for test_name, passed in self.test_results.items():
-            status = "✅ PASS" if passed else "❌ FAIL"
+            if test_name in self.skipped:
+                status = f"⏭️ SKIP ({self.skipped[test_name]})"
+            else:
+                status = "✅ PASS" if passed else "❌ FAIL"
             logger.info(f"{test_name.replace('_', ' ').title().ljust(20)}: {status}")
         
         passed_tests = sum(1 for passed in self.test_results.values() if passed)
@@ -504,6 +807,12 @@ class LyvoLoginTester:
             json.dump({
                 'timestamp': datetime.now().isoformat(),
                 'results': self.test_results,
+                'skipped': self.skipped,
+                'circuit_breakers': self.breakers.summary(),
+                'host_contention': self.host_contention,
+                'timings_reliable': not self.host_contention.get('throttled', False),
+                'network_redundancy': self.network_redundancy,
+                'redundancy_violations': self.redundancy_violations,
                 'summary': {
                     'passed': passed_tests,
                     'total': total_tests,
@@ -571,16 +880,26 @@ def main():
         # Load configuration
         config = load_config()
         
+        # Serve the production build when there is one
+        server = serve_dist(config)
+        
         # Create tester instance
         tester = LyvoLoginTester(config)
         
         # Run tests
-        results = tester.run_all_tests()
+        try:
+            results = tester.run_all_tests()
+        finally:
+            if server:
+                server.stop_background()
         
         # Exit with appropriate code
         passed_tests = sum(1 for passed in results.values() if passed)
         total_tests = len(results)
         
+        if tester.redundancy_violations:
+            logger.error(f"\n💥 {len(tester.redundancy_violations)} request budgets exceeded!")
+            sys.exit(1)
         if passed_tests == total_tests:
             logger.info("\n🏁 All tests passed!")
             sys.exit(0)
@@ -69,7 +69,8 @@ class LyvoLoginTester:
             chrome_options.add_argument('--allow-running-insecure-content')
             chrome_options.add_argument('--disable-extensions')
             chrome_options.add_argument('--disable-plugins')
-            chrome_options.add_argument('--disable-images')  # Faster loading
+            if self.config.get('browser_options', {}).get('disable_images', True):
+                chrome_options.add_argument('--blink-settings=imagesEnabled=false')  # Faster loading
             
             # Headless mode if configured
             if self.config.get('headless', False):
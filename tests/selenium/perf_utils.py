@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Lyvo Performance Utilities
+Shared statistics, budget checks and report writing for the performance harnesses
+"""
+
+import json
+import math
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+def percentile(values: Iterable[float], pct: float) -> float:
+    """Return the pct-th percentile (0-100) using linear interpolation"""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    if len(ordered) == 1:
+        return float(ordered[0])
+
+    rank = (pct / 100.0) * (len(ordered) - 1)
+    lower = math.floor(rank)
+    upper = math.ceil(rank)
+    if lower == upper:
+        return float(ordered[lower])
+    weight = rank - lower
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * weight
+
+
+def summarize(values: Iterable[float]) -> Dict[str, float]:
+    """Summarize a list of samples into count/min/mean/percentiles/max"""
+    samples = list(values)
+    if not samples:
+        return {'count': 0}
+
+    return {
+        'count': len(samples),
+        'min': round(min(samples), 2),
+        'mean': round(sum(samples) / len(samples), 2),
+        'p50': round(percentile(samples, 50), 2),
+        'p90': round(percentile(samples, 90), 2),
+        'p95': round(percentile(samples, 95), 2),
+        'p99': round(percentile(samples, 99), 2),
+        'max': round(max(samples), 2)
+    }
+
+
+def dropped_frames(deltas: Iterable[float], frame_ms: float = 1000 / 60) -> int:
+    """Frames missed at the display rate given measured frame-to-frame intervals"""
+    return sum(max(int(round(delta / frame_ms)) - 1, 0) for delta in deltas)
+
+
+def linear_fit(xs: Sequence[float], ys: Sequence[float]) -> Tuple[float, float]:
+    """Least-squares slope and intercept of ys over xs"""
+    n = len(xs)
+    if n == 0:
+        return 0.0, 0.0
+    mean_x = sum(xs) / n
+    mean_y = sum(ys) / n
+    spread = sum((x - mean_x) ** 2 for x in xs)
+    if spread == 0:
+        return 0.0, mean_y
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / spread
+    return slope, mean_y - slope * mean_x
+
+
+def bar_chart(rows: Sequence[Tuple[str, float]], width: int = 40, unit: str = 'ms') -> List[str]:
+    """Render labelled values as fixed-width text bars for log output"""
+    if not rows:
+        return []
+    peak = max(value for _, value in rows) or 1
+    label_width = max(len(label) for label, _ in rows)
+    lines = []
+    for label, value in rows:
+        bar = '#' * max(int(round(width * value / peak)), 1 if value > 0 else 0)
+        lines.append(f"{label.rjust(label_width)} | {bar.ljust(width)} {value:.1f} {unit}")
+    return lines
+
+
+def check_budgets(metrics: Dict[str, float], budgets: Dict[str, float]) -> List[str]:
+    """Return a human readable violation for every metric above its budget"""
+    violations = []
+    for name, limit in budgets.items():
+        value = metrics.get(name)
+        if value is None:
+            continue
+        if value > limit:
+            violations.append(f"{name} = {value} exceeds budget {limit}")
+    return violations
+
+
+def report_dir(config: Dict) -> Path:
+    """Directory where performance reports are written"""
+    path = Path(config.get('perf_report_dir', './test-reports/perf'))
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def save_report(config: Dict, name: str, payload: Dict, violations: Optional[List[str]] = None) -> Path:
+    """Write name.json, replacing the previous run's report, with the run's timestamp inside; return its path"""
+    report_file = report_dir(config) / f"{name}.json"
+    with open(report_file, 'w') as f:
+        json.dump({
+            'timestamp': datetime.now().isoformat(),
+            'name': name,
+            'results': payload,
+            'budget_violations': violations or []
+        }, f, indent=2)
+    return report_file
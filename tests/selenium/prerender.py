@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Lyvo Prerenderer
+Renders the public routes of the production build in headless Chrome and writes the rendered
+#root markup into dist/ as static pages, so their first paint does not wait for the bundle.
+The app mounts with createRoot, which replaces the snapshot once the bundle has run.
+index.html is never rewritten: it is the shell hosts fall back to for every other route.
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+
+from login_test import LyvoLoginTester, load_config, logger
+from static_server import HOME_PAGE, serve_dist
+
+DEFAULT_PRERENDER = {
+    'dist_dir': '../dist',
+    'routes': ['/', '/about', '/contact', '/login', '/signup'],
+    'workers': 3,
+    'settle_seconds': 0.5,
+    # The markup must come out identical this many times in a row before it is written
+    'stable_snapshots': 2,
+    'max_snapshots': 20,
+    # Third-party widgets inject iframes and per-session markup
+    'blocked_urls': ['*accounts.google.com*', '*checkout.razorpay.com*']
+}
+
+MANIFEST = 'prerender-manifest.json'
+ROOT_ELEMENT = '<div id="root"></div>'
+# Scripts inside #root would run twice, and iframes belong to third parties
+VOLATILE = re.compile(r'<(script|iframe)\b[^>]*>.*?</\1>', re.S | re.I)
+
+
+def route_file(route: str) -> str:
+    """dist/-relative file a route is written to: /login -> login/index.html, / -> home.html"""
+    route = route.strip('/')
+    return f"{route}/index.html" if route else HOME_PAGE
+
+
+def build_hash(shell: str, dist_dir: Path) -> str:
+    """Hash of the app shell and every bundled asset; any rebuild that changes the app changes it"""
+    digest = hashlib.sha256(shell.encode())
+    for path in sorted((dist_dir / 'assets').rglob('*')):
+        if path.is_file():
+            digest.update(path.relative_to(dist_dir).as_posix().encode())
+            digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def normalize_snapshot(markup: str) -> str:
+    """#root markup without the parts that differ between renders"""
+    return VOLATILE.sub('', markup).strip()
+
+
+def inject(shell: str, markup: str) -> str:
+    """The app shell with the rendered markup inside its empty #root"""
+    if ROOT_ELEMENT not in shell:
+        raise ValueError(f"App shell has no empty {ROOT_ELEMENT}")
+    return shell.replace(ROOT_ELEMENT, f'<div id="root">{markup}</div>', 1)
+
+
+class LyvoPrerenderer:
+    """Writes a static snapshot of each public route for the current build, skipping fresh ones"""
+
+    def __init__(self, config: Dict):
+        self.config = config
+        self.settings = dict(DEFAULT_PRERENDER, **config.get('prerender', {}))
+        self.dist_dir = Path(self.settings['dist_dir'])
+        self.manifest_path = self.dist_dir / MANIFEST
+
+    def shell(self) -> str:
+        """The unrendered index.html of the current build"""
+        return (self.dist_dir / 'index.html').read_text(encoding='utf-8')
+
+    def load_manifest(self) -> Dict:
+        if not self.manifest_path.exists():
+            return {'build': None, 'routes': {}}
+        with open(self.manifest_path) as f:
+            return json.load(f)
+
+    def stale_routes(self, build: str, manifest: Dict) -> List[str]:
+        """Routes without a snapshot of this build"""
+        if manifest['build'] != build:
+            return list(self.settings['routes'])
+        return [route for route in self.settings['routes']
+                if route not in manifest['routes'] or not (self.dist_dir / route_file(route)).exists()]
+
+    def snapshot(self, tester: LyvoLoginTester, route: str) -> str:
+        """#root markup once it has stopped changing"""
+        driver = tester.driver
+        driver.get(f"{self.config['base_url']}{route}")
+        tester.wait_until(f'prerender:{route}', EC.presence_of_element_located((By.CSS_SELECTOR, '#root > *')),
+                          ceiling=self.config['timeouts']['page_load'])
+        previous, repeats = None, 0
+        for _ in range(self.settings['max_snapshots']):
+            time.sleep(self.settings['settle_seconds'])
+            markup = normalize_snapshot(driver.execute_script("return document.getElementById('root').innerHTML;"))
+            repeats = repeats + 1 if markup == previous else 1
+            if repeats >= self.settings['stable_snapshots']:
+                return markup
+            previous = markup
+        raise TimeoutError(f"{route} kept changing over {self.settings['max_snapshots']} snapshots")
+
+    def render_routes(self, routes: List[str]) -> Dict[str, Optional[str]]:
+        """Snapshots for routes from one browser; None where rendering failed"""
+        tester = LyvoLoginTester(dict(self.config, headless=True, cold_profile=True))
+        snapshots: Dict[str, Optional[str]] = {route: None for route in routes}
+        if not tester.setup_driver():
+            return snapshots
+        try:
+            tester.driver.execute_cdp_cmd('Network.enable', {})
+            tester.driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': self.settings['blocked_urls']})
+            for route in routes:
+                try:
+                    snapshots[route] = self.snapshot(tester, route)
+                    logger.info(f"🖨️ Rendered {route} ({len(snapshots[route])} chars)")
+                except Exception as e:
+                    logger.error(f"❌ Prerendering {route} failed: {e}")
+        finally:
+            tester.teardown_driver()
+        return snapshots
+
+    def run(self, force: bool = False) -> List[str]:
+        """Prerender stale routes in parallel browsers and return the routes that failed"""
+        shell = self.shell()
+        build = build_hash(shell, self.dist_dir)
+        manifest = self.load_manifest()
+        if force or manifest['build'] != build:
+            manifest = {'build': build, 'routes': {}}
+        routes = self.stale_routes(build, manifest)
+        if not routes:
+            logger.info(f"✅ Prerendered pages are up to date for build {build}")
+            return []
+
+        # Serve the same dist/ this run writes to; serve_dist points base_url at it
+        self.config['static_server'] = dict(self.config.get('static_server', {}), dist_dir=str(self.dist_dir))
+        server = serve_dist(self.config)
+        if not server:
+            logger.error(f"❌ Could not serve {self.dist_dir}; run npm run build first")
+            return routes
+        try:
+            workers = max(1, min(self.settings['workers'], len(routes)))
+            shards = [routes[i::workers] for i in range(workers)]
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                snapshots = {}
+                for result in pool.map(self.render_routes, shards):
+                    snapshots.update(result)
+        finally:
+            server.stop_background()
+
+        failed = []
+        for route in routes:
+            if snapshots.get(route) is None:
+                failed.append(route)
+                continue
+            page = inject(shell, snapshots[route])
+            target = self.dist_dir / route_file(route)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_text(page, encoding='utf-8')
+            manifest['routes'][route] = hashlib.sha256(page.encode()).hexdigest()[:16]
+        with open(self.manifest_path, 'w') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        logger.info(f"📄 Prerendered {len(routes) - len(failed)}/{len(routes)} routes for build {build}")
+        return failed
+
+    def clean(self):
+        """Drop every snapshot, leaving the plain SPA build"""
+        manifest = self.load_manifest()
+        for route in manifest['routes']:
+            target = self.dist_dir / route_file(route)
+            target.unlink(missing_ok=True)
+            if target.parent != self.dist_dir and not any(target.parent.iterdir()):
+                target.parent.rmdir()
+        self.manifest_path.unlink(missing_ok=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Prerender the public routes of the Lyvo production build')
+    parser.add_argument('--route', action='append', help='Route to prerender (repeatable, default from config)')
+    parser.add_argument('--force', action='store_true', help='Render every route even if its snapshot is fresh')
+    parser.add_argument('--clean', action='store_true', help='Remove all snapshots')
+    args = parser.parse_args()
+
+    config = load_config()
+    settings = config.setdefault('prerender', {})
+    if args.route:
+        settings['routes'] = args.route
+
+    prerenderer = LyvoPrerenderer(config)
+    if args.clean:
+        prerenderer.clean()
+        return
+    failed = prerenderer.run(force=args.force)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Lyvo Profile Template
+A Chrome profile warmed once per build of dist/ (HTTP cache, V8 code cache, fonts) and cloned
+for every browser, so only tests that measure cold loads pay for the first bundle parse. The
+profile is warmed against the static server for that build, and only marked ready once the app
+has actually rendered on every route.
+"""
+
+import hashlib
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Optional, Sequence
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from static_server import DEFAULT_STATIC_SERVER, LyvoStaticServer, stale_reason
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PROFILE_TEMPLATE = {
+    'enabled': True,
+    'dist_dir': '../dist',
+    'template_root': './test-reports/profile-templates',
+    'routes': ['/login', '/', '/signup'],
+    # V8 only writes a script to the code cache once it has run it more than once
+    'visits': 2,
+    'settle_seconds': 1.0,
+    'clone': 'reflink',
+    'keep': 3,
+    'build_timeout': 120
+}
+
+READY_MARKER = '.lyvo-template-ready'
+# Present once React has rendered; Chrome's own error pages have a body but no #root
+APP_RENDERED = '#root > *'
+
+# Chrome's per-process lock files must never be shared between browsers
+NOT_CLONED = ('SingletonLock', 'SingletonSocket', 'SingletonCookie', 'lockfile')
+
+
+def dist_hash(dist_dir: Path) -> Optional[str]:
+    """Content hash of a production build, or None when it has not been built"""
+    if not (dist_dir / 'index.html').exists():
+        return None
+    digest = hashlib.sha256()
+    for path in sorted(p for p in dist_dir.rglob('*') if p.is_file()):
+        digest.update(path.relative_to(dist_dir).as_posix().encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def clone_profile(template: Path, destination: Path, mode: str = 'reflink'):
+    """Copy a template profile for one browser.
+
+    reflink shares blocks copy-on-write where the filesystem supports it and silently falls back
+    to a full copy elsewhere. hardlink shares the files themselves, so a browser writing into an
+    existing cache file changes the template too; it is for hosts where copies are too slow.
+    """
+    ignore = shutil.ignore_patterns(*NOT_CLONED)
+    if mode == 'reflink' and sys.platform.startswith('linux'):
+        destination.mkdir(parents=True, exist_ok=True)
+        subprocess.run(['cp', '-a', '--reflink=auto', f"{template}/.", str(destination)], check=True)
+        for name in NOT_CLONED:
+            (destination / name).unlink(missing_ok=True)
+    elif mode == 'hardlink':
+        shutil.copytree(template, destination, ignore=ignore, copy_function=os.link, dirs_exist_ok=True)
+    else:
+        shutil.copytree(template, destination, ignore=ignore, dirs_exist_ok=True)
+
+
+class ProfileTemplates:
+    """Warmed profiles under template_root, one per dist/ build hash"""
+
+    def __init__(self, config: Dict):
+        self.config = config
+        self.settings = dict(DEFAULT_PROFILE_TEMPLATE, **config.get('profile_template', {}))
+        self.static = dict(DEFAULT_STATIC_SERVER, **config.get('static_server', {}))
+        self.root = Path(self.settings['template_root'])
+        self.template: Optional[Path] = None
+        self.failed = False
+
+    def warm(self, profile_dir: Path, arguments: Sequence[str]):
+        """Visit the routes of the build in a throwaway browser using profile_dir so their caches are
+        written. The build is served on the static server's origin, which the tests will use too;
+        a route where the app does not render raises instead of warming an error page."""
+        url = f"http://{self.static['host']}:{self.static['port']}"
+        server = None
+        if self.config.get('base_url') != url:
+            server = LyvoStaticServer(Path(self.settings['dist_dir']), self.static['host'], self.static['port'],
+                                      self.static['keepalive_timeout'], cache_dir=Path(self.static['cache_dir']))
+            server.start_background()
+        options = Options()
+        for argument in arguments:
+            options.add_argument(argument)
+        options.add_argument('--headless')
+        options.add_argument(f'--user-data-dir={profile_dir}')
+        try:
+            driver = webdriver.Chrome(options=options)
+            try:
+                for _ in range(self.settings['visits']):
+                    for route in self.settings['routes']:
+                        driver.get(f"{url}{route}")
+                        WebDriverWait(driver, self.config['timeouts']['page_load']).until(
+                            EC.presence_of_element_located((By.CSS_SELECTOR, APP_RENDERED))
+                        )
+                        time.sleep(self.settings['settle_seconds'])
+            finally:
+                # quit() flushes the caches to disk
+                driver.quit()
+        finally:
+            if server:
+                server.stop_background()
+
+    def ensure(self, arguments: Sequence[str] = ()) -> Optional[Path]:
+        """The template for the current build, warming it first if no process has yet"""
+        if self.template or self.failed or not self.settings['enabled']:
+            return self.template
+        dist_dir = Path(self.settings['dist_dir'])
+        build = dist_hash(dist_dir)
+        # A stale build is not what the tests load, so warming it would cache the wrong bundle
+        if not build or stale_reason(dist_dir, Path(self.static['source_root'])):
+            return None
+
+        template = self.root / build
+        if not (template / READY_MARKER).exists():
+            self.root.mkdir(parents=True, exist_ok=True)
+            lock = self.root / f"{build}.lock"
+            if lock.exists() and time.time() - lock.stat().st_mtime > self.settings['build_timeout']:
+                # Left behind by a build that crashed
+                lock.rmdir()
+            try:
+                # mkdir is atomic: exactly one process (or xdist worker) builds, the others wait
+                lock.mkdir()
+            except FileExistsError:
+                deadline = time.monotonic() + self.settings['build_timeout']
+                while lock.exists() and time.monotonic() < deadline:
+                    time.sleep(0.5)
+            else:
+                try:
+                    shutil.rmtree(template, ignore_errors=True)
+                    self.warm(template, arguments)
+                    (template / READY_MARKER).touch()
+                    self.prune()
+                except Exception as e:
+                    logger.warning(f"⚠️ Could not warm a profile for build {build}: {e}")
+                    shutil.rmtree(template, ignore_errors=True)
+                finally:
+                    lock.rmdir()
+            if not (template / READY_MARKER).exists():
+                # Browsers start cold for the rest of this process instead of retrying every launch
+                self.failed = True
+                return None
+        self.template = template
+        return template
+
+    def prune(self):
+        """Drop the templates of old builds, keeping the newest few"""
+        templates = sorted((p for p in self.root.iterdir() if (p / READY_MARKER).exists()),
+                           key=lambda p: (p / READY_MARKER).stat().st_mtime, reverse=True)
+        for stale in templates[self.settings['keep']:]:
+            shutil.rmtree(stale, ignore_errors=True)
+
+    def clone(self, arguments: Sequence[str] = ()) -> Optional[Path]:
+        """A fresh copy of the warmed profile in a temporary directory, or None without a template"""
+        template = self.ensure(arguments)
+        if not template:
+            return None
+        destination = Path(tempfile.mkdtemp(prefix='lyvo-profile-'))
+        clone_profile(template, destination, self.settings['clone'])
+        return destination
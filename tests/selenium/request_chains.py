@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Lyvo Request Chains
+Rebuilds a page's network waterfall from DevTools Network events: which request started which,
+the chain of requests on the critical path to a milestone such as LCP, and API calls that ran
+one after another when nothing in the data says they had to.
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urlparse
+
+API_TYPES = ('XHR', 'Fetch')
+# Path segments that are record ids: Mongo ObjectIds, UUIDs, numbers, other digit-heavy tokens
+ID_SEGMENT = re.compile(r'^(?:[0-9a-f]{24}|[0-9a-f-]{36}|\d+|(?=[^/]*\d)[\w-]{8,})$', re.I)
+
+
+def url_label(url: str) -> str:
+    """Path of a request with ids replaced by :id, prefixed by the port for local services"""
+    parsed = urlparse(url)
+    path = '/'.join(':id' if ID_SEGMENT.match(part) else part for part in parsed.path.split('/'))
+    host = f":{parsed.port}" if parsed.hostname in ('localhost', '127.0.0.1') and parsed.port else parsed.hostname
+    return f"{host or ''}{path or '/'}"
+
+
+def initiator_url(initiator: Dict) -> Optional[str]:
+    """URL of the document, stylesheet or script that issued a request"""
+    if initiator.get('url'):
+        return initiator['url']
+    stack = initiator.get('stack')
+    while stack:
+        for frame in stack.get('callFrames', []):
+            if frame.get('url'):
+                return frame['url']
+        stack = stack.get('parent')
+    return None
+
+
+def collect_requests(events: Iterable[Dict]) -> List[Dict]:
+    """One record per request from Network.* events ({'method', 'params'}), in start order"""
+    requests: Dict[str, Dict] = {}
+    for event in events:
+        method, params = event.get('method', ''), event.get('params', {})
+        request = requests.get(params.get('requestId'))
+        if method == 'Network.requestWillBeSent':
+            if request:
+                # A redirect keeps the request id; the chain continues at the new URL
+                request['url'] = params['request']['url']
+                continue
+            requests[params['requestId']] = {
+                'id': params['requestId'],
+                'url': params['request']['url'],
+                'method': params['request'].get('method', 'GET'),
+                'type': params.get('type', 'Other'),
+                'start': params['timestamp'],
+                'end': None,
+                'status': None,
+                'bytes': 0,
+                'initiator': initiator_url(params.get('initiator', {})),
+                'failed': False
+            }
+        elif not request:
+            continue
+        elif method == 'Network.responseReceived':
+            request['status'] = params['response'].get('status')
+            request['type'] = params.get('type', request['type'])
+        elif method == 'Network.loadingFinished':
+            request['end'] = params['timestamp']
+            request['bytes'] = params.get('encodedDataLength', 0)
+        elif method == 'Network.loadingFailed':
+            request['end'] = params['timestamp']
+            request['failed'] = True
+    return sorted((r for r in requests.values() if r['end'] is not None), key=lambda r: r['start'])
+
+
+def build_waterfall(requests: List[Dict]) -> List[Dict]:
+    """Requests with ms offsets from the document request and the index of their initiating request"""
+    documents = [r for r in requests if r['type'] == 'Document']
+    origin = (documents[-1] if documents else requests[0])['start'] if requests else 0
+    # Only requests of the measured navigation; earlier ones belong to the previous page
+    page = [r for r in requests if r['start'] >= origin]
+    waterfall = []
+    for request in page:
+        parent = None
+        for index in range(len(waterfall) - 1, -1, -1):
+            if waterfall[index]['url'] == request['initiator']:
+                parent = index
+                break
+        waterfall.append(dict(
+            request,
+            label=url_label(request['url']),
+            start_ms=round((request['start'] - origin) * 1000, 1),
+            end_ms=round((request['end'] - origin) * 1000, 1),
+            parent=parent
+        ))
+    return waterfall
+
+
+def chain_to(waterfall: List[Dict], index: int) -> List[Dict]:
+    """The initiator chain from the document down to one request"""
+    chain = []
+    seen = set()
+    while index is not None and index not in seen:
+        seen.add(index)
+        chain.append(waterfall[index])
+        index = waterfall[index]['parent']
+    return list(reversed(chain))
+
+
+def critical_chain(waterfall: List[Dict], milestone_ms: Optional[float] = None) -> List[Dict]:
+    """Initiator chain of the last request to finish before the milestone (the whole load without one)"""
+    candidates = [i for i, r in enumerate(waterfall) if milestone_ms is None or r['end_ms'] <= milestone_ms]
+    if not candidates:
+        return []
+    return chain_to(waterfall, max(candidates, key=lambda i: waterfall[i]['end_ms']))
+
+
+def serial_chains(waterfall: List[Dict], max_gap_ms: float = 50) -> List[Dict]:
+    """API calls that each started right after the previous one finished, with what running them at once saves"""
+    api = [r for r in waterfall if r['type'] in API_TYPES and not r['failed']]
+    previous: Dict[int, Optional[int]] = {}
+    for i, request in enumerate(api):
+        before = [j for j, other in enumerate(api)
+                  if j != i and 0 <= request['start_ms'] - other['end_ms'] <= max_gap_ms]
+        previous[i] = max(before, key=lambda j: api[j]['end_ms']) if before else None
+
+    continued = {j for j in previous.values() if j is not None}
+    chains = []
+    for last in range(len(api)):
+        if last in continued or previous[last] is None:
+            continue
+        links = [last]
+        while previous[links[-1]] is not None and previous[links[-1]] not in links:
+            links.append(previous[links[-1]])
+        requests = [api[j] for j in reversed(links)]
+        serial = requests[-1]['end_ms'] - requests[0]['start_ms']
+        parallel = max(r['end_ms'] - r['start_ms'] for r in requests)
+        chains.append({
+            'requests': [f"{r['method']} {r['label']}" for r in requests],
+            'start_ms': requests[0]['start_ms'],
+            'serial_ms': round(serial, 1),
+            'parallel_ms': round(parallel, 1),
+            'saving_ms': round(serial - parallel, 1)
+        })
+    return sorted(chains, key=lambda c: c['saving_ms'], reverse=True)
+
+
+def format_waterfall(route: str, waterfall: List[Dict], chain: List[Dict], chains: List[Dict],
+                     lcp_ms: Optional[float]) -> List[str]:
+    """Compact text report of one page"""
+    lines = [f"{route}: {len(waterfall)} requests, LCP {lcp_ms if lcp_ms is not None else '?'} ms, "
+             f"load finished at {max((r['end_ms'] for r in waterfall), default=0)} ms"]
+    if chain:
+        lines.append(f"  critical chain ({chain[-1]['end_ms']} ms):")
+        for request in chain:
+            lines.append(f"    {request['start_ms']:>8.1f} -> {request['end_ms']:>8.1f}  "
+                         f"{request['type']:<10} {request['label']}")
+    for serial in chains:
+        lines.append(f"  serial: {' -> '.join(serial['requests'])}")
+        lines.append(f"          {serial['serial_ms']} ms one after another, {serial['parallel_ms']} ms at once")
+    return lines
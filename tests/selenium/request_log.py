@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Lyvo Request Log
+Records every fetch and XHR the app makes during a browser journey and finds the redundant
+ones: identical requests repeated within a short window, endpoints polled on a timer, and the
+response bytes those repeats cost.
+"""
+
+from typing import Dict, Iterable, List
+
+from perf_utils import check_budgets, percentile
+from request_chains import url_label
+
+DEFAULT_REQUEST_LOG = {
+    'enabled': True,
+    # An identical request (method, URL, body) this soon after the previous one is a duplicate
+    'window_ms': 2000,
+    # Calls to one endpoint before its call rate is reported as polling
+    'min_polls': 4,
+    # Over the whole run; any exceeded budget fails it
+    'budgets': {
+        'duplicates': 25,
+        'duplicate_percent': 30,
+        'wasted_kb': 250
+    }
+}
+
+# Runs before any page script. Entries go to sessionStorage so they survive navigations until
+# the runner drains them after each test; bodies are kept as a hash only. A call is logged when
+# it starts, so it belongs to the test that made it, and marked pending until its response has
+# been read; a response that arrives after the drain is dropped rather than credited to the next test.
+REQUEST_LOG_SCRIPT = """
+(function() {
+  const key = '__lyvoRequests';
+  let counter = 0;
+  function hash(body) {
+    if (body === undefined || body === null) return '';
+    const text = typeof body === 'string' ? body : (body instanceof FormData ? '[form-data]' : String(body));
+    let h = 5381;
+    for (let i = 0; i < text.length; i++) h = ((h << 5) + h + text.charCodeAt(i)) | 0;
+    return (h >>> 0).toString(16);
+  }
+  function record(entry) {
+    entry.id = performance.timeOrigin + ':' + (counter++);
+    entry.pending = true;
+    try {
+      const entries = JSON.parse(sessionStorage.getItem(key) || '[]');
+      if (entries.length < 5000) entries.push(entry);
+      sessionStorage.setItem(key, JSON.stringify(entries));
+    } catch (e) {}
+  }
+  function finish(entry, status, bytes) {
+    try {
+      const entries = JSON.parse(sessionStorage.getItem(key) || '[]');
+      const logged = entries.find(e => e.id === entry.id);
+      if (!logged) return;
+      Object.assign(logged, {status: status, bytes: bytes, pending: false});
+      sessionStorage.setItem(key, JSON.stringify(entries));
+    } catch (e) {}
+  }
+  function now() { return performance.timeOrigin + performance.now(); }
+  const originalFetch = window.fetch;
+  window.fetch = function(input, init) {
+    const request = typeof input === 'string' ? null : input;
+    const entry = {
+      method: ((init && init.method) || (request && request.method) || 'GET').toUpperCase(),
+      url: new URL(request ? request.url : String(input), location.href).href,
+      body: hash(init && init.body),
+      page: location.pathname,
+      time: now()
+    };
+    record(entry);
+    return originalFetch.apply(this, arguments).then(function(response) {
+      response.clone().arrayBuffer().then(
+        function(buffer) { finish(entry, response.status, buffer.byteLength); },
+        function() { finish(entry, response.status, 0); }
+      );
+      return response;
+    }, function(error) {
+      finish(entry, 0, 0);
+      throw error;
+    });
+  };
+  const originalOpen = XMLHttpRequest.prototype.open;
+  const originalSend = XMLHttpRequest.prototype.send;
+  XMLHttpRequest.prototype.open = function(method, url) {
+    this.__lyvoEntry = {method: String(method).toUpperCase(), url: new URL(url, location.href).href,
+                        page: location.pathname};
+    return originalOpen.apply(this, arguments);
+  };
+  XMLHttpRequest.prototype.send = function(body) {
+    const entry = this.__lyvoEntry;
+    if (entry) {
+      entry.body = hash(body);
+      entry.time = now();
+      record(entry);
+      this.addEventListener('loadend', () => {
+        const response = this.response;
+        finish(entry, this.status, typeof response === 'string' ? new Blob([response]).size
+          : (response && response.byteLength) || 0);
+      });
+    }
+    return originalSend.apply(this, arguments);
+  };
+})();
+"""
+
+DRAIN_REQUESTS_SCRIPT = """
+const entries = sessionStorage.getItem('__lyvoRequests');
+sessionStorage.removeItem('__lyvoRequests');
+return entries ? JSON.parse(entries) : [];
+"""
+
+
+def endpoint(request: Dict) -> str:
+    return f"{request['method']} {url_label(request['url'])}"
+
+
+def redundancy_summary(requests: Iterable[Dict], window_ms: float = 2000, min_polls: int = 4) -> Dict:
+    """Duplicates, wasted bytes and call rates per endpoint.
+
+    Requests are compared within the test (or journey) that made them, given as request['test'].
+    Requests still pending when their test ended count as calls but their bytes are unknown.
+    """
+    requests = sorted(requests, key=lambda r: r['time'])
+    last_seen: Dict[tuple, float] = {}
+    endpoints: Dict[str, Dict] = {}
+    by_test: Dict[str, Dict[str, int]] = {}
+    times: Dict[str, List[float]] = {}
+    for request in requests:
+        name = endpoint(request)
+        stats = endpoints.setdefault(name, {'calls': 0, 'duplicates': 0, 'wasted_bytes': 0})
+        test = by_test.setdefault(request.get('test', ''), {'requests': 0, 'duplicates': 0})
+        stats['calls'] += 1
+        test['requests'] += 1
+        times.setdefault(f"{request.get('test', '')}\0{name}", []).append(request['time'])
+
+        key = (request.get('test', ''), request['method'], request['url'], request.get('body', ''))
+        previous = last_seen.get(key)
+        if previous is not None and request['time'] - previous <= window_ms:
+            stats['duplicates'] += 1
+            stats['wasted_bytes'] += request.get('bytes') or 0
+            test['duplicates'] += 1
+        last_seen[key] = request['time']
+
+    # Call rates are measured per test so the gaps between tests do not count as intervals
+    intervals: Dict[str, List[float]] = {}
+    for test_endpoint, stamps in times.items():
+        name = test_endpoint.split('\0', 1)[1]
+        intervals.setdefault(name, []).extend(b - a for a, b in zip(stamps, stamps[1:]))
+    report = {}
+    for name, stats in sorted(endpoints.items(), key=lambda item: (-item[1]['duplicates'], -item[1]['calls'])):
+        gaps = intervals.get(name, [])
+        entry = {
+            'calls': stats['calls'],
+            'duplicates': stats['duplicates'],
+            'wasted_kb': round(stats['wasted_bytes'] / 1024, 1)
+        }
+        if len(gaps) + 1 >= min_polls:
+            median = percentile(gaps, 50)
+            entry['median_interval_ms'] = round(median, 1)
+            entry['per_minute'] = round(60000 / median, 1) if median else None
+        report[name] = entry
+
+    total = sum(e['calls'] for e in endpoints.values())
+    duplicates = sum(e['duplicates'] for e in endpoints.values())
+    return {
+        'requests': total,
+        'duplicates': duplicates,
+        'duplicate_percent': round(100 * duplicates / total, 1) if total else 0.0,
+        'wasted_kb': round(sum(e['wasted_bytes'] for e in endpoints.values()) / 1024, 1),
+        'unfinished': sum(1 for request in requests if request.get('pending')),
+        'endpoints': report,
+        'by_test': by_test
+    }
+
+
+def redundancy_violations(summary: Dict, budgets: Dict[str, float]) -> List[str]:
+    """Run-wide totals above their budgets"""
+    return check_budgets({name: summary.get(name) for name in budgets}, budgets)
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Lyvo Source Maps
+Decodes the source maps of the production build and attributes covered and uncovered
+bytes of a bundle back to the src/ modules (and node_modules packages) they came from.
+"""
+
+import json
+import re
+from itertools import accumulate
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+BASE64 = {c: i for i, c in enumerate('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/')}
+PACKAGE = re.compile(r'node_modules/((?:@[^/]+/)?[^/]+)')
+ASTRAL = re.compile('[\U00010000-\U0010FFFF]')
+
+# (generated line, generated column, source index or None)
+Segment = Tuple[int, int, Optional[int]]
+
+
+def decode_vlq(segment: str) -> List[int]:
+    """The signed integers of one base64 VLQ mapping segment"""
+    values = []
+    value = shift = 0
+    for char in segment:
+        digit = BASE64[char]
+        value += (digit & 31) << shift
+        if digit & 32:
+            shift += 5
+            continue
+        values.append(-(value >> 1) if value & 1 else value >> 1)
+        value = shift = 0
+    return values
+
+
+def module_name(source: str) -> str:
+    """src/ path of an app module, or node_modules/<package> for a dependency"""
+    package = PACKAGE.search(source)
+    if package:
+        return f"node_modules/{package.group(1)}"
+    source = source.replace('\\', '/')
+    index = source.find('src/')
+    return source[index:] if index >= 0 else source.lstrip('./')
+
+
+def utf16_text(text: str) -> str:
+    """text padded so len() and indices count UTF-16 code units, as DevTools offsets and source maps do"""
+    return ASTRAL.sub('\0\0', text)
+
+
+def line_offsets(text: str) -> List[int]:
+    """Offset of the first character of every line"""
+    offsets = [0]
+    index = text.find('\n')
+    while index >= 0:
+        offsets.append(index + 1)
+        index = text.find('\n', index + 1)
+    return offsets
+
+
+class SourceMap:
+    """The generated positions of a v3 source map and the module each one came from"""
+
+    def __init__(self, data: Dict):
+        root = data.get('sourceRoot') or ''
+        self.sources = [module_name(root + source) for source in data.get('sources', [])]
+        self.segments: List[Segment] = []
+        source = 0
+        for line, encoded in enumerate(data.get('mappings', '').split(';')):
+            column = 0
+            for part in filter(None, encoded.split(',')):
+                fields = decode_vlq(part)
+                column += fields[0]
+                if len(fields) >= 4:
+                    source += fields[1]
+                    self.segments.append((line, column, source))
+                else:
+                    # A generated position that maps to no source (e.g. bundler glue)
+                    self.segments.append((line, column, None))
+
+    @classmethod
+    def load(cls, path: Path) -> Optional['SourceMap']:
+        """The map at path, or None when the build was made without source maps"""
+        if not path.exists():
+            return None
+        with open(path) as f:
+            return cls(json.load(f))
+
+    def spans(self, text: str) -> Iterator[Tuple[int, int, Optional[str]]]:
+        """(start, end, module) character ranges of text, in order and covering all of it"""
+        starts = line_offsets(text)
+        positions = [(min(starts[line] + column, len(text)), source)
+                     for line, column, source in self.segments if line < len(starts)]
+        if not positions or positions[0][0] > 0:
+            positions.insert(0, (0, None))
+        for (start, source), (end, _) in zip(positions, positions[1:] + [(len(text), None)]):
+            if end > start:
+                yield start, end, self.sources[source] if source is not None else None
+
+
+def js_used_mask(length: int, functions: Iterable[Dict]) -> bytearray:
+    """Executed characters from Profiler.takePreciseCoverage function ranges.
+
+    Block ranges nest inside their function's range, so applying them widest first
+    lets a block with count 0 mark the part of a called function that never ran.
+    """
+    ranges = sorted(((r['startOffset'], r['endOffset'], r['count']) for f in functions for r in f['ranges']),
+                    key=lambda r: (r[0], -r[1]))
+    mask = bytearray(length)
+    for start, end, count in ranges:
+        end = min(end, length)
+        mask[start:end] = (b'\x01' if count else b'\x00') * (end - start)
+    return mask
+
+
+def css_used_mask(length: int, rules: Iterable[Dict]) -> bytearray:
+    """Characters of the stylesheet in rules CSS.stopRuleUsageTracking reported as used"""
+    mask = bytearray(length)
+    for rule in rules:
+        if rule['used']:
+            start, end = rule['startOffset'], min(rule['endOffset'], length)
+            mask[start:end] = b'\x01' * (end - start)
+    return mask
+
+
+def attribute(mask: Sequence[int], spans: Iterable[Tuple[int, int, Optional[str]]],
+              unmapped: str = '(unmapped)') -> Dict[str, Dict[str, int]]:
+    """Total and used characters per module"""
+    used = list(accumulate(mask, initial=0))
+    modules: Dict[str, Dict[str, int]] = {}
+    for start, end, module in spans:
+        totals = modules.setdefault(module or unmapped, {'total': 0, 'used': 0})
+        totals['total'] += end - start
+        totals['used'] += used[end] - used[start]
+    return modules
+
+
+def coverage_summary(modules: Dict[str, Dict[str, int]]) -> Dict:
+    """Used and unused KB of a file, with the modules that never ran and the largest unused ones"""
+    total = sum(m['total'] for m in modules.values())
+    used = sum(m['used'] for m in modules.values())
+    ranked = sorted(modules.items(), key=lambda item: item[1]['total'] - item[1]['used'], reverse=True)
+    return {
+        'total_kb': round(total / 1024, 1),
+        'used_kb': round(used / 1024, 1),
+        'unused_kb': round((total - used) / 1024, 1),
+        'unused_percent': round(100 * (total - used) / total, 1) if total else 0.0,
+        'never_executed': [name for name, m in ranked if m['total'] and not m['used']],
+        'modules': {
+            name: {'kb': round(m['total'] / 1024, 1), 'unused_kb': round((m['total'] - m['used']) / 1024, 1)}
+            for name, m in ranked
+        }
+    }
+
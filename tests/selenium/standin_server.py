@@ -0,0 +1,632 @@
+#!/usr/bin/env python3
+"""
+Lyvo Local Service Stand-in
+In-memory replacement for the Lyvo backend services used by the performance harnesses.
+Each service listens on its usual port so the frontend can talk to it unchanged.
+"""
+
+import argparse
+import asyncio
+import itertools
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+import socketio
+from aiohttp import web
+from socketio.exceptions import ConnectionRefusedError as SocketConnectionRefused
+
+from admin_fixtures import generate_admin_properties, generate_users
+from llm_fixtures import DEFAULT_LLM, PROBE_PROMPT, fault_status, gemini_chunks, prompt_text, reply_tokens
+from location_fixtures import generate_properties, reverse_place, search_places
+
+logger = logging.getLogger(__name__)
+
+# Request bodies the user service accepts, enough for the largest synthetic photo
+UPLOAD_MAX_BYTES = 64 * 1024 * 1024
+
+# Tokens issued by the stand-in look like "standin-token-<userId>"
+TOKEN_PREFIX = 'standin-token-'
+
+# The frontend's role codes
+ROLES = {'seeker': 1, 'admin': 2, 'owner': 3}
+
+DEFAULT_PORTS = {
+    'property': 3002,
+    'chat': 3004,
+    'geocoder': 3090,
+    'llm': 3095,
+    'user': 4002
+}
+
+
+def make_token(user_id: str) -> str:
+    """Build a stand-in auth token for a user id"""
+    return f"{TOKEN_PREFIX}{user_id}"
+
+
+def user_from_token(token: Optional[str]) -> Optional[str]:
+    """Extract the user id from a stand-in auth token"""
+    if not token:
+        return None
+    if token.startswith('Bearer '):
+        token = token[len('Bearer '):]
+    if token.startswith(TOKEN_PREFIX):
+        return token[len(TOKEN_PREFIX):]
+    return token
+
+
+def standin_user(role: str, tag: str, **fields) -> Dict:
+    """A test user of role ('seeker', 'owner' or 'admin') with id <role>-<tag>, as seed_session stores it"""
+    user_id = f"{role}-{tag}"
+    user = {'_id': user_id, 'id': user_id, 'email': f"{role}@test.com", 'name': f"Test {role.title()}",
+            'role': ROLES[role]}
+    return dict(user, **fields)
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class StandinStore:
+    """In-memory data shared by every stand-in service"""
+
+    def __init__(self):
+        self.chats: Dict[str, Dict] = {}
+        self.messages: Dict[str, List[Dict]] = {}
+        self.properties: List[Dict] = []
+        self.admin_properties: List[Dict] = []
+        self.users: List[Dict] = []
+        self.bookings: List[Dict] = []
+        self.favorites: List[Dict] = []
+        # Behaviour of the stand-in LLM, and every request it received
+        self.llm: Dict = dict(DEFAULT_LLM)
+        self.llm_requests: List[Dict] = []
+        # Every image upload the user service received, and the stored files by id
+        self.uploads: List[Dict] = []
+        self.uploaded_files: Dict[str, bytes] = {}
+        self._ids = itertools.count(1)
+
+    def next_id(self, prefix: str) -> str:
+        return f"{prefix}{next(self._ids):06d}"
+
+    def create_chat(self, seeker_id: str, owner_id: str, owner_name: str = 'Test Owner',
+                    property_name: str = 'Test Property') -> Dict:
+        """Create a chat between a seeker and an owner"""
+        chat_id = self.next_id('chat')
+        chat = {
+            'chatId': chat_id,
+            'bookingId': self.next_id('booking'),
+            'seekerId': seeker_id,
+            'ownerId': owner_id,
+            'participants': [seeker_id, owner_id],
+            'ownerName': owner_name,
+            'propertyDetails': {'name': property_name, 'address': 'Test City'},
+            'status': 'active',
+            'createdAt': _now_iso()
+        }
+        self.chats[chat_id] = chat
+        self.messages[chat_id] = []
+        return chat
+
+    def add_message(self, chat_id: str, sender_id: str, content: str,
+                    content_type: str = 'text', metadata: Optional[Dict] = None) -> Dict:
+        """Append a message to a chat and return it in the chat service format"""
+        message = {
+            'messageId': self.next_id('msg'),
+            'chatId': chat_id,
+            'senderId': sender_id,
+            'content': content,
+            'contentType': content_type,
+            'metadata': metadata or {},
+            'readBy': [],
+            'createdAt': _now_iso()
+        }
+        self.messages.setdefault(chat_id, []).append(message)
+        return message
+
+    def chats_for_user(self, user_id: str) -> List[Dict]:
+        """Chats a user participates in, shaped like GET /api/chat/user/:id"""
+        chats = []
+        for chat in self.chats.values():
+            if user_id not in chat['participants']:
+                continue
+            other_id = chat['ownerId'] if user_id == chat['seekerId'] else chat['seekerId']
+            history = self.messages.get(chat['chatId'], [])
+            chats.append({
+                'chatId': chat['chatId'],
+                'bookingId': chat['bookingId'],
+                'otherParticipantId': other_id,
+                'otherParticipant': {
+                    'id': other_id,
+                    'name': chat['ownerName'] if other_id == chat['ownerId'] else 'Test Seeker'
+                },
+                'propertyDetails': chat['propertyDetails'],
+                'lastMessage': history[-1] if history else None,
+                'unreadCount': 0,
+                'status': chat['status']
+            })
+        return chats
+
+
+class LyvoStandin:
+    """Runs the stand-in services on their configured ports"""
+
+    def __init__(self, store: Optional[StandinStore] = None, host: str = '127.0.0.1',
+                 ports: Optional[Dict[str, int]] = None, latency_ms: float = 0.0):
+        self.store = store or StandinStore()
+        self.host = host
+        self.ports = dict(DEFAULT_PORTS, **(ports or {}))
+        self.latency_ms = latency_ms
+        self.sio = socketio.AsyncServer(async_mode='aiohttp', cors_allowed_origins='*')
+        self._runners: List[web.AppRunner] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._register_chat_events()
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    async def _simulate_latency(self):
+        if self.latency_ms:
+            await asyncio.sleep(self.latency_ms / 1000.0)
+
+    @staticmethod
+    def _ok(data) -> web.Response:
+        return web.json_response({'success': True, 'data': data})
+
+    @staticmethod
+    @web.middleware
+    async def _cors(request: web.Request, handler):
+        if request.method == 'OPTIONS':
+            response = web.Response()
+        else:
+            response = await handler(request)
+        response.headers['Access-Control-Allow-Origin'] = '*'
+        response.headers['Access-Control-Allow-Headers'] = 'Authorization, Content-Type'
+        response.headers['Access-Control-Allow-Methods'] = 'GET, POST, PUT, PATCH, DELETE, OPTIONS'
+        # Lets the browser's Resource Timing report the response phases of cross-origin calls
+        response.headers['Timing-Allow-Origin'] = '*'
+        return response
+
+    async def _health(self, request: web.Request) -> web.Response:
+        return web.json_response({'status': 'ok', 'service': 'lyvo-standin'})
+
+    # ------------------------------------------------------------------
+    # Chat service (socket.io + REST)
+    # ------------------------------------------------------------------
+
+    def _register_chat_events(self):
+        sio = self.sio
+
+        @sio.event
+        async def connect(sid, environ, auth):
+            user_id = user_from_token((auth or {}).get('token'))
+            if not user_id:
+                raise SocketConnectionRefused('authentication failed')
+            await sio.save_session(sid, {'user_id': user_id})
+
+        @sio.on('join_chat')
+        async def join_chat(sid, data):
+            chat_id = (data or {}).get('chatId')
+            if chat_id not in self.store.chats:
+                await sio.emit('error', {'message': 'Chat not found'}, to=sid)
+                return
+            await sio.enter_room(sid, chat_id)
+            await sio.emit('chat_joined', {'chatId': chat_id}, to=sid)
+
+        @sio.on('leave_chat')
+        async def leave_chat(sid, data):
+            await sio.leave_room(sid, (data or {}).get('chatId'))
+
+        @sio.on('send_message')
+        async def send_message(sid, data):
+            session = await sio.get_session(sid)
+            chat_id = data.get('chatId')
+            if chat_id not in self.store.chats:
+                await sio.emit('error', {'message': 'Chat not found'}, to=sid)
+                return
+            await self._simulate_latency()
+            message = self.store.add_message(
+                chat_id, session['user_id'], data.get('content', ''),
+                data.get('contentType', 'text'), data.get('metadata')
+            )
+            await sio.emit('receive_message', message, room=chat_id)
+
+        @sio.on('typing')
+        async def typing(sid, data):
+            session = await sio.get_session(sid)
+            await sio.emit('user_typing', {
+                'chatId': data.get('chatId'),
+                'userId': session['user_id'],
+                'isTyping': data.get('isTyping', False)
+            }, room=data.get('chatId'), skip_sid=sid)
+
+        @sio.on('mark_read')
+        async def mark_read(sid, data):
+            session = await sio.get_session(sid)
+            await sio.emit('messages_read', {
+                'chatId': data.get('chatId'),
+                'messageIds': data.get('messageIds', []),
+                'readBy': session['user_id']
+            }, room=data.get('chatId'))
+
+    def build_chat_app(self) -> web.Application:
+        """aiohttp application mirroring the chat service on port 3004"""
+        app = web.Application(middlewares=[self._cors])
+        self.sio.attach(app)
+
+        async def user_chats(request: web.Request) -> web.Response:
+            await self._simulate_latency()
+            return self._ok({'chats': self.store.chats_for_user(request.match_info['user_id'])})
+
+        async def chat_messages(request: web.Request) -> web.Response:
+            await self._simulate_latency()
+            page = int(request.query.get('page', 1))
+            limit = int(request.query.get('limit', 50))
+            history = self.store.messages.get(request.match_info['chat_id'], [])
+            start = max(len(history) - page * limit, 0)
+            end = len(history) - (page - 1) * limit
+            return self._ok({'messages': history[start:max(end, 0)]})
+
+        async def chat_details(request: web.Request) -> web.Response:
+            chat = self.store.chats.get(request.match_info['chat_id'])
+            if not chat:
+                return web.json_response({'success': False, 'message': 'Chat not found'}, status=404)
+            return self._ok(chat)
+
+        async def post_message(request: web.Request) -> web.Response:
+            chat_id = request.match_info['chat_id']
+            if chat_id not in self.store.chats:
+                return web.json_response({'success': False, 'message': 'Chat not found'}, status=404)
+            body = await request.json()
+            sender = user_from_token(request.headers.get('Authorization')) or 'anonymous'
+            message = self.store.add_message(chat_id, sender, body.get('content', ''),
+                                             body.get('contentType', 'text'), body.get('metadata'))
+            await self.sio.emit('receive_message', message, room=chat_id)
+            return self._ok(message)
+
+        async def mark_read(request: web.Request) -> web.Response:
+            return web.json_response({'success': True})
+
+        app.router.add_get('/api/health', self._health)
+        app.router.add_get('/api/chat/user/{user_id}', user_chats)
+        app.router.add_get('/api/chat/{chat_id}/messages', chat_messages)
+        app.router.add_get('/api/chat/{chat_id}', chat_details)
+        app.router.add_post('/api/chat/{chat_id}/message', post_message)
+        app.router.add_post('/api/chat/{chat_id}/read', mark_read)
+        return app
+
+    # ------------------------------------------------------------------
+    # Property service
+    # ------------------------------------------------------------------
+
+    def build_property_app(self) -> web.Application:
+        """aiohttp application mirroring the property service on port 3002"""
+        app = web.Application(middlewares=[self._cors])
+
+        async def public_properties(request: web.Request) -> web.Response:
+            await self._simulate_latency()
+            return web.json_response({'success': True, 'properties': self.store.properties})
+
+        async def user_bookings(request: web.Request) -> web.Response:
+            await self._simulate_latency()
+            user_id = request.query.get('userId')
+            bookings = [b for b in self.store.bookings if b.get('userId') == user_id]
+            return web.json_response({'success': True, 'bookings': bookings})
+
+        async def user_favorites(request: web.Request) -> web.Response:
+            await self._simulate_latency()
+            user_id = request.query.get('userId')
+            favorites = [f for f in self.store.favorites if f.get('userId') == user_id]
+            return web.json_response({'success': True, 'favorites': favorites})
+
+        app.router.add_get('/api/health', self._health)
+        app.router.add_get('/api/public/properties', public_properties)
+        app.router.add_get('/api/bookings/user', user_bookings)
+
+        async def admin_properties(request: web.Request) -> web.Response:
+            await self._simulate_latency()
+            page = max(int(request.query.get('page', 1)), 1)
+            limit = int(request.query.get('limit', 20))
+            start = (page - 1) * limit
+            return web.json_response({
+                'success': True,
+                'data': self.store.admin_properties[start:start + limit],
+                'pagination': {'page': page, 'limit': limit, 'total': len(self.store.admin_properties)}
+            })
+
+        async def owner_bookings(request: web.Request) -> web.Response:
+            await self._simulate_latency()
+            owner_id = user_from_token(request.headers.get('Authorization'))
+            bookings = [b for b in self.store.bookings if b.get('ownerId') == owner_id]
+            return web.json_response({'success': True, 'bookings': bookings})
+
+        async def notifications(request: web.Request) -> web.Response:
+            return web.json_response({'success': True, 'data': []})
+
+        app.router.add_get('/api/favorites/user', user_favorites)
+        app.router.add_get('/api/admin/properties', admin_properties)
+        app.router.add_get('/api/owner/bookings', owner_bookings)
+        app.router.add_get('/api/notifications', notifications)
+        return app
+
+    # ------------------------------------------------------------------
+    # User service
+    # ------------------------------------------------------------------
+
+    def build_user_app(self) -> web.Application:
+        """aiohttp application mirroring the user service on port 4002"""
+        # Large enough for a phone photo the client forgot to reject
+        app = web.Application(middlewares=[self._cors], client_max_size=UPLOAD_MAX_BYTES)
+
+        async def all_users(request: web.Request) -> web.Response:
+            await self._simulate_latency()
+            return web.json_response({'success': True, 'users': self.store.users})
+
+        async def users(request: web.Request) -> web.Response:
+            await self._simulate_latency()
+            return web.json_response({'success': True, 'data': self.store.users})
+
+        async def public_user(request: web.Request) -> web.Response:
+            await self._simulate_latency()
+            user_id = request.match_info['user_id']
+            for user in self.store.users:
+                if user['_id'] == user_id:
+                    return web.json_response(user)
+            return web.json_response({'message': 'User not found'}, status=404)
+
+        async def profile(request: web.Request) -> web.Response:
+            await self._simulate_latency()
+            user_id = request.match_info['user_id']
+            user = next((u for u in self.store.users if u['_id'] == user_id), None)
+            return web.json_response(user or {'_id': user_id, 'role': 1, 'kycStatus': 'not_verified'})
+
+        async def aadhar_status(request: web.Request) -> web.Response:
+            await self._simulate_latency()
+            return web.json_response({'success': True, 'aadharStatus': 'not_uploaded'})
+
+        async def receive_upload(request: web.Request, field: str) -> Optional[Dict]:
+            """Read a multipart image upload, log it and keep the file; None if the field is missing"""
+            started = time.monotonic()
+            form = await request.post()
+            received = time.monotonic()
+            upload = form.get(field)
+            if not isinstance(upload, web.FileField):
+                return None
+            content = upload.file.read()
+            file_id = self.store.next_id('upload')
+            self.store.uploaded_files[file_id] = content
+            entry = {
+                'id': file_id,
+                'path': request.path,
+                'user': user_from_token(request.headers.get('Authorization')),
+                'bytes': len(content),
+                'request_bytes': request.content_length,
+                'content_type': upload.content_type,
+                'receive_ms': round((received - started) * 1000, 1),
+                'time': started
+            }
+            self.store.uploads.append(entry)
+            await self._simulate_latency()
+            return entry
+
+        async def upload_profile_picture(request: web.Request) -> web.Response:
+            entry = await receive_upload(request, 'profilePicture')
+            if not entry:
+                return web.json_response({'message': 'No image provided'}, status=400)
+            url = f"http://{self.host}:{self.ports['user']}/api/user/uploads/{entry['id']}"
+            return web.json_response({
+                'message': 'Profile picture updated successfully',
+                'user': {'_id': entry['user'], 'profilePicture': url}
+            })
+
+        async def upload_kyc(request: web.Request) -> web.Response:
+            entry = await receive_upload(request, 'frontImage')
+            if not entry:
+                return web.json_response({'error': 'Front image is required'}, status=400)
+            return web.json_response({
+                'success': True,
+                'kycStatus': 'pending',
+                'ocrResult': {
+                    'extractedData': {'name': 'Test Seeker', 'number': 'XXXX XXXX 1234', 'gender': 'Female'},
+                    'validation': {'is_aadhar_card': True, 'has_aadhar_keywords': True, 'has_aadhar_number': True},
+                    'confidence': 88,
+                    'verified': False,
+                    'rawText': ''
+                }
+            })
+
+        async def uploaded_file(request: web.Request) -> web.Response:
+            file_id = request.match_info['file_id']
+            entry = next((u for u in self.store.uploads if u['id'] == file_id), None)
+            if entry is None:
+                return web.json_response({'message': 'File not found'}, status=404)
+            return web.Response(body=self.store.uploaded_files[file_id], content_type=entry['content_type'])
+
+        app.router.add_get('/api/health', self._health)
+        app.router.add_get('/api/user/all', all_users)
+        app.router.add_get('/api/user/users', users)
+        app.router.add_get('/api/user/public/user/{user_id}', public_user)
+        app.router.add_get('/api/user/profile/{user_id}', profile)
+        app.router.add_get('/api/user/aadhar-status', aadhar_status)
+        app.router.add_post('/api/user/upload-profile-picture', upload_profile_picture)
+        app.router.add_post('/api/user/upload-kyc', upload_kyc)
+        app.router.add_get('/api/user/uploads/{file_id}', uploaded_file)
+        return app
+
+    # ------------------------------------------------------------------
+    # LLM (Gemini generateContent, backed by llm_fixtures)
+    # ------------------------------------------------------------------
+
+    def build_llm_app(self) -> web.Application:
+        """Gemini-compatible generateContent that streams its reply token by token"""
+        app = web.Application(middlewares=[self._cors])
+
+        async def generate(request: web.Request) -> web.StreamResponse:
+            settings = self.store.llm
+            try:
+                body = await request.json()
+            except ValueError:
+                body = {}
+            entry = {
+                'time': time.monotonic(),
+                'kind': 'probe' if prompt_text(body) == PROBE_PROMPT else 'query',
+                'status': 200
+            }
+            self.store.llm_requests.append(entry)
+            status = fault_status(settings, len(self.store.llm_requests))
+            if status:
+                entry['status'] = status
+                error = {'code': status, 'message': 'Resource has been exhausted', 'status': 'RESOURCE_EXHAUSTED'}
+                return web.json_response(
+                    {'error': error}, status=status, headers={'Retry-After': str(settings['retry_after_seconds'])})
+
+            response = web.StreamResponse(headers={'Content-Type': 'application/json; charset=UTF-8'})
+            await response.prepare(request)
+            await asyncio.sleep(settings['ttft_ms'] / 1000.0)
+            interval = 1.0 / settings['tokens_per_second'] if settings['tokens_per_second'] else 0
+            for index, chunk in enumerate(gemini_chunks(reply_tokens())):
+                if index and interval:
+                    await asyncio.sleep(interval)
+                await response.write(chunk)
+            await response.write_eof()
+            return response
+
+        app.router.add_get('/api/health', self._health)
+        app.router.add_post('/v1beta/models/{model}:generateContent', generate)
+        return app
+
+    # ------------------------------------------------------------------
+    # Geocoder (Nominatim-compatible, backed by location_fixtures)
+    # ------------------------------------------------------------------
+
+    def build_geocoder_app(self) -> web.Application:
+        """Nominatim-compatible search/reverse endpoints with deterministic results"""
+        app = web.Application(middlewares=[self._cors])
+
+        async def search(request: web.Request) -> web.Response:
+            await self._simulate_latency()
+            limit = int(request.query.get('limit', 5))
+            return web.json_response(search_places(request.query.get('q', ''), limit))
+
+        async def reverse(request: web.Request) -> web.Response:
+            await self._simulate_latency()
+            try:
+                lat = float(request.query['lat'])
+                lng = float(request.query['lon'])
+            except (KeyError, ValueError):
+                return web.json_response({'error': 'Unable to geocode'}, status=400)
+            return web.json_response(reverse_place(lat, lng) or {'error': 'Unable to geocode'})
+
+        app.router.add_get('/search', search)
+        app.router.add_get('/reverse', reverse)
+        return app
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def build_apps(self) -> Dict[str, web.Application]:
+        """One aiohttp application per stand-in service"""
+        return {
+            'property': self.build_property_app(),
+            'chat': self.build_chat_app(),
+            'geocoder': self.build_geocoder_app(),
+            'llm': self.build_llm_app(),
+            'user': self.build_user_app()
+        }
+
+    async def start(self, services: Optional[List[str]] = None):
+        """Start the requested services (all by default) on the current loop"""
+        for name, app in self.build_apps().items():
+            if services and name not in services:
+                continue
+            runner = web.AppRunner(app, access_log=None)
+            await runner.setup()
+            site = web.TCPSite(runner, self.host, self.ports[name])
+            await site.start()
+            self._runners.append(runner)
+            logger.info(f"🧩 Stand-in {name} service listening on http://{self.host}:{self.ports[name]}")
+
+    async def stop(self):
+        """Stop every running service"""
+        for runner in self._runners:
+            await runner.cleanup()
+        self._runners = []
+
+    def start_background(self, services: Optional[List[str]] = None, timeout: float = 10.0):
+        """Run the stand-in on a daemon thread so synchronous Selenium code can use it"""
+        ready = threading.Event()
+        errors: List[BaseException] = []
+
+        def run():
+            self._loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self._loop)
+            try:
+                self._loop.run_until_complete(self.start(services))
+            except BaseException as e:
+                errors.append(e)
+                ready.set()
+                return
+            ready.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=run, name='lyvo-standin', daemon=True)
+        self._thread.start()
+        ready.wait(timeout)
+        if errors:
+            raise errors[0]
+
+    def stop_background(self):
+        """Stop a stand-in started with start_background()"""
+        if not self._loop:
+            return
+        future = asyncio.run_coroutine_threadsafe(self.stop(), self._loop)
+        future.result(timeout=10)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        if self._thread:
+            self._thread.join(timeout=10)
+        self._loop = None
+        self._thread = None
+
+
+def main():
+    """Run the stand-in services until interrupted"""
+    parser = argparse.ArgumentParser(description='Run the Lyvo local service stand-in')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--service', action='append', choices=sorted(DEFAULT_PORTS),
+                        help='Service to start (repeatable, default: all)')
+    parser.add_argument('--latency-ms', type=float, default=0.0,
+                        help='Artificial latency added to every request')
+    parser.add_argument('--properties', type=int, default=0,
+                        help='Seed this many synthetic properties into the property service')
+    parser.add_argument('--users', type=int, default=0,
+                        help='Seed this many synthetic users (and admin-view properties) into the services')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    async def serve():
+        standin = LyvoStandin(host=args.host, latency_ms=args.latency_ms)
+        standin.store.properties = generate_properties(args.properties)
+        standin.store.users = generate_users(args.users)
+        standin.store.admin_properties = generate_admin_properties(args.users)
+        await standin.start(args.service)
+        try:
+            while True:
+                await asyncio.sleep(3600)
+        finally:
+            await standin.stop()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        logger.info("⏹️ Stand-in stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Lyvo Static Server
+Serves the production build in dist/ the way a CDN would: SPA fallback to index.html,
+precompressed brotli/gzip variants, immutable caching for hashed assets and keep-alive.
+Tests run against this instead of the unbundled Vite dev server when a build of the current
+sources exists.
+"""
+
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+import mimetypes
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+
+from aiohttp import web
+
+try:
+    import brotli
+except ImportError:  # br variants are skipped; gzip covers every browser
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STATIC_SERVER = {
+    'enabled': True,
+    'dist_dir': '../dist',
+    # Where the build stamp's inputs (src/, index.html, ...) live
+    'source_root': '..',
+    'host': '127.0.0.1',
+    # Fixed so the origin, and with it the warmed profile's HTTP cache, is the same every run
+    'port': 4173,
+    'keepalive_timeout': 75,
+    # Compressed variants are kept here between runs, keyed by content hash
+    'cache_dir': './test-reports/static-cache'
+}
+
+COMPRESSIBLE = {'.html', '.js', '.mjs', '.css', '.svg', '.json', '.txt', '.map', '.xml', '.webmanifest'}
+# Vite names bundled assets <name>-<8 char content hash>.<ext>
+HASHED_ASSET = re.compile(r'-[A-Za-z0-9_-]{8}\.[a-z0-9]+$')
+# prerender.py's snapshot of /. index.html stays the app shell, because hosts fall back to it for
+# every unknown route and a deep link must not paint the home page first
+HOME_PAGE = 'home.html'
+# Written into dist/ by the lyvo-build-stamp plugin in vite.config.js
+BUILD_STAMP = 'build-stamp.json'
+IMMUTABLE = 'public, max-age=31536000, immutable'
+REVALIDATE = 'no-cache'
+
+
+class StaticFile(NamedTuple):
+    content_type: str
+    etag: str
+    cache_control: str
+    # Content-Encoding ('identity', 'br', 'gzip') -> body
+    variants: Dict[str, bytes]
+
+
+def cache_control(relative: str) -> str:
+    """Hashed assets never change under their name; everything else is revalidated"""
+    return IMMUTABLE if relative.startswith('assets/') and HASHED_ASSET.search(relative) else REVALIDATE
+
+
+def compress(body: bytes, encoding: str, digest: str, cache_dir: Optional[Path]) -> Optional[bytes]:
+    """Max-level brotli or gzip, as a CDN would precompress; slow, so cached across runs"""
+    cached = cache_dir / f"{digest}.{encoding}" if cache_dir else None
+    if cached and cached.exists():
+        return cached.read_bytes()
+    if encoding == 'br':
+        if not brotli:
+            return None
+        data = brotli.compress(body, quality=11)
+    else:
+        data = gzip.compress(body, 9)
+    if cached:
+        cached.parent.mkdir(parents=True, exist_ok=True)
+        cached.write_bytes(data)
+    return data
+
+
+def load_file(path: Path, relative: str, cache_dir: Optional[Path] = None) -> StaticFile:
+    """Read a file with its compressed variants: prebuilt .br/.gz next to it, else compressed here"""
+    body = path.read_bytes()
+    digest = hashlib.sha1(body).hexdigest()
+    variants = {'identity': body}
+    if path.suffix in COMPRESSIBLE:
+        for encoding, suffix in [('br', '.br'), ('gzip', '.gz')]:
+            prebuilt = path.with_name(path.name + suffix)
+            data = prebuilt.read_bytes() if prebuilt.exists() else compress(body, encoding, digest, cache_dir)
+            # A variant that does not shrink the body is not worth the decode
+            if data is not None and len(data) < len(body):
+                variants[encoding] = data
+    content_type = mimetypes.guess_type(path.name)[0] or 'application/octet-stream'
+    return StaticFile(content_type, f'"{digest[:16]}"', cache_control(relative), variants)
+
+
+def source_digest(root: Path, inputs: List[str]) -> str:
+    """sha256 over every input file's path and content hash, as vite.config.js computes it"""
+    files = []
+    for name in inputs:
+        path = root / name
+        if path.is_file():
+            files.append(path)
+        elif path.is_dir():
+            files.extend(p for p in path.rglob('*') if p.is_file())
+    digest = hashlib.sha256()
+    for relative, path in sorted((p.relative_to(root).as_posix(), p) for p in files):
+        digest.update(f"{relative}\0{hashlib.sha256(path.read_bytes()).hexdigest()}\n".encode())
+    return digest.hexdigest()
+
+
+def stale_reason(dist_dir: Path, source_root: Path) -> Optional[str]:
+    """Why dist_dir is not a build of the current sources, or None when its stamp matches them"""
+    stamp_file = dist_dir / BUILD_STAMP
+    if not stamp_file.exists():
+        return f"no {BUILD_STAMP}: it was not built from this checkout"
+    stamp = json.loads(stamp_file.read_text())
+    if source_digest(source_root, stamp['inputs']) != stamp['digest']:
+        return "the sources changed since it was built"
+    return None
+
+
+def negotiate(accept_encoding: str, available: Dict[str, bytes]) -> str:
+    """Best encoding the client accepts: brotli, then gzip, else identity"""
+    accepted = {part.split(';')[0].strip() for part in accept_encoding.lower().split(',')}
+    for encoding in ('br', 'gzip'):
+        if encoding in accepted and encoding in available:
+            return encoding
+    return 'identity'
+
+
+class LyvoStaticServer:
+    """The dist/ build held in memory and served by aiohttp"""
+
+    def __init__(self, dist_dir: Path, host: str = '127.0.0.1', port: int = 4173, keepalive_timeout: float = 75,
+                 cache_dir: Optional[Path] = None):
+        self.dist_dir = Path(dist_dir)
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.host = host
+        self.port = port
+        self.keepalive_timeout = keepalive_timeout
+        self.files: Dict[str, StaticFile] = {}
+        self._runner: Optional[web.AppRunner] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def load(self):
+        self.files = {}
+        for path in sorted(p for p in self.dist_dir.rglob('*') if p.is_file()):
+            if path.suffix in ('.br', '.gz'):
+                continue
+            relative = path.relative_to(self.dist_dir).as_posix()
+            self.files[relative] = load_file(path, relative, self.cache_dir)
+        if 'index.html' not in self.files:
+            raise FileNotFoundError(f"No build in {self.dist_dir}; run npm run build first")
+
+    def resolve(self, path: str) -> Optional[StaticFile]:
+        """The file for a request path; extensionless routes get their prerendered page or the app shell"""
+        relative = path.strip('/')
+        if relative in self.files:
+            return self.files[relative]
+        if relative == '':
+            return self.files.get(HOME_PAGE) or self.files['index.html']
+        if '.' not in relative.rsplit('/', 1)[-1]:
+            return self.files.get(f"{relative}/index.html") or self.files['index.html']
+        return None
+
+    async def _serve(self, request: web.Request) -> web.StreamResponse:
+        static = self.resolve(request.path)
+        if not static:
+            raise web.HTTPNotFound()
+        headers = {'Cache-Control': static.cache_control, 'ETag': static.etag, 'Vary': 'Accept-Encoding'}
+        if request.headers.get('If-None-Match') == static.etag:
+            return web.Response(status=304, headers=headers)
+        encoding = negotiate(request.headers.get('Accept-Encoding', ''), static.variants)
+        if encoding != 'identity':
+            headers['Content-Encoding'] = encoding
+        return web.Response(body=static.variants[encoding], headers=headers, content_type=static.content_type)
+
+    def build_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get('/{path:.*}', self._serve)
+        return app
+
+    async def start(self):
+        self.load()
+        self._runner = web.AppRunner(self.build_app(), access_log=None, keepalive_timeout=self.keepalive_timeout)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        if not self.port:
+            self.port = self._runner.addresses[0][1]
+        logger.info(f"📦 Serving {self.dist_dir} ({len(self.files)} files) on {self.url}")
+
+    async def stop(self):
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def start_background(self, timeout: float = 10.0):
+        """Run the server on a daemon thread so synchronous Selenium code can use it"""
+        ready = threading.Event()
+        errors: List[BaseException] = []
+
+        def run():
+            self._loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self._loop)
+            try:
+                self._loop.run_until_complete(self.start())
+            except BaseException as e:
+                errors.append(e)
+                ready.set()
+                return
+            ready.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=run, name='lyvo-static', daemon=True)
+        self._thread.start()
+        ready.wait(timeout)
+        if errors:
+            raise errors[0]
+
+    def stop_background(self):
+        """Stop a server started with start_background()"""
+        if not self._loop:
+            return
+        future = asyncio.run_coroutine_threadsafe(self.stop(), self._loop)
+        future.result(timeout=10)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        if self._thread:
+            self._thread.join(timeout=10)
+        self._loop = None
+        self._thread = None
+
+
+def serve_dist(config: Dict) -> Optional[LyvoStaticServer]:
+    """Start the static server when enabled and dist/ is a build of the current sources, pointing
+    base_url at it. A stale build is left alone with a warning, so tests never run an old bundle.
+
+    base_url is also exported as LYVO_BASE_URL so subprocesses (pytest-xdist workers) follow.
+    """
+    settings = dict(DEFAULT_STATIC_SERVER, **config.get('static_server', {}))
+    dist_dir = Path(settings['dist_dir'])
+    if not settings['enabled'] or not (dist_dir / 'index.html').exists():
+        return None
+    stale = stale_reason(dist_dir, Path(settings['source_root']))
+    if stale:
+        logger.warning(f"⚠️ Not serving {dist_dir}: {stale}. Run npm run build; "
+                       f"staying on {config.get('base_url')}")
+        return None
+    server = LyvoStaticServer(dist_dir, settings['host'], settings['port'], settings['keepalive_timeout'],
+                              cache_dir=Path(settings['cache_dir']))
+    try:
+        server.start_background()
+    except OSError as e:
+        logger.warning(f"⚠️ Static server not started, staying on {config.get('base_url')}: {e}")
+        return None
+    config['base_url'] = server.url
+    os.environ['LYVO_BASE_URL'] = server.url
+    return server
+
+
+def main():
+    """Serve dist/ until interrupted"""
+    parser = argparse.ArgumentParser(description='Serve the Lyvo production build')
+    parser.add_argument('--dist', default=DEFAULT_STATIC_SERVER['dist_dir'])
+    parser.add_argument('--host', default=DEFAULT_STATIC_SERVER['host'])
+    parser.add_argument('--port', type=int, default=DEFAULT_STATIC_SERVER['port'])
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    async def serve():
+        server = LyvoStaticServer(Path(args.dist), args.host, args.port)
+        await server.start()
+        try:
+            while True:
+                await asyncio.sleep(3600)
+        finally:
+            await server.stop()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        logger.info("⏹️ Static server stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Lyvo Suite Graph
+Tests and checks declared with prerequisites and run as a DAG; when a prerequisite
+fails, everything downstream is skipped at once instead of waiting out its timeouts.
+"""
+
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+PASSED = 'passed'
+FAILED = 'failed'
+SKIPPED = 'skipped'
+SERVICE_DOWN = 'service_down'
+
+# (status, seconds, reason)
+NodeResult = Tuple[str, float, str]
+
+
+class SuiteGraph:
+    """Named nodes returning True/False, each with the nodes it requires"""
+
+    def __init__(self):
+        self.nodes: Dict[str, Callable[[], bool]] = {}
+        self.requires: Dict[str, List[str]] = {}
+        self.services: Dict[str, List[str]] = {}
+
+    def add(self, name: str, run: Callable[[], bool], requires: Iterable[str] = (), services: Iterable[str] = ()):
+        """Register a node; services are the backends it needs at run time (see circuit_breaker.py)"""
+        self.nodes[name] = run
+        self.requires[name] = list(requires)
+        self.services[name] = list(services)
+
+    def closure(self, names: Iterable[str]) -> List[str]:
+        """names plus everything they transitively require, in declaration order"""
+        needed = set()
+        pending = list(names)
+        while pending:
+            name = pending.pop()
+            if name not in self.nodes:
+                raise ValueError(f"Unknown test or check: {name}")
+            if name not in needed:
+                needed.add(name)
+                pending.extend(self.requires[name])
+        return [name for name in self.nodes if name in needed]
+
+    def order(self, names: Iterable[str]) -> List[str]:
+        """Topological order of names and their prerequisites, stable to declaration order"""
+        remaining = self.closure(names)
+        ordered: List[str] = []
+        while remaining:
+            ready = [n for n in remaining if all(r in ordered for r in self.requires[n])]
+            if not ready:
+                raise ValueError(f"Dependency cycle between: {', '.join(remaining)}")
+            ordered.append(ready[0])
+            remaining.remove(ready[0])
+        return ordered
+
+    def blocked_by(self, name: str, statuses: Dict[str, str]) -> Optional[str]:
+        """The first prerequisite of name that did not pass, if any"""
+        for requirement in self.requires[name]:
+            status = statuses.get(requirement)
+            if status is not None and status != PASSED:
+                return requirement
+        return None
+
+    def run(self, names: Iterable[str], known: Optional[Dict[str, NodeResult]] = None,
+            on_result: Optional[Callable[[str, NodeResult], None]] = None,
+            service_down: Optional[Callable[[List[str]], Optional[str]]] = None) -> Dict[str, NodeResult]:
+        """Run names (and any prerequisite not already in known); skip nodes whose prerequisites failed.
+
+        service_down is asked before each node with the services it needs and returns the one
+        that is unavailable, which short-circuits the node without running it.
+        """
+        results: Dict[str, NodeResult] = dict(known or {})
+        for name in self.order(names):
+            if name in results:
+                continue
+            statuses = {n: r[0] for n, r in results.items()}
+            blocker = self.blocked_by(name, statuses)
+            down = service_down(self.services[name]) if service_down and not blocker else None
+            if blocker:
+                result = (SKIPPED, 0.0, f"{blocker} {statuses[blocker]}")
+            elif down:
+                result = (SERVICE_DOWN, 0.0, f"service down: {down}")
+            else:
+                start = time.perf_counter()
+                try:
+                    passed = bool(self.nodes[name]())
+                    reason = ''
+                except Exception as e:
+                    passed, reason = False, str(e)
+                result = (PASSED if passed else FAILED, time.perf_counter() - start, reason)
+            results[name] = result
+            if on_result:
+                on_result(name, result)
+        return {name: result for name, result in results.items() if not known or name not in known}
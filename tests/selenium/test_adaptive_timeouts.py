@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Unit tests for history-learned step timeouts
+"""
+
+import threading
+
+import pytest
+
+from adaptive_timeouts import AdaptiveTimeouts
+
+
+def make_timeouts(tmp_path, **settings):
+    return AdaptiveTimeouts({'adaptive_timeouts': settings}, history_file=tmp_path / 'steps.json')
+
+
+class TestAdaptiveTimeouts:
+    """Learning from passing steps and capping at the static ceiling"""
+
+    def test_ceiling_until_enough_samples(self, tmp_path):
+        timeouts = make_timeouts(tmp_path, min_samples=3)
+        timeouts.record_all({'login_form': [0.5, 0.5]})
+        assert timeouts.timeout('login_form', 10) == 10
+
+    def test_learned_timeout_is_p99_with_margin(self, tmp_path):
+        timeouts = make_timeouts(tmp_path, min_samples=3, margin=2.0, min_seconds=0.1)
+        timeouts.record_all({'login_form': [0.5, 1.0, 1.5]})
+        assert timeouts.timeout('login_form', 10) == pytest.approx(2.98, abs=0.01)
+        assert timeouts.timeout('login_form', 2) == 2
+
+    def test_floor_and_disabled(self, tmp_path):
+        timeouts = make_timeouts(tmp_path, min_samples=1, min_seconds=1.0)
+        timeouts.record_all({'login_form': [0.01]})
+        assert timeouts.timeout('login_form', 10) == 1.0
+        timeouts.settings['enabled'] = False
+        assert timeouts.timeout('login_form', 10) == 10
+
+    def test_only_committed_steps_are_learned(self, tmp_path):
+        timeouts = make_timeouts(tmp_path)
+        with timeouts.step('login_form', 10) as timeout:
+            assert timeout == 10
+        timeouts.discard()
+        with timeouts.step('login_body', 10):
+            pass
+        timeouts.commit()
+        assert set(timeouts.history.samples) == {'login_body'}
+        assert list(timeouts.committed) == ['login_body']
+
+    def test_interrupted_step_is_not_recorded(self, tmp_path):
+        timeouts = make_timeouts(tmp_path)
+        with pytest.raises(RuntimeError):
+            with timeouts.step('login_form', 10):
+                raise RuntimeError('timed out')
+        timeouts.commit()
+        assert timeouts.history.samples == {}
+
+    def test_pending_steps_are_per_thread(self, tmp_path):
+        timeouts = make_timeouts(tmp_path)
+        with timeouts.step('main_step', 10):
+            pass
+
+        def other():
+            with timeouts.step('other_step', 10):
+                pass
+            timeouts.discard()
+
+        thread = threading.Thread(target=other)
+        thread.start()
+        thread.join()
+        timeouts.commit()
+        assert set(timeouts.history.samples) == {'main_step'}
+
+    def test_save_round_trip(self, tmp_path):
+        timeouts = make_timeouts(tmp_path)
+        timeouts.record_all({'login_form': [0.25]})
+        timeouts.save()
+        assert make_timeouts(tmp_path).history.samples == {'login_form': [0.25]}
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the synthetic admin datasets
+"""
+
+from admin_fixtures import generate_admin_properties, generate_bookings, generate_users
+
+
+class TestAdminFixtures:
+    """Users and admin-view properties for the large-dataset benchmarks"""
+
+    def test_users_are_deterministic_and_unique(self):
+        users = generate_users(500, seed=3)
+        assert users == generate_users(500, seed=3)
+        assert len({u['_id'] for u in users}) == 500
+        assert len({u['email'] for u in users}) == 500
+
+    def test_user_roles_match_frontend_codes(self):
+        users = generate_users(1000, owner_ratio=0.25)
+        roles = {u['role'] for u in users}
+        assert roles == {1, 3}
+        owners = [u for u in users if u['role'] == 3]
+        assert 150 < len(owners) < 350
+        assert all(u['kycStatus'] for u in owners)
+
+    def test_admin_properties_shape(self):
+        properties = generate_admin_properties(100, owners=10)
+        assert len(properties) == 100
+        sample = properties[0]
+        assert set(sample['address']) == {'street', 'city', 'state'}
+        assert sample['owner']['email'].endswith('@example.com')
+        assert 1 <= len(sample['rooms']) <= 6
+        assert all(isinstance(room['rent'], int) for p in properties for room in p['rooms'])
+        assert len({p['owner_id'] for p in properties}) <= 10
+
+    def test_bookings_cover_both_views(self):
+        bookings = generate_bookings(8, 'seeker1', 'owner1')
+        assert {b['status'] for b in bookings} == {'pending', 'confirmed', 'pending_approval', 'cancelled'}
+        assert all(b['userId'] == 'seeker1' and b['ownerId'] == 'owner1' for b in bookings)
+        assert all(b['property']['propertyName'] == b['propertySnapshot']['name'] for b in bookings)
+        assert bookings == generate_bookings(8, 'seeker1', 'owner1')
@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the assistant benchmark
+"""
+
+from assistant_benchmark import reply_phases
+
+
+class TestAssistantBenchmark:
+    """Where chatbot reply time goes between the page, the context fetch and the LLM"""
+
+    def test_reply_phases(self):
+        context = {'start': 1010.0, 'response_start': 1050.0, 'end': 1060.0}
+        calls = [{'start': 1000.0, 'response_start': 1005.0, 'end': 1005.0, 'status': 429},
+                 {'start': 6010.0, 'response_start': 6100.0, 'end': 6400.0, 'status': 200},
+                 {'start': 6420.0, 'response_start': 6820.0, 'end': 7320.0, 'status': 200}]
+        assert reply_phases(990.0, 8820.0, context, calls) == {
+            'reply_ms': 7830.0, 'context_fetch_ms': 50.0, 'llm_calls': 3, 'llm_failures': 1,
+            'llm_retry_ms': 5420.0, 'llm_ttft_ms': 400.0, 'llm_stream_ms': 500.0, 'render_ms': 1500.0}
+        # Every call rate limited: the fallback reply has no token timings
+        fallback = reply_phases(990.0, 7500.0, None, [dict(calls[0]), dict(calls[0], start=6000.0, end=6005.0)])
+        assert fallback['llm_ttft_ms'] is None and fallback['llm_failures'] == 2
+        assert fallback['render_ms'] == 1495.0
+        assert reply_phases(990.0, 2500.0, None, [])['render_ms'] == 1510.0
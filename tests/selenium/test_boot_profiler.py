@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the boot profiler
+"""
+
+from boot_profiler import BOOT_MARKS, boot_phases, missing_timing
+
+
+class TestBootProfiler:
+    """App start phases from navigation timing and lyvo:* marks"""
+
+    def test_boot_phases(self):
+        timing = {'document_end': 20.0, 'bundle_start': 25.0, 'bundle_end': 180.0, 'marks': [
+            {'name': 'lyvo:route-rendered', 'time': 350.0},
+            {'name': 'lyvo:bundle-evaluated', 'time': 300.0},
+            {'name': 'lyvo:role-repair-start', 'time': 352.0},
+            {'name': 'lyvo:role-repair-end', 'time': 480.0},
+            {'name': 'lyvo:route-rendered', 'time': 495.5},
+            {'name': 'lyvo:loader-hidden', 'time': 1495.5}
+        ]}
+        phases = boot_phases(timing)
+        assert phases == {'document': 20.0, 'bundle_download': 155.0, 'bundle_evaluate': 120.0,
+                          'react_mount': 52.0, 'role_repair': 128.0, 'route_resolution': 15.5,
+                          'route_render': 495.5, 'loader_hidden': 1495.5, 'route_mounts': 2}
+        assert boot_phases({'document_end': 20.0})['bundle_evaluate'] is None
+
+    def test_missing_timing(self):
+        marks = [{'name': name, 'time': 100.0} for name in BOOT_MARKS]
+        assert missing_timing({'bundle_start': 25.0, 'marks': marks}) == []
+        # A dev server start: modules load from /src, and an old build has no marks
+        assert missing_timing({'bundle_start': None, 'marks': marks[1:]}) == [
+            'lyvo:bundle-evaluated', 'bundle (/assets/*.js)']
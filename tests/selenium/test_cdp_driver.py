@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the direct CDP driver backend, against a scripted browser on a fake websocket
+"""
+
+import asyncio
+import itertools
+import json
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import aiohttp
+import pytest
+from selenium.common.exceptions import NoSuchElementException, WebDriverException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
+
+import login_test
+from cdp_driver import CDPBrowser, CDPConnection, CDPDriver, CDPElement, CDPError
+from login_test import LyvoLoginTester
+
+
+class FakeChrome:
+    """Answers DevTools commands like Chrome, enough for the driver, and records every command.
+
+    answers maps a method to a result, an {'error': ...} reply, or a function of the params
+    returning either. hold collects that many replies and sends them back in reverse order.
+    targets maps every page created to its browser context.
+    """
+
+    def __init__(self):
+        self.commands = []
+        self.targets = {}
+        self.answers = {}
+        self.hold = 0
+        self.held = []
+        self.ids = itertools.count(1)
+
+    def methods(self, prefix=''):
+        return [c['method'] for c in self.commands if c['method'].startswith(prefix)]
+
+    def result(self, method, params, session_id):
+        if method in self.answers:
+            answer = self.answers[method]
+            return answer(params) if callable(answer) else answer
+        if method == 'Target.createBrowserContext':
+            return {'browserContextId': f"context-{next(self.ids)}"}
+        if method == 'Target.createTarget':
+            target_id = f"page-{next(self.ids)}"
+            self.targets[target_id] = params.get('browserContextId')
+            return {'targetId': target_id}
+        if method == 'Target.attachToTarget':
+            return {'sessionId': f"session-{params['targetId']}"}
+        if method == 'Page.getFrameTree':
+            return {'frameTree': {'frame': {'id': f"frame-{session_id}", 'url': 'about:blank'}}}
+        if method.startswith('Runtime.'):
+            return {'result': {'type': 'undefined'}}
+        if method == 'Page.navigate':
+            return {'frameId': f"frame-{session_id}", 'loaderId': 'loader-1'}
+        return {}
+
+    def events(self, method, params, session_id):
+        if method != 'Page.navigate':
+            return []
+        frame = {'id': f"frame-{session_id}", 'url': params['url']}
+        return [{'method': 'Page.frameNavigated', 'params': {'frame': frame}, 'sessionId': session_id},
+                {'method': 'Page.loadEventFired', 'params': {'timestamp': 1.0}, 'sessionId': session_id}]
+
+    def handle(self, message):
+        self.commands.append(message)
+        method, params, session_id = message['method'], message['params'], message.get('sessionId')
+        result = self.result(method, params, session_id)
+        reply = dict(result, id=message['id']) if 'error' in result else {'id': message['id'], 'result': result}
+        if self.hold:
+            self.held.append(reply)
+            if len(self.held) < self.hold:
+                return []
+            replies, self.held, self.hold = self.held[::-1], [], 0
+            return replies
+        return [reply] + self.events(method, params, session_id)
+
+
+class FakeSocket:
+    """The slice of aiohttp's ClientWebSocketResponse the connection uses"""
+
+    def __init__(self, chrome):
+        self.chrome = chrome
+        self.inbox = asyncio.Queue()
+        self.closed = False
+
+    async def send_str(self, text):
+        if self.closed:
+            raise ConnectionResetError("Cannot write to closing transport")
+        for message in self.chrome.handle(json.loads(text)):
+            self.inbox.put_nowait(message)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        message = await self.inbox.get()
+        if message is None:
+            raise StopAsyncIteration
+        return SimpleNamespace(type=aiohttp.WSMsgType.TEXT, data=json.dumps(message))
+
+    async def close(self):
+        if not self.closed:
+            self.closed = True
+            self.inbox.put_nowait(None)
+
+
+class FakeHttp:
+    async def close(self):
+        pass
+
+
+class FakeConnection(CDPConnection):
+    """A CDPConnection whose websocket leads to a FakeChrome"""
+
+    def __init__(self, chrome, timeout=5.0):
+        self.chrome = chrome
+        super().__init__('ws://127.0.0.1:9222/devtools/browser/fake', timeout)
+
+    async def _connect(self, ws_url):
+        self.http = FakeHttp()
+        self.ws = FakeSocket(self.chrome)
+        self.reader = asyncio.ensure_future(self._read())
+
+    def drop(self):
+        """The browser side closes the socket"""
+        async def close():
+            await self.ws.close()
+        self._run(close())
+
+
+def fake_browser(chrome):
+    """A CDPBrowser on a FakeChrome, without starting a Chrome process"""
+    browser = CDPBrowser.__new__(CDPBrowser)
+    browser.conn = FakeConnection(chrome)
+    return browser
+
+
+@pytest.fixture
+def chrome():
+    return FakeChrome()
+
+
+@pytest.fixture
+def driver(chrome):
+    browser = fake_browser(chrome)
+    driver = CDPDriver(browser, 'page-0')
+    yield driver
+    browser.conn.close()
+
+
+class TestCDPDriver:
+    """Reply matching, key translation, element lookup, navigation and shutdown"""
+
+    def test_replies_are_matched_by_id(self, chrome):
+        conn = FakeConnection(chrome)
+        try:
+            chrome.answers = {'Runtime.evaluate': lambda params: {'result': {'value': params['expression']}}}
+            chrome.hold = 2
+            first, second = conn.send_many([('Runtime.evaluate', {'expression': 'a'}),
+                                            ('Runtime.evaluate', {'expression': 'b'})])
+            assert first['result']['value'] == 'a' and second['result']['value'] == 'b'
+            assert [c['id'] for c in chrome.commands] == [1, 2]
+            assert conn.commands == 2 and conn.pending == {}
+        finally:
+            conn.close()
+
+    def test_protocol_errors_raise(self, chrome):
+        conn = FakeConnection(chrome)
+        try:
+            chrome.answers['DOM.describeNode'] = {'error': {'code': -32000, 'message': 'No node with given id found'}}
+            with pytest.raises(CDPError, match='No node with given id found'):
+                conn.send('DOM.describeNode', {'nodeId': 7})
+            # The connection carries on after an error reply
+            assert conn.send('Page.enable') == {}
+        finally:
+            conn.close()
+
+    def test_send_keys_translates_special_keys(self, chrome, driver):
+        CDPElement(driver, 'input-1').send_keys('seeker@test.com', Keys.TAB, 'pw', Keys.ENTER)
+        focus, *inputs = chrome.commands[-7:]
+        assert focus['method'] == 'Runtime.callFunctionOn' and focus['params']['objectId'] == 'input-1'
+        tab = {'key': 'Tab', 'code': 'Tab', 'windowsVirtualKeyCode': 9, 'text': ''}
+        enter = {'key': 'Enter', 'code': 'Enter', 'windowsVirtualKeyCode': 13, 'text': '\r'}
+        assert [(c['method'], c['params']) for c in inputs] == [
+            ('Input.insertText', {'text': 'seeker@test.com'}),
+            # Keys without text go down as rawKeyDown, so the page sees no keypress
+            ('Input.dispatchKeyEvent', dict(tab, type='rawKeyDown')),
+            ('Input.dispatchKeyEvent', dict(tab, type='keyUp')),
+            ('Input.insertText', {'text': 'pw'}),
+            ('Input.dispatchKeyEvent', dict(enter, type='keyDown')),
+            ('Input.dispatchKeyEvent', dict(enter, type='keyUp'))
+        ]
+        assert all(c['sessionId'] == driver.session_id for c in inputs)
+
+    def test_find_element_without_a_match(self, chrome, driver):
+        chrome.answers['Runtime.evaluate'] = {'result': {'type': 'object', 'subtype': 'null', 'value': None}}
+        with pytest.raises(NoSuchElementException, match='#email'):
+            driver.find_element(By.CSS_SELECTOR, '#email')
+        assert driver.find_elements(By.CSS_SELECTOR, '#email') == []
+        # A document that navigates away mid-lookup has no element either
+        chrome.answers['Runtime.evaluate'] = {'error': {'code': -32000, 'message': 'Execution context was destroyed'}}
+        with pytest.raises(NoSuchElementException):
+            driver.find_element(By.CSS_SELECTOR, '#email')
+
+    def test_find_element_returns_the_node(self, chrome, driver):
+        chrome.answers['Runtime.evaluate'] = {'result': {'type': 'object', 'subtype': 'node', 'objectId': 'node-1'}}
+        element = driver.find_element(By.CSS_SELECTOR, '#email')
+        assert isinstance(element, CDPElement) and element.object_id == 'node-1'
+
+    def test_get_waits_for_the_load_event(self, chrome, driver):
+        driver.get('http://localhost:3000/login')
+        assert driver.current_url == 'http://localhost:3000/login'
+
+    def test_navigation_without_a_loader_does_not_wait(self, chrome, driver):
+        # Same-document navigations fire no load event; waiting for one would time out
+        chrome.answers['Page.navigate'] = {'frameId': f"frame-{driver.session_id}"}
+        driver.set_page_load_timeout(0.2)
+        driver.get('http://localhost:3000/login#signup')
+        chrome.answers['Page.navigate'] = {'frameId': 'frame-1', 'loaderId': 'loader-2', 'errorText': 'net::ERR_FAILED'}
+        with pytest.raises(WebDriverException, match='net::ERR_FAILED'):
+            driver.get('http://localhost:9/')
+
+    def test_socket_closing_fails_commands_in_flight(self, chrome, driver):
+        chrome.hold = 2
+        in_flight = asyncio.run_coroutine_threadsafe(
+            driver.conn._send_many([('Page.reload', {})], driver.session_id), driver.conn.loop)
+        driver.conn.drop()
+        with pytest.raises(CDPError, match='DevTools connection closed'):
+            in_flight.result(5)
+
+    def test_quit_after_the_socket_closed(self, chrome, driver):
+        driver.context_id = 'context-1'
+        driver.conn.drop()
+        driver.quit()
+        assert 'Target.closeTarget' not in chrome.methods()
+
+
+class TestBrowserContexts:
+    """Parallel workers as browser contexts of one shared Chrome"""
+
+    @pytest.fixture
+    def browser(self, chrome):
+        browser = fake_browser(chrome)
+        yield browser
+        browser.conn.close()
+
+    def contexts(self, chrome, method):
+        return [c['params']['browserContextId'] for c in chrome.commands if c['method'] == method]
+
+    def test_new_driver_opens_a_page_in_a_fresh_context(self, chrome, browser):
+        first, second = browser.new_driver(), browser.new_driver()
+        assert chrome.methods('Target.createBrowserContext') == ['Target.createBrowserContext'] * 2
+        assert first.context_id != second.context_id
+        assert chrome.targets == {first.target_id: first.context_id, second.target_id: second.context_id}
+        assert first.session_id != second.session_id
+
+        first.quit()
+        assert self.contexts(chrome, 'Target.disposeBrowserContext') == [first.context_id]
+        second.quit()
+        assert self.contexts(chrome, 'Target.disposeBrowserContext') == [first.context_id, second.context_id]
+
+    def test_quit_disposes_the_context_when_closing_the_page_fails(self, chrome, browser):
+        driver = browser.new_driver()
+        chrome.answers['Target.closeTarget'] = {'error': {'code': -32000, 'message': 'No target with given id found'}}
+        driver.quit()
+        assert self.contexts(chrome, 'Target.disposeBrowserContext') == [driver.context_id]
+
+    def test_each_shard_runs_in_its_own_context(self, chrome, browser, tmp_path):
+        config = {'screenshot_dir': str(tmp_path / 'screenshots'), 'timeouts': {'implicit': 1, 'page_load': 30}}
+        testers = [LyvoLoginTester(dict(config, screenshot_dir=str(tmp_path / f"worker{i}")), browser=browser)
+                   for i in range(3)]
+        with ThreadPoolExecutor(max_workers=len(testers)) as pool:
+            assert list(pool.map(LyvoLoginTester.run_shard, testers, [[]] * 3, [{}] * 3)) == [{}] * 3
+
+        created = set(chrome.targets.values())
+        assert len(created) == 3
+        assert sorted(self.contexts(chrome, 'Target.disposeBrowserContext')) == sorted(created)
+        # Each worker set up its page over a session of its own, on a page in a context of its own
+        sessions = {c['sessionId'] for c in chrome.commands if c['method'] == 'Page.addScriptToEvaluateOnNewDocument'}
+        assert {chrome.targets[session.replace('session-', '', 1)] for session in sessions} == created
+        assert all(tester.driver is None for tester in testers)
+
+    def test_shared_browser_only_in_contexts_mode(self, monkeypatch, tmp_path):
+        launched = []
+        monkeypatch.setattr(login_test, 'CDPBrowser', lambda arguments, binary=None: launched.append(arguments) or 'chrome')
+        config = {'screenshot_dir': str(tmp_path), 'chrome_binary': '/usr/bin/chromium'}
+        assert LyvoLoginTester(config).shared_browser() is None
+        assert LyvoLoginTester(dict(config, parallel_mode='browsers')).shared_browser() is None
+        assert launched == []
+
+        assert LyvoLoginTester(dict(config, parallel_mode='contexts')).shared_browser() == 'chrome'
+        assert '--disable-background-timer-throttling' in launched[0]
+        assert '--disable-renderer-backgrounding' in launched[0]
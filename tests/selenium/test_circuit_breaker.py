@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the backend circuit breaker
+"""
+
+import time
+
+from circuit_breaker import CLOSED, HALF_OPEN, OPEN, BackendBreakers, CircuitBreaker
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeService:
+    def __init__(self, healthy=True):
+        self.healthy = healthy
+        self.probes = 0
+
+    def __call__(self, *args):
+        self.probes += 1
+        return self.healthy
+
+
+class TestCircuitBreaker:
+    """State transitions driven by probes, API errors and the cooldown"""
+
+    def test_first_use_probes_the_service(self):
+        service = FakeService(healthy=False)
+        breaker = CircuitBreaker('user', service)
+        assert not breaker.allow()
+        assert breaker.state == OPEN
+        assert service.probes == 1
+
+    def test_consecutive_errors_trip_the_breaker(self):
+        breaker = CircuitBreaker('user', FakeService(), failure_threshold=3)
+        breaker.check()
+        breaker.record(False)
+        breaker.record(False)
+        assert breaker.state == CLOSED
+        breaker.record(False)
+        assert breaker.state == OPEN
+        assert breaker.trips == 1
+
+    def test_error_rate_trips_the_breaker(self):
+        breaker = CircuitBreaker('user', FakeService(), failure_threshold=3, error_rate=0.5, window=4)
+        breaker.check()
+        for success in [True, False, True, False]:
+            breaker.record(success)
+        assert breaker.state == OPEN
+
+    def test_recovers_after_cooldown(self):
+        clock = FakeClock()
+        service = FakeService(healthy=False)
+        breaker = CircuitBreaker('user', service, cooldown=10, clock=clock)
+        assert not breaker.allow()
+
+        service.healthy = True
+        clock.now = 5
+        assert not breaker.allow()
+        assert service.probes == 1
+
+        clock.now = 11
+        assert breaker.allow()
+        assert breaker.state == CLOSED
+
+    def test_failed_half_open_probe_reopens(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker('user', FakeService(healthy=False), cooldown=10, clock=clock)
+        breaker.allow()
+        clock.now = 11
+        assert not breaker.allow()
+        assert breaker.state == OPEN
+        assert breaker.opened_at == 11
+
+    def test_healthy_probe_does_not_clear_an_error_trip(self):
+        clock = FakeClock()
+        service = FakeService()
+        breaker = CircuitBreaker('user', service, failure_threshold=2, cooldown=10, clock=clock)
+        breaker.check()
+        breaker.record(False)
+        breaker.record(False)
+        assert breaker.state == OPEN
+        breaker.check()
+        assert breaker.state == OPEN
+        assert not breaker.allow()
+
+    def test_error_trip_closes_after_a_successful_trial(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker('user', FakeService(), failure_threshold=2, cooldown=10, trial_calls=3, clock=clock)
+        breaker.check()
+        breaker.record_calls(ok=0, failed=2)
+        clock.now = 11
+        assert breaker.allow()
+        assert breaker.state == HALF_OPEN
+        breaker.record_calls(ok=2, failed=0)
+        assert breaker.state == HALF_OPEN
+        breaker.record_calls(ok=1, failed=0)
+        assert breaker.state == CLOSED
+        assert breaker.trips == 1
+
+    def test_failed_trial_reopens(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker('user', FakeService(), failure_threshold=2, cooldown=10, clock=clock)
+        breaker.check()
+        breaker.record_calls(ok=0, failed=2)
+        clock.now = 11
+        assert breaker.allow()
+        breaker.record_calls(ok=5, failed=1)
+        assert breaker.state == OPEN
+        assert breaker.opened_at == 11
+        assert not breaker.allow()
+
+    def test_unreachable_service_during_trial_reopens(self):
+        clock = FakeClock()
+        service = FakeService()
+        breaker = CircuitBreaker('user', service, failure_threshold=2, cooldown=10, clock=clock)
+        breaker.check()
+        breaker.record_calls(ok=0, failed=2)
+        service.healthy = False
+        clock.now = 11
+        assert not breaker.allow()
+        assert breaker.state == OPEN
+        # Now a probe trip: the next healthy probe closes it
+        service.healthy = True
+        breaker.check()
+        assert breaker.state == CLOSED
+
+
+class TestBackendBreakers:
+    """Per-service breakers built from the test configuration"""
+
+    CONFIG = {
+        'backend_url': 'http://localhost:4002',
+        'property_service_url': 'http://localhost:3002/',
+        'circuit_breaker': {'failure_threshold': 2}
+    }
+
+    def test_down_reports_the_unavailable_service(self):
+        probe = FakeService(healthy=False)
+        breakers = BackendBreakers(self.CONFIG, probe=probe)
+        assert set(breakers.breakers) == {'user', 'property'}
+        assert breakers.down(['chat', 'user']) == 'user'
+        assert breakers.down([]) is None
+
+    def test_api_calls_are_routed_by_origin(self):
+        breakers = BackendBreakers(self.CONFIG, probe=FakeService())
+        breakers['property'].check()
+        breakers.record_api_calls({
+            'http://localhost:3002': {'ok': 5, 'failed': 2},
+            'https://accounts.google.com': {'ok': 0, 'failed': 9}
+        })
+        assert breakers['property'].state == OPEN
+        assert breakers.summary()['property'] == {'state': OPEN, 'trips': 1}
+        assert breakers.service_for_origin('http://localhost:4002') == 'user'
+
+    def test_monitor_picks_up_services_added_later(self):
+        probed = []
+        config = dict(self.CONFIG, circuit_breaker={'monitor_interval': 0.01})
+        breakers = BackendBreakers(config, probe=lambda url, timeout: probed.append(url) or True)
+        breakers.start_monitor(['user'])
+        breakers.start_monitor(['property', 'chat'])
+        try:
+            deadline = time.monotonic() + 2
+            while len(set(probed)) < 2 and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            breakers.stop_monitor()
+        assert set(probed) == {'http://localhost:4002/api/health', 'http://localhost:3002/api/health'}
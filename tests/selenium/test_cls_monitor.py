@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the CLS monitor
+"""
+
+from cls_monitor import layout_shift_summary
+
+
+class TestClsMonitor:
+    """Session windows and culprits of layout shift entries"""
+
+    def test_layout_shift_summary(self):
+        entries = [
+            {'value': 0.05, 'time': 100.0, 'sources': [{'node': 'div#root>nav', 'area': 500},
+                                                       {'node': 'footer', 'area': 100}]},
+            {'value': 0.10, 'time': 600.0, 'sources': [{'node': 'section.hero', 'area': 900}]},
+            # More than a second later: a new session window
+            {'value': 0.08, 'time': 2000.0, 'sources': [{'node': 'section.hero', 'area': 300}]},
+            {'value': 0.50, 'time': 2100.0, 'had_recent_input': True, 'sources': [{'node': 'form', 'area': 900}]}
+        ]
+        summary = layout_shift_summary(entries)
+        assert summary['cls'] == 0.15
+        assert summary['shifts'] == 3
+        assert summary['input_shifts'] == 1
+        assert summary['worst_window_ms'] == [100.0, 600.0]
+        assert summary['nodes'][0] == {'node': 'section.hero', 'score': 0.18, 'shifts': 2}
+        assert summary['nodes'][1]['node'] == 'div#root>nav'
+        assert layout_shift_summary([])['cls'] == 0.0
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the resource-aware concurrency controller
+"""
+
+import threading
+
+from concurrency_controller import ConcurrencyController, HostSample
+
+CONFIG = {'concurrency': {'cpu_high': 85, 'cpu_low': 60, 'memory_min_mb': 1000, 'worker_rss_mb': 300}}
+
+IDLE = HostSample(cpu_percent=20, available_mb=8000, chrome_rss_mb=0)
+BUSY = HostSample(cpu_percent=95, available_mb=8000, chrome_rss_mb=0)
+LOW_MEMORY = HostSample(cpu_percent=20, available_mb=500, chrome_rss_mb=0)
+
+
+class TestConcurrencyController:
+    """Limit changes from host samples, slots and the contention flag"""
+
+    def test_cpu_pressure_steps_down_to_the_minimum(self):
+        events = []
+        controller = ConcurrencyController(CONFIG, 3, sampler=lambda: IDLE, on_change=events.append)
+        assert [controller.decide(BUSY) for _ in range(3)] == [2, 1, 1]
+        assert [(e['from'], e['to']) for e in events] == [(3, 2), (2, 1)]
+        assert events[0]['reason'].startswith('CPU 95%')
+        assert controller.throttled
+
+    def test_low_memory_steps_down(self):
+        controller = ConcurrencyController(CONFIG, 2, sampler=lambda: IDLE)
+        assert controller.decide(LOW_MEMORY) == 1
+        assert 'free memory' in controller.events[0]['reason']
+
+    def test_recovers_up_to_the_maximum_when_a_worker_fits(self):
+        controller = ConcurrencyController(CONFIG, 2, sampler=lambda: IDLE)
+        controller.decide(BUSY)
+        assert controller.decide(IDLE) == 2
+        assert controller.decide(IDLE) == 2
+        assert controller.events[-1]['reason'] == 'host has headroom again'
+
+    def test_no_scale_up_when_another_browser_would_not_fit(self):
+        controller = ConcurrencyController(CONFIG, 2, sampler=lambda: IDLE)
+        controller.decide(BUSY)
+        assert controller.decide(HostSample(cpu_percent=20, available_mb=1200, chrome_rss_mb=0)) == 1
+
+    def test_measured_chrome_rss_replaces_the_estimate(self):
+        controller = ConcurrencyController(CONFIG, 4, sampler=lambda: IDLE)
+        controller.active = 2
+        assert controller.worker_rss_mb(HostSample(10, 4000, 1200)) == 600
+        controller.active = 0
+        assert controller.worker_rss_mb(HostSample(10, 4000, 1200)) == 300
+
+    def test_slots_block_above_the_limit(self):
+        controller = ConcurrencyController(CONFIG, 2, sampler=lambda: IDLE)
+        controller.decide(BUSY)
+        held = threading.Event()
+        entered = threading.Event()
+        release = threading.Event()
+
+        def hold():
+            with controller.slot():
+                held.set()
+                release.wait(5)
+
+        def second():
+            with controller.slot():
+                entered.set()
+
+        first = threading.Thread(target=hold)
+        first.start()
+        assert held.wait(5)
+        waiter = threading.Thread(target=second)
+        waiter.start()
+        assert not entered.wait(0.2)
+        release.set()
+        assert entered.wait(5)
+        first.join()
+        waiter.join()
+        assert controller.peak == 1
+
+    def test_summary_reports_contention(self):
+        controller = ConcurrencyController(CONFIG, 2, sampler=lambda: IDLE)
+        assert controller.summary()['throttled'] is False
+        controller.decide(BUSY)
+        summary = controller.summary()
+        assert summary['throttled'] and summary['final_limit'] == 1
+        assert summary['cpu_percent']['max'] == 95
+
+    def test_a_lone_spike_does_not_mark_the_run_throttled(self):
+        controller = ConcurrencyController(CONFIG, 2, sampler=lambda: IDLE)
+        controller.decide(BUSY)
+        for _ in range(4):
+            controller.decide(IDLE)
+        assert not controller.throttled
+        controller.decide(BUSY)
+        assert controller.throttled
+        assert controller.summary()['pressured_samples'] == 2
+
+    def test_missing_psutil_keeps_a_fixed_limit(self):
+        def sampler():
+            raise ImportError("No module named 'psutil'")
+
+        controller = ConcurrencyController(CONFIG, 3, sampler=sampler).start()
+        assert controller._monitor is None
+        assert controller.limit == 3
+        assert 'psutil' in controller.summary()['sampler_error']
+        with controller.slot():
+            assert controller.active == 1
+        controller.stop()
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the database snapshots
+"""
+
+import copy
+import json
+
+import pytest
+
+from db_snapshot import DbSnapshots, restore_plan, snapshot_database
+
+
+class FakeCollection:
+    """The slice of a pymongo collection the snapshots use; exists once something writes to it"""
+
+    def __init__(self, database, name):
+        self.database = database
+        self.name = name
+        self.docs = []
+        self.indexes = {'_id_': {'key': [('_id', 1)], 'v': 2}}
+
+    def _create(self):
+        self.database.collections.setdefault(self.name, self)
+
+    def aggregate(self, pipeline):
+        out = pipeline[-1]['$out']
+        target = self.database.client[out['db']][out['coll']]
+        target.docs = copy.deepcopy(self.docs)
+        target._create()
+        self.database.client.copies.append(f"{out['db']}.{out['coll']}")
+
+    def estimated_document_count(self):
+        return len(self.docs)
+
+    def index_information(self):
+        return copy.deepcopy(self.indexes)
+
+    def create_index(self, keys, name, **options):
+        self.indexes[name] = dict(options, key=list(keys), v=2)
+        self._create()
+
+    def insert_one(self, doc):
+        self.docs.append(doc)
+        self._create()
+
+    def delete_many(self, query):
+        self.docs.clear()
+
+    def find_one(self, query):
+        return self.docs[0] if self.docs else None
+
+
+class FakeDatabase:
+    def __init__(self, client, name):
+        self.client = client
+        self.name = name
+        self.collections = {}
+
+    def __getitem__(self, name):
+        return self.collections.get(name) or FakeCollection(self, name)
+
+    def list_collection_names(self, filter=None):
+        return list(self.collections)
+
+    def command(self, name):
+        assert name == 'dbHash'
+        return {'collections': {c.name: json.dumps(c.docs, sort_keys=True) for c in self.collections.values()}}
+
+    def create_collection(self, name):
+        self[name]._create()
+
+    def drop_collection(self, name):
+        self.collections.pop(name, None)
+
+
+class FakeClient:
+    def __init__(self, data):
+        self.databases = {}
+        self.copies = []
+        for database, collections in data.items():
+            for collection, docs in collections.items():
+                self[database].create_collection(collection)
+                for doc in docs:
+                    self[database][collection].insert_one(doc)
+
+    def __getitem__(self, name):
+        return self.databases.setdefault(name, FakeDatabase(self, name))
+
+    def list_database_names(self):
+        return [name for name, database in self.databases.items() if database.collections]
+
+    def drop_database(self, name):
+        self.databases.pop(name, None)
+
+    def dump(self, name):
+        return {c.name: c.docs for c in self.databases[name].collections.values()}
+
+
+SEED = {
+    'lyvo_user': {'users': [{'_id': 1, 'email': 'seeker@test.com'}], 'sessions': []},
+    'lyvo_property': {'bookings': [{'_id': 7, 'status': 'pending'}], 'properties': [{'_id': 3}]},
+    'admin': {'system.version': [{'_id': 'v'}]},
+    'other_app': {'things': [{'_id': 1}]}
+}
+
+
+@pytest.fixture
+def client():
+    client = FakeClient(copy.deepcopy(SEED))
+    client['lyvo_user']['users'].create_index([('email', 1)], name='email_1', unique=True)
+    return client
+
+
+class TestDbSnapshot:
+    """Snapshot naming, restore planning and the take/restore round trip"""
+
+    def test_restore_plan(self):
+        assert restore_plan({'a': 'h1', 'b': 'h2', 'c': 'h3'}, {'a': 'h1', 'b': 'x', 'd': 'h4'}) == {
+            'restore': ['b', 'c'], 'drop': ['d']}
+        assert restore_plan({'a': 'h1'}, {'a': 'h1'}) == {'restore': [], 'drop': []}
+
+    def test_snapshot_database_names(self):
+        assert snapshot_database('baseline', 'lyvo_user') == 'snapshot_baseline__lyvo_user'
+        with pytest.raises(ValueError):
+            snapshot_database('a__b', 'lyvo_user')
+        with pytest.raises(ValueError):
+            snapshot_database('baseline', 'x' * 60)
+
+    def test_take_matches_configured_databases(self, client):
+        snapshots = DbSnapshots({}, client=client)
+        assert snapshots.databases() == ['lyvo_property', 'lyvo_user']
+        taken = snapshots.take()
+        assert taken['databases'] == {'lyvo_property': ['bookings', 'properties'], 'lyvo_user': ['sessions', 'users']}
+        assert snapshots.snapshots() == {'baseline': ['lyvo_property', 'lyvo_user']}
+        # Snapshot databases never match the patterns themselves
+        assert snapshots.databases() == ['lyvo_property', 'lyvo_user']
+        assert DbSnapshots({'db_snapshot': {'databases': ['lyvo_user']}}, client=client).databases() == ['lyvo_user']
+
+    def test_restore_rewrites_only_what_changed(self, client):
+        snapshots = DbSnapshots({}, client=client)
+        snapshots.take()
+        client['lyvo_property']['bookings'].insert_one({'_id': 8, 'status': 'confirmed'})
+        client['lyvo_user']['sessions'].insert_one({'_id': 's1'})
+        client['lyvo_user']['audit'].insert_one({'_id': 'a1'})
+        client.copies.clear()
+
+        restored = snapshots.restore()
+        assert restored['changes'] == {
+            'lyvo_property': {'restore': ['bookings'], 'drop': []},
+            'lyvo_user': {'restore': ['sessions'], 'drop': ['audit']}
+        }
+        assert client.dump('lyvo_property') == SEED['lyvo_property']
+        assert client.dump('lyvo_user') == SEED['lyvo_user']
+        # Unchanged collections are left alone; the emptied one was cleared, not copied
+        assert client.copies == ['lyvo_property.bookings']
+        assert snapshots.restore()['changes'] == {}
+
+    def test_restore_recreates_a_dropped_collection_with_its_indexes(self, client):
+        snapshots = DbSnapshots({}, client=client)
+        snapshots.take()
+        client['lyvo_user'].drop_collection('users')
+        snapshots.restore()
+        users = client['lyvo_user']['users']
+        assert users.docs == SEED['lyvo_user']['users']
+        assert users.indexes['email_1'] == {'key': [('email', 1)], 'unique': True, 'v': 2}
+
+    def test_take_replaces_an_older_snapshot(self, client):
+        snapshots = DbSnapshots({}, client=client)
+        snapshots.take()
+        client['lyvo_user']['users'].insert_one({'_id': 2, 'email': 'owner@test.com'})
+        snapshots.take()
+        client['lyvo_user']['users'].delete_many({})
+        snapshots.restore()
+        assert len(client['lyvo_user']['users'].docs) == 2
+        snapshots.drop()
+        assert snapshots.snapshots() == {}
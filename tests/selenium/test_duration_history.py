@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Unit tests for duration history and the longest-first scheduler
+"""
+
+import re
+from pathlib import Path
+
+from duration_history import DurationHistory, lpt_schedule, makespan
+
+pytest_plugins = ['pytester']
+
+SELENIUM_DIR = Path(__file__).parent
+# Loads this suite's conftest under another name and applies only its scheduling hook,
+# with a history file of its own
+PLAN_CONFTEST = f"""
+import importlib.util
+import sys
+from pathlib import Path
+
+sys.path.insert(0, {str(SELENIUM_DIR)!r})
+spec = importlib.util.spec_from_file_location('lyvo_conftest', {str(SELENIUM_DIR / 'conftest.py')!r})
+lyvo_conftest = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(lyvo_conftest)
+lyvo_conftest.DURATION_HISTORY_FILE = Path(__file__).parent / 'durations.json'
+pytest_collection_modifyitems = lyvo_conftest.pytest_collection_modifyitems
+"""
+
+
+class TestDurationHistory:
+    """Recorded durations, estimates and worker assignment"""
+
+    def test_record_keeps_rolling_window(self, tmp_path):
+        history = DurationHistory(tmp_path / 'durations.json', keep=3)
+        for seconds in [1, 2, 3, 4, 5]:
+            history.record('login', seconds)
+        assert history.samples['login'] == [3, 4, 5]
+        assert history.estimate('login') == 4
+
+    def test_estimate_fallbacks(self, tmp_path):
+        history = DurationHistory(tmp_path / 'durations.json')
+        assert history.estimate('new') == 5.0
+        history.record('a', 2)
+        history.record('b', 8)
+        assert history.estimate('new') == 5.0
+        assert history.estimate('new', default=12.0) == 12.0
+        history.record('c', 10)
+        assert history.estimate('new') == 8
+
+    def test_save_and_reload(self, tmp_path):
+        path = tmp_path / 'reports' / 'durations.json'
+        history = DurationHistory(path)
+        history.record('login', 7.25)
+        history.save()
+        assert DurationHistory(path).estimate('login') == 7.25
+
+    def test_lpt_schedule_balances_load(self):
+        estimates = {'valid_login': 8, 'invalid_login': 7, 'toggle': 4, 'validation': 3, 'elements': 2}
+        shards = lpt_schedule(list(estimates), estimates, 2)
+        assert makespan(shards, estimates) == 13
+        assert sorted(t for shard in shards for t in shard) == sorted(estimates)
+
+    def test_lpt_schedule_keeps_declared_order(self):
+        estimates = {'a': 1, 'b': 9, 'c': 5}
+        assert lpt_schedule(['a', 'b', 'c'], estimates, 1) == [['a', 'b', 'c']]
+        assert len(lpt_schedule(['a', 'b', 'c'], estimates, 8)) == 3
+        assert lpt_schedule([], estimates, 4) == []
+
+    def test_lpt_schedule_spreads_zero_estimates(self):
+        estimates = {name: 0.0 for name in 'abcd'}
+        assert lpt_schedule(list('abcd'), estimates, 2) == [['a', 'c'], ['b', 'd']]
+
+    def test_collection_hook_pins_each_group_to_one_worker(self, pytester):
+        pytester.makeconftest(PLAN_CONFTEST)
+        pytester.makepyfile(test_plan="\n".join(f"def test_{name}(): pass" for name in 'abcdef'))
+        result = pytester.runpytest_subprocess('-n', '2', '--dist', 'loadgroup', '-v', '-p', 'no:cacheprovider')
+        result.assert_outcomes(passed=6)
+        ran = re.findall(r'\[(gw\d+)\].*PASSED \S+::test_\w+@(lpt\d+)', result.stdout.str())
+        assert len(ran) == 6
+        workers_by_group = {}
+        for worker, group in ran:
+            workers_by_group.setdefault(group, set()).add(worker)
+        assert sorted(workers_by_group) == ['lpt0', 'lpt1']
+        assert all(len(workers) == 1 for workers in workers_by_group.values())
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the fast UI test mode
+"""
+
+import time
+
+from fast_ui import (ADVANCE_SCRIPT, DEFAULT_FAST_UI, NEXT_TIMER_SCRIPT, NO_ANIMATION_SCRIPT, VIRTUAL_CLOCK_SCRIPT,
+                     advancing, fast_ui_settings, init_scripts, settle)
+
+
+class FakeDriver:
+    """Answers the clock scripts from a list of page states"""
+
+    def __init__(self, states):
+        self.states = list(states)
+        self.calls = []
+
+    def execute_script(self, script, *args):
+        self.calls.append((script, args))
+        state = self.states.pop(0) if self.states else {'fired': 0, 'in_flight': 0, 'timers': 0}
+        if isinstance(state, Exception):
+            raise state
+        return state
+
+
+SETTINGS = dict(DEFAULT_FAST_UI, enabled=True, poll_seconds=0.001)
+
+
+class TestFastUi:
+    """Settling on page idleness instead of sleeping"""
+
+    def test_scripts_only_when_enabled(self):
+        assert init_scripts(DEFAULT_FAST_UI) == []
+        assert init_scripts(SETTINGS) == [NO_ANIMATION_SCRIPT, VIRTUAL_CLOCK_SCRIPT]
+        assert init_scripts(dict(SETTINGS, virtual_clock=False)) == [NO_ANIMATION_SCRIPT]
+
+    def test_env_overrides_enabled(self, monkeypatch):
+        monkeypatch.setenv('LYVO_FAST_UI', '1')
+        assert fast_ui_settings({'fast_ui': {'enabled': False, 'quiet_polls': 3}}) == dict(
+            DEFAULT_FAST_UI, enabled=True, quiet_polls=3)
+        monkeypatch.setenv('LYVO_FAST_UI', 'false')
+        assert fast_ui_settings({'fast_ui': {'enabled': True}})['enabled'] is False
+
+    def test_settle_returns_once_idle(self):
+        driver = FakeDriver([
+            {'fired': 1, 'in_flight': 0, 'timers': 0},
+            {'fired': 0, 'in_flight': 1, 'timers': 0},
+            RuntimeError('navigating'),
+            {'fired': 0, 'in_flight': 0, 'timers': 2},
+            {'fired': 0, 'in_flight': 0, 'timers': 2}
+        ])
+        assert settle(driver, 5, SETTINGS) < 1
+        assert len(driver.calls) == 5
+        # One virtual budget for the whole settle
+        assert {args for _, args in driver.calls} == {(5000, driver.calls[0][1][1])}
+        assert driver.calls[0][0] == ADVANCE_SCRIPT
+
+    def test_settle_gives_up_after_real_seconds(self):
+        driver = FakeDriver([{'fired': 0, 'in_flight': 1, 'timers': 0}] * 1000)
+        start = time.monotonic()
+        settle(driver, 0.05, SETTINGS)
+        assert 0.05 <= time.monotonic() - start < 1
+
+    def test_advancing_fires_next_timer_until_condition_holds(self):
+        driver = FakeDriver([])
+        outcomes = iter([False, False, 'element'])
+        check = advancing(lambda d: next(outcomes), SETTINGS)
+        assert not check(driver)
+        assert not check(driver)
+        assert check(driver) == 'element'
+        assert driver.calls == [(NEXT_TIMER_SCRIPT, (5000,))] * 2
@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the image audit
+"""
+
+from image_audit import image_summary
+
+
+class TestImageAudit:
+    """Per-route image weight and loading issues"""
+
+    def test_image_summary(self):
+        logo = {'url': '/LYVO.png', 'format': 'png', 'bytes': 150 * 1024, 'natural_width': 1200,
+                'natural_height': 400, 'rendered_width': 150, 'rendered_height': 50,
+                'loading': 'lazy', 'above_fold': True}
+        photo = {'url': 'https://cdn/room.webp', 'format': 'webp', 'bytes': None, 'natural_width': 800,
+                 'natural_height': 600, 'rendered_width': 400, 'rendered_height': 300,
+                 'loading': 'eager', 'above_fold': False}
+        summary = image_summary([logo, photo], device_pixel_ratio=2)
+        assert summary['images'] == 2 and summary['unknown_size'] == 1
+        assert summary['total_kb'] == 150.0 and summary['largest_image'] == '/LYVO.png'
+        assert summary['max_oversize_ratio'] == 16.0
+        assert summary['details'][0]['issues'] == ['oversized', 'lazy_above_fold', 'legacy_format']
+        assert summary['details'][1]['issues'] == ['eager_below_fold']
+        assert summary['details'][1]['oversize_ratio'] == 1.0
+        assert image_summary([])['images'] == 0
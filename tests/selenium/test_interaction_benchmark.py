@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the interaction benchmark
+"""
+
+from interaction_benchmark import interaction_summary
+
+
+class TestInteractionBenchmark:
+    """INP from Event Timing entries grouped by interaction"""
+
+    def test_interaction_summary(self):
+        def entry(interaction, name, duration):
+            return {'id': interaction, 'name': name, 'duration': duration,
+                    'inputDelay': 4, 'processing': duration - 10, 'presentation': 6}
+
+        summary = interaction_summary([entry(1, 'pointerdown', 24), entry(1, 'click', 56), entry(2, 'keydown', 40)])
+        assert summary['interactions'] == 2
+        assert summary['inp_ms'] == 56
+        assert summary['event'] == 'click'
+        assert summary['processing_ms'] == 46
+        assert interaction_summary([]) == {'interactions': 0, 'inp_ms': None}
+
+    def test_interaction_summary_skips_outliers(self):
+        entries = [{'id': i, 'name': 'keydown', 'duration': 20 + i, 'inputDelay': 1, 'processing': 1,
+                    'presentation': 1} for i in range(60)]
+        assert interaction_summary(entries)['inp_ms'] == 78
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the stand-in LLM fixtures
+"""
+
+import json
+
+from llm_fixtures import DEFAULT_LLM, REPLY, fault_status, gemini_chunks, prompt_text, reply_tokens, retry_summary
+
+
+class TestLlmFixtures:
+    """Streamed replies, fault patterns and retry analysis"""
+
+    def test_chunks_join_to_a_generate_content_response(self):
+        tokens = reply_tokens('Rooms from ₹8,000 "all inclusive"')
+        chunks = gemini_chunks(tokens)
+        assert len(chunks) == len(tokens) == 5
+        body = json.loads(b''.join(chunks).decode())
+        assert body['candidates'][0]['content']['parts'][0]['text'] == 'Rooms from ₹8,000 "all inclusive"'
+        assert ''.join(reply_tokens()) == REPLY
+
+    def test_fault_patterns(self):
+        assert fault_status(DEFAULT_LLM, 1) is None
+        settings = dict(DEFAULT_LLM, fail_requests=[1, 2], fail_every=5, fail_status=503)
+        assert [fault_status(settings, n) for n in range(1, 7)] == [503, 503, None, None, 503, None]
+
+    def test_prompt_text(self):
+        assert prompt_text({'contents': [{'parts': [{'text': 'test'}]}]}) == 'test'
+        assert prompt_text({}) == ''
+
+    def test_retry_summary(self):
+        summary = retry_summary([
+            {'time': 10.0, 'kind': 'probe', 'status': 429},
+            {'time': 15.02, 'kind': 'probe', 'status': 200},
+            {'time': 16.0, 'kind': 'query', 'status': 429},
+            {'time': 16.5, 'kind': 'probe', 'status': 200}
+        ])
+        assert summary['requests'] == 4
+        assert (summary['probes'], summary['queries'], summary['failures']) == (3, 1, 2)
+        assert summary['backoffs'][0] == {'after': 'probe', 'status': 429, 'next': 'probe', 'wait_ms': 5020.0}
+        assert summary['backoff_ms'] == 5520.0
+        assert retry_summary([])['backoffs'] == []
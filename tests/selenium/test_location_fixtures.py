@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the deterministic location fixtures
+"""
+
+from location_fixtures import PLACES, generate_properties, haversine_km, reverse_place, search_places
+
+
+class TestLocationFixtures:
+    """Geocoding fixture and synthetic property generator"""
+
+    def test_search_matches_case_insensitively(self):
+        results = search_places('koraMAN')
+        assert len(results) == 1
+        assert results[0]['display_name'].startswith('Koramangala, Bangalore')
+        assert results[0]['lat'] == '12.9352000'
+
+    def test_search_orders_by_importance_and_limits(self):
+        results = search_places('Bangalore', limit=3)
+        assert len(results) == 3
+        importances = [r['importance'] for r in results]
+        assert importances == sorted(importances, reverse=True)
+
+    def test_search_requires_three_characters(self):
+        assert search_places('Ko') == []
+        assert search_places('   ') == []
+
+    def test_reverse_returns_nearest_place(self):
+        record = reverse_place(10.0160, 76.3420)
+        assert record['address']['suburb'] == 'Kakkanad'
+        assert record['lat'] == '10.0160000'
+
+    def test_generate_properties_is_deterministic(self):
+        first = generate_properties(50, seed=7)
+        second = generate_properties(50, seed=7)
+        assert first == second
+        assert generate_properties(50, seed=8) != first
+        assert len({p['_id'] for p in first}) == 50
+
+    def test_generated_properties_stay_near_their_place(self):
+        for i, prop in enumerate(generate_properties(len(PLACES) * 2, spread_km=5.0)):
+            place = PLACES[i % len(PLACES)]
+            assert haversine_km(place[3], place[4], prop['latitude'], prop['longitude']) <= 5.1
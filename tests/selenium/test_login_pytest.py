@@ -5,64 +5,36 @@ More advanced testing with fixtures and parametrization
 """
 
 import pytest
-import json
 import time
-from pathlib import Path
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 
 class TestLyvoLogin:
     """Test class for Lyvo login functionality"""
     
     @pytest.fixture(scope="class")
-    def config(self):
-        """Load test configuration"""
-        config_file = Path(__file__).parent.parent / "test_config.json"
-        if config_file.exists():
-            with open(config_file, 'r') as f:
-                return json.load(f)
-        else:
-            # Default configuration
-            return {
-                'base_url': 'http://localhost:3000',
-                'headless': False,
-                'slow_mo': 1.0,
-                'test_users': {
-                    'seeker': {'email': 'seeker@test.com', 'password': 'password123'},
-                    'owner': {'email': 'owner@test.com', 'password': 'password123'},
-                    'admin': {'email': 'admin@test.com', 'password': 'password123'},
-                    'invalid': {'email': 'invalid@test.com', 'password': 'wrongpassword'}
-                }
-            }
+    def config(self, lyvo_config):
+        """Load test configuration (per-worker users under pytest-xdist)"""
+        return lyvo_config
     
     @pytest.fixture(scope="class")
-    def driver(self, config):
-        """Setup Chrome WebDriver"""
-        chrome_options = Options()
-        
-        if config.get('headless', False):
-            chrome_options.add_argument('--headless')
-        
-        chrome_options.add_argument('--no-sandbox')
-        chrome_options.add_argument('--disable-dev-shm-usage')
-        chrome_options.add_argument('--window-size=1920,1080')
-        
-        driver = webdriver.Chrome(options=chrome_options)
-        driver.implicitly_wait(10)
+    def driver(self, config, driver_pool):
+        """Lease a Chrome WebDriver from the worker-local pool"""
+        driver = driver_pool.acquire(config.get('headless', False), 10, window_size='1920,1080')
         
         yield driver
         
-        driver.quit()
+        driver_pool.release(driver)
     
     @pytest.fixture(autouse=True)
-    def navigate_to_login(self, driver, config):
+    def navigate_to_login(self, driver, config, settle, adaptive_timeouts):
         """Navigate to login page before each test"""
         driver.get(f"{config['base_url']}/login")
-        time.sleep(config.get('slow_mo', 1.0))
+        with adaptive_timeouts.step('fixture_login_form', 10) as timeout:
+            WebDriverWait(driver, timeout).until(EC.presence_of_element_located((By.ID, "email")))
+        settle(driver, config.get('slow_mo', 1.0))
         yield
         # Cleanup after each test
         driver.delete_all_cookies()
@@ -90,13 +62,14 @@ class TestLyvoLogin:
         title_text = title_element.text
         assert "Welcome back" in title_text, f"Title should contain 'Welcome back', got: {title_text}"
     
+    @pytest.mark.backend('user')
     @pytest.mark.parametrize("user_type,expected_result", [
         ("invalid", False),
         ("seeker", True),
         ("owner", True),
         ("admin", True)
     ])
-    def test_login_credentials(self, driver, config, user_type, expected_result):
+    def test_login_credentials(self, driver, config, settle, user_type, expected_result):
         """Test login with different user credentials"""
         user = config['test_users'][user_type]
         
@@ -115,7 +88,7 @@ class TestLyvoLogin:
         sign_in_button.click()
         
         # Wait for response
-        time.sleep(3)
+        settle(driver, 3)
         
         current_url = driver.current_url
         
@@ -126,7 +99,7 @@ class TestLyvoLogin:
             # Should stay on login page or show error
             assert "/login" in current_url or self._has_error_message(driver), f"Should stay on login page or show error, current URL: {current_url}"
     
-    def test_password_visibility_toggle(self, driver):
+    def test_password_visibility_toggle(self, driver, settle):
         """Test password visibility toggle functionality"""
         password_field = driver.find_element(By.ID, "password")
         toggle_button = driver.find_element(By.CSS_SELECTOR, 'button[type="button"]')
@@ -136,14 +109,14 @@ class TestLyvoLogin:
         
         # Click toggle button
         toggle_button.click()
-        time.sleep(0.5)
+        settle(driver, 0.5)
         
         # Check if password is visible
         assert password_field.get_attribute('type') == 'text', "Password should be visible after toggle"
         
         # Click toggle button again
         toggle_button.click()
-        time.sleep(0.5)
+        settle(driver, 0.5)
         
         # Check if password is hidden again
         assert password_field.get_attribute('type') == 'password', "Password should be hidden after second toggle"
@@ -201,14 +174,14 @@ class TestLyvoLogin:
         href = signup_link.get_attribute('href')
         assert '/signup' in href, f"Sign up link should point to /signup, got: {href}"
     
-    def test_responsive_design(self, driver):
+    def test_responsive_design(self, driver, settle):
         """Test that login page is responsive"""
         # Test desktop size (already set)
         assert driver.get_window_size()['width'] >= 1920, "Should be desktop size"
         
         # Test mobile size
         driver.set_window_size(375, 667)  # iPhone size
-        time.sleep(1)
+        settle(driver, 1)
         
         # Check if elements are still visible
         email_field = driver.find_element(By.ID, "email")
@@ -248,41 +221,37 @@ class TestLyvoLoginPerformance:
     """Performance tests for login functionality"""
     
     @pytest.fixture(scope="class")
-    def driver(self):
-        """Setup Chrome WebDriver for performance tests"""
-        chrome_options = Options()
-        chrome_options.add_argument('--headless')
-        chrome_options.add_argument('--no-sandbox')
-        chrome_options.add_argument('--disable-dev-shm-usage')
-        
-        driver = webdriver.Chrome(options=chrome_options)
-        driver.implicitly_wait(5)
+    def driver(self, driver_pool):
+        """Lease a headless Chrome WebDriver for performance tests (cold profile: they time first loads)"""
+        driver = driver_pool.acquire(True, 5, warm=False)
         
         yield driver
         
-        driver.quit()
+        driver_pool.release(driver)
     
-    def test_page_load_time(self, driver):
+    def test_page_load_time(self, driver, lyvo_config, adaptive_timeouts):
         """Test that login page loads within acceptable time"""
         start_time = time.time()
-        driver.get("http://localhost:3000/login")
+        driver.get(f"{lyvo_config['base_url']}/login")
         
         # Wait for page to be ready
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.TAG_NAME, "body"))
-        )
+        with adaptive_timeouts.step('cold_login_body', 10) as timeout:
+            WebDriverWait(driver, timeout).until(
+                EC.presence_of_element_located((By.TAG_NAME, "body"))
+            )
         
         load_time = time.time() - start_time
         
         # Page should load within 5 seconds
         assert load_time < 5.0, f"Page load time {load_time:.2f}s exceeds 5s limit"
     
-    def test_form_submission_time(self, driver):
+    def test_form_submission_time(self, driver, lyvo_config, adaptive_timeouts):
         """Test that form submission responds within acceptable time"""
-        driver.get("http://localhost:3000/login")
+        driver.get(f"{lyvo_config['base_url']}/login")
         
         # Fill form
-        email_field = driver.find_element(By.ID, "email")
+        with adaptive_timeouts.step('cold_login_form', 10) as timeout:
+            email_field = WebDriverWait(driver, timeout).until(EC.presence_of_element_located((By.ID, "email")))
         email_field.send_keys("test@example.com")
         
         password_field = driver.find_element(By.ID, "password")
@@ -295,12 +264,13 @@ class TestLyvoLoginPerformance:
         
         # Wait for response (error or redirect)
         try:
-            WebDriverWait(driver, 5).until(
-                EC.any_of(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, '.bg-red-50')),
-                    EC.url_changes(driver.current_url)
+            with adaptive_timeouts.step('login_submit_response', 5) as timeout:
+                WebDriverWait(driver, timeout).until(
+                    EC.any_of(
+                        EC.presence_of_element_located((By.CSS_SELECTOR, '.bg-red-50')),
+                        EC.url_changes(driver.current_url)
+                    )
                 )
-            )
         except TimeoutException:
             pass  # Some responses might take longer
         
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the shared performance utilities
+"""
+
+import json
+
+from perf_utils import bar_chart, check_budgets, dropped_frames, linear_fit, percentile, save_report, summarize
+
+
+class TestPerfUtils:
+    """Statistics and report helpers used by the benchmarks"""
+
+    def test_percentile_interpolates(self):
+        values = [10, 20, 30, 40, 50]
+        assert percentile(values, 0) == 10
+        assert percentile(values, 50) == 30
+        assert percentile(values, 100) == 50
+        assert percentile(values, 25) == 20
+        assert percentile([1, 2], 50) == 1.5
+
+    def test_percentile_edge_cases(self):
+        assert percentile([], 95) == 0.0
+        assert percentile([7], 99) == 7.0
+
+    def test_summarize(self):
+        summary = summarize(range(1, 101))
+        assert summary['count'] == 100
+        assert summary['min'] == 1
+        assert summary['max'] == 100
+        assert summary['p50'] == 50.5
+        assert summarize([]) == {'count': 0}
+
+    def test_dropped_frames(self):
+        assert dropped_frames([16.7, 16.6, 16.7]) == 0
+        assert dropped_frames([33.4, 50.0, 16.7]) == 3
+        assert dropped_frames([]) == 0
+
+    def test_linear_fit(self):
+        slope, intercept = linear_fit([1000, 10000, 50000], [120, 300, 1100])
+        assert round(slope * 1000, 2) == 20.0
+        assert round(intercept, 2) == 100.0
+        assert linear_fit([5, 5], [1, 3]) == (0.0, 2.0)
+        assert linear_fit([], []) == (0.0, 0.0)
+
+    def test_bar_chart(self):
+        lines = bar_chart([('1k', 50.0), ('10k', 100.0), ('50k', 0.0)], width=10)
+        assert lines[0] == ' 1k | #####      50.0 ms'
+        assert lines[1] == '10k | ########## 100.0 ms'
+        assert lines[2] == '50k |            0.0 ms'
+        assert bar_chart([]) == []
+
+    def test_check_budgets(self):
+        violations = check_budgets(
+            {'load_ms': 1200, 'cls': 0.05, 'missing': None},
+            {'load_ms': 1000, 'cls': 0.1, 'missing': 5, 'absent': 1}
+        )
+        assert violations == ['load_ms = 1200 exceeds budget 1000']
+
+    def test_save_report(self, tmp_path):
+        config = {'perf_report_dir': str(tmp_path / 'perf')}
+        path = save_report(config, 'sample', {'value': 1}, ['too slow'])
+        data = json.loads(path.read_text())
+        assert data['name'] == 'sample'
+        assert data['results'] == {'value': 1}
+        assert data['budget_violations'] == ['too slow']
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Unit tests for prerendered public pages
+"""
+
+from prerender import (MANIFEST, ROOT_ELEMENT, LyvoPrerenderer, build_hash, inject, normalize_snapshot,
+                       route_file)
+from static_server import HOME_PAGE
+
+SHELL = f'<!doctype html><head><script type="module" src="/assets/index-D_F0uR8M.js"></script></head>' \
+        f'<body>{ROOT_ELEMENT}</body>'
+
+
+def build_dist(root, bundle='console.log(1)'):
+    dist = root / 'dist'
+    (dist / 'assets').mkdir(parents=True, exist_ok=True)
+    (dist / 'index.html').write_text(SHELL)
+    (dist / 'assets' / 'index-D_F0uR8M.js').write_text(bundle)
+    return dist
+
+
+class TestPrerender:
+    """Snapshot placement, normalisation and incremental regeneration"""
+
+    def test_route_file(self):
+        assert route_file('/') == HOME_PAGE
+        assert route_file('/login') == 'login/index.html'
+        assert route_file('/about/') == 'about/index.html'
+
+    def test_normalize_and_inject(self):
+        markup = normalize_snapshot('\n<h1>Lyvo+</h1><iframe src="https://accounts.google.com/x?id=1"></iframe>'
+                                    '<script>track()</script>\n')
+        assert markup == '<h1>Lyvo+</h1>'
+        page = inject(SHELL, markup)
+        assert '<div id="root"><h1>Lyvo+</h1></div>' in page
+        assert page.startswith('<!doctype html><head><script type="module"')
+
+    def test_build_hash_follows_bundle(self, tmp_path):
+        dist = build_dist(tmp_path)
+        first = build_hash(SHELL, dist)
+        assert build_hash(SHELL, dist) == first
+        (dist / 'assets' / 'index-D_F0uR8M.js').write_text('console.log(2)')
+        assert build_hash(SHELL, dist) != first
+
+    def test_shell_is_kept_and_only_stale_routes_render(self, tmp_path):
+        dist = build_dist(tmp_path)
+        prerenderer = LyvoPrerenderer({'prerender': {'dist_dir': str(dist), 'routes': ['/', '/login']}})
+        assert prerenderer.shell() == SHELL
+
+        build = build_hash(SHELL, dist)
+        (dist / HOME_PAGE).write_text(inject(SHELL, '<h1>Home</h1>'))
+        manifest = {'build': build, 'routes': {'/': 'a', '/login': 'b'}}
+        assert prerenderer.stale_routes(build, manifest) == ['/login']
+        (dist / 'login').mkdir()
+        (dist / 'login' / 'index.html').write_text(inject(SHELL, '<form></form>'))
+        assert prerenderer.stale_routes(build, manifest) == []
+        assert prerenderer.stale_routes('newbuild', manifest) == ['/', '/login']
+
+        (dist / MANIFEST).write_text('{"build": "%s", "routes": {"/": "a", "/login": "b"}}' % build)
+        prerenderer.clean()
+        assert (dist / 'index.html').read_text() == SHELL
+        assert not (dist / HOME_PAGE).exists() and not (dist / 'login').exists() and not (dist / MANIFEST).exists()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Unit tests for warmed Chrome profile templates
+"""
+
+import json
+
+from profile_template import READY_MARKER, ProfileTemplates, clone_profile, dist_hash
+from static_server import BUILD_STAMP, source_digest
+
+
+def build_dist(root, bundle='console.log(1)'):
+    """A build of src/main.jsx, stamped as npm run build would"""
+    (root / 'src').mkdir(exist_ok=True)
+    (root / 'src' / 'main.jsx').write_text(bundle)
+    dist = root / 'dist'
+    (dist / 'assets').mkdir(parents=True, exist_ok=True)
+    (dist / 'index.html').write_text('<div id="root"></div>')
+    (dist / 'assets' / 'index.js').write_text(bundle)
+    (dist / BUILD_STAMP).write_text(json.dumps({'inputs': ['src'], 'digest': source_digest(root, ['src'])}))
+    return dist
+
+
+class CountingTemplates(ProfileTemplates):
+    """Writes a fake cache instead of driving Chrome"""
+
+    builds = 0
+
+    def warm(self, profile_dir, arguments):
+        CountingTemplates.builds += 1
+        (profile_dir / 'Default' / 'Cache').mkdir(parents=True)
+        (profile_dir / 'Default' / 'Cache' / 'data_0').write_text('cached')
+        (profile_dir / 'SingletonLock').write_text('host-1234')
+
+
+def make_templates(tmp_path, **settings):
+    return CountingTemplates({'profile_template': dict(dist_dir=str(tmp_path / 'dist'),
+                                                      template_root=str(tmp_path / 'templates'), **settings),
+                              'static_server': {'source_root': str(tmp_path)}})
+
+
+class BrokenTemplates(CountingTemplates):
+    """The app never renders, as when the server is down"""
+
+    def warm(self, profile_dir, arguments):
+        (profile_dir / 'Default').mkdir(parents=True)
+        raise TimeoutError('#root > * never appeared')
+
+
+class TestProfileTemplate:
+    """Build hashing, one warm-up per build and per-browser clones"""
+
+    def test_dist_hash_follows_the_build(self, tmp_path):
+        assert dist_hash(tmp_path / 'dist') is None
+        first = dist_hash(build_dist(tmp_path))
+        assert first == dist_hash(tmp_path / 'dist')
+        assert dist_hash(build_dist(tmp_path, 'console.log(2)')) != first
+
+    def test_template_is_warmed_once_per_build(self, tmp_path):
+        build_dist(tmp_path)
+        CountingTemplates.builds = 0
+        template = make_templates(tmp_path).ensure()
+        assert (template / READY_MARKER).exists()
+        assert make_templates(tmp_path).ensure() == template
+        assert CountingTemplates.builds == 1
+
+        build_dist(tmp_path, 'console.log(2)')
+        assert make_templates(tmp_path).ensure() != template
+        assert CountingTemplates.builds == 2
+
+    def test_no_template_without_a_build_or_when_disabled(self, tmp_path):
+        assert make_templates(tmp_path).clone() is None
+        build_dist(tmp_path)
+        assert make_templates(tmp_path, enabled=False).clone() is None
+
+    def test_no_template_for_a_stale_build(self, tmp_path):
+        build_dist(tmp_path)
+        (tmp_path / 'src' / 'main.jsx').write_text('console.log("edited")')
+        assert make_templates(tmp_path).ensure() is None
+
+    def test_failed_warm_up_is_never_marked_ready(self, tmp_path):
+        build_dist(tmp_path)
+        templates = BrokenTemplates(make_templates(tmp_path).config)
+        assert templates.ensure() is None
+        assert not list((tmp_path / 'templates').glob(f'*/{READY_MARKER}'))
+        assert not list((tmp_path / 'templates').iterdir())
+        assert templates.clone() is None
+
+    def test_old_builds_are_pruned(self, tmp_path):
+        for bundle in ['a', 'b', 'c']:
+            build_dist(tmp_path, bundle)
+            make_templates(tmp_path, keep=2).ensure()
+        assert len(list((tmp_path / 'templates').glob(f'*/{READY_MARKER}'))) == 2
+
+    def test_clones_leave_lock_files_behind(self, tmp_path):
+        build_dist(tmp_path)
+        templates = make_templates(tmp_path)
+        for mode in ['reflink', 'hardlink', 'copy']:
+            templates.settings['clone'] = mode
+            clone = templates.clone()
+            assert (clone / 'Default' / 'Cache' / 'data_0').read_text() == 'cached'
+            assert not (clone / 'SingletonLock').exists()
+
+    def test_clone_profile_copies_nested_directories(self, tmp_path):
+        template = tmp_path / 'template'
+        (template / 'Default' / 'Code Cache' / 'js').mkdir(parents=True)
+        (template / 'Default' / 'Code Cache' / 'js' / 'index').write_text('v8')
+        clone_profile(template, tmp_path / 'clone', 'copy')
+        assert (tmp_path / 'clone' / 'Default' / 'Code Cache' / 'js' / 'index').read_text() == 'v8'
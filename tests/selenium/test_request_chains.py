@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Unit tests for request waterfalls, critical chains and serial API calls
+"""
+
+from request_chains import (build_waterfall, collect_requests, critical_chain, format_waterfall, initiator_url,
+                            serial_chains, url_label)
+
+BUNDLE = 'http://127.0.0.1:4173/assets/index-D_F0uR8M.js'
+
+
+def sent(request_id, url, timestamp, kind, initiator):
+    return {'method': 'Network.requestWillBeSent',
+            'params': {'requestId': request_id, 'request': {'url': url, 'method': 'GET'},
+                       'timestamp': timestamp, 'type': kind, 'initiator': initiator}}
+
+
+def finished(request_id, timestamp):
+    return {'method': 'Network.loadingFinished',
+            'params': {'requestId': request_id, 'timestamp': timestamp, 'encodedDataLength': 100}}
+
+
+def script_initiator(url=BUNDLE):
+    # Async fetches carry the calling script only in a parent stack
+    return {'type': 'script', 'stack': {'callFrames': [], 'parent': {'callFrames': [{'url': url}]}}}
+
+
+def dashboard_events():
+    document = {'type': 'other'}
+    return [
+        sent('old', 'http://127.0.0.1:4173/', 0.5, 'Document', document), finished('old', 0.6),
+        sent('1', 'http://127.0.0.1:4173/seeker-dashboard', 10.0, 'Document', document), finished('1', 10.1),
+        sent('2', BUNDLE, 10.11, 'Script', {'type': 'parser', 'url': 'http://127.0.0.1:4173/seeker-dashboard'}),
+        finished('2', 10.5),
+        sent('3', 'http://localhost:4002/api/user/public/user/64b7f1c2e4b0a1a2b3c4d5e6', 10.6, 'Fetch',
+             script_initiator()),
+        finished('3', 10.8),
+        sent('4', 'http://localhost:3002/api/bookings/user', 10.81, 'Fetch', script_initiator()),
+        finished('4', 11.0),
+        sent('5', 'http://localhost:3002/api/favorites', 10.6, 'XHR', script_initiator()),
+        {'method': 'Network.loadingFailed', 'params': {'requestId': '5', 'timestamp': 10.7}},
+        sent('6', 'http://127.0.0.1:4173/never-finished.js', 10.9, 'Script', script_initiator())
+    ]
+
+
+class TestRequestChains:
+    """Event parsing, initiators and chain detection"""
+
+    def test_url_label(self):
+        assert url_label('http://localhost:4002/api/user/public/user/64b7f1c2e4b0a1a2b3c4d5e6?x=1') == \
+            ':4002/api/user/public/user/:id'
+        assert url_label('http://localhost:3002/api/bookings/user') == ':3002/api/bookings/user'
+        assert url_label('https://fonts.gstatic.com/s/inter/v12/abc.woff2') == 'fonts.gstatic.com/s/inter/v12/abc.woff2'
+
+    def test_initiator_url_walks_async_stacks(self):
+        assert initiator_url({'type': 'parser', 'url': 'http://x/'}) == 'http://x/'
+        assert initiator_url(script_initiator()) == BUNDLE
+        assert initiator_url({'type': 'other'}) is None
+
+    def test_waterfall_links_initiators_and_drops_previous_page(self):
+        waterfall = build_waterfall(collect_requests(dashboard_events()))
+        assert [r['id'] for r in waterfall] == ['1', '2', '3', '5', '4']
+        assert [r['parent'] for r in waterfall] == [None, 0, 1, 1, 1]
+        assert waterfall[2]['start_ms'] == 600.0 and waterfall[2]['end_ms'] == 800.0
+        assert waterfall[3]['failed']
+
+    def test_critical_chain_to_milestone(self):
+        waterfall = build_waterfall(collect_requests(dashboard_events()))
+        chain = critical_chain(waterfall)
+        assert [r['id'] for r in chain] == ['1', '2', '4']
+        assert [r['id'] for r in critical_chain(waterfall, milestone_ms=850)] == ['1', '2', '3']
+        assert critical_chain(waterfall, milestone_ms=10) == []
+
+    def test_serial_api_calls_are_flagged(self):
+        waterfall = build_waterfall(collect_requests(dashboard_events()))
+        chains = serial_chains(waterfall)
+        assert chains == [{
+            'requests': ['GET :4002/api/user/public/user/:id', 'GET :3002/api/bookings/user'],
+            'start_ms': 600.0, 'serial_ms': 400.0, 'parallel_ms': 200.0, 'saving_ms': 200.0
+        }]
+        assert serial_chains(waterfall, max_gap_ms=5) == []
+        lines = format_waterfall('/seeker-dashboard', waterfall, critical_chain(waterfall), chains, 950)
+        assert lines[0] == '/seeker-dashboard: 5 requests, LCP 950 ms, load finished at 1000.0 ms'
+        assert 'serial: GET :4002/api/user/public/user/:id -> GET :3002/api/bookings/user' in lines[-2]
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Unit tests for duplicate and polled request detection
+"""
+
+from request_log import endpoint, redundancy_summary, redundancy_violations
+
+USER = 'http://localhost:4002/api/user/public/user/64b7f1c2e4b0a1a2b3c4d5e6'
+BOOKINGS = 'http://localhost:3002/api/bookings/user'
+
+
+def call(url, time, method='GET', body='', test='seeker_login', bytes=1024):
+    return {'method': method, 'url': url, 'body': body, 'time': time, 'test': test, 'bytes': bytes, 'status': 200}
+
+
+class TestRequestLog:
+    """Grouping, duplicate windows, polling rates and budgets"""
+
+    def test_endpoint_groups_ids(self):
+        assert endpoint(call(USER, 0)) == 'GET :4002/api/user/public/user/:id'
+
+    def test_duplicates_within_window_per_test(self):
+        requests = [
+            call(USER, 0), call(USER, 500), call(USER, 5000),
+            # Same URL, different body: not a duplicate
+            call(BOOKINGS, 100, method='POST', body='a1'), call(BOOKINGS, 200, method='POST', body='b2'),
+            # Another test's session
+            call(USER, 600, test='owner_login')
+        ]
+        summary = redundancy_summary(requests, window_ms=2000)
+        assert summary['requests'] == 6 and summary['duplicates'] == 1
+        assert summary['wasted_kb'] == 1.0 and summary['duplicate_percent'] == 16.7
+        assert summary['endpoints']['GET :4002/api/user/public/user/:id'] == \
+            {'calls': 4, 'duplicates': 1, 'wasted_kb': 1.0}
+        assert summary['by_test'] == {'seeker_login': {'requests': 5, 'duplicates': 1},
+                                      'owner_login': {'requests': 1, 'duplicates': 0}}
+
+    def test_polling_rate(self):
+        requests = [call(BOOKINGS, t) for t in (0, 30000, 60000, 90000)]
+        stats = redundancy_summary(requests, min_polls=4)['endpoints']['GET :3002/api/bookings/user']
+        assert stats['median_interval_ms'] == 30000 and stats['per_minute'] == 2.0
+        assert stats['duplicates'] == 0
+
+    def test_budgets(self):
+        summary = redundancy_summary([call(USER, t) for t in range(0, 1000, 100)])
+        assert summary['duplicates'] == 9
+        assert redundancy_violations(summary, {'duplicates': 5, 'wasted_kb': 100}) == \
+            ['duplicates = 9 exceeds budget 5']
+        assert redundancy_summary([])['duplicate_percent'] == 0.0
+
+    def test_unfinished_calls_count_without_bytes(self):
+        # Still in flight when the test ended: logged at its start, response size never read
+        pending = dict(call(USER, 500, bytes=None), pending=True)
+        summary = redundancy_summary([call(USER, 0), pending])
+        assert summary['requests'] == 2 and summary['duplicates'] == 1
+        assert summary['wasted_kb'] == 0.0 and summary['unfinished'] == 1
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Unit tests for source map decoding and coverage attribution
+"""
+
+from source_maps import (SourceMap, attribute, coverage_summary, css_used_mask, decode_vlq, js_used_mask,
+                         line_offsets, module_name, utf16_text)
+
+
+class TestSourceMaps:
+    """VLQ decoding, generated spans and per-module used bytes"""
+
+    def test_decode_vlq(self):
+        assert decode_vlq('AAAA') == [0, 0, 0, 0]
+        assert decode_vlq('AACA') == [0, 0, 1, 0]
+        assert decode_vlq('D') == [-1]
+        assert decode_vlq('gB') == [16]
+
+    def test_module_name(self):
+        assert module_name('../../src/pages/Login.jsx') == 'src/pages/Login.jsx'
+        assert module_name('../node_modules/react-dom/cjs/react-dom.production.min.js') == 'node_modules/react-dom'
+        assert module_name('../node_modules/@radix-ui/react-dialog/dist/index.mjs') == 'node_modules/@radix-ui/react-dialog'
+        assert module_name('vite/modulepreload-polyfill') == 'vite/modulepreload-polyfill'
+
+    def test_spans_follow_segments_across_lines(self):
+        text = 'aaaabbbb\ncc'
+        # Line 0: col 0 -> source 0, col 4 -> source 1; line 1: col 0 -> no source
+        source_map = SourceMap({'sources': ['../src/a.js', '../src/b.js'], 'mappings': 'AAAA,ICAA;A'})
+        assert line_offsets(text) == [0, 9]
+        assert list(source_map.spans(text)) == [(0, 4, 'src/a.js'), (4, 9, 'src/b.js'), (9, 11, None)]
+
+    def test_js_mask_lets_nested_blocks_override(self):
+        functions = [{'ranges': [{'startOffset': 0, 'endOffset': 10, 'count': 1},
+                                 {'startOffset': 4, 'endOffset': 8, 'count': 0}]},
+                     {'ranges': [{'startOffset': 10, 'endOffset': 14, 'count': 0}]}]
+        assert list(js_used_mask(14, functions)) == [1] * 4 + [0] * 4 + [1] * 2 + [0] * 4
+
+    def test_attribution_and_summary(self):
+        mask = css_used_mask(12, [{'startOffset': 0, 'endOffset': 6, 'used': True},
+                                  {'startOffset': 6, 'endOffset': 12, 'used': False}])
+        modules = attribute(mask, [(0, 4, 'src/index.css'), (4, 8, 'src/App.css'), (8, 12, None)])
+        assert modules == {'src/index.css': {'total': 4, 'used': 4}, 'src/App.css': {'total': 4, 'used': 2},
+                           '(unmapped)': {'total': 4, 'used': 0}}
+        summary = coverage_summary(modules)
+        assert summary['unused_percent'] == 50.0
+        assert summary['never_executed'] == ['(unmapped)']
+        assert list(summary['modules']) == ['(unmapped)', 'src/App.css', 'src/index.css']
+
+    def test_utf16_text_counts_surrogate_pairs(self):
+        text = utf16_text('a🏠b\nc')
+        assert len(text) == 6 and text[3] == 'b'
+        assert line_offsets(text) == [0, 5]
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the production-build static server
+"""
+
+import gzip
+
+import json
+
+from static_server import (BUILD_STAMP, IMMUTABLE, REVALIDATE, HOME_PAGE, LyvoStaticServer, cache_control, load_file,
+                           negotiate, source_digest, stale_reason)
+
+BUNDLE = 'export const routes = ["/login", "/signup"];\n' * 200
+
+
+def build_dist(root):
+    dist = root / 'dist'
+    (dist / 'assets').mkdir(parents=True)
+    (dist / 'index.html').write_text('<!doctype html><div id="root"></div>' * 20)
+    (dist / 'assets' / 'index-D_F0uR8M.js').write_text(BUNDLE)
+    (dist / 'LYVO.png').write_bytes(b'\x89PNG' + bytes(200))
+    return dist
+
+
+class TestStaticServer:
+    """Routing, caching headers and content negotiation"""
+
+    def test_hashed_assets_are_immutable(self):
+        assert cache_control('assets/index-D_F0uR8M.js') == IMMUTABLE
+        assert cache_control('assets/index-Cvp2Ui-x.css') == IMMUTABLE
+        assert cache_control('index.html') == REVALIDATE
+        assert cache_control('lyvo-favicon.svg') == REVALIDATE
+
+    def test_negotiate_prefers_brotli_then_gzip(self):
+        variants = {'identity': b'', 'br': b'', 'gzip': b''}
+        assert negotiate('gzip, deflate, br', variants) == 'br'
+        assert negotiate('gzip;q=1.0', variants) == 'gzip'
+        assert negotiate('gzip, br', {'identity': b'', 'gzip': b''}) == 'gzip'
+        assert negotiate('', variants) == 'identity'
+
+    def test_text_is_compressed_and_cached(self, tmp_path):
+        dist = build_dist(tmp_path)
+        cache = tmp_path / 'cache'
+        static = load_file(dist / 'assets' / 'index-D_F0uR8M.js', 'assets/index-D_F0uR8M.js', cache)
+        assert gzip.decompress(static.variants['gzip']).decode() == BUNDLE
+        assert static.content_type in ('application/javascript', 'text/javascript')
+        assert list(cache.glob('*.gzip'))
+        assert load_file(dist / 'assets' / 'index-D_F0uR8M.js', 'assets/index-D_F0uR8M.js', cache) == static
+
+    def test_prebuilt_variants_win_and_images_stay_raw(self, tmp_path):
+        dist = build_dist(tmp_path)
+        prebuilt = gzip.compress(BUNDLE.encode(), 1)
+        (dist / 'assets' / 'index-D_F0uR8M.js.gz').write_bytes(prebuilt)
+        assert load_file(dist / 'assets' / 'index-D_F0uR8M.js', 'assets/index-D_F0uR8M.js').variants['gzip'] == prebuilt
+        assert set(load_file(dist / 'LYVO.png', 'LYVO.png').variants) == {'identity'}
+
+    def test_spa_routes_fall_back_to_index(self, tmp_path):
+        server = LyvoStaticServer(build_dist(tmp_path))
+        server.load()
+        index = server.files['index.html']
+        assert server.resolve('/') is index
+        assert server.resolve('/seeker-bookings/123') is index
+        assert server.resolve('/assets/index-D_F0uR8M.js') is server.files['assets/index-D_F0uR8M.js']
+        assert server.resolve('/assets/missing-12345678.js') is None
+        assert 'assets/index-D_F0uR8M.js.gz' not in server.files
+
+    def test_prerendered_routes_and_shell_fallback(self, tmp_path):
+        dist = build_dist(tmp_path)
+        (dist / HOME_PAGE).write_text('<div id="root"><h1>Home</h1></div>')
+        (dist / 'login').mkdir()
+        (dist / 'login' / 'index.html').write_text('<div id="root"><form></form></div>')
+        server = LyvoStaticServer(dist)
+        server.load()
+        assert server.resolve('/') is server.files[HOME_PAGE]
+        assert server.resolve('/login') is server.files['login/index.html']
+        assert server.resolve('/login/') is server.files['login/index.html']
+        assert server.resolve('/seeker-dashboard') is server.files['index.html']
+
+    def test_only_a_build_of_the_current_sources_is_fresh(self, tmp_path):
+        dist = build_dist(tmp_path)
+        (tmp_path / 'src' / 'pages').mkdir(parents=True)
+        (tmp_path / 'src' / 'main.jsx').write_text('render()')
+        (tmp_path / 'src' / 'pages' / 'Login.jsx').write_text('login')
+        (tmp_path / 'index.html').write_text('<div id="root"></div>')
+        assert 'no build-stamp.json' in stale_reason(dist, tmp_path)
+
+        inputs = ['index.html', 'src', 'missing.config.js']
+        (dist / BUILD_STAMP).write_text(json.dumps({'inputs': inputs, 'digest': source_digest(tmp_path, inputs)}))
+        assert stale_reason(dist, tmp_path) is None
+        (tmp_path / 'src' / 'pages' / 'Login.jsx').write_text('login v2')
+        assert 'changed' in stale_reason(dist, tmp_path)
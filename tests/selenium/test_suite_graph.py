@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the prerequisite-aware suite graph
+"""
+
+import pytest
+
+from suite_graph import FAILED, PASSED, SERVICE_DOWN, SKIPPED, SuiteGraph
+
+
+def build_graph(calls, page_ok=True):
+    graph = SuiteGraph()
+    graph.add('backend', lambda: calls.append('backend') or True)
+    graph.add('page', lambda: calls.append('page') or page_ok)
+    graph.add('elements', lambda: calls.append('elements') or True, requires=['page'])
+    graph.add('login', lambda: calls.append('login') or True, requires=['page', 'backend'])
+    return graph
+
+
+class TestSuiteGraph:
+    """Ordering, prerequisite closure and fail-fast skipping"""
+
+    def test_order_runs_prerequisites_first(self):
+        graph = SuiteGraph()
+        graph.add('login', lambda: True, requires=['page'])
+        graph.add('page', lambda: True)
+        assert graph.order(['login']) == ['page', 'login']
+
+    def test_run_pulls_in_prerequisites(self):
+        calls = []
+        results = build_graph(calls).run(['login'])
+        assert calls == ['backend', 'page', 'login']
+        assert {name: r[0] for name, r in results.items()} == {'backend': PASSED, 'page': PASSED, 'login': PASSED}
+
+    def test_failed_prerequisite_skips_downstream(self):
+        calls = []
+        results = build_graph(calls, page_ok=False).run(['elements', 'login'])
+        assert 'elements' not in calls and 'login' not in calls
+        assert results['page'][0] == FAILED
+        assert results['elements'] == (SKIPPED, 0.0, 'page failed')
+        assert results['login'][0] == SKIPPED
+
+    def test_known_results_are_not_rerun(self):
+        calls = []
+        known = {'page': (PASSED, 1.0, ''), 'backend': (FAILED, 0.1, '')}
+        results = build_graph(calls).run(['elements', 'login'], known)
+        assert calls == ['elements']
+        assert set(results) == {'elements', 'login'}
+        assert results['login'] == (SKIPPED, 0.0, 'backend failed')
+
+    def test_service_down_short_circuits_node_and_dependents(self):
+        calls = []
+        graph = build_graph(calls)
+        graph.add('dashboard', lambda: calls.append('dashboard') or True, requires=['login'])
+        graph.services['login'] = ['user']
+        results = graph.run(['elements', 'dashboard'],
+                            service_down=lambda services: 'user' if 'user' in services else None)
+        assert results['login'] == (SERVICE_DOWN, 0.0, 'service down: user')
+        assert results['dashboard'] == (SKIPPED, 0.0, 'login service_down')
+        assert results['elements'][0] == PASSED
+        assert 'login' not in calls
+
+    def test_exception_counts_as_failure(self):
+        graph = SuiteGraph()
+        graph.add('boom', lambda: 1 / 0)
+        status, _, reason = graph.run(['boom'])['boom']
+        assert status == FAILED and 'division' in reason
+
+    def test_cycles_and_unknown_nodes_are_rejected(self):
+        graph = SuiteGraph()
+        graph.add('a', lambda: True, requires=['b'])
+        graph.add('b', lambda: True, requires=['a'])
+        with pytest.raises(ValueError):
+            graph.order(['a'])
+        with pytest.raises(ValueError):
+            graph.order(['missing'])
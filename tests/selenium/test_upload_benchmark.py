@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the upload benchmark
+"""
+
+from upload_benchmark import upload_phases
+
+
+class TestUploadBenchmark:
+    """Where upload time goes between selecting a file and the server's answer"""
+
+    def test_upload_phases(self):
+        timing = {'selected': 1000.0, 'previewed': 1400.0, 'sent': 2000.0, 'done': 4500.0}
+        request = {'start': 2300.0, 'response_start': 4300.0, 'end': 4310.0}
+        tasks = [{'start': 900.0, 'duration': 60.0}, {'start': 1100.0, 'duration': 250.0},
+                 {'start': 2050.0, 'duration': 200.0}, {'start': 4600.0, 'duration': 80.0}]
+        assert upload_phases(timing, request, tasks, 5_000_000) == {
+            'preview_ms': 400.0, 'encode_ms': 300.0, 'transfer_ms': 2000.0, 'throughput_mbps': 20.0,
+            'result_ms': 2500.0, 'long_tasks': 2, 'longest_task_ms': 250.0, 'blocking_ms': 350.0}
+        # Rejected before upload: nothing was sent
+        rejected = upload_phases({'selected': 1000.0}, None, tasks[:2], 30_000_000)
+        assert rejected['transfer_ms'] is None and rejected['throughput_mbps'] is None
+        assert rejected['long_tasks'] == 1 and rejected['preview_ms'] is None
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the synthetic upload photos
+"""
+
+import struct
+import zlib
+
+import pytest
+
+from upload_fixtures import (JPEG_AC_TABLE, JPEG_DC_TABLE, huffman_codes, photo_dimensions, synthetic_jpeg,
+                             synthetic_photo, synthetic_png)
+
+
+def jpeg_segments(data):
+    """(marker, payload) of every segment up to the scan, and the entropy-coded scan"""
+    assert data[:2] == b'\xff\xd8' and data[-2:] == b'\xff\xd9'
+    segments, offset = [], 2
+    while True:
+        marker, length = struct.unpack('>xBH', data[offset:offset + 4])
+        segments.append((marker, data[offset + 4:offset + 2 + length]))
+        offset += 2 + length
+        if marker == 0xDA:
+            return segments, data[offset:-2]
+
+
+def count_blocks(scan):
+    """Huffman-decode a scan written with the generator's tables and count its 8x8 blocks"""
+    bits = ''.join(format(byte, '08b') for byte in scan.replace(b'\xff\x00', b'\xff'))
+    dc = {code: symbol for symbol, code in huffman_codes(JPEG_DC_TABLE).items()}
+    ac = {code: symbol for symbol, code in huffman_codes(JPEG_AC_TABLE).items()}
+
+    def read(table, position):
+        for end in range(position + 1, position + 17):
+            if bits[position:end] in table:
+                return table[bits[position:end]], end
+        raise AssertionError(f"no Huffman code at bit {position}")
+
+    blocks, position = 0, 0
+    while position < len(bits):
+        category, position = read(dc, position)
+        position += category
+        coefficients = 0
+        while coefficients < 63:
+            symbol, position = read(ac, position)
+            if symbol == 0x00:
+                break
+            position += symbol & 0x0F
+            coefficients += 1 + (symbol >> 4)
+        blocks += 1
+    assert position == len(bits)
+    return blocks
+
+
+class TestUploadFixtures:
+    """Exact-size photos the browser can decode"""
+
+    def test_photo_dimensions_grow_with_size(self):
+        assert photo_dimensions(100 * 1024, 0.4) == (584, 432)
+        width, height = photo_dimensions(20 * 1024 * 1024, 0.4)
+        assert width % 8 == 0 and height % 8 == 0
+        assert width * height <= 20 * 1024 * 1024 / 0.4
+
+    def test_canonical_huffman_codes(self):
+        assert huffman_codes(JPEG_DC_TABLE) == {0x00: '0'}
+        codes = huffman_codes(JPEG_AC_TABLE)
+        assert codes[0x00] == '0000' and codes[0x0A] == '1010'
+
+    @pytest.mark.parametrize('size', [100 * 1024, 512 * 1024 + 3])
+    def test_jpeg_is_exact_and_well_formed(self, size):
+        data = synthetic_jpeg(size, seed=1)
+        assert len(data) == size
+        segments, scan = jpeg_segments(data)
+        frame = next(payload for marker, payload in segments if marker == 0xC0)
+        _, height, width, components = struct.unpack('>BHHB', frame[:6])
+        assert (width, height) == photo_dimensions(size, 0.4) and components == 1
+        assert count_blocks(scan) == (width // 8) * (height // 8)
+        assert synthetic_jpeg(size, seed=1) == data
+
+    @pytest.mark.parametrize('size', [100 * 1024, 2 * 1024 * 1024 + 7])
+    def test_png_is_exact_and_well_formed(self, size):
+        data = synthetic_png(size)
+        assert len(data) == size and data[:8] == b'\x89PNG\r\n\x1a\n'
+        chunks, offset = {}, 8
+        while offset < len(data):
+            length, kind = struct.unpack('>I4s', data[offset:offset + 8])
+            body = data[offset + 8:offset + 8 + length]
+            assert struct.unpack('>I', data[offset + 8 + length:offset + 12 + length])[0] == zlib.crc32(kind + body)
+            chunks[kind] = body
+            offset += 12 + length
+        width, height = struct.unpack('>II', chunks[b'IHDR'][:8])
+        assert len(zlib.decompress(chunks[b'IDAT'])) == height * (width * 3 + 1)
+        assert b'IEND' in chunks
+
+    def test_synthetic_photo_is_cached_by_name(self, tmp_path):
+        path = synthetic_photo(tmp_path, 'png', 100)
+        assert path.name == 'photo-100kb-0.png' and path.stat().st_size == 100 * 1024
+        modified = path.stat().st_mtime_ns
+        assert synthetic_photo(tmp_path, 'png', 100).stat().st_mtime_ns == modified
+        assert synthetic_photo(tmp_path, 'jpeg', 100).suffix == '.jpg'
+        assert sorted(p.name for p in tmp_path.iterdir()) == ['photo-100kb-0.jpg', 'photo-100kb-0.png']
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Unit tests for per-worker isolation under pytest-xdist
+"""
+
+from worker_isolation import log_file_name, merge_worker_results, namespace_email, worker_config, write_worker_results
+
+CONFIG = {
+    'screenshot_dir': './test-screenshots',
+    'test_users': {
+        'seeker': {'email': 'seeker@test.com', 'password': 'password123'},
+        'invalid': {'email': 'invalid@test.com', 'password': 'wrongpassword'}
+    }
+}
+
+
+class TestWorkerIsolation:
+    """Users, artifact paths and result merging per worker"""
+
+    def test_namespace_email(self):
+        assert namespace_email('seeker@test.com', 'gw3') == 'seeker+gw3@test.com'
+        assert namespace_email('seeker@test.com', 'main') == 'seeker@test.com'
+
+    def test_log_file_name(self):
+        assert log_file_name('main') == 'test_results.log'
+        assert log_file_name('gw1') == 'test_results.gw1.log'
+
+    def test_worker_config_isolates_users_and_artifacts(self):
+        isolated = worker_config(CONFIG, 'gw2')
+        assert isolated['test_users']['seeker']['email'] == 'seeker+gw2@test.com'
+        assert isolated['test_users']['invalid']['email'] == 'invalid@test.com'
+        assert isolated['screenshot_dir'].endswith('gw2')
+        assert isolated['perf_report_dir'].endswith('gw2')
+        assert CONFIG['test_users']['seeker']['email'] == 'seeker@test.com'
+
+    def test_worker_config_outside_xdist_is_unchanged(self):
+        isolated = worker_config(CONFIG, 'main')
+        assert isolated['screenshot_dir'] == CONFIG['screenshot_dir']
+        assert isolated['test_users'] == CONFIG['test_users']
+
+    def test_merge_worker_results(self, tmp_path):
+        write_worker_results(tmp_path, 'gw0', [{'test': 'a', 'outcome': 'passed', 'duration': 1.5}])
+        write_worker_results(tmp_path, 'gw1', [{'test': 'b', 'outcome': 'failed', 'duration': 2.0},
+                                               {'test': 'c', 'outcome': 'passed', 'duration': 0.5}])
+        merged = merge_worker_results(tmp_path)
+        assert merged['summary'] == {'passed': 2, 'total': 3, 'success_rate': '66.7%'}
+        assert merged['workers']['gw1'] == {'tests': 2, 'passed': 1, 'duration': 2.5}
+        assert {r['worker'] for r in merged['results']} == {'gw0', 'gw1'}
+
+    def test_merge_combines_step_timings(self, tmp_path):
+        write_worker_results(tmp_path, 'gw0', [], step_timings={'login_form': [0.4]})
+        write_worker_results(tmp_path, 'gw1', [], step_timings={'login_form': [0.6], 'login_body': [0.2]})
+        merged = merge_worker_results(tmp_path)
+        assert merged['step_timings'] == {'login_form': [0.4, 0.6], 'login_body': [0.2]}
@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""
+Lyvo Upload Benchmark
+Drives the profile-picture and KYC upload flows with synthetic photos from 100 KB to 20 MB
+against the stand-in user service, optionally over a throttled mobile uplink. For every photo it
+reports the time to a decoded preview, the component's own encoding work, upload throughput,
+main-thread long tasks, the JS heap and renderer memory peaks, and whether the flow rejected or
+failed the file.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urlparse
+
+from selenium.common.exceptions import UnexpectedAlertPresentException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+
+from login_test import LyvoLoginTester, load_config, logger
+from perf_utils import check_budgets, save_report
+from standin_server import LyvoStandin, StandinStore, make_token, standin_user
+from upload_fixtures import FORMATS, synthetic_photo
+
+DEFAULT_UPLOAD_BENCHMARK = {
+    'flows': ['profile_picture', 'kyc'],
+    'formats': ['jpeg', 'png'],
+    # Phone cameras write 2-12 MB JPEGs; both flows refuse anything over 5 MB
+    'sizes_kb': [100, 1024, 4096, 8192, 20480],
+    'image_dir': './test-reports/upload-images',
+    # Network.emulateNetworkConditions parameters (throughput in bytes/s); an empty entry leaves
+    # the network alone
+    'networks': {
+        'local': {},
+        'mobile_4g': {'latency': 70, 'downloadThroughput': 1500000, 'uploadThroughput': 500000}
+    },
+    # Real seconds between memory samples while a flow runs
+    'sample_seconds': 0.05,
+    # Applied to every photo a flow accepts
+    'budgets': {
+        'preview_ms': 1000,
+        'blocking_ms': 300,
+        'heap_peak_mb': 150,
+        'renderer_peak_mb': 400
+    }
+}
+
+SEEKER = standin_user('seeker', 'upload', isVerified=True)
+
+# What the benchmark needs to know of each flow's markup. The profile picture flow reports a
+# rejected or failed upload with alert(); KYC uses toasts.
+FLOWS = {
+    'profile_picture': {
+        'route': '/seeker-profile',
+        'input': 'input[type="file"][accept="image/*"]',
+        'preview': 'img[alt="Preview"]',
+        'submit': "//button[.//span[text()='Upload']]",
+        'upload_path': '/api/user/upload-profile-picture',
+        # The preview modal closes once the new picture is saved
+        'done_text': None,
+        'rejected_text': None,
+        'failed_text': None
+    },
+    'kyc': {
+        'route': '/seeker-kyc',
+        'input': '#front-upload',
+        'preview': 'img[alt="Front preview"]',
+        'submit': "//button[contains(., 'Verify Document')]",
+        'upload_path': '/api/user/upload-kyc',
+        'done_text': 'Verification Complete!',
+        'rejected_text': 'File too large',
+        'failed_text': 'Upload failed'
+    }
+}
+
+UNTHROTTLED = {'offline': False, 'latency': 0, 'downloadThroughput': -1, 'uploadThroughput': -1}
+
+# Installed after the flow's page loads: when the file is chosen, when its preview is decoded,
+# how the flow ended and every long task
+WATCH_SCRIPT = """
+const flow = arguments[0];
+const state = {selected: null, previewed: null, sent: null, done: null, outcome: null, long_tasks: []};
+window.__lyvoUpload = state;
+try {
+  new PerformanceObserver(function(list) {
+    list.getEntries().forEach(function(e) { state.long_tasks.push({start: e.startTime, duration: e.duration}); });
+  }).observe({type: 'longtask', buffered: true});
+} catch (e) {}
+document.addEventListener('change', function(e) {
+  if (e.target.type === 'file') state.selected = performance.now();
+}, true);
+function finish(outcome) {
+  state.outcome = outcome;
+  state.done = performance.now();
+}
+function check() {
+  if (state.selected === null || state.outcome !== null) return;
+  const preview = document.querySelector(flow.preview);
+  if (preview && preview.src.startsWith('data:') && !preview.__lyvoWatched) {
+    preview.__lyvoWatched = true;
+    preview.decode().then(function() { state.previewed = performance.now(); },
+                          function() { if (state.outcome === null) finish('preview_failed'); });
+  }
+  const text = document.body.textContent;
+  if (flow.rejected_text && text.includes(flow.rejected_text)) return finish('rejected');
+  if (state.sent === null) return;
+  if (flow.failed_text && text.includes(flow.failed_text)) return finish('failed');
+  if (flow.done_text ? text.includes(flow.done_text) : !preview) finish('uploaded');
+}
+new MutationObserver(check).observe(document.body,
+  {childList: true, subtree: true, characterData: true, attributes: true, attributeFilter: ['src']});
+"""
+
+SEND_SCRIPT = "const sent = performance.now(); arguments[0].click(); window.__lyvoUpload.sent = sent; return sent;"
+
+REQUEST_SCRIPT = """
+const entry = performance.getEntriesByType('resource').filter(r => r.name.includes(arguments[0])).pop();
+return entry ? {start: entry.startTime, response_start: entry.responseStart || entry.responseEnd,
+                end: entry.responseEnd} : null;
+"""
+
+
+def upload_phases(timing: Dict, request: Optional[Dict], long_tasks: Iterable[Dict], size_bytes: int) -> Dict:
+    """Client work, transfer and main-thread blocking of one image upload.
+
+    Times are ms on the page clock. timing holds selected (file chosen), previewed (preview image
+    loaded), sent (upload clicked) and done (the flow showed its result); request is the Resource
+    Timing entry ({'start', 'response_start', 'end'}) of the upload, long_tasks Long Tasks entries
+    ({'start', 'duration'}). Phases whose times are missing are None.
+    """
+    def span(start, end):
+        return round(end - start, 1) if start is not None and end is not None else None
+
+    selected, done = timing.get('selected'), timing.get('done')
+    # Long tasks from choosing the file to the result; the 50 ms over budget is what blocks input
+    window = [task for task in long_tasks
+              if selected is not None and task['start'] + task['duration'] >= selected
+              and (done is None or task['start'] <= done)]
+    transfer = span(request['start'], request['response_start']) if request else None
+    return {
+        'preview_ms': span(selected, timing.get('previewed')),
+        # The component's own work between the click and the request leaving
+        'encode_ms': span(timing.get('sent'), request['start'] if request else None),
+        'transfer_ms': transfer,
+        'throughput_mbps': round(size_bytes * 8 / 1000 / transfer, 2) if transfer else None,
+        'result_ms': span(timing.get('sent'), done),
+        'long_tasks': len(window),
+        'longest_task_ms': round(max((task['duration'] for task in window), default=0.0), 1),
+        'blocking_ms': round(sum(max(task['duration'] - 50, 0.0) for task in window), 1)
+    }
+
+
+def renderer_rss(root_pid: int) -> int:
+    """Resident bytes of the Chrome renderer processes started under root_pid (chromedriver); needs psutil.
+
+    Decoded images and blobs live here, outside the JS heap.
+    """
+    import psutil
+
+    total = 0
+    for process in psutil.Process(root_pid).children(recursive=True):
+        try:
+            if '--type=renderer' in process.cmdline():
+                total += process.memory_info().rss
+        except psutil.Error:
+            # Renderers come and go while pages load
+            continue
+    return total
+
+
+class LyvoUploadBenchmark:
+    """Image upload cost per flow, format, size and network"""
+
+    def __init__(self, config: Dict):
+        self.config = config
+        self.settings = dict(DEFAULT_UPLOAD_BENCHMARK, **config.get('upload_benchmark', {}))
+        self.budgets = dict(DEFAULT_UPLOAD_BENCHMARK['budgets'], **self.settings.get('budgets', {}))
+        self.store = StandinStore()
+        self.store.users.append(SEEKER)
+        self.standin = LyvoStandin(store=self.store, ports={
+            'property': urlparse(config.get('property_service_url', 'http://localhost:3002')).port or 3002,
+            'chat': urlparse(config.get('chat_service_url', 'http://localhost:3004')).port or 3004,
+            'user': urlparse(config.get('backend_url', 'http://localhost:4002')).port or 4002
+        })
+        self.tester: Optional[LyvoLoginTester] = None
+        # chromedriver's pid, whose descendant renderers are sampled; None without psutil
+        self.renderer_root: Optional[int] = None
+        self.results: Dict[str, Dict[str, Dict]] = {}
+
+    def find_renderer_root(self) -> Optional[int]:
+        service = getattr(self.tester.driver, 'service', None)
+        if not service or not service.process:
+            logger.warning("⚠️ No chromedriver process to sample; reporting the JS heap only")
+            return None
+        try:
+            # One sample up front, so a missing psutil shows here rather than mid-flow
+            renderer_rss(service.process.pid)
+        except ImportError:
+            logger.warning("⚠️ psutil is not installed; reporting the JS heap only, without renderer memory")
+            return None
+        return service.process.pid
+
+    def memory(self) -> Dict[str, Optional[int]]:
+        """JS heap in use (Performance.getMetrics) and renderer resident memory, in bytes"""
+        metrics = self.tester.driver.execute_cdp_cmd('Performance.getMetrics', {})['metrics']
+        heap = next(int(m['value']) for m in metrics if m['name'] == 'JSHeapUsedSize')
+        return {'heap': heap, 'renderer': renderer_rss(self.renderer_root) if self.renderer_root else None}
+
+    @staticmethod
+    def update_peak(peak: Dict[str, Optional[int]], sample: Dict[str, Optional[int]]):
+        for name, value in sample.items():
+            if value is not None:
+                peak[name] = max(peak[name] or 0, value)
+
+    def watch(self, until: str, ceiling: float, peak: Dict) -> Dict:
+        """Sample memory until the page state has until set or the flow ended; an alert ends it too"""
+        driver = self.tester.driver
+        deadline = time.monotonic() + ceiling
+        while True:
+            try:
+                self.update_peak(peak, self.memory())
+                state = driver.execute_script("return window.__lyvoUpload;")
+            except UnexpectedAlertPresentException as e:
+                # WebDriver dismisses the alert; the page is still the one being watched
+                state = driver.execute_script("return window.__lyvoUpload;")
+                if state['outcome'] is None:
+                    state['outcome'] = 'failed' if state['sent'] is not None else 'rejected'
+                    state['done'] = driver.execute_script("return performance.now();")
+                state['alert'] = e.alert_text
+                return state
+            if state[until] is not None or state['outcome'] is not None or time.monotonic() > deadline:
+                return state
+            time.sleep(self.settings['sample_seconds'])
+
+    def measure(self, flow_name: str, image_format: str, size_kb: int) -> Dict:
+        """One photo through one flow, on a freshly loaded page"""
+        flow = FLOWS[flow_name]
+        driver = self.tester.driver
+        photo = synthetic_photo(Path(self.settings['image_dir']), image_format, size_kb)
+        driver.get(f"{self.config['base_url']}{flow['route']}")
+        field = self.tester.wait_until(f"upload_input:{flow['route']}",
+                                       EC.presence_of_element_located((By.CSS_SELECTOR, flow['input'])),
+                                       ceiling=self.config['timeouts']['page_load'])
+        driver.execute_cdp_cmd('HeapProfiler.collectGarbage', {})
+        baseline = self.memory()
+        peak = dict(baseline)
+        driver.execute_script(WATCH_SCRIPT, flow)
+        uploads_before = len(self.store.uploads)
+
+        field.send_keys(str(photo.resolve()))
+        ceiling = self.config['timeouts']['page_load'] * 2
+        state = self.watch('previewed', ceiling, peak)
+        if state['outcome'] is None and state['previewed'] is not None:
+            submit = driver.find_element(By.XPATH, flow['submit'])
+            driver.execute_script(SEND_SCRIPT, submit)
+            state = self.watch('done', ceiling, peak)
+        request = driver.execute_script(REQUEST_SCRIPT, flow['upload_path']) if state['sent'] is not None else None
+        received = self.store.uploads[uploads_before:]
+
+        result = upload_phases(state, request, state['long_tasks'], photo.stat().st_size)
+        result.update({
+            'outcome': state['outcome'] or 'timed_out',
+            'alert': state.get('alert'),
+            'bytes': photo.stat().st_size,
+            'server_receive_ms': received[-1]['receive_ms'] if received else None
+        })
+        for name in ('heap', 'renderer'):
+            known = peak[name] is not None
+            result[f"{name}_peak_mb"] = round(peak[name] / 2 ** 20, 1) if known else None
+            result[f"{name}_growth_mb"] = round((peak[name] - baseline[name]) / 2 ** 20, 1) if known else None
+        logger.info(
+            f"📤 {flow_name} {image_format} {size_kb} KB: {result['outcome']}, preview {result['preview_ms']} ms, "
+            f"{result['throughput_mbps']} Mbps, {result['blocking_ms']} ms blocking, "
+            f"heap {result['heap_peak_mb']} MB, renderer {result['renderer_peak_mb']} MB"
+        )
+        return result
+
+    def run_network(self, network: str):
+        self.tester.driver.execute_cdp_cmd('Network.emulateNetworkConditions',
+                                           dict(UNTHROTTLED, **self.settings['networks'][network]))
+        results = self.results.setdefault(network, {})
+        for flow_name in self.settings['flows']:
+            for image_format in self.settings['formats']:
+                for size_kb in self.settings['sizes_kb']:
+                    key = f"{flow_name}:{image_format}:{size_kb}kb"
+                    try:
+                        results[key] = self.measure(flow_name, image_format, size_kb)
+                    except Exception as e:
+                        logger.error(f"❌ Upload {key} on {network} failed: {e}")
+                        self.tester.take_screenshot(f"error_upload_{network}_{flow_name}_{image_format}_{size_kb}")
+                        results[key] = {'error': str(e)}
+
+    def run(self) -> List[str]:
+        """Run every network, save the report and return budget violations"""
+        self.standin.start_background(['property', 'chat', 'user'])
+        try:
+            self.tester = LyvoLoginTester(self.config)
+            if not self.tester.setup_driver():
+                logger.error("❌ Failed to prepare browser for upload benchmark")
+                return ['browser setup failed']
+            self.tester.driver.execute_cdp_cmd('Network.enable', {})
+            self.tester.driver.execute_cdp_cmd('Performance.enable', {})
+            self.renderer_root = self.find_renderer_root()
+            self.tester.seed_session(SEEKER, make_token(SEEKER['_id']))
+            for network in self.settings['networks']:
+                self.run_network(network)
+        finally:
+            if self.tester:
+                self.tester.teardown_driver()
+            self.standin.stop_background()
+
+        metrics, budgets = {}, {}
+        for network, runs in self.results.items():
+            for key, result in runs.items():
+                if result.get('outcome') not in ('uploaded', 'failed'):
+                    continue
+                for name, limit in self.budgets.items():
+                    metrics[f"{network}:{key}:{name}"] = result.get(name)
+                    budgets[f"{network}:{key}:{name}"] = limit
+        violations = check_budgets(metrics, budgets)
+        report = save_report(self.config, 'upload_benchmark', self.results, violations)
+        self.print_results(violations)
+        logger.info(f"📄 Upload report saved to: {report}")
+        return violations
+
+    def print_results(self, violations: List[str]):
+        columns = ['preview_ms', 'encode_ms', 'transfer_ms', 'throughput_mbps', 'blocking_ms', 'heap_peak_mb',
+                   'renderer_peak_mb']
+        logger.info("\n📊 Image Uploads by Flow, Format and Size:")
+        logger.info("=" * 50)
+        for network, runs in self.results.items():
+            logger.info(f"{network}:")
+            logger.info(f"  {'photo'.ljust(30)} {'outcome'.ljust(12)} " + ' '.join(c.rjust(15) for c in columns))
+            for key, result in runs.items():
+                if 'error' in result:
+                    logger.info(f"  {key.ljust(30)} ❌ {result['error']}")
+                    continue
+                row = ' '.join(str(result[c] if result[c] is not None else '-').rjust(15) for c in columns)
+                logger.info(f"  {key.ljust(30)} {result['outcome'].ljust(12)} {row}")
+        for violation in violations:
+            logger.error(f"❌ Budget exceeded: {violation}")
+        if not violations:
+            logger.info("✅ All upload budgets met")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Lyvo KYC and profile-picture upload benchmark')
+    parser.add_argument('--flow', action='append', choices=sorted(FLOWS),
+                        help='Upload flow to measure (repeatable, default from config)')
+    parser.add_argument('--format', action='append', choices=sorted(FORMATS),
+                        help='Photo format (repeatable, default from config)')
+    parser.add_argument('--size-kb', action='append', type=int,
+                        help='Photo size in KB (repeatable, default from config)')
+    parser.add_argument('--network', action='append', help='Network from config to use (repeatable, default all)')
+    args = parser.parse_args()
+
+    config = load_config()
+    settings = config.setdefault('upload_benchmark', {})
+    if args.flow:
+        settings['flows'] = args.flow
+    if args.format:
+        settings['formats'] = args.format
+    if args.size_kb:
+        settings['sizes_kb'] = args.size_kb
+    if args.network:
+        networks = settings.get('networks', DEFAULT_UPLOAD_BENCHMARK['networks'])
+        settings['networks'] = {name: networks[name] for name in args.network}
+
+    violations = LyvoUploadBenchmark(config).run()
+    sys.exit(1 if violations else 0)
+
+
+if __name__ == "__main__":
+    main()
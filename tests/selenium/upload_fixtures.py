@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Lyvo Upload Fixtures
+Synthetic photos of an exact byte size for the upload benchmark, built without an imaging
+library. Pixel data is random so nothing compresses it away, and the dimensions grow with the
+file the way a phone photo's do, so the browser has as much to decode as it would for a real one.
+"""
+
+import math
+import os
+import random
+import struct
+import zlib
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+FORMATS = {
+    'jpeg': {'extension': 'jpg', 'mime': 'image/jpeg', 'bytes_per_pixel': 0.4},
+    'png': {'extension': 'png', 'mime': 'image/png', 'bytes_per_pixel': 3.0}
+}
+
+# Baseline JPEG Huffman tables holding only the symbols the generator writes: DC difference
+# category 0 (every block has the same DC), AC run 0 with categories 1-10, and end of block.
+# (bits per code length 1-16, symbols), as in a DHT segment.
+JPEG_DC_TABLE = ([1] + [0] * 15, [0x00])
+JPEG_AC_TABLE = ([0, 0, 0, 11] + [0] * 12, [0x00] + list(range(0x01, 0x0B)))
+JPEG_MAX_BLOCK_BYTES = 110
+
+
+def huffman_codes(table: Tuple[List[int], List[int]]) -> Dict[int, str]:
+    """Canonical code for every symbol of a DHT-style (bits, symbols) table"""
+    bits, symbols = table
+    codes, code, index = {}, 0, 0
+    for length, count in enumerate(bits, start=1):
+        for _ in range(count):
+            codes[symbols[index]] = format(code, f'0{length}b')
+            code += 1
+            index += 1
+        code <<= 1
+    return codes
+
+
+def photo_dimensions(size_bytes: int, bytes_per_pixel: float) -> Tuple[int, int]:
+    """4:3 width and height, multiples of 8, of a photo holding about size_bytes"""
+    pixels = max(size_bytes / bytes_per_pixel, 64)
+    width = max(int(math.sqrt(pixels * 4 / 3)) // 8 * 8, 8)
+    height = max(int(width * 3 / 4) // 8 * 8, 8)
+    return width, height
+
+
+def _segment(marker: int, payload: bytes) -> bytes:
+    return struct.pack('>BBH', 0xFF, marker, len(payload) + 2) + payload
+
+
+def _comment_padding(size: int) -> bytes:
+    """COM segments adding exactly size bytes (size 0 or at least 4)"""
+    segments = []
+    while size:
+        take = min(size, 65537)
+        if 0 < size - take < 4:
+            # Never leave a remainder too small for a segment of its own
+            take = size - 4
+        segments.append(_segment(0xFE, b'\x00' * (take - 4)))
+        size -= take
+    return b''.join(segments)
+
+
+def _jpeg_block_pool(block_bytes: int, rng: random.Random, pool_size: int = 64) -> List[bytes]:
+    """Entropy-coded 8x8 blocks of exactly block_bytes, each a different random coefficient set"""
+    dc, ac = huffman_codes(JPEG_DC_TABLE), huffman_codes(JPEG_AC_TABLE)
+    target = block_bytes * 8 - len(dc[0])
+    # (coefficients, category of all but the last, category of the last) that fill the block exactly
+    layouts = [
+        (count, bulk, last)
+        for count in range(1, 64)
+        for bulk in range(1, 11)
+        for last in range(1, 11)
+        if (count - 1) * (len(ac[bulk]) + bulk) + len(ac[last]) + last + (len(ac[0]) if count < 63 else 0) == target
+    ]
+    if not layouts:
+        raise ValueError(f"no {block_bytes}-byte JPEG block layout")
+    pool = []
+    for _ in range(pool_size):
+        count, bulk, last = rng.choice(layouts)
+        bits = [dc[0]]
+        for category in [bulk] * (count - 1) + [last]:
+            bits.append(ac[category] + format(rng.getrandbits(category), f'0{category}b'))
+        if count < 63:
+            bits.append(ac[0])
+        pool.append(int(''.join(bits), 2).to_bytes(block_bytes, 'big'))
+    return pool
+
+
+def synthetic_jpeg(size_bytes: int, seed: int = 0) -> bytes:
+    """A valid greyscale baseline JPEG of exactly size_bytes"""
+    rng = random.Random(seed)
+    width, height = photo_dimensions(size_bytes, FORMATS['jpeg']['bytes_per_pixel'])
+    blocks = (width // 8) * (height // 8)
+    dc_bits, dc_symbols = JPEG_DC_TABLE
+    ac_bits, ac_symbols = JPEG_AC_TABLE
+    header = b''.join([
+        b'\xff\xd8',
+        _segment(0xE0, b'JFIF\x00\x01\x01\x00\x00\x01\x00\x01\x00\x00'),
+        # Quantisation of 1 everywhere: the random coefficients become random pixels
+        _segment(0xDB, b'\x00' + b'\x01' * 64),
+        _segment(0xC0, struct.pack('>BHHBBBB', 8, height, width, 1, 1, 0x11, 0)),
+        _segment(0xC4, b'\x00' + bytes(dc_bits) + bytes(dc_symbols)),
+        _segment(0xC4, b'\x10' + bytes(ac_bits) + bytes(ac_symbols))
+    ])
+    scan_header = _segment(0xDA, b'\x01\x01\x00\x00\x3f\x00')
+    fixed = len(header) + len(scan_header) + 2
+    # Byte stuffing adds about one byte in 256 to the scan
+    block_bytes = int((size_bytes - fixed - 4) / blocks / (1 + 1 / 256))
+    block_bytes = min(block_bytes, JPEG_MAX_BLOCK_BYTES)
+    if block_bytes < 2:
+        raise ValueError(f"{size_bytes} bytes is too small for a {width}x{height} JPEG")
+    pool = _jpeg_block_pool(block_bytes, rng)
+    scan = b''.join(rng.choice(pool) for _ in range(blocks)).replace(b'\xff', b'\xff\x00')
+    padding = size_bytes - fixed - len(scan)
+    if 0 < padding < 4:
+        raise ValueError(f"cannot pad a JPEG to {size_bytes} bytes")
+    return header + _comment_padding(padding) + scan_header + scan + b'\xff\xd9'
+
+
+def _png_chunk(kind: bytes, data: bytes) -> bytes:
+    return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+
+
+def synthetic_png(size_bytes: int, seed: int = 0) -> bytes:
+    """A valid RGB PNG of exactly size_bytes, its noise stored uncompressed"""
+    rng = random.Random(seed)
+    width, height = photo_dimensions(size_bytes, FORMATS['png']['bytes_per_pixel'])
+    # Each row is filter type 0 and its pixels
+    rows = b''.join(b'\x00' + rng.randbytes(width * 3) for _ in range(height))
+    while True:
+        body = [
+            _png_chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)),
+            _png_chunk(b'IDAT', zlib.compress(rows[:height * (width * 3 + 1)], 0)),
+            _png_chunk(b'IEND', b'')
+        ]
+        # A tEXt chunk takes up the rest; it needs 12 bytes of framing and its keyword
+        padding = size_bytes - 8 - sum(len(chunk) for chunk in body) - 12 - len(b'Comment\x00')
+        if padding >= 0:
+            break
+        height -= 1
+        if height < 1:
+            raise ValueError(f"{size_bytes} bytes is too small for a PNG")
+    text = _png_chunk(b'tEXt', b'Comment\x00' + b' ' * padding)
+    return b'\x89PNG\r\n\x1a\n' + body[0] + text + body[1] + body[2]
+
+
+GENERATORS = {'jpeg': synthetic_jpeg, 'png': synthetic_png}
+
+
+def synthetic_photo(directory: Path, image_format: str, size_kb: int, seed: int = 0) -> Path:
+    """Write (or reuse) a synthetic photo and return its path; the name ends in the format's extension
+    so the browser gives the File the right type
+    """
+    spec = FORMATS[image_format]
+    path = Path(directory) / f"photo-{size_kb}kb-{seed}.{spec['extension']}"
+    size_bytes = size_kb * 1024
+    if not path.exists() or path.stat().st_size != size_bytes:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        partial = path.with_suffix(f".{os.getpid()}.part")
+        partial.write_bytes(GENERATORS[image_format](size_bytes, seed))
+        partial.replace(path)
+    return path
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Lyvo Waterfall Report
+Records every network request of a page load through Chrome's performance log, rebuilds the
+initiator chains and reports the critical chain to LCP and the API calls made one after another.
+"""
+
+import argparse
+import json
+import sys
+import time
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+
+from image_audit import INIT_SCRIPT as LCP_SCRIPT
+from login_test import LyvoLoginTester, load_config, logger
+from perf_utils import check_budgets, report_dir, save_report
+from request_chains import build_waterfall, collect_requests, critical_chain, format_waterfall, serial_chains
+from standin_server import LyvoStandin, StandinStore, make_token, standin_user
+
+DEFAULT_WATERFALL_REPORT = {
+    # user is one of the USERS below, or null to load the route signed out
+    'routes': [
+        {'route': '/login', 'user': None},
+        {'route': '/seeker-dashboard', 'user': 'seeker'},
+        {'route': '/seeker-bookings', 'user': 'seeker'},
+        {'route': '/owner-dashboard', 'user': 'owner'}
+    ],
+    'settle_seconds': 3.0,
+    # Per-request delay of the stand-in services, so dependent calls show up as chains
+    'standin_latency_ms': 50,
+    # Longest gap between one API call ending and the next starting that still counts as serial
+    'max_gap_ms': 50,
+    # Applied to every route
+    'budgets': {
+        'critical_chain_ms': 2500,
+        'serial_saving_ms': 300
+    }
+}
+
+USERS = {role: standin_user(role, 'net') for role in ('seeker', 'owner')}
+
+
+class LyvoWaterfallReport:
+    """Per-route request waterfalls with critical chains and serial API calls"""
+
+    def __init__(self, config: Dict):
+        self.config = config
+        self.settings = dict(DEFAULT_WATERFALL_REPORT, **config.get('waterfall_report', {}))
+        self.budgets = dict(DEFAULT_WATERFALL_REPORT['budgets'], **self.settings.get('budgets', {}))
+        self.standin = LyvoStandin(store=StandinStore(), latency_ms=self.settings['standin_latency_ms'], ports={
+            'property': urlparse(config.get('property_service_url', 'http://localhost:3002')).port or 3002,
+            'chat': urlparse(config.get('chat_service_url', 'http://localhost:3004')).port or 3004,
+            'user': urlparse(config.get('backend_url', 'http://localhost:4002')).port or 4002
+        })
+        self.tester: Optional[LyvoLoginTester] = None
+        self.results: Dict[str, Dict] = {}
+        self.lines: List[str] = []
+
+    def network_events(self) -> List[Dict]:
+        """Network.* events logged since the previous call"""
+        events = []
+        for entry in self.tester.driver.get_log('performance'):
+            message = json.loads(entry['message'])['message']
+            if message['method'].startswith('Network.'):
+                events.append(message)
+        return events
+
+    def measure_route(self, route: str, user: Optional[str]):
+        driver = self.tester.driver
+        if user:
+            self.tester.seed_session(USERS[user], make_token(USERS[user]['_id']))
+        driver.execute_cdp_cmd('Network.clearBrowserCache', {})
+        self.network_events()
+        driver.get(f"{self.config['base_url']}{route}")
+        self.tester.wait_until(f'waterfall_body:{route}', EC.presence_of_element_located((By.TAG_NAME, 'body')))
+        time.sleep(self.settings['settle_seconds'])
+        lcp = driver.execute_script("return window.__lyvoLcp;")
+        lcp_ms = round(lcp['startTime'], 1) if lcp else None
+
+        waterfall = build_waterfall(collect_requests(self.network_events()))
+        chain = critical_chain(waterfall, lcp_ms)
+        chains = serial_chains(waterfall, self.settings['max_gap_ms'])
+        self.results[route] = {
+            'user': user,
+            'requests': len(waterfall),
+            'lcp_ms': lcp_ms,
+            'critical_chain_ms': chain[-1]['end_ms'] if chain else None,
+            'critical_chain': [f"{r['type']} {r['label']}" for r in chain],
+            'serial_chains': chains,
+            'serial_saving_ms': max((c['saving_ms'] for c in chains), default=0),
+            'waterfall': [{key: r[key] for key in ('label', 'method', 'type', 'status', 'start_ms', 'end_ms',
+                                                   'bytes', 'failed', 'parent')} for r in waterfall]
+        }
+        self.lines.extend(format_waterfall(route, waterfall, chain, chains, lcp_ms))
+        logger.info(f"🌊 {route}: {len(waterfall)} requests, critical chain {self.results[route]['critical_chain_ms']} ms")
+
+    def run(self) -> List[str]:
+        """Record every route, save the JSON and text reports and return budget violations"""
+        self.standin.start_background(['property', 'chat', 'user'])
+        try:
+            # The performance log is a chromedriver feature
+            self.tester = LyvoLoginTester(dict(self.config, performance_log=True, cold_profile=True,
+                                               driver_backend='webdriver'))
+            if not self.tester.setup_driver():
+                logger.error("❌ Failed to prepare browser for waterfall report")
+                return ['browser setup failed']
+            self.tester.driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': LCP_SCRIPT})
+            for entry in self.settings['routes']:
+                route, user = entry['route'], entry.get('user')
+                try:
+                    self.measure_route(route, user)
+                except Exception as e:
+                    logger.error(f"❌ Waterfall of {route} failed: {e}")
+                    self.tester.take_screenshot(f"error_waterfall_{route.strip('/') or 'home'}")
+                    self.results[route] = {'error': str(e)}
+        finally:
+            if self.tester:
+                self.tester.teardown_driver()
+            self.standin.stop_background()
+
+        metrics = {f"{route}:{name}": result.get(name) for route, result in self.results.items() for name in self.budgets}
+        budgets = {f"{route}:{name}": limit for route in self.results for name, limit in self.budgets.items()}
+        violations = check_budgets(metrics, budgets)
+        report = save_report(self.config, 'waterfall_report', self.results, violations)
+        text_report = report_dir(self.config) / 'waterfall_report.txt'
+        text_report.write_text('\n'.join(self.lines) + '\n')
+        self.print_results(violations)
+        logger.info(f"📄 Waterfall report saved to: {report} and {text_report}")
+        return violations
+
+    def print_results(self, violations: List[str]):
+        logger.info("\n📊 Request Waterfalls:")
+        logger.info("=" * 50)
+        for line in self.lines:
+            logger.info(line)
+        for route, result in self.results.items():
+            if 'error' in result:
+                logger.info(f"{route}: ❌ {result['error']}")
+        for violation in violations:
+            logger.error(f"❌ Budget exceeded: {violation}")
+        if not violations:
+            logger.info("✅ All waterfall budgets met")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Lyvo per-route request waterfall and critical chain report')
+    parser.add_argument('--route', action='append', help='Signed-out route to record (repeatable, default from config)')
+    parser.add_argument('--latency-ms', type=float, help='Per-request delay of the stand-in services')
+    args = parser.parse_args()
+
+    config = load_config()
+    settings = config.setdefault('waterfall_report', {})
+    if args.route:
+        settings['routes'] = [{'route': route, 'user': None} for route in args.route]
+    if args.latency_ms is not None:
+        settings['standin_latency_ms'] = args.latency_ms
+
+    violations = LyvoWaterfallReport(config).run()
+    sys.exit(1 if violations else 0)
+
+
+if __name__ == "__main__":
+    main()
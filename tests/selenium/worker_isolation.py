@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Lyvo Worker Isolation
+Per pytest-xdist worker test users, artifact directories and result merging,
+so parallel workers never share accounts, screenshots or logs.
+"""
+
+import copy
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+MAIN_WORKER = 'main'
+SHARED_USERS = {'invalid'}
+
+
+def worker_id() -> str:
+    """Name of the current xdist worker (gw0, gw1, ...) or 'main' outside xdist"""
+    return os.getenv('PYTEST_XDIST_WORKER', MAIN_WORKER)
+
+
+def worker_count() -> int:
+    return int(os.getenv('PYTEST_XDIST_WORKER_COUNT', '1'))
+
+
+def log_file_name(worker: Optional[str] = None) -> str:
+    """Per-worker log file so concurrent workers never interleave lines in one file"""
+    worker = worker or worker_id()
+    return 'test_results.log' if worker == MAIN_WORKER else f"test_results.{worker}.log"
+
+
+def namespace_email(email: str, worker: str) -> str:
+    """seeker@test.com -> seeker+gw1@test.com; unchanged outside xdist"""
+    if worker == MAIN_WORKER or '@' not in email:
+        return email
+    local, domain = email.split('@', 1)
+    return f"{local}+{worker}@{domain}"
+
+
+def worker_config(config: Dict, worker: Optional[str] = None) -> Dict:
+    """Copy of config with this worker's users and artifact directories"""
+    worker = worker or worker_id()
+    isolated = copy.deepcopy(config)
+    isolated['worker_id'] = worker
+    if worker == MAIN_WORKER:
+        return isolated
+
+    for name, user in isolated.get('test_users', {}).items():
+        if name not in SHARED_USERS:
+            user['email'] = namespace_email(user['email'], worker)
+    isolated['screenshot_dir'] = str(Path(config.get('screenshot_dir', './test-screenshots')) / worker)
+    isolated['perf_report_dir'] = str(Path(config.get('perf_report_dir', './test-reports/perf')) / worker)
+    return isolated
+
+
+def write_worker_results(directory: Path, worker: str, results: List[Dict],
+                         step_timings: Optional[Dict[str, List[float]]] = None) -> Path:
+    """Persist one worker's test outcomes (and passing step timings) for the controller to merge"""
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{worker}.json"
+    with open(path, 'w') as f:
+        json.dump({'worker': worker, 'results': results, 'step_timings': step_timings or {}}, f, indent=2)
+    return path
+
+
+def merge_worker_results(directory: Path) -> Dict:
+    """Combine every worker's results file into one summary in the test_results.json shape"""
+    results: List[Dict] = []
+    workers: Dict[str, Dict] = {}
+    step_timings: Dict[str, List[float]] = {}
+    for path in sorted(directory.glob('*.json')):
+        with open(path, 'r') as f:
+            data = json.load(f)
+        outcomes = data.get('results', [])
+        results.extend(dict(r, worker=data['worker']) for r in outcomes)
+        for step, values in data.get('step_timings', {}).items():
+            step_timings.setdefault(step, []).extend(values)
+        workers[data['worker']] = {
+            'tests': len(outcomes),
+            'passed': sum(1 for r in outcomes if r['outcome'] == 'passed'),
+            'duration': round(sum(r.get('duration', 0) for r in outcomes), 2)
+        }
+
+    passed = sum(1 for r in results if r['outcome'] == 'passed')
+    return {
+        'timestamp': datetime.now().isoformat(),
+        'results': results,
+        'workers': workers,
+        'step_timings': step_timings,
+        'summary': {
+            'passed': passed,
+            'total': len(results),
+            'success_rate': f"{(passed / len(results)) * 100:.1f}%" if results else 'n/a'
+        }
+    }
@@ -239,7 +239,7 @@ def main():
     backend_url = os.getenv('BACKEND_URL', 'http://localhost:4002')
     if not check_service(f"{backend_url}/api/health", 'Backend'):
         print(f"⚠️ Backend might not be running on {backend_url}")
-        print("   Tests may fail if backend is not available")
+        print("   Tests that need it will be reported as 'service down' until it responds")
     else:
         print("✅ Backend is running")
     
@@ -1,12 +1,57 @@
+import { createHash } from 'node:crypto'
+import { existsSync, readdirSync, readFileSync, statSync, writeFileSync } from 'node:fs'
+import path from 'node:path'
 import { defineConfig } from 'vite'
 import react from '@vitejs/plugin-react'
 
+// Everything the build is made from. The stamp lets tests/selenium/static_server.py refuse a
+// dist/ that no longer matches the sources.
+const BUILD_INPUTS = ['index.html', 'src', 'public', 'vite.config.js', 'tailwind.config.js', 'postcss.config.js', 'package-lock.json']
+
+function listFiles(root, name) {
+  const full = path.join(root, name)
+  if (!existsSync(full)) return []
+  if (statSync(full).isFile()) return [name]
+  return readdirSync(full).flatMap(child => listFiles(root, `${name}/${child}`))
+}
+
+// sha256 over "<path>\0<sha256 of content>\n" per file, sorted by path; static_server.py matches it
+function sourceDigest(root, inputs) {
+  const digest = createHash('sha256')
+  for (const file of inputs.flatMap(name => listFiles(root, name)).sort()) {
+    const content = createHash('sha256').update(readFileSync(path.join(root, file))).digest('hex')
+    digest.update(`${file}\0${content}\n`)
+  }
+  return digest.digest('hex')
+}
+
+function buildStamp() {
+  let root
+  let outDir
+  return {
+    name: 'lyvo-build-stamp',
+    apply: 'build',
+    configResolved(config) {
+      root = config.root
+      outDir = path.resolve(config.root, config.build.outDir)
+    },
+    closeBundle() {
+      const stamp = { inputs: BUILD_INPUTS, digest: sourceDigest(root, BUILD_INPUTS) }
+      writeFileSync(path.join(outDir, 'build-stamp.json'), JSON.stringify(stamp, null, 2))
+    }
+  }
+}
+
 // https://vitejs.dev/config/
 export default defineConfig({
-  plugins: [react()],
+  plugins: [react(), buildStamp()],
   server: {
     port: 3000,
     host: '0.0.0.0', // Allow external connections
     open: true
+  },
+  build: {
+    // LYVO_SOURCEMAP=1 writes .map files (without a sourceMappingURL) for the coverage report
+    sourcemap: process.env.LYVO_SOURCEMAP ? 'hidden' : false
   }
-}) 
\ No newline at end of file
+})